@@ -1,12 +1,25 @@
+import functools
+import hashlib
 import io
 import json
 import tempfile
 import os
+import posixpath
 import ast
+import errno
+import stat
 
 import flask
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
 
+from factorizer import utils
+from factorizer.admission_control import AdmissionControl, AdmissionQueueFullError, AdmissionTimeoutError
+from factorizer.csv_validator import CSVValidationError, CSVValidator, LIBSVMValidator
+from factorizer.data_drivers.data_driver import DataDriver
 from factorizer.data_drivers.postgresql_data_driver import PostgreSQLDataDriver
+from factorizer.data_drivers.sharded_postgresql_data_driver import ShardedPostgreSQLDataDriver
+from factorizer.ingestion_jobs import IngestionJobs, IngestionQueueFullError
+from factorizer.single_flight import SingleFlight
 
 
 POSTGRESQL_PORT = '5432'
@@ -16,29 +29,374 @@ POSTGRESQL_PASSWORD = 'postgres'
 
 DATA_CHUNK_SIZE = 4096
 
+# The directories allowed for the imports, separated by the path separator, on each host.
+DATABASE_IMPORT_DIRECTORIES_VARIABLE = 'DATABASE_IMPORT_DIRECTORIES'
+APPLICATION_IMPORT_DIRECTORIES_VARIABLE = 'APPLICATION_IMPORT_DIRECTORIES'
+
+DATABASE_IMPORT_LOCATION = 'database'
+APPLICATION_IMPORT_LOCATION = 'application'
+
+# The formats of the datasets files: the sparse datasets are uploaded and read as LIBSVM files, or read as compressed
+# sparse rows.
+CSV_FORMAT = 'csv'
+LIBSVM_FORMAT = 'libsvm'
+CSR_FORMAT = 'csr'
+
+
+INGESTION_WORKERS_NUMBER = 2
+INGESTION_QUEUED_JOBS_NUMBER = 16
+INGESTION_JOBS_RETENTION_TIME = 3600
+
+
+SPLIT_FLIGHTS_MAXIMUM_SHARED_SIZE = 256 * 1024 * 1024
+SPLIT_FLIGHTS_WAIT_TIMEOUT = 600
+
+SPLIT_ADMISSION_RUNNING_NUMBER = 8
+SPLIT_ADMISSION_DATASET_RUNNING_NUMBER = 4
+SPLIT_ADMISSION_QUEUED_NUMBER = 64
+SPLIT_ADMISSION_WAIT_TIMEOUT = 30
+SPLIT_ADMISSION_RETRY_AFTER = 5
+
+
+def create_data_driver():
+    # Reads the comma separated shards, as hostname[:port][/database], spreading every dataset across them if any.
+    shards = []
+    for shard in filter(None, os.environ.get('POSTGRESQL_SHARDS_HOSTNAMES', '').split(',')):
+        address, _, database = shard.strip().partition('/')
+        hostname, _, port = address.partition(':')
+        shards.append((hostname, port or POSTGRESQL_PORT, database or POSTGRESQL_DATABASE))
+    if shards:
+        return ShardedPostgreSQLDataDriver(
+            POSTGRESQL_USERNAME,
+            POSTGRESQL_PASSWORD,
+            shards,
+        )
+
+    # Reads the comma separated replicas, as hostname or hostname:port.
+    replicas = []
+    for replica in filter(None, os.environ.get('POSTGRESQL_REPLICAS_HOSTNAMES', '').split(',')):
+        hostname, _, port = replica.strip().partition(':')
+        replicas.append((hostname, port or POSTGRESQL_PORT))
+
+    return PostgreSQLDataDriver(
+        POSTGRESQL_DATABASE,
+        POSTGRESQL_USERNAME,
+        POSTGRESQL_PASSWORD,
+        os.environ.get('POSTGRESQL_HOSTNAME', 'postgresql'),
+        POSTGRESQL_PORT,
+        replicas=replicas,
+    )
+
 
 # App initialization.
 app = flask.Flask(__name__)
 
+# Ingestion jobs initialization, tracked by the serving process only.
+ingestion_jobs = IngestionJobs(
+    create_data_driver=create_data_driver,
+    workers_number=INGESTION_WORKERS_NUMBER,
+    queued_jobs_number=INGESTION_QUEUED_JOBS_NUMBER,
+    retention_time=INGESTION_JOBS_RETENTION_TIME,
+)
+
+# Split requests coalescing initialization.
+split_flights = SingleFlight(
+    maximum_shared_size=SPLIT_FLIGHTS_MAXIMUM_SHARED_SIZE,
+    wait_timeout=SPLIT_FLIGHTS_WAIT_TIMEOUT,
+)
+
+# Split requests admission control initialization.
+split_admission = AdmissionControl(
+    running_number=SPLIT_ADMISSION_RUNNING_NUMBER,
+    dataset_running_number=SPLIT_ADMISSION_DATASET_RUNNING_NUMBER,
+    queued_number=SPLIT_ADMISSION_QUEUED_NUMBER,
+    wait_timeout=SPLIT_ADMISSION_WAIT_TIMEOUT,
+)
+
 
 def get_data_driver():
     if not hasattr(flask.g, 'data_driver'):
-        flask.g.data_driver = PostgreSQLDataDriver(
-            POSTGRESQL_DATABASE,
-            POSTGRESQL_USERNAME,
-            POSTGRESQL_PASSWORD,
-            os.environ.get('POSTGRESQL_HOSTNAME', 'postgresql'),
-            POSTGRESQL_PORT
-        )
+        flask.g.data_driver = create_data_driver()
     return flask.g.data_driver
 
 
+def get_enum_argument(name, enum_type, default):
+    """
+    Reads an argument of the request among the values of an enumeration, aborting with 400 if it is not one of them.
+
+    :param name: the name of the argument
+    :type name: str
+
+    :param enum_type: the enumeration
+    :type enum_type: type
+
+    :param default: the value if the argument is missing
+    :type default: enum.Enum
+
+    :return: the enumeration member
+    :rtype: enum.Enum
+    """
+    value = flask.request.args.get(name, default.value)
+    try:
+        return enum_type(value)
+    except ValueError:
+        flask.abort(400, 'The {} must be one of {}, not {}.'.format(
+            name,
+            ', '.join(x.value for x in enum_type),
+            value,
+        ))
+
+
+def send_split_file(stream, split_sizes):
+    """
+    Sends a split CSV file, reporting the requested and the achieved split sizes in the response headers.
+
+    The splits of the sparse datasets, read as LIBSVM files, are converted to compressed sparse rows if the 'format'
+    argument is 'csr', as written by utils.write_csr.
+
+    :param stream: the output file as an opened stream
+    :type stream: io.BytesIO
+
+    :param split_sizes: the requested split size, None if unknown, and the achieved one
+    :type split_sizes: dict[str, int]
+
+    :return: the response
+    :rtype: flask.Response
+    """
+    stream.seek(0)
+
+    mimetype = 'text/csv'
+    if flask.request.args.get('format') == CSR_FORMAT:
+        csr_stream = io.BytesIO()
+        try:
+            utils.write_csr(io.TextIOWrapper(stream, encoding='utf-8'), csr_stream)
+        except ValueError as error:
+            flask.abort(400, 'The split is not a LIBSVM file: {}'.format(error))
+        stream = csr_stream
+        stream.seek(0)
+        mimetype = 'application/octet-stream'
+
+    response = flask.send_file(stream, mimetype=mimetype)
+    if split_sizes['requested_size'] is not None:
+        response.headers['X-Requested-Size'] = str(split_sizes['requested_size'])
+    response.headers['X-Achieved-Size'] = str(split_sizes['achieved_size'])
+    return response
+
+
+def coalesce_requests(view):
+    """
+    Coalesces the concurrent identical GET requests of a dataset view, computing the response once for all of them, as
+    the learners of a run requesting the same split with the same seed at the same moment.
+
+    The response is shared only if its body fits in SPLIT_FLIGHTS_MAXIMUM_SHARED_SIZE bytes, otherwise, or if it fails
+    or takes more than SPLIT_FLIGHTS_WAIT_TIMEOUT seconds, every request computes its own. The requests are coalesced
+    within the process only, the workers of the application computing their responses independently.
+
+    :param view: the view of a dataset split, with the dataset name as 'name' argument
+    :type view: callable
+
+    :return: the coalescing view
+    :rtype: callable
+    """
+    @functools.wraps(view)
+    def coalescing_view(**kwargs):
+        if flask.request.method != 'GET':
+            return view(**kwargs)
+
+        def compute():
+            response = flask.make_response(view(**kwargs))
+            response.direct_passthrough = False
+            return response.status_code, list(response.headers.items()), response.get_data()
+
+        status, headers, data = split_flights.run(
+            key=(kwargs['name'], flask.request.path, tuple(sorted(flask.request.args.items(multi=True)))),
+            compute=compute,
+            get_size=lambda x: len(x[2]),
+        )
+        return flask.Response(data, status=status, headers=headers)
+
+    return coalescing_view
+
+
+def admit_requests(view):
+    """
+    Limits the concurrent requests of a dataset view, overall and on every dataset, as the split queries sorting the
+    instances, so that a burst of requests queues instead of exhausting the database memory.
+
+    The requests queued beyond SPLIT_ADMISSION_QUEUED_NUMBER are rejected with 429, the ones not admitted within
+    SPLIT_ADMISSION_WAIT_TIMEOUT seconds with 503, both to be retried after SPLIT_ADMISSION_RETRY_AFTER seconds.
+
+    :param view: the view of a dataset split, with the dataset name as 'name' argument
+    :type view: callable
+
+    :return: the admitted view
+    :rtype: callable
+    """
+    @functools.wraps(view)
+    def admitted_view(**kwargs):
+        try:
+            with split_admission.admit(dataset_name=kwargs['name']):
+                return view(**kwargs)
+        except AdmissionQueueFullError as error:
+            message, status = str(error), 429
+        except AdmissionTimeoutError as error:
+            message, status = str(error), 503
+        flask.abort(flask.Response(
+            message,
+            status=status,
+            headers={'Retry-After': str(SPLIT_ADMISSION_RETRY_AFTER)},
+        ))
+
+    return admitted_view
+
+
+def create_dataset_validator(form, attributes):
+    """
+    Creates the validator of a dataset file, in the format of the form fields: CSV, or LIBSVM if the 'format' field is
+    'libsvm'.
+
+    :param form: the form fields received so far
+    :type form: dict[str, str]
+
+    :param attributes: the list of the attributes of the dataset, None to read them from the form
+    :type attributes: list[dict[str, object]]
+
+    :return: the validator, None if the form fields describing the dataset are missing
+    :rtype: CSVValidator | LIBSVMValidator
+    """
+    # The stored attributes of the sparse datasets are their label followed by their features.
+    if attributes is not None:
+        label_attributes = attributes[:1]
+    elif 'attributes' not in form:
+        return None
+    else:
+        attributes = json.loads(form['attributes'])
+        label_attributes = attributes
+
+    if form.get('format') == LIBSVM_FORMAT:
+        return LIBSVMValidator(attributes=label_attributes)
+
+    if not {'delimiter', 'header'} <= set(form):
+        return None
+    return CSVValidator(
+        attributes=attributes,
+        delimiter=form['delimiter'],
+        header=ast.literal_eval(form['header']),
+    )
+
+
+def receive_dataset_upload(output_file, attributes=None):
+    """
+    Reads a dataset upload as it arrives, writing the dataset file into the output file.
+
+    The dataset file is validated chunk by chunk against the attributes if the form fields describing it precede it,
+    as sent by most clients, otherwise once it is complete.
+
+    :param output_file: the output file as an opened stream
+    :type output_file: file
+
+    :param attributes: the list of the attributes of the dataset, None to read them from the form
+    :type attributes: list[dict[str, object]]
+
+    :return: the form fields
+    :rtype: dict[str, str]
+
+    :raises CSVValidationError: if the dataset file is invalid
+    """
+    decoder = MultipartDecoder(flask.request.mimetype_params['boundary'].encode())
+    form = {}
+    validator = None
+    part_name = None
+    part_value = b''
+
+    while True:
+        chunk = flask.request.stream.read(DATA_CHUNK_SIZE)
+        decoder.receive_data(chunk if chunk else None)
+
+        event = decoder.next_event()
+        while not isinstance(event, (NeedData, Epilogue)):
+            if isinstance(event, (Field, File)):
+                part_name = event.name
+                part_value = b''
+                if part_name == 'dataset':
+                    validator = create_dataset_validator(form, attributes)
+            elif isinstance(event, Data):
+                if part_name == 'dataset':
+                    output_file.write(event.data)
+                    if validator is not None:
+                        validator.feed(event.data)
+                else:
+                    part_value += event.data
+                    if not event.more_data:
+                        form[part_name] = part_value.decode()
+            event = decoder.next_event()
+
+        if not chunk or isinstance(event, Epilogue):
+            break
+
+    # Validates the dataset file once complete, if it preceded its description.
+    if validator is None:
+        validator = create_dataset_validator(form, attributes)
+        if validator is None:
+            raise CSVValidationError(1, None, 'the form fields describing the dataset are missing.')
+        output_file.seek(0)
+        while True:
+            chunk = output_file.read(DATA_CHUNK_SIZE)
+            if len(chunk) == 0:
+                break
+            validator.feed(chunk)
+    validator.close()
+
+    return form
+
+
+def resolve_import_path(path, location):
+    """
+    Resolves a path, checking that it is inside one of the directories whitelisted for the imports on its host.
+
+    The application paths are resolved, following the symbolic links, while the database paths, on another host,
+    are only normalized. The resolved path is the one to read, so that the file checked is the file imported.
+
+    :param path: the absolute path of the file
+    :type path: str
+
+    :param location: the host of the file, 'database' | 'application'
+    :type location: str
+
+    :return: the resolved path if the file can be imported, None otherwise
+    :rtype: str
+    """
+    if location == DATABASE_IMPORT_LOCATION:
+        directories = os.environ.get(DATABASE_IMPORT_DIRECTORIES_VARIABLE, '')
+        normalize = posixpath.normpath
+        is_absolute = posixpath.isabs
+    else:
+        directories = os.environ.get(APPLICATION_IMPORT_DIRECTORIES_VARIABLE, '')
+        normalize = os.path.realpath
+        is_absolute = os.path.isabs
+
+    if not is_absolute(path):
+        return None
+    path = normalize(path)
+    for directory in filter(None, directories.split(os.pathsep)):
+        directory = normalize(directory)
+        if os.path.commonpath([path, directory]) == directory:
+            return path
+    return None
+
+
 @app.teardown_appcontext
 def delete_data_driver(exception):
     if hasattr(flask.g, 'data_driver'):
         flask.g.data_driver.close()
 
 
+@app.errorhandler(NotImplementedError)
+def handle_not_implemented_error(error):
+    # The operations not supported by the configured data driver.
+    return str(error), 501
+
+
 @app.route('/dataset', methods=['POST'])
 def post_dataset():
     """
@@ -48,7 +406,7 @@ def post_dataset():
     :param form['name']: the name of the structure
     :type form['name']: str
 
-    :param form['attributes']: the json representation of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}
+    :param form['attributes']: the json representation of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}, optionally with 'encoded': true for the dictionary encoding of a text attribute, or 'array': true for storing a numeric attribute in the array of the instance
     :type form['attributes']: str
 
     :param form['delimiter']: the delimiter used in the CSV file (ex. ',')
@@ -57,48 +415,359 @@ def post_dataset():
     :param form['header']: specifies if the CSV has a header
     :type form['header']: bool
 
+    :param form['asynchronous']: if True, it returns 202 with the job id, ingesting the dataset in background and
+    replacing the existing one once loaded
+    :type form['asynchronous']: bool
+
+    :param form['column_group_size']: if given, the attributes are stored in groups of this size sharing the row ids, so
+    that the splits of few attributes read only their groups
+    :type form['column_group_size']: int
+
+    :param form['array_type']: the type of the elements of the array attributes, 'float4' | 'float8'
+    :type form['array_type']: str
+
+    :param form['format']: the format of the file, 'csv' by default, or 'libsvm' for storing the features of every
+    instance sparsely, the label being the only attribute and the delimiter and the header being ignored
+    :type form['format']: str
+
+    :param form['partition_attribute']: if given, the instances of every value of this attribute are stored in their own
+    partition, read directly by the splits by this class attribute
+    :type form['partition_attribute']: str
+
+    :param form['class_attribute']: if given, the dataset is optimized for the splits by this class attribute once
+    ingested, as by the optimize route
+    :type form['class_attribute']: str
+
+    :param form['cluster']: if True, the optimization clusters the instances by class
+    :type form['cluster']: bool
+
     :param files['dataset']: the file to read
     :type files['dataset']: file
     """
     data_driver = get_data_driver()
 
+    # Prepares a temporary file before uploading to the database, closed by the ingestion job if asynchronous.
+    temporary_file = tempfile.TemporaryFile()
+    try:
+        # Reads the stream chunk by chunk, validating the dataset before touching the existing structure.
+        try:
+            form = receive_dataset_upload(temporary_file)
+        except CSVValidationError as error:
+            flask.abort(400, str(error))
+
+        name = form.get('name')
+        attributes = json.loads(form.get('attributes'))
+        delimiter = form.get('delimiter')
+        header = ast.literal_eval(form.get('header', 'False'))
+        asynchronous = ast.literal_eval(form.get('asynchronous', 'False'))
+        column_group_size = form.get('column_group_size')
+        if column_group_size is not None:
+            column_group_size = int(column_group_size)
+            if column_group_size < 1:
+                flask.abort(400, 'The column group size must be positive.')
+        array_type = form.get('array_type', 'float8')
+        if array_type not in ('float4', 'float8'):
+            flask.abort(400, 'The array type must be float4 or float8.')
+        dataset_format = form.get('format', CSV_FORMAT)
+        if dataset_format not in (CSV_FORMAT, LIBSVM_FORMAT):
+            flask.abort(400, 'The format must be csv or libsvm.')
+        sparse = dataset_format == LIBSVM_FORMAT
+        partition_attribute = form.get('partition_attribute')
+        class_attribute = form.get('class_attribute')
+        cluster = ast.literal_eval(form.get('cluster', 'False'))
+        for attribute_name in (partition_attribute, class_attribute):
+            if attribute_name is not None and attribute_name not in [x['name'] for x in attributes]:
+                flask.abort(400, 'The attribute {} is not an attribute of the dataset.'.format(attribute_name))
+
+        # Queues the ingestion.
+        if asynchronous:
+            try:
+                job_id = ingestion_jobs.submit(
+                    name=name,
+                    attributes=attributes,
+                    delimiter=delimiter,
+                    header=header,
+                    input_file=temporary_file,
+                    column_group_size=column_group_size,
+                    array_type=array_type,
+                    sparse=sparse,
+                    partition_attribute=partition_attribute,
+                    class_attribute=class_attribute,
+                    cluster=cluster,
+                )
+            except IngestionQueueFullError as error:
+                flask.abort(503, str(error))
+            temporary_file = None
+
+            split_flights.forget(name)
+
+            response = flask.jsonify({'job_id': job_id})
+            response.status_code = 202
+            response.headers['Location'] = flask.url_for('get_job', job_id=job_id)
+            return response
+
+        # Shift to the file start.
+        temporary_file.seek(0)
+
+        # Replaces the structure atomically, keeping the existing dataset if the file cannot be loaded.
+        try:
+            data_driver.import_structure(
+                name=name,
+                attributes=attributes,
+                delimiter=delimiter,
+                header=header,
+                input_csv=temporary_file,
+                column_group_size=column_group_size,
+                array_type=array_type,
+                sparse=sparse,
+                partition_attribute=partition_attribute,
+            )
+        except ValueError as error:
+            flask.abort(400, str(error))
+    finally:
+        if temporary_file is not None:
+            temporary_file.close()
+
+    # Detaches the splits computed before the upload.
+    split_flights.forget(name)
+
+    if class_attribute is None:
+        return 'Dataset uploaded correctly.'
+
+    # Optimizes the structure.
+    try:
+        durations = data_driver.optimize_structure(
+            name=name,
+            class_attribute=class_attribute,
+            cluster=cluster,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+    return 'Dataset uploaded and optimized correctly: {}.'.format(
+        ', '.join(['{} {:.3f} s'.format(step, duration) for step, duration in durations.items()])
+    )
+
+
+@app.route('/job/<string:job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Retrieves the status of an ingestion job, with its phase ('queued' | 'loading' | 'optimizing' | 'done' | 'failed'),
+    its progress and the durations of the optimization steps.
+    GET: /job/<str:job_id>
+
+    The jobs are known only by the process that accepted them, so that the application must be served by a single
+    process, as by 'python -m factorizer', for the polls to find them.
+
+    :param job_id: the job id
+    :type job_id: str
+
+    :return: the json representation of the job status
+    :rtype: str
+    """
+    try:
+        status = ingestion_jobs.get_status(job_id=job_id)
+    except KeyError:
+        flask.abort(404, 'The job does not exist or it has expired.')
+
+    return flask.jsonify(status)
+
+
+@app.route('/dataset/import', methods=['POST'])
+def post_dataset_import():
+    """
+    Stores a dataset from a CSV file already on the database or the application host, without sending it.
+    POST: /dataset/import
+
+    The database server reads the file directly (the user needs the pg_read_server_files role), while the
+    application streams it to the database. The file must be inside one of the directories whitelisted by the
+    DATABASE_IMPORT_DIRECTORIES or APPLICATION_IMPORT_DIRECTORIES environment variables.
+
+    :param form['name']: the name of the structure
+    :type form['name']: str
+
+    :param form['attributes']: the json representation of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}, optionally with 'encoded': true for the dictionary encoding of a text attribute
+    :type form['attributes']: str
+
+    :param form['delimiter']: the delimiter used in the CSV file (ex. ',')
+    :type form['delimiter']: str
+
+    :param form['header']: specifies if the CSV has a header
+    :type form['header']: bool
+
+    :param form['path']: the absolute path of the CSV file
+    :type form['path']: str
+
+    :param form['location']: the host of the file, 'database' (default) | 'application'
+    :type form['location']: str
+    """
+    data_driver = get_data_driver()
+
     name = flask.request.form.get('name')
     attributes = json.loads(flask.request.form.get('attributes'))
     delimiter = flask.request.form.get('delimiter')
-    header = flask.request.form.get('header')
+    header = ast.literal_eval(flask.request.form.get('header', 'False'))
+    path = flask.request.form.get('path')
+    location = flask.request.form.get('location', DATABASE_IMPORT_LOCATION)
+
+    if location not in (DATABASE_IMPORT_LOCATION, APPLICATION_IMPORT_LOCATION):
+        flask.abort(400, 'The location must be "database" or "application".')
+    if not path:
+        flask.abort(400, 'The path is required.')
+    path = resolve_import_path(path, location)
+    if path is None:
+        flask.abort(403, 'The path is not inside an import directory.')
+
+    try:
+        if location == DATABASE_IMPORT_LOCATION:
+            # Replaces the structure, as read by the database server.
+            instances_number = data_driver.import_structure(
+                name=name,
+                attributes=attributes,
+                delimiter=delimiter,
+                header=header,
+                server_path=path,
+            )
+        else:
+            # Opens the resolved path without following a symbolic link swapped in since the check.
+            try:
+                file_descriptor = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+            except FileNotFoundError:
+                flask.abort(404, 'The file does not exist.')
+            except OSError as error:
+                if error.errno != errno.ELOOP:
+                    raise
+                flask.abort(403, 'The path is not inside an import directory.')
+
+            with os.fdopen(file_descriptor, mode='rb') as input_file:
+                if not stat.S_ISREG(os.fstat(input_file.fileno()).st_mode):
+                    flask.abort(404, 'The file does not exist.')
+
+                # Reads the file chunk by chunk, validating the dataset before touching the existing structure.
+                try:
+                    validator = CSVValidator(
+                        attributes=attributes,
+                        delimiter=delimiter,
+                        header=header,
+                    )
+                    while True:
+                        chunk = input_file.read(DATA_CHUNK_SIZE)
+                        if len(chunk) == 0:
+                            break
+                        validator.feed(chunk)
+                    validator.close()
+                except CSVValidationError as error:
+                    flask.abort(400, str(error))
+
+                # Shift to the file start.
+                input_file.seek(0)
+
+                # Replaces the structure, streaming the file.
+                instances_number = data_driver.import_structure(
+                    name=name,
+                    attributes=attributes,
+                    delimiter=delimiter,
+                    header=header,
+                    input_csv=input_file,
+                )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    split_flights.forget(name)
+
+    return 'Dataset imported correctly: {} instances.'.format(instances_number)
+
+
+@app.route('/dataset/<string:name>/append', methods=['POST'])
+def post_dataset_append(name):
+    """
+    Appends instances to a dataset, updating its derived structures incrementally.
+    POST: /dataset/<str:name>/append
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param form['delimiter']: the delimiter used in the CSV file (ex. ',')
+    :type form['delimiter']: str
+
+    :param form['header']: specifies if the CSV has a header
+    :type form['header']: bool
+
+    :param form['format']: the format of the file, 'csv' by default, or 'libsvm' for the sparse datasets
+    :type form['format']: str
+
+    :param files['dataset']: the file to read
+    :type files['dataset']: file
+    """
+    data_driver = get_data_driver()
+
+    attributes = data_driver.get_structure_attributes(name=name)
+    if not attributes:
+        flask.abort(404, 'The dataset does not exist.')
 
     # Prepares a temporary file before uploading to the database.
     with tempfile.TemporaryFile() as temporary_file:
-        # Reads the stream chunk by chunk and writes into the temporary file.
-        while True:
-            chunk = flask.request.files.get('dataset').stream.read(DATA_CHUNK_SIZE)
-            temporary_file.write(chunk)
-            if len(chunk) == 0:
-                break
+        # Reads the stream chunk by chunk, validating the instances before appending them.
+        try:
+            form = receive_dataset_upload(temporary_file, attributes)
+        except CSVValidationError as error:
+            flask.abort(400, str(error))
+
+        delimiter = form.get('delimiter')
+        header = ast.literal_eval(form.get('header', 'False'))
 
         # Shift to the file start.
         temporary_file.seek(0)
 
-        # Destroys the structure.
-        data_driver.destroy_structure(
+        # Appends to the structure.
+        appended_instances_number = data_driver.append_structure(
             name=name,
+            delimiter=delimiter,
+            header=header,
+            input_csv=temporary_file,
         )
 
-        # Creates the structure.
-        data_driver.create_structure(
-            name=name,
-            attributes=attributes,
-        )
+    split_flights.forget(name)
+
+    return 'Dataset appended correctly: {} instances.'.format(appended_instances_number)
+
+
+@app.route('/dataset/<string:name>/optimize', methods=['POST'])
+def post_dataset_optimize(name):
+    """
+    Optimizes the physical layout of a dataset for the splits by a class attribute: indexes it, optionally clusters the
+    instances by class, and refreshes the planner statistics.
+    POST: /dataset/<str:name>/optimize
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param form['class_attribute']: the class attribute name
+    :type form['class_attribute']: str
+
+    :param form['cluster']: if True, the instances of every class are rewritten contiguously
+    :type form['cluster']: bool
+
+    :return: the json representation of the duration in seconds of every step
+    :rtype: str
+    """
+    data_driver = get_data_driver()
 
-        # Fills the structure.
-        data_driver.fill_structure(
+    if not data_driver.get_structure_attributes(name=name):
+        flask.abort(404, 'The dataset does not exist.')
+
+    class_attribute = flask.request.form.get('class_attribute')
+    cluster = ast.literal_eval(flask.request.form.get('cluster', 'False'))
+
+    try:
+        durations = data_driver.optimize_structure(
             name=name,
-            delimiter=delimiter,
-            header=header,
-            input_csv=temporary_file,
+            class_attribute=class_attribute,
+            cluster=cluster,
         )
+    except ValueError as error:
+        flask.abort(400, str(error))
 
-    return 'Dataset uploaded correctly.'
+    return flask.jsonify(durations)
 
 
 @app.route('/dataset/<string:name>', methods=['DELETE'])
@@ -112,16 +781,890 @@ def delete_dataset(name):
     """
     data_driver = get_data_driver()
 
-    data_driver.destroy_structure(name=name)
+    data_driver.destroy_structure(name=name)
+
+    split_flights.forget(name)
+
+    return 'Dataset deleted correctly.'
+
+
+@app.route('/upload', methods=['POST'])
+def post_upload():
+    """
+    Starts a resumable upload of a dataset, sent as chunks of a CSV file split on line boundaries.
+    POST: /upload
+
+    :param form['name']: the name of the structure
+    :type form['name']: str
+
+    :param form['attributes']: the json representation of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}, optionally with 'encoded': true for the dictionary encoding of a text attribute
+    :type form['attributes']: str
+
+    :param form['delimiter']: the delimiter used in the CSV file (ex. ',')
+    :type form['delimiter']: str
+
+    :param form['header']: specifies if the first chunk has a header
+    :type form['header']: bool
+
+    :return: the json representation of the upload id
+    :rtype: str
+    """
+    data_driver = get_data_driver()
+
+    name = flask.request.form.get('name')
+    attributes = json.loads(flask.request.form.get('attributes'))
+    delimiter = flask.request.form.get('delimiter')
+    header = ast.literal_eval(flask.request.form.get('header', 'False'))
+
+    try:
+        upload_id = data_driver.create_upload(
+            name=name,
+            attributes=attributes,
+            delimiter=delimiter,
+            header=header,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return flask.jsonify({'upload_id': upload_id})
+
+
+@app.route('/upload/<string:upload_id>', methods=['GET'])
+def get_upload(upload_id):
+    """
+    Retrieves the status of an upload, listing the stored chunks to resume it.
+    GET: /upload/<str:upload_id>
+
+    :param upload_id: the upload id
+    :type upload_id: str
+
+    :return: the json representation of the upload and its chunks
+    :rtype: str
+    """
+    data_driver = get_data_driver()
+
+    try:
+        upload = data_driver.get_upload(upload_id=upload_id)
+    except KeyError:
+        flask.abort(404, 'The upload does not exist.')
+
+    return flask.jsonify(upload)
+
+
+@app.route('/upload/<string:upload_id>/chunk/<int:chunk_number>', methods=['PUT'])
+def put_upload_chunk(upload_id, chunk_number):
+    """
+    Stores a chunk of an upload, sent as the request body. A chunk can be sent again, in case of failure.
+    PUT: /upload/<str:upload_id>/chunk/<int:chunk_number>
+
+    :param upload_id: the upload id
+    :type upload_id: str
+
+    :param chunk_number: the number of the chunk starting from 0
+    :type chunk_number: int
+
+    :param args['checksum']: the hexadecimal MD5 digest of the chunk
+    :type args['checksum']: str
+
+    :return: the json representation of the chunk number and its number of instances
+    :rtype: str
+    """
+    data_driver = get_data_driver()
+
+    checksum = flask.request.args.get('checksum').lower()
+
+    try:
+        upload = data_driver.get_upload(upload_id=upload_id)
+    except KeyError:
+        flask.abort(404, 'The upload does not exist.')
+
+    # Prepares a temporary file before uploading to the database.
+    with tempfile.TemporaryFile() as temporary_file:
+        # Reads the stream chunk by chunk, verifying and validating the chunk before storing it.
+        digest = hashlib.md5()
+        try:
+            validator = CSVValidator(
+                attributes=upload['attributes'],
+                delimiter=upload['delimiter'],
+                header=upload['header'] and chunk_number == 0,
+            )
+            while True:
+                data = flask.request.stream.read(DATA_CHUNK_SIZE)
+                if len(data) == 0:
+                    break
+                temporary_file.write(data)
+                digest.update(data)
+                validator.feed(data)
+            validator.close()
+        except CSVValidationError as error:
+            flask.abort(400, 'Chunk {}, {}'.format(chunk_number, error))
+
+        if digest.hexdigest() != checksum:
+            flask.abort(400, 'The checksum of the chunk does not match.')
+
+        # Shift to the file start.
+        temporary_file.seek(0)
+
+        try:
+            instances_number = data_driver.upload_chunk(
+                upload_id=upload_id,
+                chunk_number=chunk_number,
+                checksum=checksum,
+                input_csv=temporary_file,
+            )
+        except KeyError:
+            flask.abort(404, 'The upload does not exist.')
+
+    return flask.jsonify({'chunk_number': chunk_number, 'instances_number': instances_number})
+
+
+@app.route('/upload/<string:upload_id>/finalize', methods=['POST'])
+def post_upload_finalize(upload_id):
+    """
+    Replaces the dataset with the uploaded chunks atomically.
+    POST: /upload/<str:upload_id>/finalize
+
+    :param upload_id: the upload id
+    :type upload_id: str
+
+    :param form['chunks_number']: the expected number of chunks
+    :type form['chunks_number']: int
+    """
+    data_driver = get_data_driver()
+
+    chunks_number = int(flask.request.form.get('chunks_number'))
+
+    try:
+        name = data_driver.get_upload(upload_id=upload_id)['name']
+        instances_number = data_driver.finalize_upload(
+            upload_id=upload_id,
+            chunks_number=chunks_number,
+        )
+    except KeyError:
+        flask.abort(404, 'The upload does not exist.')
+    except ValueError as error:
+        flask.abort(409, str(error))
+
+    split_flights.forget(name)
+
+    return 'Dataset uploaded correctly: {} instances.'.format(instances_number)
+
+
+@app.route('/upload/<string:upload_id>', methods=['DELETE'])
+def delete_upload(upload_id):
+    """
+    Discards an upload and its chunks.
+    DELETE: /upload/<str:upload_id>
+
+    :param upload_id: the upload id
+    :type upload_id: str
+    """
+    data_driver = get_data_driver()
+
+    data_driver.abort_upload(upload_id=upload_id)
+
+    return 'Upload deleted correctly.'
+
+
+@app.route('/dataset/<string:name>/stats', methods=['GET'])
+def get_dataset_statistics(name):
+    """
+    Retrieves the statistics of the attributes of a dataset, optionally for every class.
+    GET: /dataset/<str:name>/stats
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['class_attribute']: the class attribute name, to include the statistics of every class
+    :type args['class_attribute']: str
+
+    :param args['quantiles']: if True, it includes the estimated quantiles of the numeric attributes
+    :type args['quantiles']: bool
+
+    :return: the json representation of the statistics
+    :rtype: str
+    """
+    data_driver = get_data_driver()
+
+    class_attribute = flask.request.args.get('class_attribute')
+    quantiles = ast.literal_eval(flask.request.args.get('quantiles', 'False'))
+
+    statistics = data_driver.get_statistics(
+        dataset_name=name,
+        class_attribute=class_attribute,
+        quantiles=quantiles,
+    )
+    if statistics is None:
+        flask.abort(404, 'The dataset does not exist.')
+
+    return flask.jsonify(statistics)
+
+
+@app.route('/dataset/<string:name>/split/training', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_training_split(name):
+    """
+    Retrieves a dataset training split as a CSV file.
+    GET: /dataset/<str:name>/split/training
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['training_rate']: the percentage of the dataset to consider as training split
+    :type args['training_rate']: float
+
+    :param args['class_attribute']: the class attribute name
+    :type args['class_attribute']: str
+
+    :param args['include_attributes']: the list of the attributes to include, None otherwise
+    :type args['include_attributes']: list[str]
+
+    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
+    :type args['exclude_attributes']: list[str]
+
+    :param args['attributes_rate']: the percentage of attributes to include
+    :type args['attributes_rate']: float
+
+    :param args['random_seed']: the random seed
+    :type args['random_seed']: int
+
+    :param args['include_header']: if True, it includes the header in the output CSV
+    :type args['include_header']: bool
+
+    :param args['split_mode']: the way instances are assigned to the splits, 'random' (default) | 'hash' | 'bernoulli' | 'system'
+    :type args['split_mode']: str
+
+    :param args['strata_number']: if given, the number of quantile buckets of the class attribute to stratify by, for continuous or high-cardinality class attributes
+    :type args['strata_number']: int
+
+    :param args['normalization']: the scaling of the numeric attributes, except the class attribute, fitted on the training split of the same seed, 'none' (default) | 'zscore' | 'minmax' | 'robust', only for the random and hash modes without strata
+    :type args['normalization']: str
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
+    :rtype: file
+    """
+    data_driver = get_data_driver()
+
+    training_rate = float(flask.request.args.get('training_rate'))
+    class_attribute = flask.request.args.get('class_attribute')
+    include_attributes = flask.request.args.getlist('include_attributes')
+    exclude_attributes = flask.request.args.getlist('exclude_attributes')
+    attributes_rate = float(flask.request.args.get('attributes_rate'))
+    random_seed = int(flask.request.args.get('random_seed'))
+    include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    split_mode = get_enum_argument('split_mode', DataDriver.SplitMode, DataDriver.SplitMode.random)
+    strata_number = flask.request.args.get('strata_number', type=int)
+    normalization = get_enum_argument('normalization', DataDriver.Normalization, DataDriver.Normalization.none)
+
+    stream = io.BytesIO()
+
+    try:
+        split_sizes = data_driver.get_training_split(
+            dataset_name=name,
+            training_rate=training_rate,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=False,
+            split_mode=split_mode,
+            strata_number=strata_number,
+            normalization=normalization,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return send_split_file(stream, split_sizes)
+
+
+@app.route('/dataset/<string:name>/split/fusion', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_fusion_split(name):
+    """
+    Retrieves a dataset fusion split as a CSV file.
+    GET: /dataset/<str:name>/split/fusion
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['training_rate']: the percentage of the dataset to consider as training split
+    :type args['training_rate']: float
+
+    :param args['fusion_rate']: the percentage of the dataset to consider as fusion split
+    :type args['fusion_rate']: float
+
+    :param args['class_attribute']: the class attribute name
+    :type args['class_attribute']: str
+
+    :param args['include_attributes']: the list of the attributes to include, None otherwise
+    :type args['include_attributes']: list[str]
+
+    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
+    :type args['exclude_attributes']: list[str]
+
+    :param args['attributes_rate']: the percentage of attributes to include
+    :type args['attributes_rate']: float
+
+    :param args['random_seed']: the random seed
+    :type args['random_seed']: int
+
+    :param args['include_header']: if True, it includes the header in the output CSV
+    :type args['include_header']: bool
+
+    :param args['split_mode']: the way instances are assigned to the splits, 'random' (default) | 'hash' | 'bernoulli' | 'system'
+    :type args['split_mode']: str
+
+    :param args['strata_number']: if given, the number of quantile buckets of the class attribute to stratify by, for continuous or high-cardinality class attributes
+    :type args['strata_number']: int
+
+    :param args['normalization']: the scaling of the numeric attributes, except the class attribute, fitted on the training split of the same seed, 'none' (default) | 'zscore' | 'minmax' | 'robust', only for the random and hash modes without strata
+    :type args['normalization']: str
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
+    :rtype: file
+    """
+    data_driver = get_data_driver()
+
+    training_rate = float(flask.request.args.get('training_rate'))
+    fusion_rate = float(flask.request.args.get('fusion_rate'))
+    class_attribute = flask.request.args.get('class_attribute')
+    include_attributes = flask.request.args.getlist('include_attributes')
+    exclude_attributes = flask.request.args.getlist('exclude_attributes')
+    attributes_rate = float(flask.request.args.get('attributes_rate'))
+    random_seed = int(flask.request.args.get('random_seed'))
+    include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    split_mode = get_enum_argument('split_mode', DataDriver.SplitMode, DataDriver.SplitMode.random)
+    strata_number = flask.request.args.get('strata_number', type=int)
+    normalization = get_enum_argument('normalization', DataDriver.Normalization, DataDriver.Normalization.none)
+
+    stream = io.BytesIO()
+
+    try:
+        split_sizes = data_driver.get_fusion_split(
+            dataset_name=name,
+            training_rate=training_rate,
+            fusion_rate=fusion_rate,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=False,
+            split_mode=split_mode,
+            strata_number=strata_number,
+            normalization=normalization,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return send_split_file(stream, split_sizes)
+
+
+@app.route('/dataset/<string:name>/split/test', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_test_split(name):
+    """
+    Retrieves a dataset test split as a CSV file.
+    GET: /dataset/<str:name>/split/test
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['training_rate']: the percentage of the dataset to consider as training split
+    :type args['training_rate']: float
+
+    :param args['fusion_rate']: the percentage of the dataset to consider as fusion split
+    :type args['fusion_rate']: float
+
+    :param args['class_attribute']: the class attribute name
+    :type args['class_attribute']: str
+
+    :param args['include_attributes']: the list of the attributes to include, None otherwise
+    :type args['include_attributes']: list[str]
+
+    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
+    :type args['exclude_attributes']: list[str]
+
+    :param args['attributes_rate']: the percentage of attributes to include
+    :type args['attributes_rate']: float
+
+    :param args['random_seed']: the random seed
+    :type args['random_seed']: int
+
+    :param args['include_header']: if True, it includes the header in the output CSV
+    :type args['include_header']: bool
+
+    :param args['split_mode']: the way instances are assigned to the splits, 'random' (default) | 'hash' | 'bernoulli' | 'system'
+    :type args['split_mode']: str
+
+    :param args['strata_number']: if given, the number of quantile buckets of the class attribute to stratify by, for continuous or high-cardinality class attributes
+    :type args['strata_number']: int
+
+    :param args['normalization']: the scaling of the numeric attributes, except the class attribute, fitted on the training split of the same seed, 'none' (default) | 'zscore' | 'minmax' | 'robust', only for the random and hash modes without strata
+    :type args['normalization']: str
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
+    :rtype: file
+    """
+    data_driver = get_data_driver()
+    training_rate = float(flask.request.args.get('training_rate'))
+    fusion_rate = float(flask.request.args.get('fusion_rate'))
+    class_attribute = flask.request.args.get('class_attribute')
+    include_attributes = flask.request.args.getlist('include_attributes')
+    exclude_attributes = flask.request.args.getlist('exclude_attributes')
+    attributes_rate = float(flask.request.args.get('attributes_rate'))
+    random_seed = int(flask.request.args.get('random_seed'))
+    include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    split_mode = get_enum_argument('split_mode', DataDriver.SplitMode, DataDriver.SplitMode.random)
+    strata_number = flask.request.args.get('strata_number', type=int)
+    normalization = get_enum_argument('normalization', DataDriver.Normalization, DataDriver.Normalization.none)
+
+    stream = io.BytesIO()
+
+    try:
+        split_sizes = data_driver.get_test_split(
+            dataset_name=name,
+            training_rate=training_rate,
+            fusion_rate=fusion_rate,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=False,
+            split_mode=split_mode,
+            strata_number=strata_number,
+            normalization=normalization,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return send_split_file(stream, split_sizes)
+
+
+@app.route('/dataset/<string:name>/split/training/sample', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_training_sample(name):
+    """
+    Retrieves a dataset sample within the training split as a CSV file.
+    GET: /dataset/<str:name>/split/training/sample
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['training_rate']: the percentage of the dataset to consider as training split
+    :type args['training_rate']: float
+
+    :param args['sample_rate']: the percentage of instances, within the training split, to include
+    :type args['sample_rate']: float
+
+    :param args['sample_number']: the sample number starting from 0
+    :type args['sample_number']: int
+
+    :param args['class_attribute']: the class attribute name
+    :type args['class_attribute']: str
+
+    :param args['include_attributes']: the list of the attributes to include, None otherwise
+    :type args['include_attributes']: list[str]
+
+    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
+    :type args['exclude_attributes']: list[str]
+
+    :param args['attributes_rate']: the percentage of attributes to include
+    :type args['attributes_rate']: float
+
+    :param args['random_seed']: the random seed
+    :type args['random_seed']: int
+
+    :param args['include_header']: if True, it includes the header in the output CSV
+    :type args['include_header']: bool
+
+    :param args['split_mode']: the way instances are assigned to the splits, 'random' (default) | 'hash' | 'bernoulli' | 'system'
+    :type args['split_mode']: str
+
+    :param args['strata_number']: if given, the number of quantile buckets of the class attribute to stratify by, for continuous or high-cardinality class attributes
+    :type args['strata_number']: int
+
+    :param args['balancing_strategy']: the way the sample sizes are balanced among the classes, random split mode only, 'none' (default) | 'cap' | 'undersample' | 'oversample' | 'ratio'
+    :type args['balancing_strategy']: str
+
+    :param args['balancing_size']: the maximum sample size of a class, for the 'cap' strategy
+    :type args['balancing_size']: int
+
+    :param args['balancing_ratio']: the maximum ratio between the sample sizes of a class and of the smallest one, for the 'ratio' strategy
+    :type args['balancing_ratio']: float
+
+    :param args['normalization']: the scaling of the numeric attributes, except the class attribute, fitted on the training split of the same seed, 'none' (default) | 'zscore' | 'minmax' | 'robust', only for the random and hash modes without strata
+    :type args['normalization']: str
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
+    :rtype: file
+    """
+    data_driver = get_data_driver()
+
+    training_rate = float(flask.request.args.get('training_rate'))
+    sample_rate = float(flask.request.args.get('sample_rate'))
+    sample_number = int(flask.request.args.get('sample_number'))
+    class_attribute = flask.request.args.get('class_attribute')
+    include_attributes = flask.request.args.getlist('include_attributes')
+    exclude_attributes = flask.request.args.getlist('exclude_attributes')
+    attributes_rate = float(flask.request.args.get('attributes_rate'))
+    random_seed = int(flask.request.args.get('random_seed'))
+    include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    split_mode = get_enum_argument('split_mode', DataDriver.SplitMode, DataDriver.SplitMode.random)
+    strata_number = flask.request.args.get('strata_number', type=int)
+    balancing_strategy = get_enum_argument(
+        'balancing_strategy',
+        DataDriver.BalancingStrategy,
+        DataDriver.BalancingStrategy.none,
+    )
+    balancing_size = flask.request.args.get('balancing_size', type=int)
+    balancing_ratio = flask.request.args.get('balancing_ratio', type=float)
+    normalization = get_enum_argument('normalization', DataDriver.Normalization, DataDriver.Normalization.none)
+
+    stream = io.BytesIO()
+
+    try:
+        split_sizes = data_driver.get_training_sample(
+            dataset_name=name,
+            training_rate=training_rate,
+            sample_rate=sample_rate,
+            sample_number=sample_number,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=False,
+            split_mode=split_mode,
+            strata_number=strata_number,
+            balancing_strategy=balancing_strategy,
+            balancing_size=balancing_size,
+            balancing_ratio=balancing_ratio,
+            normalization=normalization,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return send_split_file(stream, split_sizes)
+
+
+@app.route('/dataset/<string:name>/split/training/bootstrap', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_training_bootstrap(name):
+    """
+    Retrieves a dataset bootstrap sample, drawn with replacement within the training split, as a CSV file.
+    GET: /dataset/<str:name>/split/training/bootstrap
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['training_rate']: the percentage of the dataset to consider as training split
+    :type args['training_rate']: float
+
+    :param args['sample_size']: the number of instances to draw
+    :type args['sample_size']: int
+
+    :param args['class_attribute']: the class attribute name
+    :type args['class_attribute']: str
+
+    :param args['include_attributes']: the list of the attributes to include, None otherwise
+    :type args['include_attributes']: list[str]
+
+    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
+    :type args['exclude_attributes']: list[str]
+
+    :param args['attributes_rate']: the percentage of attributes to include
+    :type args['attributes_rate']: float
+
+    :param args['random_seed']: the random seed
+    :type args['random_seed']: int
+
+    :param args['include_header']: if True, it includes the header in the output CSV
+    :type args['include_header']: bool
+
+    :param args['include_weights']: if True, every drawn instance is output once with its multiplicity as last column
+    :type args['include_weights']: bool
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
+    :rtype: file
+    """
+    data_driver = get_data_driver()
+
+    training_rate = float(flask.request.args.get('training_rate'))
+    sample_size = int(flask.request.args.get('sample_size'))
+    class_attribute = flask.request.args.get('class_attribute')
+    include_attributes = flask.request.args.getlist('include_attributes')
+    exclude_attributes = flask.request.args.getlist('exclude_attributes')
+    attributes_rate = float(flask.request.args.get('attributes_rate'))
+    random_seed = int(flask.request.args.get('random_seed'))
+    include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    include_weights = ast.literal_eval(flask.request.args.get('include_weights', 'False'))
+
+    stream = io.BytesIO()
+
+    try:
+        split_sizes = data_driver.get_training_bootstrap(
+            dataset_name=name,
+            training_rate=training_rate,
+            sample_size=sample_size,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=False,
+            include_weights=include_weights,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return send_split_file(stream, split_sizes)
+
+
+@app.route('/dataset/<string:name>/split/training/bootstrap/class', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_training_bootstrap_class(name):
+    """
+    Retrieves the class column from a dataset bootstrap sample, drawn with replacement within the training split, as a CSV file.
+    GET: /dataset/<str:name>/split/training/bootstrap/class
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['training_rate']: the percentage of the dataset to consider as training split
+    :type args['training_rate']: float
+
+    :param args['sample_size']: the number of instances to draw
+    :type args['sample_size']: int
+
+    :param args['class_attribute']: the class attribute name
+    :type args['class_attribute']: str
+
+    :param args['random_seed']: the random seed
+    :type args['random_seed']: int
+
+    :param args['include_header']: if True, it includes the header in the output CSV
+    :type args['include_header']: bool
+
+    :param args['include_weights']: if True, every drawn instance is output once with its multiplicity as last column
+    :type args['include_weights']: bool
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
+    :rtype: file
+    """
+    data_driver = get_data_driver()
+
+    training_rate = float(flask.request.args.get('training_rate'))
+    sample_size = int(flask.request.args.get('sample_size'))
+    class_attribute = flask.request.args.get('class_attribute')
+    random_seed = int(flask.request.args.get('random_seed'))
+    include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    include_weights = ast.literal_eval(flask.request.args.get('include_weights', 'False'))
+
+    stream = io.BytesIO()
+
+    try:
+        split_sizes = data_driver.get_training_bootstrap(
+            dataset_name=name,
+            training_rate=training_rate,
+            sample_size=sample_size,
+            class_attribute=class_attribute,
+            include_attributes=[],
+            exclude_attributes=[],
+            attributes_rate=0.0,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=True,
+            include_weights=include_weights,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return send_split_file(stream, split_sizes)
+
+
+@app.route('/dataset/<string:name>/split/training/weighted', methods=['GET', 'POST'])
+@coalesce_requests
+@admit_requests
+def get_dataset_training_weighted_sample(name):
+    """
+    Retrieves a dataset sample, drawn within the training split proportionally to the instance weights, as a CSV file.
+    GET: /dataset/<str:name>/split/training/weighted
+    POST: /dataset/<str:name>/split/training/weighted
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['training_rate']: the percentage of the dataset to consider as training split
+    :type args['training_rate']: float
+
+    :param args['sample_size']: the number of instances to draw
+    :type args['sample_size']: int
+
+    :param args['class_attribute']: the class attribute name
+    :type args['class_attribute']: str
+
+    :param args['include_attributes']: the list of the attributes to include, None otherwise
+    :type args['include_attributes']: list[str]
+
+    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
+    :type args['exclude_attributes']: list[str]
+
+    :param args['attributes_rate']: the percentage of attributes to include
+    :type args['attributes_rate']: float
+
+    :param args['random_seed']: the random seed
+    :type args['random_seed']: int
+
+    :param args['include_header']: if True, it includes the header in the output CSV
+    :type args['include_header']: bool
+
+    :param args['weight_attribute']: the name of the attribute storing the weights, required by GET
+    :type args['weight_attribute']: str
+
+    :param files['weights']: the weights as 'row id,weight' lines, the row ids being numbered from 1 in the ingestion
+    order of the instances, continued by the appended files and skipping the numbers of the failed appends, required by
+    POST
+    :type files['weights']: file
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
+    :rtype: file
+    """
+    data_driver = get_data_driver()
+
+    training_rate = float(flask.request.args.get('training_rate'))
+    sample_size = int(flask.request.args.get('sample_size'))
+    class_attribute = flask.request.args.get('class_attribute')
+    include_attributes = flask.request.args.getlist('include_attributes')
+    exclude_attributes = flask.request.args.getlist('exclude_attributes')
+    attributes_rate = float(flask.request.args.get('attributes_rate'))
+    random_seed = int(flask.request.args.get('random_seed'))
+    include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    weight_attribute = flask.request.args.get('weight_attribute')
+    weights = flask.request.files.get('weights')
+
+    stream = io.BytesIO()
+
+    try:
+        split_sizes = data_driver.get_training_weighted_sample(
+            dataset_name=name,
+            training_rate=training_rate,
+            sample_size=sample_size,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=False,
+            weight_attribute=weight_attribute,
+            input_weights_csv=weights.stream if weights is not None else None,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return send_split_file(stream, split_sizes)
+
+
+@app.route('/dataset/<string:name>/split/training/weighted/class', methods=['GET', 'POST'])
+@coalesce_requests
+@admit_requests
+def get_dataset_training_weighted_sample_class(name):
+    """
+    Retrieves the class column from a dataset sample, drawn within the training split proportionally to the instance weights, as a CSV file.
+    GET: /dataset/<str:name>/split/training/weighted/class
+    POST: /dataset/<str:name>/split/training/weighted/class
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['training_rate']: the percentage of the dataset to consider as training split
+    :type args['training_rate']: float
+
+    :param args['sample_size']: the number of instances to draw
+    :type args['sample_size']: int
+
+    :param args['class_attribute']: the class attribute name
+    :type args['class_attribute']: str
+
+    :param args['random_seed']: the random seed
+    :type args['random_seed']: int
+
+    :param args['include_header']: if True, it includes the header in the output CSV
+    :type args['include_header']: bool
+
+    :param args['weight_attribute']: the name of the attribute storing the weights, required by GET
+    :type args['weight_attribute']: str
+
+    :param files['weights']: the weights as 'row id,weight' lines, the row ids being numbered from 1 in the ingestion
+    order of the instances, continued by the appended files and skipping the numbers of the failed appends, required by
+    POST
+    :type files['weights']: file
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
+    :rtype: file
+    """
+    data_driver = get_data_driver()
+
+    training_rate = float(flask.request.args.get('training_rate'))
+    sample_size = int(flask.request.args.get('sample_size'))
+    class_attribute = flask.request.args.get('class_attribute')
+    random_seed = int(flask.request.args.get('random_seed'))
+    include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    weight_attribute = flask.request.args.get('weight_attribute')
+    weights = flask.request.files.get('weights')
+
+    stream = io.BytesIO()
+
+    try:
+        split_sizes = data_driver.get_training_weighted_sample(
+            dataset_name=name,
+            training_rate=training_rate,
+            sample_size=sample_size,
+            class_attribute=class_attribute,
+            include_attributes=[],
+            exclude_attributes=[],
+            attributes_rate=0.0,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=True,
+            weight_attribute=weight_attribute,
+            input_weights_csv=weights.stream if weights is not None else None,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
 
-    return 'Dataset deleted correctly.'
+    return send_split_file(stream, split_sizes)
 
 
-@app.route('/dataset/<string:name>/split/training', methods=['GET'])
-def get_dataset_training_split(name):
+@app.route('/dataset/<string:name>/split/training/class', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_training_split_class(name):
     """
     Retrieves a dataset training split as a CSV file.
-    GET: /dataset/<str:name>/split/training
+    GET: /dataset/<str:name>/split/training/class
 
     :param name: the name of the dataset
     :type name: str
@@ -132,59 +1675,60 @@ def get_dataset_training_split(name):
     :param args['class_attribute']: the class attribute name
     :type args['class_attribute']: str
 
-    :param args['include_attributes']: the list of the attributes to include, None otherwise
-    :type args['include_attributes']: list[str]
-
-    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
-    :type args['exclude_attributes']: list[str]
-
-    :param args['attributes_rate']: the percentage of attributes to include
-    :type args['attributes_rate']: float
-
     :param args['random_seed']: the random seed
     :type args['random_seed']: int
 
     :param args['include_header']: if True, it includes the header in the output CSV
     :type args['include_header']: bool
 
-    :return: the output file as an opened stream
+    :param args['split_mode']: the way instances are assigned to the splits, 'random' (default) | 'hash' | 'bernoulli' | 'system'
+    :type args['split_mode']: str
+
+    :param args['strata_number']: if given, the number of quantile buckets of the class attribute to stratify by, for continuous or high-cardinality class attributes
+    :type args['strata_number']: int
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
     :rtype: file
     """
     data_driver = get_data_driver()
 
     training_rate = float(flask.request.args.get('training_rate'))
     class_attribute = flask.request.args.get('class_attribute')
-    include_attributes = flask.request.args.getlist('include_attributes')
-    exclude_attributes = flask.request.args.getlist('exclude_attributes')
-    attributes_rate = float(flask.request.args.get('attributes_rate'))
     random_seed = int(flask.request.args.get('random_seed'))
     include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    split_mode = get_enum_argument('split_mode', DataDriver.SplitMode, DataDriver.SplitMode.random)
+    strata_number = flask.request.args.get('strata_number', type=int)
 
     stream = io.BytesIO()
 
-    data_driver.get_training_split(
-        dataset_name=name,
-        training_rate=training_rate,
-        class_attribute=class_attribute,
-        include_attributes=include_attributes,
-        exclude_attributes=exclude_attributes,
-        attributes_rate=attributes_rate,
-        random_seed=random_seed,
-        output_csv=stream,
-        include_header=include_header,
-        class_only=False,
-    )
-
-    stream.seek(0)
+    try:
+        split_sizes = data_driver.get_training_split(
+            dataset_name=name,
+            training_rate=training_rate,
+            class_attribute=class_attribute,
+            include_attributes=[],
+            exclude_attributes=[],
+            attributes_rate=0.0,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=True,
+            split_mode=split_mode,
+            strata_number=strata_number,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
 
-    return flask.send_file(stream, mimetype='text/csv')
+    return send_split_file(stream, split_sizes)
 
 
-@app.route('/dataset/<string:name>/split/fusion', methods=['GET'])
-def get_dataset_fusion_split(name):
+@app.route('/dataset/<string:name>/split/fusion/class', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_fusion_split_class(name):
     """
-    Retrieves a dataset fusion split as a CSV file.
-    GET: /dataset/<str:name>/split/fusion
+    Retrieves the class column from the dataset fusion split as a CSV file.
+    GET: /dataset/<str:name>/split/fusion/class
 
     :param name: the name of the dataset
     :type name: str
@@ -198,22 +1742,19 @@ def get_dataset_fusion_split(name):
     :param args['class_attribute']: the class attribute name
     :type args['class_attribute']: str
 
-    :param args['include_attributes']: the list of the attributes to include, None otherwise
-    :type args['include_attributes']: list[str]
-
-    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
-    :type args['exclude_attributes']: list[str]
-
-    :param args['attributes_rate']: the percentage of attributes to include
-    :type args['attributes_rate']: float
-
     :param args['random_seed']: the random seed
     :type args['random_seed']: int
 
     :param args['include_header']: if True, it includes the header in the output CSV
     :type args['include_header']: bool
 
-    :return: the output file as an opened stream
+    :param args['split_mode']: the way instances are assigned to the splits, 'random' (default) | 'hash' | 'bernoulli' | 'system'
+    :type args['split_mode']: str
+
+    :param args['strata_number']: if given, the number of quantile buckets of the class attribute to stratify by, for continuous or high-cardinality class attributes
+    :type args['strata_number']: int
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
     :rtype: file
     """
     data_driver = get_data_driver()
@@ -221,38 +1762,42 @@ def get_dataset_fusion_split(name):
     training_rate = float(flask.request.args.get('training_rate'))
     fusion_rate = float(flask.request.args.get('fusion_rate'))
     class_attribute = flask.request.args.get('class_attribute')
-    include_attributes = flask.request.args.getlist('include_attributes')
-    exclude_attributes = flask.request.args.getlist('exclude_attributes')
-    attributes_rate = float(flask.request.args.get('attributes_rate'))
     random_seed = int(flask.request.args.get('random_seed'))
     include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    split_mode = get_enum_argument('split_mode', DataDriver.SplitMode, DataDriver.SplitMode.random)
+    strata_number = flask.request.args.get('strata_number', type=int)
 
     stream = io.BytesIO()
 
-    data_driver.get_fusion_split(
-        dataset_name=name,
-        training_rate=training_rate,
-        fusion_rate=fusion_rate,
-        class_attribute=class_attribute,
-        include_attributes=include_attributes,
-        exclude_attributes=exclude_attributes,
-        attributes_rate=attributes_rate,
-        random_seed=random_seed,
-        output_csv=stream,
-        include_header=include_header,
-        class_only=False,
-    )
-
-    stream.seek(0)
+    try:
+        split_sizes = data_driver.get_fusion_split(
+            dataset_name=name,
+            training_rate=training_rate,
+            fusion_rate=fusion_rate,
+            class_attribute=class_attribute,
+            include_attributes=[],
+            exclude_attributes=[],
+            attributes_rate=0.0,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=True,
+            split_mode=split_mode,
+            strata_number=strata_number,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
 
-    return flask.send_file(stream, mimetype='text/csv')
+    return send_split_file(stream, split_sizes)
 
 
-@app.route('/dataset/<string:name>/split/test', methods=['GET'])
-def get_dataset_test_split(name):
+@app.route('/dataset/<string:name>/split/test/class', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_test_split_class(name):
     """
-    Retrieves a dataset test split as a CSV file.
-    GET: /dataset/<str:name>/split/test
+    Retrieves the class column from the dataset test split as a CSV file.
+    GET: /dataset/<str:name>/split/test/class
 
     :param name: the name of the dataset
     :type name: str
@@ -266,60 +1811,61 @@ def get_dataset_test_split(name):
     :param args['class_attribute']: the class attribute name
     :type args['class_attribute']: str
 
-    :param args['include_attributes']: the list of the attributes to include, None otherwise
-    :type args['include_attributes']: list[str]
-
-    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
-    :type args['exclude_attributes']: list[str]
-
-    :param args['attributes_rate']: the percentage of attributes to include
-    :type args['attributes_rate']: float
-
     :param args['random_seed']: the random seed
     :type args['random_seed']: int
 
     :param args['include_header']: if True, it includes the header in the output CSV
     :type args['include_header']: bool
 
-    :return: the output file as an opened stream
+    :param args['split_mode']: the way instances are assigned to the splits, 'random' (default) | 'hash' | 'bernoulli' | 'system'
+    :type args['split_mode']: str
+
+    :param args['strata_number']: if given, the number of quantile buckets of the class attribute to stratify by, for continuous or high-cardinality class attributes
+    :type args['strata_number']: int
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
     :rtype: file
     """
     data_driver = get_data_driver()
     training_rate = float(flask.request.args.get('training_rate'))
     fusion_rate = float(flask.request.args.get('fusion_rate'))
     class_attribute = flask.request.args.get('class_attribute')
-    include_attributes = flask.request.args.getlist('include_attributes')
-    exclude_attributes = flask.request.args.getlist('exclude_attributes')
-    attributes_rate = float(flask.request.args.get('attributes_rate'))
     random_seed = int(flask.request.args.get('random_seed'))
     include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    split_mode = get_enum_argument('split_mode', DataDriver.SplitMode, DataDriver.SplitMode.random)
+    strata_number = flask.request.args.get('strata_number', type=int)
 
     stream = io.BytesIO()
 
-    data_driver.get_test_split(
-        dataset_name=name,
-        training_rate=training_rate,
-        fusion_rate=fusion_rate,
-        class_attribute=class_attribute,
-        include_attributes=include_attributes,
-        exclude_attributes=exclude_attributes,
-        attributes_rate=attributes_rate,
-        random_seed=random_seed,
-        output_csv=stream,
-        include_header=include_header,
-        class_only=False,
-    )
-
-    stream.seek(0)
+    try:
+        split_sizes = data_driver.get_test_split(
+            dataset_name=name,
+            training_rate=training_rate,
+            fusion_rate=fusion_rate,
+            class_attribute=class_attribute,
+            include_attributes=[],
+            exclude_attributes=[],
+            attributes_rate=0.0,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=True,
+            split_mode=split_mode,
+            strata_number=strata_number,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
 
-    return flask.send_file(stream, mimetype='text/csv')
+    return send_split_file(stream, split_sizes)
 
 
-@app.route('/dataset/<string:name>/split/training/sample', methods=['GET'])
-def get_dataset_training_sample(name):
+@app.route('/dataset/<string:name>/split/training/sample/class', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_training_sample_class(name):
     """
-    Retrieves a dataset sample within the training split as a CSV file.
-    GET: /dataset/<str:name>/split/training/sample
+    Retrieves the class column from the dataset sample within the training split as a CSV file.
+    GET: /dataset/<str:name>/split/training/sample/class
 
     :param name: the name of the dataset
     :type name: str
@@ -336,6 +1882,99 @@ def get_dataset_training_sample(name):
     :param args['class_attribute']: the class attribute name
     :type args['class_attribute']: str
 
+    :param args['random_seed']: the random seed
+    :type args['random_seed']: int
+
+    :param args['include_header']: if True, it includes the header in the output CSV
+    :type args['include_header']: bool
+
+    :param args['split_mode']: the way instances are assigned to the splits, 'random' (default) | 'hash' | 'bernoulli' | 'system'
+    :type args['split_mode']: str
+
+    :param args['strata_number']: if given, the number of quantile buckets of the class attribute to stratify by, for continuous or high-cardinality class attributes
+    :type args['strata_number']: int
+
+    :param args['balancing_strategy']: the way the sample sizes are balanced among the classes, random split mode only, 'none' (default) | 'cap' | 'undersample' | 'oversample' | 'ratio'
+    :type args['balancing_strategy']: str
+
+    :param args['balancing_size']: the maximum sample size of a class, for the 'cap' strategy
+    :type args['balancing_size']: int
+
+    :param args['balancing_ratio']: the maximum ratio between the sample sizes of a class and of the smallest one, for the 'ratio' strategy
+    :type args['balancing_ratio']: float
+
+    :param args['class_only']: specifies if returning the class column only
+    :type args['class_only']: bool
+
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
+    :rtype: file
+    """
+    data_driver = get_data_driver()
+
+    training_rate = float(flask.request.args.get('training_rate'))
+    sample_rate = float(flask.request.args.get('sample_rate'))
+    sample_number = int(flask.request.args.get('sample_number'))
+    class_attribute = flask.request.args.get('class_attribute')
+    random_seed = int(flask.request.args.get('random_seed'))
+    include_header = ast.literal_eval(flask.request.args.get('include_header'))
+    split_mode = get_enum_argument('split_mode', DataDriver.SplitMode, DataDriver.SplitMode.random)
+    strata_number = flask.request.args.get('strata_number', type=int)
+    balancing_strategy = get_enum_argument(
+        'balancing_strategy',
+        DataDriver.BalancingStrategy,
+        DataDriver.BalancingStrategy.none,
+    )
+    balancing_size = flask.request.args.get('balancing_size', type=int)
+    balancing_ratio = flask.request.args.get('balancing_ratio', type=float)
+
+    stream = io.BytesIO()
+
+    try:
+        split_sizes = data_driver.get_training_sample(
+            dataset_name=name,
+            training_rate=training_rate,
+            sample_rate=sample_rate,
+            sample_number=sample_number,
+            class_attribute=class_attribute,
+            include_attributes=[],
+            exclude_attributes=[],
+            attributes_rate=0.0,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=True,
+            split_mode=split_mode,
+            strata_number=strata_number,
+            balancing_strategy=balancing_strategy,
+            balancing_size=balancing_size,
+            balancing_ratio=balancing_ratio,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return send_split_file(stream, split_sizes)
+
+
+@app.route('/dataset/<string:name>/folds/training', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_fold_training_split(name):
+    """
+    Retrieves the training part of a dataset cross-validation fold as a CSV file.
+    GET: /dataset/<str:name>/folds/training
+
+    :param name: the name of the dataset
+    :type name: str
+
+    :param args['folds_number']: the number of folds
+    :type args['folds_number']: int
+
+    :param args['fold_number']: the fold number starting from 0
+    :type args['fold_number']: int
+
+    :param args['class_attribute']: the class attribute name
+    :type args['class_attribute']: str
+
     :param args['include_attributes']: the list of the attributes to include, None otherwise
     :type args['include_attributes']: list[str]
 
@@ -351,14 +1990,13 @@ def get_dataset_training_sample(name):
     :param args['include_header']: if True, it includes the header in the output CSV
     :type args['include_header']: bool
 
-    :return: the output file as an opened stream
+    :return: the output file as an opened stream, with the achieved size in the headers
     :rtype: file
     """
     data_driver = get_data_driver()
 
-    training_rate = float(flask.request.args.get('training_rate'))
-    sample_rate = float(flask.request.args.get('sample_rate'))
-    sample_number = int(flask.request.args.get('sample_number'))
+    folds_number = int(flask.request.args.get('folds_number'))
+    fold_number = int(flask.request.args.get('fold_number'))
     class_attribute = flask.request.args.get('class_attribute')
     include_attributes = flask.request.args.getlist('include_attributes')
     exclude_attributes = flask.request.args.getlist('exclude_attributes')
@@ -368,91 +2006,113 @@ def get_dataset_training_sample(name):
 
     stream = io.BytesIO()
 
-    data_driver.get_training_sample(
-        dataset_name=name,
-        training_rate=training_rate,
-        sample_rate=sample_rate,
-        sample_number=sample_number,
-        class_attribute=class_attribute,
-        include_attributes=include_attributes,
-        exclude_attributes=exclude_attributes,
-        attributes_rate=attributes_rate,
-        random_seed=random_seed,
-        output_csv=stream,
-        include_header=include_header,
-        class_only=False,
-    )
-
-    stream.seek(0)
+    try:
+        split_sizes = data_driver.get_fold_training_split(
+            dataset_name=name,
+            folds_number=folds_number,
+            fold_number=fold_number,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=False,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
 
-    return flask.send_file(stream, mimetype='text/csv')
+    return send_split_file(stream, split_sizes)
 
 
-@app.route('/dataset/<string:name>/split/training/class', methods=['GET'])
-def get_dataset_training_split_class(name):
+@app.route('/dataset/<string:name>/folds/validation', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_fold_validation_split(name):
     """
-    Retrieves a dataset training split as a CSV file.
-    GET: /dataset/<str:name>/split/training/class
+    Retrieves the validation part of a dataset cross-validation fold as a CSV file.
+    GET: /dataset/<str:name>/folds/validation
 
     :param name: the name of the dataset
     :type name: str
 
-    :param args['training_rate']: the percentage of the dataset to consider as training split
-    :type args['training_rate']: float
+    :param args['folds_number']: the number of folds
+    :type args['folds_number']: int
+
+    :param args['fold_number']: the fold number starting from 0
+    :type args['fold_number']: int
 
     :param args['class_attribute']: the class attribute name
     :type args['class_attribute']: str
 
+    :param args['include_attributes']: the list of the attributes to include, None otherwise
+    :type args['include_attributes']: list[str]
+
+    :param args['exclude_attributes']: the list of the attributes to exclude, None otherwise
+    :type args['exclude_attributes']: list[str]
+
+    :param args['attributes_rate']: the percentage of attributes to include
+    :type args['attributes_rate']: float
+
     :param args['random_seed']: the random seed
     :type args['random_seed']: int
 
     :param args['include_header']: if True, it includes the header in the output CSV
     :type args['include_header']: bool
 
-    :return: the output file as an opened stream
+    :return: the output file as an opened stream, with the achieved size in the headers
     :rtype: file
     """
     data_driver = get_data_driver()
 
-    training_rate = float(flask.request.args.get('training_rate'))
+    folds_number = int(flask.request.args.get('folds_number'))
+    fold_number = int(flask.request.args.get('fold_number'))
     class_attribute = flask.request.args.get('class_attribute')
+    include_attributes = flask.request.args.getlist('include_attributes')
+    exclude_attributes = flask.request.args.getlist('exclude_attributes')
+    attributes_rate = float(flask.request.args.get('attributes_rate'))
     random_seed = int(flask.request.args.get('random_seed'))
     include_header = ast.literal_eval(flask.request.args.get('include_header'))
 
     stream = io.BytesIO()
 
-    data_driver.get_training_split(
-        dataset_name=name,
-        training_rate=training_rate,
-        class_attribute=class_attribute,
-        include_attributes=[],
-        exclude_attributes=[],
-        attributes_rate=0.0,
-        random_seed=random_seed,
-        output_csv=stream,
-        include_header=include_header,
-        class_only=True,
-    )
-
-    stream.seek(0)
+    try:
+        split_sizes = data_driver.get_fold_validation_split(
+            dataset_name=name,
+            folds_number=folds_number,
+            fold_number=fold_number,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=False,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
 
-    return flask.send_file(stream, mimetype='text/csv')
+    return send_split_file(stream, split_sizes)
 
 
-@app.route('/dataset/<string:name>/split/fusion/class', methods=['GET'])
-def get_dataset_fusion_split_class(name):
+@app.route('/dataset/<string:name>/folds/training/class', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_fold_training_split_class(name):
     """
-    Retrieves the class column from the dataset fusion split as a CSV file.
-    GET: /dataset/<str:name>/split/fusion/class
+    Retrieves the class column from the training part of a dataset cross-validation fold as a CSV file.
+    GET: /dataset/<str:name>/folds/training/class
 
     :param name: the name of the dataset
     :type name: str
 
-    :param args['training_rate']: the percentage of the dataset to consider as training split
-    :type args['training_rate']: float
+    :param args['folds_number']: the number of folds
+    :type args['folds_number']: int
 
-    :param args['fusion_rate']: the percentage of the dataset to consider as fusion split
-    :type args['fusion_rate']: float
+    :param args['fold_number']: the fold number starting from 0
+    :type args['fold_number']: int
 
     :param args['class_attribute']: the class attribute name
     :type args['class_attribute']: str
@@ -463,52 +2123,55 @@ def get_dataset_fusion_split_class(name):
     :param args['include_header']: if True, it includes the header in the output CSV
     :type args['include_header']: bool
 
-    :return: the output file as an opened stream
+    :return: the output file as an opened stream, with the achieved size in the headers
     :rtype: file
     """
     data_driver = get_data_driver()
 
-    training_rate = float(flask.request.args.get('training_rate'))
-    fusion_rate = float(flask.request.args.get('fusion_rate'))
+    folds_number = int(flask.request.args.get('folds_number'))
+    fold_number = int(flask.request.args.get('fold_number'))
     class_attribute = flask.request.args.get('class_attribute')
     random_seed = int(flask.request.args.get('random_seed'))
     include_header = ast.literal_eval(flask.request.args.get('include_header'))
 
     stream = io.BytesIO()
 
-    data_driver.get_fusion_split(
-        dataset_name=name,
-        training_rate=training_rate,
-        fusion_rate=fusion_rate,
-        class_attribute=class_attribute,
-        include_attributes=[],
-        exclude_attributes=[],
-        attributes_rate=0.0,
-        random_seed=random_seed,
-        output_csv=stream,
-        include_header=include_header,
-        class_only=True,
-    )
-
-    stream.seek(0)
+    try:
+        split_sizes = data_driver.get_fold_training_split(
+            dataset_name=name,
+            folds_number=folds_number,
+            fold_number=fold_number,
+            class_attribute=class_attribute,
+            include_attributes=[],
+            exclude_attributes=[],
+            attributes_rate=0.0,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=True,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
 
-    return flask.send_file(stream, mimetype='text/csv')
+    return send_split_file(stream, split_sizes)
 
 
-@app.route('/dataset/<string:name>/split/test/class', methods=['GET'])
-def get_dataset_test_split_class(name):
+@app.route('/dataset/<string:name>/folds/validation/class', methods=['GET'])
+@coalesce_requests
+@admit_requests
+def get_dataset_fold_validation_split_class(name):
     """
-    Retrieves the class column from the dataset test split as a CSV file.
-    GET: /dataset/<str:name>/split/test/class
+    Retrieves the class column from the validation part of a dataset cross-validation fold as a CSV file.
+    GET: /dataset/<str:name>/folds/validation/class
 
     :param name: the name of the dataset
     :type name: str
 
-    :param args['training_rate']: the percentage of the dataset to consider as training split
-    :type args['training_rate']: float
+    :param args['folds_number']: the number of folds
+    :type args['folds_number']: int
 
-    :param args['fusion_rate']: the percentage of the dataset to consider as fusion split
-    :type args['fusion_rate']: float
+    :param args['fold_number']: the fold number starting from 0
+    :type args['fold_number']: int
 
     :param args['class_attribute']: the class attribute name
     :type args['class_attribute']: str
@@ -519,99 +2182,178 @@ def get_dataset_test_split_class(name):
     :param args['include_header']: if True, it includes the header in the output CSV
     :type args['include_header']: bool
 
-    :return: the output file as an opened stream
+    :return: the output file as an opened stream, with the achieved size in the headers
     :rtype: file
     """
     data_driver = get_data_driver()
-    training_rate = float(flask.request.args.get('training_rate'))
-    fusion_rate = float(flask.request.args.get('fusion_rate'))
+
+    folds_number = int(flask.request.args.get('folds_number'))
+    fold_number = int(flask.request.args.get('fold_number'))
     class_attribute = flask.request.args.get('class_attribute')
     random_seed = int(flask.request.args.get('random_seed'))
     include_header = ast.literal_eval(flask.request.args.get('include_header'))
 
     stream = io.BytesIO()
 
-    data_driver.get_test_split(
-        dataset_name=name,
-        training_rate=training_rate,
-        fusion_rate=fusion_rate,
-        class_attribute=class_attribute,
-        include_attributes=[],
-        exclude_attributes=[],
-        attributes_rate=0.0,
-        random_seed=random_seed,
-        output_csv=stream,
-        include_header=include_header,
-        class_only=True,
-    )
-
-    stream.seek(0)
+    try:
+        split_sizes = data_driver.get_fold_validation_split(
+            dataset_name=name,
+            folds_number=folds_number,
+            fold_number=fold_number,
+            class_attribute=class_attribute,
+            include_attributes=[],
+            exclude_attributes=[],
+            attributes_rate=0.0,
+            random_seed=random_seed,
+            output_csv=stream,
+            include_header=include_header,
+            class_only=True,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
 
-    return flask.send_file(stream, mimetype='text/csv')
+    return send_split_file(stream, split_sizes)
 
 
-@app.route('/dataset/<string:name>/split/training/sample/class', methods=['GET'])
-def get_dataset_training_sample_class(name):
+@app.route('/dataset/<string:name>/iterator', methods=['POST'])
+def post_dataset_iterator(name):
     """
-    Retrieves the class column from the dataset sample within the training split as a CSV file.
-    GET: /dataset/<str:name>/split/training/sample/class
+    Opens an iterator session over a dataset split, to be consumed in mini-batches across epochs.
+    POST: /dataset/<str:name>/iterator
 
     :param name: the name of the dataset
     :type name: str
 
-    :param args['training_rate']: the percentage of the dataset to consider as training split
-    :type args['training_rate']: float
+    :param form['split_type']: the split to iterate, 'training' (default) | 'fusion' | 'test'
+    :type form['split_type']: str
 
-    :param args['sample_rate']: the percentage of instances, within the training split, to include
-    :type args['sample_rate']: float
+    :param form['training_rate']: the percentage of the dataset to consider as training split
+    :type form['training_rate']: float
 
-    :param args['sample_number']: the sample number starting from 0
-    :type args['sample_number']: int
+    :param form['fusion_rate']: the percentage of the dataset to consider as fusion split
+    :type form['fusion_rate']: float
 
-    :param args['class_attribute']: the class attribute name
-    :type args['class_attribute']: str
+    :param form['class_attribute']: the class attribute name
+    :type form['class_attribute']: str
 
-    :param args['random_seed']: the random seed
-    :type args['random_seed']: int
+    :param form['include_attributes']: the list of the attributes to include, None otherwise
+    :type form['include_attributes']: list[str]
+
+    :param form['exclude_attributes']: the list of the attributes to exclude, None otherwise
+    :type form['exclude_attributes']: list[str]
+
+    :param form['attributes_rate']: the percentage of attributes to include
+    :type form['attributes_rate']: float
+
+    :param form['random_seed']: the random seed
+    :type form['random_seed']: int
+
+    :param form['epoch']: the initial epoch starting from 0
+    :type form['epoch']: int
+
+    :param form['batch_size']: the number of instances of a mini-batch
+    :type form['batch_size']: int
+
+    :param form['class_only']: specifies if returning the class column only
+    :type form['class_only']: bool
+
+    :return: the json representation of the session token, the split size and the number of mini-batches per epoch
+    :rtype: str
+    """
+    data_driver = get_data_driver()
+
+    try:
+        split_type = DataDriver.SplitType(flask.request.form.get('split_type', DataDriver.SplitType.training.value))
+    except ValueError as error:
+        flask.abort(400, str(error))
+    training_rate = float(flask.request.form.get('training_rate'))
+    fusion_rate = float(flask.request.form.get('fusion_rate', '0.0'))
+    class_attribute = flask.request.form.get('class_attribute')
+    include_attributes = flask.request.form.getlist('include_attributes')
+    exclude_attributes = flask.request.form.getlist('exclude_attributes')
+    attributes_rate = float(flask.request.form.get('attributes_rate'))
+    random_seed = int(flask.request.form.get('random_seed'))
+    epoch = int(flask.request.form.get('epoch', '0'))
+    batch_size = int(flask.request.form.get('batch_size'))
+    class_only = ast.literal_eval(flask.request.form.get('class_only', 'False'))
+
+    try:
+        iterator = data_driver.open_iterator(
+            dataset_name=name,
+            split_type=split_type,
+            training_rate=training_rate,
+            fusion_rate=fusion_rate,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            epoch=epoch,
+            batch_size=batch_size,
+            class_only=class_only,
+        )
+    except ValueError as error:
+        flask.abort(400, str(error))
+
+    return flask.jsonify(iterator)
+
+
+@app.route('/iterator/<string:token>/batch/<int:batch_number>', methods=['GET'])
+def get_iterator_batch(token, batch_number):
+    """
+    Retrieves a mini-batch of an iterator session as a CSV file, reshuffling the split when the epoch changes.
+    GET: /iterator/<str:token>/batch/<int:batch_number>
+
+    :param token: the session token
+    :type token: str
+
+    :param batch_number: the mini-batch number starting from 0
+    :type batch_number: int
+
+    :param args['epoch']: the epoch starting from 0
+    :type args['epoch']: int
 
     :param args['include_header']: if True, it includes the header in the output CSV
     :type args['include_header']: bool
 
-    :param args['class_only']: specifies if returning the class column only
-    :type args['class_only']: bool
-
-    :return: the output file as an opened stream
+    :return: the output file as an opened stream, with the requested and achieved sizes in the headers
     :rtype: file
     """
     data_driver = get_data_driver()
 
-    training_rate = float(flask.request.args.get('training_rate'))
-    sample_rate = float(flask.request.args.get('sample_rate'))
-    sample_number = int(flask.request.args.get('sample_number'))
-    class_attribute = flask.request.args.get('class_attribute')
-    random_seed = int(flask.request.args.get('random_seed'))
+    epoch = int(flask.request.args.get('epoch'))
     include_header = ast.literal_eval(flask.request.args.get('include_header'))
 
     stream = io.BytesIO()
 
-    data_driver.get_training_sample(
-        dataset_name=name,
-        training_rate=training_rate,
-        sample_rate=sample_rate,
-        sample_number=sample_number,
-        class_attribute=class_attribute,
-        include_attributes=[],
-        exclude_attributes=[],
-        attributes_rate=0.0,
-        random_seed=random_seed,
-        output_csv=stream,
-        include_header=include_header,
-        class_only=True,
-    )
+    try:
+        split_sizes = data_driver.get_iterator_batch(
+            token=token,
+            epoch=epoch,
+            batch_number=batch_number,
+            output_csv=stream,
+            include_header=include_header,
+        )
+    except KeyError:
+        flask.abort(404, 'The iterator session does not exist or it has expired.')
 
-    stream.seek(0)
+    return send_split_file(stream, split_sizes)
+
+
+@app.route('/iterator/<string:token>', methods=['DELETE'])
+def delete_iterator(token):
+    """
+    Closes an iterator session.
+    DELETE: /iterator/<str:token>
+
+    :param token: the session token
+    :type token: str
+    """
+    data_driver = get_data_driver()
+
+    data_driver.close_iterator(token=token)
 
-    return flask.send_file(stream, mimetype='text/csv')
+    return 'Iterator closed correctly.'
 
 
 if __name__ == '__main__':
@@ -0,0 +1,153 @@
+import collections
+import contextlib
+import threading
+
+
+class AdmissionQueueFullError(Exception):
+    """
+    Reports that the admission queue cannot accept more requests.
+    """
+    pass
+
+
+class AdmissionTimeoutError(Exception):
+    """
+    Reports that a request waited in the admission queue longer than the wait timeout.
+    """
+    pass
+
+
+class AdmissionRequest(object):
+    """
+    Tracks a request waiting in the admission queue.
+    """
+
+    def __init__(self, dataset_name):
+        """
+        Initializes the request.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+        """
+        self.dataset_name = dataset_name
+        self.is_admitted = False
+
+        self.__admission = threading.Event()
+
+    def admit(self):
+        """
+        Admits the request, waking it up.
+        """
+        self.is_admitted = True
+        self.__admission.set()
+
+    def wait(self, timeout):
+        """
+        Waits for the admission.
+
+        :param timeout: the maximum seconds to wait for
+        :type timeout: float
+        """
+        self.__admission.wait(timeout)
+
+
+class AdmissionControl(object):
+    """
+    Limits the requests running concurrently, overall and on every dataset, so that the queries do not exhaust the
+    database memory under a burst of requests.
+
+    The requests exceeding the limits wait in a bounded queue, admitted in turn across the datasets and in arrival order
+    within every dataset, so that a dataset flooded with requests does not starve the others.
+    """
+
+    def __init__(self, running_number, dataset_running_number, queued_number, wait_timeout):
+        """
+        Initializes the admission control.
+
+        :param running_number: the maximum number of requests running concurrently
+        :type running_number: int
+
+        :param dataset_running_number: the maximum number of requests running concurrently on the same dataset
+        :type dataset_running_number: int
+
+        :param queued_number: the maximum number of requests waiting for the admission
+        :type queued_number: int
+
+        :param wait_timeout: the maximum seconds a request waits for the admission
+        :type wait_timeout: float
+        """
+        self.__running_number = running_number
+        self.__dataset_running_number = dataset_running_number
+        self.__queued_number = queued_number
+        self.__wait_timeout = wait_timeout
+
+        self.__lock = threading.Lock()
+        self.__running = 0
+        self.__datasets_running = collections.Counter()
+        self.__queues = collections.OrderedDict()
+
+    @contextlib.contextmanager
+    def admit(self, dataset_name):
+        """
+        Runs a request on a dataset once admitted.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :raises AdmissionQueueFullError: if too many requests are waiting for the admission
+        :raises AdmissionTimeoutError: if the request is not admitted within the wait timeout
+        """
+        request = AdmissionRequest(dataset_name)
+
+        with self.__lock:
+            self.__queues.setdefault(dataset_name, collections.deque()).append(request)
+            self.__admit_requests()
+
+            if not request.is_admitted and sum(len(x) for x in self.__queues.values()) > self.__queued_number:
+                self.__dequeue(request)
+                raise AdmissionQueueFullError('Too many requests are queued.')
+
+        request.wait(self.__wait_timeout)
+
+        with self.__lock:
+            if not request.is_admitted:
+                self.__dequeue(request)
+                raise AdmissionTimeoutError('The request was not admitted in {} s.'.format(self.__wait_timeout))
+
+        try:
+            yield
+        finally:
+            with self.__lock:
+                self.__running -= 1
+                self.__datasets_running[dataset_name] -= 1
+                if not self.__datasets_running[dataset_name]:
+                    del self.__datasets_running[dataset_name]
+                self.__admit_requests()
+
+    def __dequeue(self, request):
+        # Removes a request not admitted from the queue of its dataset.
+        queue = self.__queues[request.dataset_name]
+        queue.remove(request)
+        if not queue:
+            del self.__queues[request.dataset_name]
+
+    def __admit_requests(self):
+        # Admits the first request of the first dataset below its limit, moving the dataset after the others.
+        while self.__running < self.__running_number:
+            dataset_name = next(
+                (x for x in self.__queues if self.__datasets_running[x] < self.__dataset_running_number),
+                None,
+            )
+            if dataset_name is None:
+                break
+
+            queue = self.__queues[dataset_name]
+            request = queue.popleft()
+            if queue:
+                self.__queues.move_to_end(dataset_name)
+            else:
+                del self.__queues[dataset_name]
+
+            self.__running += 1
+            self.__datasets_running[dataset_name] += 1
+            request.admit()
@@ -0,0 +1,280 @@
+import csv
+import re
+
+from factorizer import utils
+
+
+INTEGER_MINIMUM = -2 ** 31
+INTEGER_MAXIMUM = 2 ** 31 - 1
+
+NULL_TEXT_VALUE = '\\N'
+
+# The numeric values accepted by the input functions of every supported database version, without the underscores
+# allowed by the recent ones and by Python.
+INTEGER_PATTERN = re.compile(r'\s*[+-]?[0-9]+\s*', re.ASCII)
+REAL_PATTERN = re.compile(
+    r'\s*([+-]?([0-9]+\.?[0-9]*|\.[0-9]+)(e[+-]?[0-9]+)?|[+-]?inf(inity)?|nan)\s*',
+    re.ASCII | re.IGNORECASE,
+)
+
+
+class CSVValidationError(Exception):
+    """
+    Reports the first invalid value of a CSV file, with its position.
+    """
+
+    def __init__(self, line_number, column_number, message):
+        """
+        Initializes the error.
+
+        :param line_number: the line number starting from 1
+        :type line_number: int
+
+        :param column_number: the column number starting from 1, None if the whole line is invalid
+        :type column_number: int
+
+        :param message: the description of the error
+        :type message: str
+        """
+        if column_number is None:
+            super().__init__('Line {}: {}'.format(line_number, message))
+        else:
+            super().__init__('Line {}, column {}: {}'.format(line_number, column_number, message))
+
+        self.line_number = line_number
+        self.column_number = column_number
+
+
+class CSVValidator(object):
+    """
+    Validates a CSV file chunk by chunk against the declared attributes, as the file is read by the COPY statements.
+
+    With the header the file is parsed as a CSV file, without it as a delimited text file.
+    """
+
+    def __init__(self, attributes, delimiter, header):
+        """
+        Initializes the validator.
+
+        :param attributes: the list of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}
+        :type attributes: list[dict[str, object]]
+
+        :param delimiter: the delimiter used in the CSV file (ex. ',')
+        :type delimiter: str
+
+        :param header: specifies if the CSV has a header
+        :type header: bool
+        """
+        if len(delimiter) != 1:
+            raise CSVValidationError(1, None, 'the delimiter must be a single character, not "{}".'.format(delimiter))
+
+        self.__attributes = attributes
+        self.__delimiter = delimiter
+        self.__header = header
+
+        self.__buffer = b''
+        self.__record = None
+        self.__record_line_number = 0
+        self.__line_number = 0
+
+    def feed(self, chunk):
+        """
+        Validates the complete lines of a chunk, keeping the last partial line for the next chunk.
+
+        :param chunk: the chunk of the file
+        :type chunk: bytes
+
+        :raises CSVValidationError: if a line is invalid
+        """
+        self.__buffer += chunk
+        lines = self.__buffer.split(b'\n')
+        self.__buffer = lines.pop()
+        for line in lines:
+            self.__validate_line(line)
+
+    def close(self):
+        """
+        Validates the last line of the file.
+
+        :raises CSVValidationError: if the last line is invalid
+        """
+        if self.__buffer:
+            self.__validate_line(self.__buffer)
+            self.__buffer = b''
+        if self.__record is not None:
+            raise CSVValidationError(self.__record_line_number, None, 'unterminated quoted value.')
+
+    def __validate_line(self, line):
+        """
+        Validates a line, or collects it if it belongs to a record with quoted line breaks.
+
+        :param line: the line without the line break
+        :type line: bytes
+        """
+        self.__line_number += 1
+
+        try:
+            text = line.rstrip(b'\r').decode('utf-8')
+        except UnicodeDecodeError as error:
+            raise CSVValidationError(self.__line_number, None, 'invalid UTF-8 byte at position {}.'.format(error.start))
+
+        # Joins the lines of a CSV record until its quotes are balanced.
+        if self.__header:
+            if self.__record is None:
+                self.__record = text
+                self.__record_line_number = self.__line_number
+            else:
+                self.__record += '\n' + text
+            if self.__record.count('"') % 2 == 1:
+                return
+            text = self.__record
+            self.__record = None
+
+            # Skips the header.
+            if self.__record_line_number == 1:
+                return
+            values = next(csv.reader([text], delimiter=self.__delimiter))
+            line_number = self.__record_line_number
+        else:
+            values = self.__split_text_line(text)
+            line_number = self.__line_number
+
+        if len(values) != len(self.__attributes):
+            raise CSVValidationError(
+                line_number,
+                None,
+                'expected {} values, found {}.'.format(len(self.__attributes), len(values)),
+            )
+
+        for column_number, (attribute, value) in enumerate(zip(self.__attributes, values), start=1):
+            if not self.__is_valid_value(attribute['type'], value):
+                raise CSVValidationError(
+                    line_number,
+                    column_number,
+                    'invalid {} value "{}" for the attribute {}.'.format(attribute['type'], value, attribute['name']),
+                )
+
+    def __split_text_line(self, text):
+        """
+        Splits a delimited text line, ignoring the delimiters escaped by a backslash.
+
+        :param text: the line
+        :type text: str
+
+        :return: the list of values
+        :rtype: list[str]
+        """
+        values = []
+        value = ''
+        is_escaped = False
+        for character in text:
+            if is_escaped:
+                value += character
+                is_escaped = False
+            elif character == '\\':
+                value += character
+                is_escaped = True
+            elif character == self.__delimiter:
+                values.append(value)
+                value = ''
+            else:
+                value += character
+        values.append(value)
+        return values
+
+    def __is_valid_value(self, type_name, value):
+        """
+        Checks if a value can be stored in a column of the given attribute type.
+
+        :param type_name: the attribute type, 'integer' | 'real' | 'text'
+        :type type_name: str
+
+        :param value: the value
+        :type value: str
+
+        :return: True if the value is valid
+        :rtype: bool
+        """
+        if type_name == 'text':
+            return True
+
+        # The null values are stored as they are.
+        if (self.__header and value == '') or (not self.__header and value == NULL_TEXT_VALUE):
+            return True
+
+        if type_name == 'integer':
+            return INTEGER_PATTERN.fullmatch(value) is not None and INTEGER_MINIMUM <= int(value) <= INTEGER_MAXIMUM
+        elif type_name == 'real':
+            return REAL_PATTERN.fullmatch(value) is not None
+        return False
+
+
+class LIBSVMValidator(object):
+    """
+    Validates a LIBSVM file chunk by chunk, with the label of the instances as only declared attribute.
+    """
+
+    def __init__(self, attributes):
+        """
+        Initializes the validator.
+
+        :param attributes: the list with the label attribute in the form {'name': str, 'type': 'integer' | 'real'}
+        :type attributes: list[dict[str, object]]
+        """
+        if len(attributes) != 1 or attributes[0]['type'] == 'text':
+            raise CSVValidationError(1, None, 'the LIBSVM files have a single numeric label attribute.')
+
+        self.__label_validator = CSVValidator(attributes=attributes, delimiter=' ', header=False)
+
+        self.__buffer = b''
+        self.__line_number = 0
+
+    def feed(self, chunk):
+        """
+        Validates the complete lines of a chunk, keeping the last partial line for the next chunk.
+
+        :param chunk: the chunk of the file
+        :type chunk: bytes
+
+        :raises CSVValidationError: if a line is invalid
+        """
+        self.__buffer += chunk
+        lines = self.__buffer.split(b'\n')
+        self.__buffer = lines.pop()
+        for line in lines:
+            self.__validate_line(line)
+
+    def close(self):
+        """
+        Validates the last line of the file.
+
+        :raises CSVValidationError: if the last line is invalid
+        """
+        if self.__buffer:
+            self.__validate_line(self.__buffer)
+            self.__buffer = b''
+
+    def __validate_line(self, line):
+        """
+        Validates a line.
+
+        :param line: the line without the line break
+        :type line: bytes
+        """
+        self.__line_number += 1
+
+        try:
+            text = line.rstrip(b'\r').decode('utf-8')
+        except UnicodeDecodeError as error:
+            raise CSVValidationError(self.__line_number, None, 'invalid UTF-8 byte at position {}.'.format(error.start))
+
+        try:
+            label, _, _ = utils.parse_libsvm_line(text)
+        except ValueError as error:
+            raise CSVValidationError(self.__line_number, None, str(error))
+
+        # Validates the label as a single value line, reporting the line number of the file.
+        try:
+            self.__label_validator.feed(label.encode() + b'\n')
+        except CSVValidationError as error:
+            raise CSVValidationError(self.__line_number, 1, str(error).split(': ', 1)[1])
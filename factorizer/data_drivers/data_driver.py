@@ -15,6 +15,25 @@ class DataDriver(object):
         test = 'test'
         training_sample = 'training_sample'
 
+    class SplitMode(enum.Enum):
+        random = 'random'
+        hash = 'hash'
+        bernoulli = 'bernoulli'
+        system = 'system'
+
+    class BalancingStrategy(enum.Enum):
+        none = 'none'
+        cap = 'cap'
+        undersample = 'undersample'
+        oversample = 'oversample'
+        ratio = 'ratio'
+
+    class Normalization(enum.Enum):
+        none = 'none'
+        zscore = 'zscore'
+        minmax = 'minmax'
+        robust = 'robust'
+
     def __init__(self):
         pass
 
@@ -29,6 +48,10 @@ class DataDriver(object):
             self,
             name,
             attributes,
+            column_group_size=None,
+            array_type='float8',
+            sparse=False,
+            partition_attribute=None,
     ):
         """
         Creates the dataset skeleton.
@@ -36,8 +59,26 @@ class DataDriver(object):
         :param name: the name of the dataset
         :type name: str
 
-        :param attributes: the list of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}
-        :type attributes: list[dict[str, str]]
+        :param attributes: the list of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}, where
+        the text attributes can also specify {'encoded': True} to be stored as integer codes of a per-dataset dictionary,
+        and decoded on output only, while the numeric attributes can specify {'array': True} to be stored together in a
+        single array, without limits on their number
+        :type attributes: list[dict[str, object]]
+
+        :param column_group_size: if not None, the attributes are stored in groups of this size sharing the row ids, so
+        that the splits of few attributes read only their groups
+        :type column_group_size: int
+
+        :param array_type: the type of the elements of the array attributes, float4 | float8
+        :type array_type: str
+
+        :param sparse: if True, the dataset is loaded from LIBSVM files, with the label as only attribute, and every
+        instance stores the indices and the values of its non-zero features only, output as LIBSVM lines
+        :type sparse: bool
+
+        :param partition_attribute: if not None, the instances of every value of this attribute are stored in their own
+        partition, read directly by the splits by this class attribute, the null values being stored in a default one
+        :type partition_attribute: str
         """
         pass
 
@@ -79,6 +120,133 @@ class DataDriver(object):
         """
         pass
 
+    @abstractmethod
+    def import_structure(
+            self,
+            name,
+            attributes,
+            delimiter,
+            header,
+            input_csv=None,
+            server_path=None,
+            column_group_size=None,
+            array_type='float8',
+            sparse=False,
+            partition_attribute=None,
+    ):
+        """
+        Replaces the dataset with the provided CSV file atomically, the existing dataset is preserved if the file is
+        invalid.
+
+        :param name: the name of the dataset
+        :type name: str
+
+        :param attributes: the list of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}
+        :type attributes: list[dict[str, object]]
+
+        :param delimiter: the delimiter used in the CSV file (ex. ',')
+        :type delimiter: str
+
+        :param header: specifies if the CSV file has a header
+        :type header: bool
+
+        :param input_csv: the input file as an opened stream, None if reading the server path
+        :type input_csv: file
+
+        :param server_path: the path of the CSV file on the database server, read directly by the server, None if
+        reading the input file
+        :type server_path: str
+
+        :param column_group_size: if not None, the attributes are stored in groups of this size sharing the row ids
+        :type column_group_size: int
+
+        :param array_type: the type of the elements of the array attributes, float4 | float8
+        :type array_type: str
+
+        :param sparse: if True, the file is in the LIBSVM format, with the label as only attribute
+        :type sparse: bool
+
+        :param partition_attribute: if not None, the instances are partitioned by the values of this attribute
+        :type partition_attribute: str
+
+        :return: the number of instances of the dataset
+        :rtype: int
+
+        :raises ValueError: if the file cannot be read or it is invalid
+        """
+        pass
+
+    @abstractmethod
+    def append_structure(
+            self,
+            name,
+            delimiter,
+            header,
+            input_csv,
+    ):
+        """
+        Appends the instances of the provided CSV file to the dataset, updating its derived structures incrementally.
+
+        :param name: the name of the dataset
+        :type name: str
+
+        :param delimiter: the delimiter used in the CSV file (ex. ',')
+        :type delimiter: str
+
+        :param header: specifies if the CSV file has a header
+        :type header: bool
+
+        :param input_csv: the input file as an opened stream
+        :type input_csv: file
+
+        :return: the number of appended instances
+        :rtype: int
+        """
+        pass
+
+    @abstractmethod
+    def optimize_structure(
+            self,
+            name,
+            class_attribute,
+            cluster=False,
+    ):
+        """
+        Optimizes the physical layout of the dataset once ingested: indexes the class attribute, optionally clusters
+        the instances by class, and refreshes the planner statistics and the visibility map.
+
+        :param name: the name of the dataset
+        :type name: str
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param cluster: if True, the instances are rewritten in the order of the class index
+        :type cluster: bool
+
+        :return: the duration in seconds of every step ('index' | 'cluster' | 'analyze' | 'vacuum')
+        :rtype: dict[str, float]
+
+        :raises ValueError: if the class attribute is not a column of the dataset
+        """
+        pass
+
+    @abstractmethod
+    def get_structure_attributes(
+            self,
+            name,
+    ):
+        """
+        Retrieves the attributes of the dataset.
+
+        :param name: the name of the dataset
+        :type name: str
+
+        :return: the list of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}
+        :rtype: list[dict[str, str]]
+        """
+        pass
+
     @abstractmethod
     def get_training_split(
             self,
@@ -92,6 +260,9 @@ class DataDriver(object):
             output_csv,
             include_header,
             class_only,
+            split_mode=SplitMode.random,
+            strata_number=None,
+            normalization=Normalization.none,
     ):
         """
         Retrieves a random dataset split for the training.
@@ -125,6 +296,22 @@ class DataDriver(object):
 
         :param class_only: specifies if returning the class column only
         :type class_only: bool
+
+        :param split_mode: the way instances are assigned to the splits
+        :type split_mode: DataDriver.SplitMode
+
+        :param strata_number: if not None, the instances are stratified into this number of quantile buckets of the
+        class attribute instead of by its values, for continuous or high-cardinality class attributes, only for the
+        random mode
+        :type strata_number: int
+
+        :param normalization: the scaling of the numeric attributes, except the class attribute, fitted on the training
+        split of the same seed, only for the random and hash modes without strata: none, zscore by mean and standard
+        deviation, minmax to [0, 1] over the training split, or robust by median and interquartile range
+        :type normalization: DataDriver.Normalization
+
+        :return: the requested split size, None if unknown, and the achieved one
+        :rtype: dict[str, int]
         """
         pass
 
@@ -142,6 +329,9 @@ class DataDriver(object):
             output_csv,
             include_header,
             class_only,
+            split_mode=SplitMode.random,
+            strata_number=None,
+            normalization=Normalization.none,
     ):
         """
         Retrieves a random dataset split for the fusion.
@@ -178,6 +368,22 @@ class DataDriver(object):
 
         :param class_only: specifies if returning the class column only
         :type class_only: bool
+
+        :param split_mode: the way instances are assigned to the splits
+        :type split_mode: DataDriver.SplitMode
+
+        :param strata_number: if not None, the instances are stratified into this number of quantile buckets of the
+        class attribute instead of by its values, for continuous or high-cardinality class attributes, only for the
+        random mode
+        :type strata_number: int
+
+        :param normalization: the scaling of the numeric attributes, except the class attribute, fitted on the training
+        split of the same seed, only for the random and hash modes without strata: none, zscore by mean and standard
+        deviation, minmax to [0, 1] over the training split, or robust by median and interquartile range
+        :type normalization: DataDriver.Normalization
+
+        :return: the requested split size, None if unknown, and the achieved one
+        :rtype: dict[str, int]
         """
         pass
 
@@ -195,6 +401,9 @@ class DataDriver(object):
             output_csv,
             include_header,
             class_only,
+            split_mode=SplitMode.random,
+            strata_number=None,
+            normalization=Normalization.none,
     ):
         """
         Retrieves a random dataset split for the test.
@@ -231,6 +440,22 @@ class DataDriver(object):
 
         :param class_only: specifies if returning the class column only
         :type class_only: bool
+
+        :param split_mode: the way instances are assigned to the splits
+        :type split_mode: DataDriver.SplitMode
+
+        :param strata_number: if not None, the instances are stratified into this number of quantile buckets of the
+        class attribute instead of by its values, for continuous or high-cardinality class attributes, only for the
+        random mode
+        :type strata_number: int
+
+        :param normalization: the scaling of the numeric attributes, except the class attribute, fitted on the training
+        split of the same seed, only for the random and hash modes without strata: none, zscore by mean and standard
+        deviation, minmax to [0, 1] over the training split, or robust by median and interquartile range
+        :type normalization: DataDriver.Normalization
+
+        :return: the requested split size, None if unknown, and the achieved one
+        :rtype: dict[str, int]
         """
         pass
 
@@ -249,6 +474,12 @@ class DataDriver(object):
             output_csv,
             include_header,
             class_only,
+            split_mode=SplitMode.random,
+            strata_number=None,
+            balancing_strategy=BalancingStrategy.none,
+            balancing_size=None,
+            balancing_ratio=None,
+            normalization=Normalization.none,
     ):
         """
         Retrieves a random dataset sample in the CSV format.
@@ -288,5 +519,535 @@ class DataDriver(object):
 
         :param class_only: specifies if returning the class column only
         :type class_only: bool
+
+        :param split_mode: the way instances are assigned to the splits
+        :type split_mode: DataDriver.SplitMode
+
+        :param strata_number: if not None, the instances are stratified into this number of quantile buckets of the
+        class attribute instead of by its values, for continuous or high-cardinality class attributes, only for the
+        random mode
+        :type strata_number: int
+
+        :param balancing_strategy: the way the sample sizes are balanced among the partitions, only for the random mode:
+        none, cap to balancing_size, undersample to the smallest, oversample to the largest, or cap to balancing_ratio
+        times the smallest
+        :type balancing_strategy: DataDriver.BalancingStrategy
+
+        :param balancing_size: the maximum sample size of a partition, for the cap strategy
+        :type balancing_size: int
+
+        :param balancing_ratio: the maximum ratio between the sample sizes of a partition and of the smallest one, for
+        the ratio strategy
+        :type balancing_ratio: float
+
+        :param normalization: the scaling of the numeric attributes, except the class attribute, fitted on the training
+        split of the same seed, only for the random and hash modes without strata: none, zscore by mean and standard
+        deviation, minmax to [0, 1] over the training split, or robust by median and interquartile range
+        :type normalization: DataDriver.Normalization
+
+        :return: the requested split size, None if unknown, and the achieved one
+        :rtype: dict[str, int]
+        """
+        pass
+
+    @abstractmethod
+    def get_training_bootstrap(
+            self,
+            dataset_name,
+            training_rate,
+            sample_size,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            include_weights=False,
+    ):
+        """
+        Retrieves a bootstrap sample, drawn with replacement from the training split, in the CSV format.
+
+        The sample size is split among the partitions proportionally to their training split sizes.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param sample_size: the number of instances to draw
+        :type sample_size: int
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param include_attributes: the list of the attributes to include, None otherwise
+        :type include_attributes: list[str]
+
+        :param exclude_attributes: the list of the attributes to exclude, None otherwise
+        :type exclude_attributes: list[str]
+
+        :param attributes_rate: the percentage of attributes to include
+        :type attributes_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :param class_only: specifies if returning the class column only
+        :type class_only: bool
+
+        :param include_weights: if True, every drawn instance is output once with its multiplicity as last column,
+        otherwise it is repeated
+        :type include_weights: bool
+
+        :return: the requested sample size and the achieved one
+        :rtype: dict[str, int]
+        """
+        pass
+
+    @abstractmethod
+    def get_training_weighted_sample(
+            self,
+            dataset_name,
+            training_rate,
+            sample_size,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            weight_attribute=None,
+            input_weights_csv=None,
+    ):
+        """
+        Retrieves a sample drawn without replacement from the training split, with probabilities proportional to the
+        instance weights, in the CSV format.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param sample_size: the number of instances to draw
+        :type sample_size: int
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param include_attributes: the list of the attributes to include, None otherwise
+        :type include_attributes: list[str]
+
+        :param exclude_attributes: the list of the attributes to exclude, None otherwise
+        :type exclude_attributes: list[str]
+
+        :param attributes_rate: the percentage of attributes to include
+        :type attributes_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :param class_only: specifies if returning the class column only
+        :type class_only: bool
+
+        :param weight_attribute: the name of the attribute storing the weights, None if uploading them
+        :type weight_attribute: str
+
+        :param input_weights_csv: the weights as an opened stream of 'row id,weight' lines, the row ids being numbered
+        from 1 in the ingestion order of the instances, continued by the appended files and skipping the numbers of the
+        failed appends, None if the weights are stored in the dataset
+        :type input_weights_csv: file
+
+        :return: the requested sample size and the achieved one
+        :rtype: dict[str, int]
+
+        :raises ValueError: if neither the weight attribute nor the weights are given
+        """
+        pass
+
+    @abstractmethod
+    def get_fold_training_split(
+            self,
+            dataset_name,
+            folds_number,
+            fold_number,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+    ):
+        """
+        Retrieves the training part of a stratified cross-validation fold, all the folds but the required one.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param folds_number: the number of folds
+        :type folds_number: int
+
+        :param fold_number: the fold number starting from 0
+        :type fold_number: int
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param include_attributes: the list of the attributes to include, None otherwise
+        :type include_attributes: list[str]
+
+        :param exclude_attributes: the list of the attributes to exclude, None otherwise
+        :type exclude_attributes: list[str]
+
+        :param attributes_rate: the percentage of attributes to include
+        :type attributes_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :param class_only: specifies if returning the class column only
+        :type class_only: bool
+
+        :return: the requested split size, None if unknown, and the achieved one
+        :rtype: dict[str, int]
+        """
+        pass
+
+    @abstractmethod
+    def get_fold_validation_split(
+            self,
+            dataset_name,
+            folds_number,
+            fold_number,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+    ):
+        """
+        Retrieves the validation part of a stratified cross-validation fold.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param folds_number: the number of folds
+        :type folds_number: int
+
+        :param fold_number: the fold number starting from 0
+        :type fold_number: int
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param include_attributes: the list of the attributes to include, None otherwise
+        :type include_attributes: list[str]
+
+        :param exclude_attributes: the list of the attributes to exclude, None otherwise
+        :type exclude_attributes: list[str]
+
+        :param attributes_rate: the percentage of attributes to include
+        :type attributes_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :param class_only: specifies if returning the class column only
+        :type class_only: bool
+
+        :return: the requested split size, None if unknown, and the achieved one
+        :rtype: dict[str, int]
+        """
+        pass
+
+    @abstractmethod
+    def get_statistics(
+            self,
+            dataset_name,
+            class_attribute=None,
+            quantiles=False,
+    ):
+        """
+        Retrieves the statistics of the attributes, computed once and updated incrementally by the appends.
+
+        The statistics of every attribute are in the form {'values_number': int, 'nulls_number': int, 'minimum': float,
+        'maximum': float, 'mean': float, 'variance': float}, with 'quantiles': list[float] if requested, estimated on a
+        sample. The minimum, maximum, mean, variance and quantiles of the text attributes are None.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param class_attribute: the class attribute name, to retrieve the statistics of every class, None otherwise
+        :type class_attribute: str
+
+        :param quantiles: specifies if including the quantiles
+        :type quantiles: bool
+
+        :return: the statistics in the form {'instances_number': int, 'attributes': dict[str, dict]}, with
+        'quantiles_fractions': list[float] if requested, and 'classes': list[dict] of the statistics of every class
+        with their 'class_value' if requested, None if the dataset does not exist
+        :rtype: dict[str, object]
+        """
+        pass
+
+    @abstractmethod
+    def create_upload(
+            self,
+            name,
+            attributes,
+            delimiter,
+            header,
+    ):
+        """
+        Starts a resumable upload of a dataset, sent as chunks of a CSV file split on line boundaries.
+
+        The dataset is replaced only when the upload is finalized. The row ids of the instances are the line numbers
+        in their chunk plus the chunk number multiplied by 2^32, so that the chunks can be uploaded in any order.
+
+        :param name: the name of the dataset
+        :type name: str
+
+        :param attributes: the list of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}
+        :type attributes: list[dict[str, object]]
+
+        :param delimiter: the delimiter used in the CSV file (ex. ',')
+        :type delimiter: str
+
+        :param header: specifies if the first chunk has a header, the following chunks are read without header
+        :type header: bool
+
+        :return: the upload id
+        :rtype: str
+        """
+        pass
+
+    @abstractmethod
+    def upload_chunk(
+            self,
+            upload_id,
+            chunk_number,
+            checksum,
+            input_csv,
+    ):
+        """
+        Stores a chunk of an upload, replacing the previous attempt of the same chunk if its checksum differs.
+
+        :param upload_id: the upload id
+        :type upload_id: str
+
+        :param chunk_number: the number of the chunk starting from 0
+        :type chunk_number: int
+
+        :param checksum: the checksum of the chunk
+        :type checksum: str
+
+        :param input_csv: the chunk as an opened stream
+        :type input_csv: file
+
+        :return: the number of instances in the chunk
+        :rtype: int
+
+        :raises KeyError: if the upload does not exist
+        """
+        pass
+
+    @abstractmethod
+    def get_upload(
+            self,
+            upload_id,
+    ):
+        """
+        Retrieves the status of an upload, to resume it.
+
+        :param upload_id: the upload id
+        :type upload_id: str
+
+        :return: the name, attributes, delimiter and header of the upload, and the list of the stored chunks in the
+        form {'chunk_number': int, 'checksum': str, 'instances_number': int}
+        :rtype: dict[str, object]
+
+        :raises KeyError: if the upload does not exist
+        """
+        pass
+
+    @abstractmethod
+    def finalize_upload(
+            self,
+            upload_id,
+            chunks_number,
+    ):
+        """
+        Replaces the dataset with the uploaded chunks atomically.
+
+        :param upload_id: the upload id
+        :type upload_id: str
+
+        :param chunks_number: the expected number of chunks
+        :type chunks_number: int
+
+        :return: the number of instances of the dataset
+        :rtype: int
+
+        :raises KeyError: if the upload does not exist
+        :raises ValueError: if some chunks are missing
+        """
+        pass
+
+    @abstractmethod
+    def abort_upload(
+            self,
+            upload_id,
+    ):
+        """
+        Discards an upload and its chunks.
+
+        :param upload_id: the upload id
+        :type upload_id: str
+        """
+        pass
+
+    @abstractmethod
+    def open_iterator(
+            self,
+            dataset_name,
+            split_type,
+            training_rate,
+            fusion_rate,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            epoch,
+            batch_size,
+            class_only,
+    ):
+        """
+        Opens an iterator session over a split, to be consumed in mini-batches across epochs.
+
+        The split is the same returned by the random split mode with the same parameters, while the order of its
+        instances depends on the random seed and on the epoch.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param split_type: the split to iterate, training, fusion or test
+        :type split_type: DataDriver.SplitType
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param fusion_rate: the percentage of the dataset to consider as fusion split
+        :type fusion_rate: float
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param include_attributes: the list of the attributes to include, None otherwise
+        :type include_attributes: list[str]
+
+        :param exclude_attributes: the list of the attributes to exclude, None otherwise
+        :type exclude_attributes: list[str]
+
+        :param attributes_rate: the percentage of attributes to include
+        :type attributes_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param epoch: the initial epoch starting from 0
+        :type epoch: int
+
+        :param batch_size: the number of instances of a mini-batch
+        :type batch_size: int
+
+        :param class_only: specifies if returning the class column only
+        :type class_only: bool
+
+        :return: the session token, the split size and the number of mini-batches per epoch
+        :rtype: dict
+
+        :raises ValueError: if the batch size is not positive
+        """
+        pass
+
+    @abstractmethod
+    def get_iterator_batch(
+            self,
+            token,
+            epoch,
+            batch_number,
+            output_csv,
+            include_header,
+    ):
+        """
+        Retrieves a mini-batch of an iterator session, reshuffling the split if the epoch changes.
+
+        :param token: the session token
+        :type token: str
+
+        :param epoch: the epoch starting from 0
+        :type epoch: int
+
+        :param batch_number: the mini-batch number starting from 0
+        :type batch_number: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :return: the requested mini-batch size and the achieved one
+        :rtype: dict[str, int]
+
+        :raises KeyError: if the session does not exist or it has expired
+        """
+        pass
+
+    @abstractmethod
+    def close_iterator(
+            self,
+            token,
+    ):
+        """
+        Closes an iterator session, releasing its resources.
+
+        :param token: the session token
+        :type token: str
         """
         pass
@@ -1,5 +1,16 @@
+import codecs
+import collections
+import csv
+import decimal
+import functools
+import hashlib
+import json
 import random
+import tempfile
+import time
+import uuid
 import psycopg2
+import psycopg2.errors
 from factorizer import utils
 from factorizer.data_drivers.data_driver import DataDriver
 
@@ -8,13 +19,48 @@ CREATE_TABLE_STATEMENT = 'CREATE TABLE {table_name_} ({columns_definitions_});'
 
 COLUMN_DEFINITIONS_PATTERN = '"{name_}" {type_}'
 
-COPY_FROM_CSV_WITH_HEADER_STATEMENT = 'COPY {table_name_} ' \
-                                      'FROM STDIN ' \
+ROW_ID_COLUMN_DEFINITION = '"{name_}" bigserial PRIMARY KEY'
+
+COLUMN_GROUP_ROW_ID_COLUMN_DEFINITION = '"{name_}" bigint PRIMARY KEY'
+
+CREATE_PARTITIONED_TABLE_STATEMENT = 'CREATE TABLE {table_name_} (' \
+                                     '{columns_definitions_}, ' \
+                                     'UNIQUE ("{row_id_}", "{partition_attribute_}")' \
+                                     ') PARTITION BY LIST ("{partition_attribute_}");'
+
+PARTITIONED_ROW_ID_COLUMN_DEFINITION = '"{name_}" bigserial'
+
+CREATE_PARTITION_STATEMENT = 'CREATE TABLE {partition_table_name_} ' \
+                             'PARTITION OF {table_name_} ' \
+                             'FOR VALUES IN ({value_});'
+
+CREATE_DEFAULT_PARTITION_STATEMENT = 'CREATE TABLE {partition_table_name_} ' \
+                                     'PARTITION OF {table_name_} ' \
+                                     'DEFAULT;'
+
+CREATE_VIEW_STATEMENT = 'CREATE VIEW {view_name_} AS ' \
+                        'SELECT {columns_} ' \
+                        'FROM {tables_};'
+
+COLUMN_GROUP_JOIN_PATTERN = ' LEFT JOIN {table_name_} USING ("{row_id_}")'
+
+SELECT_ROW_ID_SEQUENCE_STATEMENT = 'SELECT PG_GET_SERIAL_SEQUENCE(\'{table_name_}\', \'{row_id_}\');'
+
+SET_VIEW_ROW_ID_DEFAULT_STATEMENT = 'ALTER VIEW {view_name_} ' \
+                                    'ALTER COLUMN "{row_id_}" SET DEFAULT NEXTVAL(\'{sequence_name_}\'::regclass);'
+
+IS_VIEW_STATEMENT = 'SELECT COALESCE((' \
+                    'SELECT relkind = \'v\' ' \
+                    'FROM pg_class ' \
+                    'WHERE oid = TO_REGCLASS(\'{table_name_}\')), false);'
+
+COPY_FROM_CSV_WITH_HEADER_STATEMENT = 'COPY {table_name_} ({columns_}) ' \
+                                      'FROM {source_} ' \
                                       'WITH CSV HEADER ' \
                                       'DELIMITER AS \'{delimiter_}\''
 
-COPY_FROM_CSV_WITHOUT_HEADER_STATEMENT = 'COPY {table_name_} ' \
-                                         'FROM STDIN ' \
+COPY_FROM_CSV_WITHOUT_HEADER_STATEMENT = 'COPY {table_name_} ({columns_}) ' \
+                                         'FROM {source_} ' \
                                          'DELIMITER AS \'{delimiter_}\''
 
 COPY_TO_CSV_WITH_HEADER_STATEMENT = 'SELECT SETSEED({random_seed_}); ' \
@@ -30,13 +76,91 @@ COPY_TO_CSV_WITHOUT_HEADER_STATEMENT = 'SELECT SETSEED({random_seed_}); ' \
 
 DROP_TABLE_STATEMENT = 'DROP TABLE IF EXISTS {table_name_};'
 
+DROP_VIEW_STATEMENT = 'DROP VIEW IF EXISTS {view_name_};'
+
+COMMENT_TABLE_STATEMENT = 'COMMENT ON {relation_kind_} {table_name_} IS \'{comment_}\';'
+
+SELECT_TABLE_COMMENT_STATEMENT = 'SELECT OBJ_DESCRIPTION(TO_REGCLASS(\'{table_name_}\'), \'pg_class\');'
+
+CREATE_DICTIONARY_TABLE_STATEMENT = 'CREATE TABLE {dictionary_table_name_} (' \
+                                    '"{code_}" serial PRIMARY KEY, ' \
+                                    '"{attribute_}" text NOT NULL, ' \
+                                    '"{value_}" text NOT NULL, ' \
+                                    'UNIQUE ("{attribute_}", "{value_}"));'
+
+CREATE_STAGING_TABLE_STATEMENT = 'DROP TABLE IF EXISTS pg_temp.{staging_table_name_}; ' \
+                                 'CREATE TEMPORARY TABLE {staging_table_name_} ' \
+                                 '(LIKE {table_name_} INCLUDING DEFAULTS) ' \
+                                 'ON COMMIT DROP;'
+
+ALTER_COLUMN_TYPE_STATEMENT = 'ALTER TABLE {table_name_} ' \
+                              'ALTER COLUMN "{column_name_}" TYPE {type_};'
+
+INSERT_DICTIONARY_VALUES_STATEMENT = 'INSERT INTO {dictionary_table_name_} ("{attribute_}", "{value_}") ' \
+                                     'SELECT DISTINCT \'{attribute_name_}\', "{attribute_name_}" ' \
+                                     'FROM {staging_table_name_} ' \
+                                     'WHERE "{attribute_name_}" IS NOT NULL ' \
+                                     'ORDER BY "{attribute_name_}" ' \
+                                     'ON CONFLICT DO NOTHING;'
+
+INSERT_STAGED_INSTANCES_STATEMENT = 'INSERT INTO {table_name_} ({columns_}) ' \
+                                    'SELECT {values_} ' \
+                                    'FROM {staging_table_name_}{joins_} ' \
+                                    'ORDER BY "{row_id_}";'
+
+ROW_ID_OFFSET_PATTERN = '{row_id_offset_} + ROW_NUMBER() OVER (ORDER BY "{row_id_}")'
+
+# The encoded attributes are converted by joining the dictionary once per attribute, instead of looking every value up.
+DICTIONARY_JOIN_PATTERN = ' LEFT JOIN {dictionary_table_name_} AS "{alias_}" ' \
+                          'ON "{alias_}"."{attribute_}" = \'{attribute_name_}\' ' \
+                          'AND "{alias_}"."{key_}" = {instances_}."{attribute_name_}"'
+
+DICTIONARY_ALIAS_PATTERN = 'factorizer_dictionary_{number_}'
+
+ENCODE_ATTRIBUTE_PATTERN = '"{alias_}"."{code_}"'
+
+DECODE_ATTRIBUTE_PATTERN = '"{alias_}"."{value_}" AS "{attribute_name_}"'
+
+SELECT_DECODED_STATEMENT = 'SELECT {columns_} ' \
+                           'FROM ({statement_}) AS {instances_}{joins_}'
+
+DESCRIBE_STATEMENT = 'SELECT * ' \
+                     'FROM ({statement_}) AS described_instances ' \
+                     'LIMIT 0;'
+
+ENCODED_INSTANCES_ALIAS = 'encoded_instances'
+
 SELECT_DISTINCT_STATEMENT = 'SELECT DISTINCT "{column_name_}" ' \
-                            'FROM {table_name_};'
+                            'FROM {table_name_} ' \
+                            'ORDER BY "{column_name_}";'
 
 COUNT_STATEMENT = 'SELECT COUNT(*) ' \
                   'FROM {table_name_} ' \
                   'WHERE "{column_name_}" = \'{value_}\';'
 
+COUNT_ALL_STATEMENT = 'SELECT COUNT(*) ' \
+                      'FROM {table_name_};'
+
+COUNT_GROUPED_AFTER_STATEMENT = 'SELECT "{column_name_}"::text, COUNT(*) ' \
+                                'FROM {table_name_} ' \
+                                'WHERE "{row_id_}" > {last_row_id_} ' \
+                                'GROUP BY "{column_name_}";'
+
+SELECT_LAST_ROW_ID_STATEMENT = 'SELECT COALESCE(MAX("{row_id_}"), 0) ' \
+                               'FROM {table_name_};'
+
+LOCK_TABLE_STATEMENT = 'LOCK TABLE {table_name_} IN {mode_} MODE;'
+
+COLUMNS_TYPES_STATEMENT = 'SELECT column_name, data_type ' \
+                          'FROM information_schema.columns ' \
+                          'WHERE table_schema = CURRENT_SCHEMA() ' \
+                          'AND table_name = \'{table_name_}\' ' \
+                          'ORDER BY ordinal_position;'
+
+COUNT_GROUPED_STATEMENT = 'SELECT "{column_name_}", COUNT(*) ' \
+                          'FROM {table_name_} ' \
+                          'GROUP BY "{column_name_}";'
+
 GET_COLUMNS_NAMES_STATEMENT = 'SELECT * ' \
                               'FROM {table_name_} ' \
                               'LIMIT 0;'
@@ -48,24 +172,555 @@ SELECT_SAMPLE_STATEMENT = 'SELECT {attributes_} ' \
                           'LIMIT {limit_} ' \
                           'OFFSET {offset_}'
 
+SELECT_STRATIFIED_SAMPLE_STATEMENT = 'SELECT {attributes_} ' \
+                                     'FROM (' \
+                                     'SELECT *, ' \
+                                     'ROW_NUMBER() OVER (PARTITION BY "{stratum_}" ORDER BY RANDOM()) - 1 ' \
+                                     'AS "{position_}", ' \
+                                     'COUNT(*) OVER (PARTITION BY "{stratum_}") AS "{stratum_size_}" ' \
+                                     'FROM (' \
+                                     'SELECT *, ' \
+                                     'NTILE({strata_number_}) OVER (ORDER BY "{class_attribute_}", "{row_id_}") ' \
+                                     'AS "{stratum_}" ' \
+                                     'FROM {table_name_}' \
+                                     ') AS stratified_instances' \
+                                     ') AS ranked_instances ' \
+                                     'WHERE "{position_}" >= {offset_} ' \
+                                     'AND "{position_}" < {offset_} + {size_} ' \
+                                     'ORDER BY "{stratum_}", "{position_}"'
+
+SPLIT_SIZE_PATTERN = 'FLOOR(({size_})::double precision * {rate_}::double precision)::bigint'
+
+# Every class is ranked by the keyed hash, so that the split sizes are apportioned among the classes as in the random
+# mode.
+HASH_RANKED_INSTANCES_PATTERN = '(' \
+                                'SELECT *, ' \
+                                'ROW_NUMBER() OVER (PARTITION BY "{class_attribute_}" ORDER BY {hash_}, "{row_id_}") ' \
+                                '- 1 AS "{position_}", ' \
+                                'COUNT(*) OVER (PARTITION BY "{class_attribute_}") AS "{partition_size_}" ' \
+                                'FROM {table_name_}' \
+                                ') AS ranked_instances'
+
+POSITION_RANGE_CONDITION_PATTERN = ' WHERE "{position_}" >= {offset_} AND "{position_}" < {offset_} + {size_}'
+
+SELECT_HASH_SAMPLE_STATEMENT = 'SELECT {attributes_} ' \
+                               'FROM {ranked_instances_}{condition_} ' \
+                               'ORDER BY "{class_attribute_}", "{position_}"'
+
+FIT_NORMALIZATION_STATEMENT = 'SELECT {aggregates_} ' \
+                              'FROM {table_name_}{condition_};'
+
+SPLIT_INSTANCES_JOIN_PATTERN = ' JOIN {split_instances_table_name_} USING ("{row_id_}")'
+
+NORMALIZATION_AGGREGATES_PATTERNS = {
+    'zscore': 'AVG("{column_name_}")::double precision, '
+              'STDDEV_POP("{column_name_}")::double precision',
+    'minmax': 'MIN("{column_name_}")::double precision, '
+              '(MAX("{column_name_}") - MIN("{column_name_}"))::double precision',
+    'robust': 'PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY "{column_name_}"), '
+              'PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY "{column_name_}") '
+              '- PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY "{column_name_}")',
+}
+
+NORMALIZE_ATTRIBUTE_PATTERN = '(("{attribute_name_}" - {center_}) / {scale_}) AS "{attribute_name_}"'
+
+SELECT_TABLESAMPLE_STATEMENT = 'SELECT {attributes_} ' \
+                               'FROM {table_name_} AS instances ' \
+                               'TABLESAMPLE {method_} ({percentage_}) REPEATABLE ({random_seed_}) ' \
+                               'WHERE "{class_attribute_}" = \'{class_attribute_value_}\'{exclusion_}'
+
+# The samples of the same seed are nested, so that the split excludes the instances of the lower sample by their ctid.
+# The sampling is not exposed per instance, so that the lower sample is drawn by a second sample scan, reading only its
+# pages for SYSTEM, and planned as a hash anti-join, instead of flagging the sampled instances in a single scan.
+TABLESAMPLE_EXCLUSION_PATTERN = ' AND NOT EXISTS (' \
+                                'SELECT 1 ' \
+                                'FROM {table_name_} AS excluded_instances ' \
+                                'TABLESAMPLE {method_} ({percentage_}) REPEATABLE ({random_seed_}) ' \
+                                'WHERE excluded_instances."{class_attribute_}" = \'{class_attribute_value_}\' ' \
+                                'AND excluded_instances.ctid = instances.ctid)'
+
+# The positions are drawn by the database, hashing the draw numbers, so that they are not shipped in the statement.
+SELECT_BOOTSTRAP_STATEMENT = 'SELECT {attributes_}{weight_} ' \
+                             'FROM (' \
+                             'SELECT *, ROW_NUMBER() OVER (ORDER BY "{row_id_}") - 1 AS "{position_}" ' \
+                             'FROM ({split_statement_}) AS split_instances' \
+                             ') AS numbered_instances ' \
+                             'JOIN (' \
+                             'SELECT {hash_} % {split_size_} AS "{position_}", COUNT(*) AS "{multiplicity_}" ' \
+                             'FROM GENERATE_SERIES(0::bigint, {sample_size_} - 1) AS "{draw_}" ' \
+                             'GROUP BY 1' \
+                             ') AS draws USING ("{position_}")' \
+                             '{repetition_}'
+
+BOOTSTRAP_WEIGHT_PATTERN = ', "{multiplicity_}" AS "{weight_}"'
+
+BOOTSTRAP_REPETITION_PATTERN = ' CROSS JOIN LATERAL GENERATE_SERIES(1, "{multiplicity_}")'
+
+CREATE_SPLIT_INSTANCES_TABLE_STATEMENT = 'DROP TABLE IF EXISTS pg_temp.{split_instances_table_name_}; ' \
+                                         'CREATE TEMPORARY TABLE {split_instances_table_name_} ' \
+                                         '("{row_id_}" bigint PRIMARY KEY) ' \
+                                         'ON COMMIT DROP;'
+
+INSERT_SPLIT_INSTANCES_STATEMENT = 'SELECT SETSEED({random_seed_}); ' \
+                                   'INSERT INTO {split_instances_table_name_} {statement_};'
+
+CREATE_WEIGHTS_TABLE_STATEMENT = 'DROP TABLE IF EXISTS pg_temp.{weights_table_name_}; ' \
+                                 'CREATE TEMPORARY TABLE {weights_table_name_} ' \
+                                 '("{row_id_}" bigint PRIMARY KEY, "{weight_}" double precision) ' \
+                                 'ON COMMIT DROP;'
+
+COPY_WEIGHTS_STATEMENT = 'COPY {weights_table_name_} ' \
+                         'FROM STDIN ' \
+                         'WITH CSV ' \
+                         'DELIMITER AS \',\''
+
+SELECT_WEIGHTED_SAMPLE_STATEMENT = 'SELECT {attributes_} ' \
+                                   'FROM {table_name_} ' \
+                                   'JOIN {split_instances_table_name_} USING ("{row_id_}"){weights_join_} ' \
+                                   'WHERE {weight_} > 0 ' \
+                                   'ORDER BY -LN(({hash_} + 0.5) / {hash_range_}) / {weight_} ' \
+                                   'LIMIT {limit_}'
+
+WEIGHTS_JOIN_PATTERN = ' JOIN {weights_table_name_} USING ("{row_id_}")'
+
+SELECT_OVERSAMPLE_STATEMENT = 'SELECT {attributes_} ' \
+                              'FROM (' \
+                              'SELECT *, ROW_NUMBER() OVER () AS "{position_}" ' \
+                              'FROM ({split_statement_}) AS split_instances' \
+                              ') AS numbered_instances ' \
+                              'CROSS JOIN LATERAL GENERATE_SERIES(' \
+                              '1, {repetitions_} + CASE WHEN "{position_}" <= {remainder_} THEN 1 ELSE 0 END)'
+
+SELECT_FOLD_STATEMENT = 'SELECT {attributes_} ' \
+                        'FROM {table_name_} ' \
+                        'JOIN {folds_table_name_} USING ("{row_id_}") ' \
+                        'WHERE "{fold_}" {operator_} {fold_number_}'
+
+CREATE_FOLDS_TABLE_STATEMENT = 'CREATE TABLE {folds_table_name_} AS ' \
+                               'SELECT "{row_id_}", (ROW_NUMBER() OVER (' \
+                               'PARTITION BY "{class_attribute_}" ' \
+                               'ORDER BY {hash_}, "{row_id_}") - 1) % {folds_number_} AS "{fold_}" ' \
+                               'FROM {table_name_} ' \
+                               'ORDER BY "{fold_}", "{row_id_}";'
+
+INSERT_FOLDS_STATEMENT = 'INSERT INTO {folds_table_name_} ("{row_id_}", "{fold_}") ' \
+                         'SELECT "{row_id_}", (ROW_NUMBER() OVER (' \
+                         'PARTITION BY "{class_attribute_}" ' \
+                         'ORDER BY {hash_}, "{row_id_}") - 1 + {offset_}) % {folds_number_} ' \
+                         'FROM {table_name_} ' \
+                         'WHERE "{row_id_}" > {last_row_id_} ' \
+                         'ORDER BY "{row_id_}";'
+
+FOLD_OFFSET_PATTERN = 'CASE "{class_attribute_}"::text {cases_} ELSE 0 END'
+
+FOLD_OFFSET_CASE_PATTERN = 'WHEN \'{value_}\' THEN {offset_}'
+
+CREATE_FOLDS_INDEX_STATEMENT = 'CREATE INDEX ON {folds_table_name_} ("{fold_}", "{row_id_}");'
+
+TABLE_EXISTS_STATEMENT = 'SELECT TO_REGCLASS(\'{table_name_}\') IS NOT NULL;'
+
+SELECT_CLASS_INDEX_STATEMENT = 'SELECT indexrelid::regclass::text ' \
+                               'FROM pg_index ' \
+                               'JOIN pg_attribute ON attrelid = indrelid AND attnum = indkey[0] ' \
+                               'WHERE indrelid = TO_REGCLASS(%s) ' \
+                               'AND attname = %s ' \
+                               'AND indnkeyatts = 2 ' \
+                               'LIMIT 1;'
+
+CREATE_CLASS_INDEX_STATEMENT = 'CREATE INDEX ON {table_name_} ("{class_attribute_}", "{row_id_}");'
+
+CLUSTER_TABLE_STATEMENT = 'CLUSTER {table_name_} USING {index_name_};'
+
+ANALYZE_TABLE_STATEMENT = 'ANALYZE {table_name_};'
+
+VACUUM_TABLE_STATEMENT = 'VACUUM (FREEZE) {table_name_};'
+
+SELECT_DERIVED_TABLES_STATEMENT = 'SELECT tablename ' \
+                                  'FROM pg_tables ' \
+                                  'WHERE schemaname = CURRENT_SCHEMA() ' \
+                                  'AND LEFT(tablename, {prefix_length_}) = \'{prefix_}\';'
+
+# The derived tables are named after the hash of the table name, so that the names are not truncated and the prefix of
+# a table does not match the tables derived from the others.
+DERIVED_TABLE_NAME_PATTERN = 'fd_{table_hash_}__{suffix_}'
+
+SELECT_STAGING_STRUCTURES_STATEMENT = 'SELECT relname ' \
+                                      'FROM pg_class ' \
+                                      'WHERE relnamespace = CURRENT_SCHEMA()::regnamespace ' \
+                                      'AND relkind IN (\'r\', \'v\', \'p\') ' \
+                                      'AND relname ~ %s;'
+
+SELECT_UPLOADS_STAGING_TABLES_STATEMENT = 'SELECT staging_table_name FROM {uploads_table_name_};'
+
+# The staging structures are locked by name for the whole session building them, so that a structure whose lock is
+# free was left by a session that ended without dropping it.
+LOCK_STAGING_STRUCTURE_STATEMENT = 'SELECT PG_ADVISORY_LOCK(HASHTEXT(%s));'
+
+TRY_LOCK_STAGING_STRUCTURE_STATEMENT = 'SELECT PG_TRY_ADVISORY_LOCK(HASHTEXT(%s));'
+
+UNLOCK_STAGING_STRUCTURE_STATEMENT = 'SELECT PG_ADVISORY_UNLOCK(HASHTEXT(%s));'
+
+DERIVED_TABLE_HASH_LENGTH = 16
+
+MAXIMUM_TABLE_NAME_LENGTH = 63
+
+CREATE_STATISTICS_TABLE_STATEMENT = 'CREATE TABLE {statistics_table_name_} (' \
+                                    'class_attribute text NOT NULL, ' \
+                                    'class_value text, ' \
+                                    'attribute_name text NOT NULL, ' \
+                                    'values_number bigint NOT NULL, ' \
+                                    'nulls_number bigint NOT NULL, ' \
+                                    'minimum double precision, ' \
+                                    'maximum double precision, ' \
+                                    'mean double precision, ' \
+                                    'variance double precision, ' \
+                                    'quantiles double precision[]);'
+
+CREATE_STATISTICS_INDEX_STATEMENT = 'CREATE INDEX ON {statistics_table_name_} (class_attribute, attribute_name);'
+
+SELECT_STATISTICS_STATEMENT = 'SELECT class_value, attribute_name, values_number, nulls_number, ' \
+                              'minimum, maximum, mean, variance, quantiles ' \
+                              'FROM {statistics_table_name_} ' \
+                              'WHERE class_attribute = %s;'
+
+SELECT_STATISTICS_CLASS_ATTRIBUTES_STATEMENT = 'SELECT DISTINCT class_attribute ' \
+                                               'FROM {statistics_table_name_};'
+
+DELETE_STATISTICS_STATEMENT = 'DELETE FROM {statistics_table_name_} ' \
+                              'WHERE class_attribute = %s;'
+
+INSERT_STATISTICS_STATEMENT = 'INSERT INTO {statistics_table_name_} (class_attribute, class_value, attribute_name, ' \
+                              'values_number, nulls_number, minimum, maximum, mean, variance, quantiles) ' \
+                              'VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);'
+
+UPDATE_STATISTICS_QUANTILES_STATEMENT = 'UPDATE {statistics_table_name_} ' \
+                                        'SET quantiles = %s ' \
+                                        'WHERE class_attribute = %s ' \
+                                        'AND class_value IS NOT DISTINCT FROM %s ' \
+                                        'AND attribute_name = %s;'
+
+COMPUTE_STATISTICS_STATEMENT = 'SELECT {class_value_}, {aggregates_} ' \
+                               'FROM {table_name_} ' \
+                               'WHERE "{row_id_}" > {last_row_id_}{group_by_};'
+
+NUMERIC_STATISTICS_PATTERN = 'COUNT("{column_name_}"), ' \
+                             'COUNT(*) - COUNT("{column_name_}"), ' \
+                             'MIN("{column_name_}")::double precision, ' \
+                             'MAX("{column_name_}")::double precision, ' \
+                             'AVG("{column_name_}")::double precision, ' \
+                             'VAR_POP("{column_name_}")::double precision'
+
+TEXT_STATISTICS_PATTERN = 'COUNT("{column_name_}"), ' \
+                          'COUNT(*) - COUNT("{column_name_}"), ' \
+                          'NULL, NULL, NULL, NULL'
+
+COMPUTE_QUANTILES_STATEMENT = 'SELECT {class_value_}, {aggregates_} ' \
+                              'FROM {table_name_} ' \
+                              'WHERE {hash_} < {hash_bound_}{group_by_};'
+
+QUANTILES_PATTERN = 'PERCENTILE_CONT(ARRAY[{fractions_}]::double precision[]) WITHIN GROUP (ORDER BY "{column_name_}")'
+
+COMPUTE_ARRAY_STATISTICS_STATEMENT = 'SELECT {class_value_}, "{position_}", {aggregates_} ' \
+                                     'FROM {table_name_} ' \
+                                     'CROSS JOIN LATERAL UNNEST("{array_}") ' \
+                                     'WITH ORDINALITY AS array_values ("{value_}", "{position_}") ' \
+                                     'WHERE "{row_id_}" > {last_row_id_} ' \
+                                     'GROUP BY 1, 2;'
+
+COMPUTE_ARRAY_QUANTILES_STATEMENT = 'SELECT {class_value_}, "{position_}", {aggregates_} ' \
+                                    'FROM {table_name_} ' \
+                                    'CROSS JOIN LATERAL UNNEST("{array_}") ' \
+                                    'WITH ORDINALITY AS array_values ("{value_}", "{position_}") ' \
+                                    'WHERE {hash_} < {hash_bound_} ' \
+                                    'GROUP BY 1, 2;'
+
+ARRAY_ATTRIBUTE_PATTERN = '"{array_}"[{position_}] AS "{attribute_name_}"'
+
+LIBSVM_LINE_PATTERN = 'CONCAT_WS(\' \', "{class_attribute_}", (' \
+                      'SELECT STRING_AGG("{index_}" || \':\' || "{value_}", \' \' ORDER BY "{index_}") ' \
+                      'FROM UNNEST("{indices_}", "{values_}") AS features ("{index_}", "{value_}"){condition_}' \
+                      ')) AS "{class_attribute_}"'
+
+SPARSE_FEATURES_CONDITION_PATTERN = ' WHERE "{index_}" = ANY(\'{{{indices_}}}\'::int[])'
+
+CLASS_VALUE_PATTERN = '"{class_attribute_}"::text'
+
+SELECT_DICTIONARY_STATEMENT = 'SELECT "{code_}"::text, "{value_}" ' \
+                              'FROM {dictionary_table_name_} ' \
+                              'WHERE "{attribute_}" = %s;'
+
+NULL_CLASS_VALUE = 'NULL::text'
+
+GROUP_BY_CLASS_VALUE = ' GROUP BY 1'
+
+CREATE_UPLOADS_TABLES_STATEMENT = 'CREATE TABLE IF NOT EXISTS {uploads_table_name_} (' \
+                                  'upload_id text PRIMARY KEY, ' \
+                                  'dataset_name text NOT NULL, ' \
+                                  'staging_table_name text NOT NULL, ' \
+                                  'attributes text NOT NULL, ' \
+                                  'delimiter text NOT NULL, ' \
+                                  'header boolean NOT NULL, ' \
+                                  'creation timestamptz NOT NULL DEFAULT NOW()); ' \
+                                  'CREATE TABLE IF NOT EXISTS {chunks_table_name_} (' \
+                                  'upload_id text NOT NULL REFERENCES {uploads_table_name_} ON DELETE CASCADE, ' \
+                                  'chunk_number int NOT NULL, ' \
+                                  'checksum text NOT NULL, ' \
+                                  'instances_number bigint NOT NULL, ' \
+                                  'PRIMARY KEY (upload_id, chunk_number));'
+
+INSERT_UPLOAD_STATEMENT = 'INSERT INTO {uploads_table_name_} ' \
+                          '(upload_id, dataset_name, staging_table_name, attributes, delimiter, header) ' \
+                          'VALUES (%s, %s, %s, %s, %s, %s);'
+
+SELECT_UPLOAD_STATEMENT = 'SELECT dataset_name, staging_table_name, attributes, delimiter, header ' \
+                          'FROM {uploads_table_name_} ' \
+                          'WHERE upload_id = %s{lock_};'
+
+SELECT_UPLOAD_CHUNKS_STATEMENT = 'SELECT chunk_number, checksum, instances_number ' \
+                                 'FROM {chunks_table_name_} ' \
+                                 'WHERE upload_id = %s ' \
+                                 'ORDER BY chunk_number;'
+
+SELECT_UPLOAD_CHUNK_STATEMENT = 'SELECT checksum, instances_number ' \
+                                'FROM {chunks_table_name_} ' \
+                                'WHERE upload_id = %s AND chunk_number = %s;'
+
+LOCK_UPLOAD_CHUNK_STATEMENT = 'SELECT PG_ADVISORY_XACT_LOCK(HASHTEXT(%s), %s);'
+
+UPSERT_UPLOAD_CHUNK_STATEMENT = 'INSERT INTO {chunks_table_name_} ' \
+                                '(upload_id, chunk_number, checksum, instances_number) ' \
+                                'VALUES (%s, %s, %s, %s) ' \
+                                'ON CONFLICT (upload_id, chunk_number) DO UPDATE ' \
+                                'SET checksum = EXCLUDED.checksum, instances_number = EXCLUDED.instances_number;'
+
+DELETE_UPLOAD_STATEMENT = 'DELETE FROM {uploads_table_name_} ' \
+                          'WHERE upload_id = %s ' \
+                          'RETURNING staging_table_name;'
+
+DELETE_ROW_IDS_RANGE_STATEMENT = 'DELETE FROM {table_name_} ' \
+                                 'WHERE "{row_id_}" > {first_row_id_} AND "{row_id_}" <= {last_row_id_};'
+
+# The row ids are renumbered through negative values, so that they do not collide with the ones not updated yet.
+RENUMBER_ROW_IDS_STATEMENT = 'UPDATE {table_name_} AS instances SET "{row_id_}" = -positions.{position_} ' \
+                             'FROM (' \
+                             'SELECT "{row_id_}", ROW_NUMBER() OVER (ORDER BY "{row_id_}") AS {position_} ' \
+                             'FROM {table_name_}' \
+                             ') AS positions ' \
+                             'WHERE instances."{row_id_}" = positions."{row_id_}";'
+
+NEGATE_ROW_IDS_STATEMENT = 'UPDATE {table_name_} SET "{row_id_}" = -"{row_id_}";'
+
+PRIMARY_KEY_INDEX_NAME_PATTERN = '{table_name_}_pkey'
+
+RENAME_TABLE_STATEMENT = 'ALTER TABLE {table_name_} RENAME TO {new_table_name_};'
+
+RESET_ROW_ID_SEQUENCE_STATEMENT = 'SELECT SETVAL(' \
+                                  'PG_GET_SERIAL_SEQUENCE(\'{table_name_}\', \'{row_id_}\'), ' \
+                                  'COALESCE(MAX("{row_id_}"), 0) + 1, ' \
+                                  'false) ' \
+                                  'FROM {table_name_};'
+
+SELECT_CURRENT_LSN_STATEMENT = 'SELECT PG_CURRENT_WAL_LSN()::text;'
+
+IS_LSN_REPLAYED_STATEMENT = 'SELECT COALESCE(PG_LAST_WAL_REPLAY_LSN() >= %s::pg_lsn, NOT PG_IS_IN_RECOVERY());'
+
+CREATE_ITERATOR_SESSIONS_TABLE_STATEMENT = 'CREATE TABLE IF NOT EXISTS {sessions_table_name_} (' \
+                                           'token text PRIMARY KEY, ' \
+                                           'dataset_name text NOT NULL, ' \
+                                           'iterator_table_name text NOT NULL, ' \
+                                           'attributes text NOT NULL, ' \
+                                           'random_seed bigint NOT NULL, ' \
+                                           'epoch bigint NOT NULL, ' \
+                                           'batch_size bigint NOT NULL, ' \
+                                           'size bigint NOT NULL, ' \
+                                           'last_access timestamptz NOT NULL DEFAULT NOW());'
+
+INSERT_ITERATOR_SESSION_STATEMENT = 'INSERT INTO {sessions_table_name_} ' \
+                                    '(token, dataset_name, iterator_table_name, attributes, random_seed, epoch, ' \
+                                    'batch_size, size) ' \
+                                    'VALUES (%s, %s, %s, %s, %s, %s, %s, %s);'
+
+TOUCH_ITERATOR_SESSION_STATEMENT = 'UPDATE {sessions_table_name_} ' \
+                                   'SET last_access = NOW() ' \
+                                   'WHERE token = %s ' \
+                                   'AND last_access >= NOW() - %s * INTERVAL \'1 second\' ' \
+                                   'RETURNING dataset_name, iterator_table_name, attributes, random_seed, epoch, ' \
+                                   'batch_size, size;'
+
+UPDATE_ITERATOR_SESSION_EPOCH_STATEMENT = 'UPDATE {sessions_table_name_} ' \
+                                          'SET epoch = %s ' \
+                                          'WHERE token = %s;'
+
+DELETE_ITERATOR_SESSION_STATEMENT = 'DELETE FROM {sessions_table_name_} ' \
+                                    'WHERE token = %s ' \
+                                    'RETURNING iterator_table_name;'
+
+DELETE_EXPIRED_ITERATOR_SESSIONS_STATEMENT = 'DELETE FROM {sessions_table_name_} ' \
+                                             'WHERE last_access < NOW() - %s * INTERVAL \'1 second\' ' \
+                                             'RETURNING iterator_table_name;'
+
+DELETE_DATASET_ITERATOR_SESSIONS_STATEMENT = 'DELETE FROM {sessions_table_name_} ' \
+                                             'WHERE dataset_name = %s;'
+
+CREATE_ITERATOR_TABLE_STATEMENT = 'CREATE TABLE {iterator_table_name_} AS ' \
+                                  'SELECT "{row_id_}", ' \
+                                  'ROW_NUMBER() OVER (ORDER BY {hash_}, "{row_id_}") - 1 AS "{position_}" ' \
+                                  'FROM {split_instances_table_name_};'
+
+CREATE_ITERATOR_INDEX_STATEMENT = 'CREATE INDEX ON {iterator_table_name_} ("{position_}");'
+
+SHUFFLE_ITERATOR_TABLE_STATEMENT = 'UPDATE {iterator_table_name_} AS iterator_instances ' \
+                                   'SET "{position_}" = shuffled_instances."{position_}" ' \
+                                   'FROM (' \
+                                   'SELECT "{row_id_}", ' \
+                                   'ROW_NUMBER() OVER (ORDER BY {hash_}, "{row_id_}") - 1 AS "{position_}" ' \
+                                   'FROM {iterator_table_name_}' \
+                                   ') AS shuffled_instances ' \
+                                   'WHERE iterator_instances."{row_id_}" = shuffled_instances."{row_id_}";'
+
+SELECT_ITERATOR_BATCH_STATEMENT = 'SELECT {attributes_} ' \
+                                  'FROM {table_name_} ' \
+                                  'JOIN {iterator_table_name_} USING ("{row_id_}") ' \
+                                  'WHERE "{position_}" >= {first_position_} AND "{position_}" < {last_position_} ' \
+                                  'ORDER BY "{position_}"'
+
+HASH_KEY_PATTERN = '(("{row_id_}" # ("{row_id_}" >> 32) # {key_}) & {mask_})'
+
+HASH_STEP_PATTERN = '((((({value_}) >> 16) # ({value_})) * {multiplier_}) & {mask_})'
+
+HASH_FINAL_STEP_PATTERN = '((({value_}) >> 16) # ({value_}))'
+
 ATTRIBUTE_TYPE_NAMES = {
     'integer': 'int',
     'real': 'numeric',
     'text': 'text',
 }
 
+ENCODED_ATTRIBUTE_TYPE_NAME = 'int'
+
+ARRAY_TYPE_NAMES = {
+    'float4': 'float4[]',
+    'float8': 'float8[]',
+}
+
+ARRAY_TYPE = 'float8'
+
+SPARSE_INDICES_TYPE_NAME = 'int[]'
+
+SPARSE_VALUES_TYPE_NAME = 'float8[]'
+
+COLUMN_DATA_TYPES = {
+    'integer': 'integer',
+    'numeric': 'real',
+    'text': 'text',
+}
+
+ROW_ID_COLUMN_NAME = 'factorizer_row_id'
+
+ARRAY_COLUMN_NAME = 'factorizer_values'
+
+ARRAY_VALUE_COLUMN_NAME = 'factorizer_value'
+
+INDICES_COLUMN_NAME = 'factorizer_indices'
+
+INDEX_COLUMN_NAME = 'factorizer_index'
+
+DICTIONARY_CODE_COLUMN_NAME = 'factorizer_code'
+
+DICTIONARY_ATTRIBUTE_COLUMN_NAME = 'factorizer_attribute'
+
+DICTIONARY_VALUE_COLUMN_NAME = 'factorizer_value'
+
+STAGING_TABLE_NAME = 'factorizer_staging'
+
+FOLD_COLUMN_NAME = 'factorizer_fold'
+
+FOLDS_TABLE_SUFFIX = 'folds_'
+
+COLUMN_GROUP_TABLE_SUFFIX = 'columns_'
+
+# The partitions suffixes are short, so that the names of the partitions of the staging tables are not truncated.
+PARTITION_TABLE_SUFFIX = 'p_'
+
+DEFAULT_PARTITION_TABLE_SUFFIX = 'p_default'
+
+POSITION_COLUMN_NAME = 'factorizer_position'
+
+STRATUM_COLUMN_NAME = 'factorizer_stratum'
+
+STRATUM_SIZE_COLUMN_NAME = 'factorizer_stratum_size'
+
+MULTIPLICITY_COLUMN_NAME = 'factorizer_multiplicity'
+
+DRAW_COLUMN_NAME = 'factorizer_draw'
+
+WEIGHT_COLUMN_NAME = 'weight'
+
+INSTANCE_WEIGHT_COLUMN_NAME = 'factorizer_weight'
+
+SPLIT_INSTANCES_TABLE_NAME = 'factorizer_split_instances'
+
+WEIGHTS_TABLE_NAME = 'factorizer_weights'
+
+ITERATOR_SESSIONS_TABLE_NAME = 'factorizer_iterator_sessions'
+
+UPLOADS_TABLE_NAME = 'factorizer_uploads'
+
+UPLOAD_CHUNKS_TABLE_NAME = 'factorizer_upload_chunks'
+
+UPLOAD_STAGING_TABLE_PREFIX = 'factorizer_upload_'
+
+IMPORT_STAGING_TABLE_PREFIX = 'factorizer_import_'
+
+STAGING_TABLE_NAME_REGEX = '^(' + UPLOAD_STAGING_TABLE_PREFIX + '|' + IMPORT_STAGING_TABLE_PREFIX + ')[0-9a-f]{32}$'
+
+STDIN_SOURCE = 'STDIN'
+
+CHUNK_ROW_IDS_NUMBER = 2 ** 32
+
+STATISTICS_TABLE_SUFFIX = 'statistics'
+
+# The statistics of the whole dataset are stored with an empty class attribute.
+NO_CLASS_ATTRIBUTE = ''
+
+QUANTILES_FRACTIONS = [0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99]
+
+QUANTILES_SAMPLE_SIZE = 100000
+
+QUANTILES_RANDOM_SEED = 0
+
+ITERATOR_IDLE_TIMEOUT = 1800
+
 DATA_CHUNK_SIZE = 4096
 
+NULL_ARRAY_ELEMENT = 'NULL'
+
+SPARSE_DELIMITER = '\t'
+
 
 class PostgreSQLDataDriver(DataDriver):
     """
     Implements a data driver communicating with a PostgreSQL database.
     """
 
-    def __init__(self, database, username, password, hostname, port):
+    def __init__(
+            self,
+            database,
+            username,
+            password,
+            hostname,
+            port,
+            iterator_idle_timeout=ITERATOR_IDLE_TIMEOUT,
+            replicas=None,
+    ):
         """
         Initializes the data driver.
 
+        The splits, the bootstrap samples, the folds and the iterator batches are read from a replica, chosen in random
+        order, that has replayed every write committed on the primary database when the read starts, otherwise from
+        the primary database. The weighted samples and the normalized random splits, which write temporary tables, are
+        always read from the primary database.
+
         :param database: the name of the database
         :type database: str
 
@@ -80,9 +735,24 @@ class PostgreSQLDataDriver(DataDriver):
 
         :param port: the port
         :type port: str
+
+        :param iterator_idle_timeout: the seconds after which an unused iterator session expires
+        :type iterator_idle_timeout: int
+
+        :param replicas: the list of the (hostname, port) of the hot standby replicas of the database
+        :type replicas: list[(str, str)]
         """
         super().__init__()
 
+        self.__iterator_idle_timeout = iterator_idle_timeout
+        self.__datasets_options = {}
+
+        self.__database = database
+        self.__username = username
+        self.__password = password
+        self.__replicas = list(replicas or [])
+        self.__replicas_connections = {}
+
         self.__connection = psycopg2.connect(
             database=database,
             user=username,
@@ -94,24 +764,112 @@ class PostgreSQLDataDriver(DataDriver):
         self.__cursor = self.__connection.cursor()
 
     def close(self):
+        for replica_connection in self.__replicas_connections.values():
+            replica_connection.close()
         self.__cursor.close()
         self.__connection.close()
 
     def create_structure(
             self,
             name,
-            attributes
+            attributes,
+            column_group_size=None,
+            array_type=ARRAY_TYPE,
+            sparse=False,
+            partition_attribute=None,
     ):
-        # Creates the structure.
-        columns_definitions = self.__compose_columns_definitions(attributes)
-        self.__cursor.execute(CREATE_TABLE_STATEMENT.format(table_name_=name, columns_definitions_=columns_definitions))
+        self.__check_table_name(name)
+
+        # Creates the structure, as a view joining the column groups by row id if requested.
+        array_attributes = [x['name'] for x in attributes if x.get('array', False)]
+        if partition_attribute is not None:
+            partition_attributes = [
+                x for x in attributes
+                if x['name'] == partition_attribute and not x.get('array', False) and not x.get('encoded', False)
+            ]
+            if not partition_attributes or sparse or column_group_size is not None:
+                raise ValueError('The partition attribute must be a column of a table without column groups.')
+
+            # Every class value is stored in its own partition, created when loaded, the nulls in the default one.
+            columns_definitions = self.__compose_columns_definitions(
+                attributes,
+                row_id_column_definition=PARTITIONED_ROW_ID_COLUMN_DEFINITION,
+                array_type=array_type,
+            )
+            self.__cursor.execute(
+                CREATE_PARTITIONED_TABLE_STATEMENT.format(
+                    table_name_=name,
+                    columns_definitions_=columns_definitions,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                    partition_attribute_=partition_attribute,
+                )
+            )
+            self.__cursor.execute(
+                CREATE_DEFAULT_PARTITION_STATEMENT.format(
+                    partition_table_name_=self.__get_default_partition_table_name(name),
+                    table_name_=name,
+                )
+            )
+            column_groups_number = 0
+        elif sparse:
+            if len(attributes) != 1 or attributes[0]['type'] == 'text' or attributes[0].get('array', False):
+                raise ValueError('The sparse datasets have a single numeric label attribute.')
+            if column_group_size is not None:
+                raise ValueError('The sparse datasets cannot be stored in column groups.')
+
+            # The features of every instance are stored as the arrays of their indices and of their values.
+            columns_definitions = ', '.join([
+                self.__compose_columns_definitions(attributes),
+                COLUMN_DEFINITIONS_PATTERN.format(name_=INDICES_COLUMN_NAME, type_=SPARSE_INDICES_TYPE_NAME),
+                COLUMN_DEFINITIONS_PATTERN.format(name_=ARRAY_COLUMN_NAME, type_=SPARSE_VALUES_TYPE_NAME),
+            ])
+            self.__cursor.execute(
+                CREATE_TABLE_STATEMENT.format(table_name_=name, columns_definitions_=columns_definitions)
+            )
+            column_groups_number = 0
+        elif column_group_size is None:
+            columns_definitions = self.__compose_columns_definitions(attributes, array_type=array_type)
+            self.__cursor.execute(
+                CREATE_TABLE_STATEMENT.format(table_name_=name, columns_definitions_=columns_definitions)
+            )
+            column_groups_number = 0
+        elif array_attributes:
+            raise ValueError('The array attributes cannot be stored in column groups.')
+        else:
+            column_groups_number = self.__create_column_groups(name, attributes, column_group_size)
+
+        # Creates the dictionary of the encoded attributes.
+        encoded_attributes = [x['name'] for x in attributes if x.get('encoded', False)]
+        if encoded_attributes:
+            self.__cursor.execute(
+                CREATE_DICTIONARY_TABLE_STATEMENT.format(
+                    dictionary_table_name_=self.__get_dictionary_table_name(name),
+                    code_=DICTIONARY_CODE_COLUMN_NAME,
+                    attribute_=DICTIONARY_ATTRIBUTE_COLUMN_NAME,
+                    value_=DICTIONARY_VALUE_COLUMN_NAME,
+                )
+            )
+
+        # Stores the dataset options.
+        self.__set_dataset_options(
+            table_name=name,
+            options={
+                'encoded_attributes': encoded_attributes,
+                'column_groups_number': column_groups_number,
+                'array_attributes': array_attributes,
+                'attributes_names': [x['name'] for x in attributes] if array_attributes else [],
+                'sparse': sparse,
+                'features_number': 0,
+                'partition_attribute': partition_attribute,
+            },
+        )
         self.__connection.commit()
 
     def destroy_structure(
             self,
             name,
     ):
-        self.__cursor.execute(DROP_TABLE_STATEMENT.format(table_name_=name))
+        self.__drop_structure(name)
         self.__connection.commit()
 
     def fill_structure(
@@ -121,16 +879,193 @@ class PostgreSQLDataDriver(DataDriver):
             header,
             input_csv,
     ):
-        if header:
-            statement = COPY_FROM_CSV_WITH_HEADER_STATEMENT.format(table_name_=name, delimiter_=delimiter)
-        else:
-            statement = COPY_FROM_CSV_WITHOUT_HEADER_STATEMENT.format(table_name_=name, delimiter_=delimiter)
+        self.__cursor.execute(SELECT_LAST_ROW_ID_STATEMENT.format(table_name_=name, row_id_=ROW_ID_COLUMN_NAME))
+        last_row_id = self.__cursor.fetchone()[0]
 
-        self.__cursor.copy_expert(
-            statement,
-            file=input_csv,
+        self.__copy_csv_to_table(
+            table_name=name,
+            delimiter=delimiter,
+            header=header,
+            input_csv=input_csv,
+        )
+        self.__update_statistics(name, last_row_id)
+        self.__connection.commit()
+
+    def import_structure(
+            self,
+            name,
+            attributes,
+            delimiter,
+            header,
+            input_csv=None,
+            server_path=None,
+            column_group_size=None,
+            array_type=ARRAY_TYPE,
+            sparse=False,
+            partition_attribute=None,
+    ):
+        self.__check_table_name(name)
+
+        # Drops the staging structures left by the imports and the uploads interrupted before cleaning up.
+        self.__drop_stale_staging_structures()
+
+        # Loads a staging structure, published as the dataset only if the whole file is valid.
+        staging_table_name = IMPORT_STAGING_TABLE_PREFIX + uuid.uuid4().hex
+        self.__cursor.execute(LOCK_STAGING_STRUCTURE_STATEMENT, (staging_table_name,))
+        try:
+            self.create_structure(
+                name=staging_table_name,
+                attributes=attributes,
+                column_group_size=column_group_size,
+                array_type=array_type,
+                sparse=sparse,
+                partition_attribute=partition_attribute,
+            )
+
+            try:
+                instances_number = self.__copy_csv_to_table(
+                    table_name=staging_table_name,
+                    delimiter=delimiter,
+                    header=header,
+                    input_csv=input_csv,
+                    server_path=server_path,
+                )
+            except (psycopg2.Error, ValueError) as error:
+                self.__connection.rollback()
+                self.destroy_structure(staging_table_name)
+                raise ValueError(str(error).strip()) from error
+
+            self.__update_statistics(staging_table_name, 0)
+            self.__publish_structure(staging_table_name, name)
+            self.__connection.commit()
+        finally:
+            self.__unlock_staging_structure(staging_table_name)
+        return instances_number
+
+    def append_structure(
+            self,
+            name,
+            delimiter,
+            header,
+            input_csv,
+    ):
+        # Serializes the appends, and the creation of the derived tables, while allowing the reads.
+        self.__cursor.execute(LOCK_TABLE_STATEMENT.format(table_name_=name, mode_='SHARE ROW EXCLUSIVE'))
+        self.__cursor.execute(SELECT_LAST_ROW_ID_STATEMENT.format(table_name_=name, row_id_=ROW_ID_COLUMN_NAME))
+        last_row_id = self.__cursor.fetchone()[0]
+
+        appended_instances_number = self.__copy_csv_to_table(
+            table_name=name,
+            delimiter=delimiter,
+            header=header,
+            input_csv=input_csv,
         )
+        self.__update_statistics(name, last_row_id)
+
+        # Deals the appended instances to the folds, after the existing ones.
+        folds_tables_prefix = '"' + self.__get_derived_table_name(name, FOLDS_TABLE_SUFFIX)
+        for derived_table_name in self.__get_derived_tables_names(name):
+            if derived_table_name.startswith(folds_tables_prefix):
+                self.__append_folds(
+                    table_name=name,
+                    folds_table_name=derived_table_name,
+                    last_row_id=last_row_id,
+                )
+
+        self.__connection.commit()
+        return appended_instances_number
+
+    def optimize_structure(
+            self,
+            name,
+            class_attribute,
+            cluster=False,
+    ):
+        # The class attribute is indexed in the table storing it, a column group if the dataset is a view.
+        if self.__is_view(name):
+            tables_names = [
+                self.__get_column_group_table_name(name, x)
+                for x in range(self.__get_dataset_options(name)['column_groups_number'] + 1)
+            ]
+        else:
+            tables_names = [name]
+        class_tables_names = [x for x in tables_names if class_attribute in self.__get_columns_names(x)]
+        if not class_tables_names:
+            self.__connection.rollback()
+            raise ValueError('The class attribute is not a column of the dataset.')
+        class_table_name = class_tables_names[0]
+
+        # Indexes the class attribute with the row ids, so that every partition is read in the order of the ingestion.
+        durations = collections.OrderedDict()
+        start_time = time.monotonic()
+        self.__cursor.execute(SELECT_CLASS_INDEX_STATEMENT, (class_table_name, class_attribute))
+        index = self.__cursor.fetchone()
+        if index is None:
+            self.__cursor.execute(
+                CREATE_CLASS_INDEX_STATEMENT.format(
+                    table_name_=class_table_name,
+                    class_attribute_=class_attribute,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                )
+            )
+            self.__cursor.execute(SELECT_CLASS_INDEX_STATEMENT, (class_table_name, class_attribute))
+            index = self.__cursor.fetchone()
         self.__connection.commit()
+        durations['index'] = time.monotonic() - start_time
+
+        # The vacuum, and the clustering of the partitioned tables, cannot run in a transaction.
+        self.__connection.autocommit = True
+        try:
+            # Stores the instances of every class contiguously, keeping the order of their row ids.
+            if cluster:
+                start_time = time.monotonic()
+                self.__cursor.execute(
+                    CLUSTER_TABLE_STATEMENT.format(
+                        table_name_=class_table_name,
+                        index_name_=index[0],
+                    )
+                )
+                durations['cluster'] = time.monotonic() - start_time
+
+            for step, statement in [('analyze', ANALYZE_TABLE_STATEMENT), ('vacuum', VACUUM_TABLE_STATEMENT)]:
+                start_time = time.monotonic()
+                for table_name in tables_names:
+                    self.__cursor.execute(statement.format(table_name_=table_name))
+                durations[step] = time.monotonic() - start_time
+        finally:
+            self.__connection.autocommit = False
+        return durations
+
+    def get_structure_attributes(
+            self,
+            name,
+    ):
+        dataset_options = self.__get_dataset_options(name)
+        encoded_attributes = dataset_options['encoded_attributes']
+        self.__cursor.execute(COLUMNS_TYPES_STATEMENT.format(table_name_=name.lower().replace('\'', '\'\'')))
+        attributes = [
+            {
+                'name': column_name,
+                'type': 'text' if column_name in encoded_attributes else COLUMN_DATA_TYPES[data_type],
+            }
+            for column_name, data_type in self.__cursor.fetchall()
+            if column_name not in (ROW_ID_COLUMN_NAME, ARRAY_COLUMN_NAME, INDICES_COLUMN_NAME)
+        ]
+
+        # The features of the sparse datasets are named by their indices, starting from 1.
+        if dataset_options['sparse']:
+            attributes += [
+                {'name': str(x), 'type': 'real'} for x in range(1, dataset_options['features_number'] + 1)
+            ]
+
+        # The array attributes are stored as floating point numbers, in the file order with the columns.
+        if dataset_options['array_attributes']:
+            columns_attributes = {x['name']: x for x in attributes}
+            attributes = [
+                columns_attributes.get(x, {'name': x, 'type': 'real'})
+                for x in dataset_options['attributes_names']
+            ]
+        return attributes
 
     def get_training_split(
             self,
@@ -144,22 +1079,33 @@ class PostgreSQLDataDriver(DataDriver):
             output_csv,
             include_header,
             class_only,
+            split_mode=DataDriver.SplitMode.random,
+            strata_number=None,
+            normalization=DataDriver.Normalization.none,
     ):
-        return self._get_split(
-            split_type=DataDriver.SplitType.training,
-            dataset_name=dataset_name,
-            training_rate=training_rate,
-            fusion_rate=0,
-            training_sample_rate=0,
-            training_sample_number=0,
-            class_attribute=class_attribute,
-            include_attributes=include_attributes,
-            exclude_attributes=exclude_attributes,
-            attributes_rate=attributes_rate,
-            random_seed=random_seed,
+        return self.__read_from_replica(
+            is_replicable=self.__is_split_replicable(split_mode, normalization),
             output_csv=output_csv,
-            include_header=include_header,
-            class_only=False,
+            read=functools.partial(
+                self._get_split,
+                split_type=DataDriver.SplitType.training,
+                dataset_name=dataset_name,
+                training_rate=training_rate,
+                fusion_rate=0,
+                training_sample_rate=0,
+                training_sample_number=0,
+                class_attribute=class_attribute,
+                include_attributes=include_attributes,
+                exclude_attributes=exclude_attributes,
+                attributes_rate=attributes_rate,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=include_header,
+                class_only=False,
+                split_mode=split_mode,
+                strata_number=strata_number,
+                normalization=normalization,
+            ),
         )
 
     def get_fusion_split(
@@ -175,22 +1121,33 @@ class PostgreSQLDataDriver(DataDriver):
             output_csv,
             include_header,
             class_only,
+            split_mode=DataDriver.SplitMode.random,
+            strata_number=None,
+            normalization=DataDriver.Normalization.none,
     ):
-        return self._get_split(
-            split_type=DataDriver.SplitType.fusion,
-            dataset_name=dataset_name,
-            training_rate=training_rate,
-            fusion_rate=fusion_rate,
-            training_sample_rate=0,
-            training_sample_number=0,
-            class_attribute=class_attribute,
-            include_attributes=include_attributes,
-            exclude_attributes=exclude_attributes,
-            attributes_rate=attributes_rate,
-            random_seed=random_seed,
+        return self.__read_from_replica(
+            is_replicable=self.__is_split_replicable(split_mode, normalization),
             output_csv=output_csv,
-            include_header=include_header,
-            class_only=class_only,
+            read=functools.partial(
+                self._get_split,
+                split_type=DataDriver.SplitType.fusion,
+                dataset_name=dataset_name,
+                training_rate=training_rate,
+                fusion_rate=fusion_rate,
+                training_sample_rate=0,
+                training_sample_number=0,
+                class_attribute=class_attribute,
+                include_attributes=include_attributes,
+                exclude_attributes=exclude_attributes,
+                attributes_rate=attributes_rate,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=include_header,
+                class_only=class_only,
+                split_mode=split_mode,
+                strata_number=strata_number,
+                normalization=normalization,
+            ),
         )
 
     def get_test_split(
@@ -206,30 +1163,219 @@ class PostgreSQLDataDriver(DataDriver):
             output_csv,
             include_header,
             class_only,
+            split_mode=DataDriver.SplitMode.random,
+            strata_number=None,
+            normalization=DataDriver.Normalization.none,
     ):
-        return self._get_split(
-            split_type=DataDriver.SplitType.test,
-            dataset_name=dataset_name,
-            training_rate=training_rate,
-            fusion_rate=fusion_rate,
-            training_sample_rate=0,
-            training_sample_number=0,
+        return self.__read_from_replica(
+            is_replicable=self.__is_split_replicable(split_mode, normalization),
+            output_csv=output_csv,
+            read=functools.partial(
+                self._get_split,
+                split_type=DataDriver.SplitType.test,
+                dataset_name=dataset_name,
+                training_rate=training_rate,
+                fusion_rate=fusion_rate,
+                training_sample_rate=0,
+                training_sample_number=0,
+                class_attribute=class_attribute,
+                include_attributes=include_attributes,
+                exclude_attributes=exclude_attributes,
+                attributes_rate=attributes_rate,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=include_header,
+                class_only=class_only,
+                split_mode=split_mode,
+                strata_number=strata_number,
+                normalization=normalization,
+            ),
+        )
+
+    def get_training_sample(
+            self,
+            dataset_name,
+            training_rate,
+            sample_rate,
+            sample_number,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            split_mode=DataDriver.SplitMode.random,
+            strata_number=None,
+            balancing_strategy=DataDriver.BalancingStrategy.none,
+            balancing_size=None,
+            balancing_ratio=None,
+            normalization=DataDriver.Normalization.none,
+    ):
+        return self.__read_from_replica(
+            is_replicable=self.__is_split_replicable(split_mode, normalization),
+            output_csv=output_csv,
+            read=functools.partial(
+                self._get_split,
+                split_type=DataDriver.SplitType.training_sample,
+                dataset_name=dataset_name,
+                training_rate=training_rate,
+                fusion_rate=0,
+                training_sample_rate=sample_rate,
+                training_sample_number=sample_number,
+                class_attribute=class_attribute,
+                include_attributes=include_attributes,
+                exclude_attributes=exclude_attributes,
+                attributes_rate=attributes_rate,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=include_header,
+                class_only=class_only,
+                split_mode=split_mode,
+                strata_number=strata_number,
+                balancing_strategy=balancing_strategy,
+                balancing_size=balancing_size,
+                balancing_ratio=balancing_ratio,
+                normalization=normalization,
+            ),
+        )
+
+    def get_training_bootstrap(
+            self,
+            dataset_name,
+            training_rate,
+            sample_size,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            include_weights=False,
+    ):
+        return self.__read_from_replica(
+            is_replicable=True,
+            output_csv=output_csv,
+            read=functools.partial(
+                self._get_bootstrap,
+                dataset_name=dataset_name,
+                training_rate=training_rate,
+                sample_size=sample_size,
+                class_attribute=class_attribute,
+                include_attributes=include_attributes,
+                exclude_attributes=exclude_attributes,
+                attributes_rate=attributes_rate,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=include_header,
+                class_only=class_only,
+                include_weights=include_weights,
+            ),
+        )
+
+    def get_training_weighted_sample(
+            self,
+            dataset_name,
+            training_rate,
+            sample_size,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            weight_attribute=None,
+            input_weights_csv=None,
+    ):
+        if weight_attribute is None and input_weights_csv is None:
+            raise ValueError('The weights require a weight attribute or a weights file.')
+
+        # Generates the random list of attributes.
+        attributes_sample = self.__get_attributes_sample(
+            table_name=dataset_name,
             class_attribute=class_attribute,
             include_attributes=include_attributes,
             exclude_attributes=exclude_attributes,
             attributes_rate=attributes_rate,
             random_seed=random_seed,
+        )
+
+        # The LIBSVM lines of the sparse datasets have no header.
+        include_header = include_header and not self.__get_dataset_options(dataset_name)['sparse']
+
+        # Collects the row ids of the training split.
+        self.__create_split_instances_table(
+            table_name=dataset_name,
+            split_type=DataDriver.SplitType.training,
+            training_rate=training_rate,
+            fusion_rate=0,
+            training_sample_rate=0,
+            training_sample_number=0,
+            class_attribute=class_attribute,
+            random_seed=random_seed,
+        )
+
+        # Loads the uploaded weights, if the weights are not stored in the dataset.
+        if weight_attribute is None:
+            self.__cursor.execute(
+                CREATE_WEIGHTS_TABLE_STATEMENT.format(
+                    weights_table_name_=WEIGHTS_TABLE_NAME,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                    weight_=INSTANCE_WEIGHT_COLUMN_NAME,
+                )
+            )
+            self.__cursor.copy_expert(
+                COPY_WEIGHTS_STATEMENT.format(weights_table_name_=WEIGHTS_TABLE_NAME),
+                file=input_weights_csv,
+            )
+            weights_join = WEIGHTS_JOIN_PATTERN.format(
+                weights_table_name_=WEIGHTS_TABLE_NAME,
+                row_id_=ROW_ID_COLUMN_NAME,
+            )
+            weight = WEIGHTS_TABLE_NAME + '."' + INSTANCE_WEIGHT_COLUMN_NAME + '"'
+        else:
+            weights_join = ''
+            weight = dataset_name + '."' + weight_attribute + '"'
+
+        # Keeps the instances with the smallest exponential keys -ln(u) / w, in a single pass with a bounded heap.
+        statement = SELECT_WEIGHTED_SAMPLE_STATEMENT.format(
+            attributes_=self.__compose_attributes_selection(
+                table_name=dataset_name,
+                attributes_sample=attributes_sample,
+                class_attribute=class_attribute,
+                class_only=class_only,
+            ),
+            table_name_=dataset_name,
+            split_instances_table_name_=SPLIT_INSTANCES_TABLE_NAME,
+            row_id_=ROW_ID_COLUMN_NAME,
+            weights_join_=weights_join,
+            weight_=weight,
+            hash_=self.__compose_hash_expression(random_seed),
+            hash_range_=utils.HASH_RANGE,
+            limit_=sample_size,
+        )
+        achieved_size = self.__copy_statement_to_csv(
+            table_name=dataset_name,
+            statement=statement,
+            random_seed=random_seed,
             output_csv=output_csv,
             include_header=include_header,
-            class_only=class_only,
         )
+        return {
+            'requested_size': sample_size,
+            'achieved_size': achieved_size,
+        }
 
-    def get_training_sample(
+    def get_fold_training_split(
             self,
             dataset_name,
-            training_rate,
-            sample_rate,
-            sample_number,
+            folds_number,
+            fold_number,
             class_attribute,
             include_attributes,
             exclude_attributes,
@@ -239,13 +1385,11 @@ class PostgreSQLDataDriver(DataDriver):
             include_header,
             class_only,
     ):
-        return self._get_split(
-            split_type=DataDriver.SplitType.training_sample,
+        return self._get_fold_split(
             dataset_name=dataset_name,
-            training_rate=training_rate,
-            fusion_rate=0,
-            training_sample_rate=sample_rate,
-            training_sample_number=sample_number,
+            folds_number=folds_number,
+            fold_number=fold_number,
+            validation=False,
             class_attribute=class_attribute,
             include_attributes=include_attributes,
             exclude_attributes=exclude_attributes,
@@ -256,14 +1400,11 @@ class PostgreSQLDataDriver(DataDriver):
             class_only=class_only,
         )
 
-    def _get_split(
+    def get_fold_validation_split(
             self,
-            split_type,
             dataset_name,
-            training_rate,
-            fusion_rate,
-            training_sample_rate,
-            training_sample_number,
+            folds_number,
+            fold_number,
             class_attribute,
             include_attributes,
             exclude_attributes,
@@ -273,132 +1414,2381 @@ class PostgreSQLDataDriver(DataDriver):
             include_header,
             class_only,
     ):
-        """
-        Outputs the required split to a CSV output file.
-
-        :param split_type: the split type
-        :type split_type: DataDriver.SplitType
-
-        :param dataset_name: the name of the dataset
-        :type dataset_name: str
-
-        :param training_rate: the percentage of the dataset to consider as training split
-        :type training_rate: float
-
-        :param fusion_rate: the percentage of the dataset to consider as fusion split
-        :type fusion_rate: float
+        return self._get_fold_split(
+            dataset_name=dataset_name,
+            folds_number=folds_number,
+            fold_number=fold_number,
+            validation=True,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            output_csv=output_csv,
+            include_header=include_header,
+            class_only=class_only,
+        )
 
-        :param class_attribute: the name of the class attribute
-        :type class_attribute: str
+    def get_statistics(
+            self,
+            dataset_name,
+            class_attribute=None,
+            quantiles=False,
+    ):
+        if not self.__table_exists(dataset_name):
+            return None
 
-        :param include_attributes: the list of the attributes to include, None otherwise
-        :type include_attributes: list[str]
+        class_attributes = [NO_CLASS_ATTRIBUTE] + ([class_attribute] if class_attribute else [])
+        statistics_rows = self.__get_stored_statistics(dataset_name, class_attributes)
 
-        :param exclude_attributes: the list of the attributes to exclude, None otherwise
-        :type exclude_attributes: list[str]
+        # Computes the missing statistics, serialized with the appends.
+        if self.__are_statistics_incomplete(statistics_rows, quantiles):
+            self.__cursor.execute(
+                LOCK_TABLE_STATEMENT.format(table_name_=dataset_name, mode_='SHARE ROW EXCLUSIVE')
+            )
+            if not self.__table_exists(self.__get_statistics_table_name(dataset_name)):
+                self.__update_statistics(dataset_name, 0)
+            statistics_rows = self.__get_stored_statistics(dataset_name, class_attributes)
+            for x in class_attributes:
+                if not statistics_rows[x]:
+                    self.__store_statistics(dataset_name, x, 0)
+                if quantiles:
+                    self.__store_quantiles(dataset_name, x)
+            statistics_rows = self.__get_stored_statistics(dataset_name, class_attributes)
+        self.__connection.commit()
 
-        :param attributes_rate: the percentage of attributes to include
-        :type attributes_rate: float
+        statistics = {}
+        if quantiles:
+            statistics['quantiles_fractions'] = QUANTILES_FRACTIONS
+        for x in class_attributes:
+            groups = collections.OrderedDict()
+            for class_value, attribute_name, values_number, nulls_number, minimum, maximum, mean, variance, \
+                    attribute_quantiles in statistics_rows[x]:
+                group = groups.setdefault(class_value, {'instances_number': 0, 'attributes': {}})
+                group['instances_number'] = values_number + nulls_number
+                group['attributes'][attribute_name] = {
+                    'values_number': values_number,
+                    'nulls_number': nulls_number,
+                    'minimum': minimum,
+                    'maximum': maximum,
+                    'mean': mean,
+                    'variance': variance,
+                }
+                if quantiles:
+                    group['attributes'][attribute_name]['quantiles'] = attribute_quantiles
 
-        :param random_seed: the random seed
-        :type random_seed: int
+            if x == NO_CLASS_ATTRIBUTE:
+                statistics.update(groups[None])
+            else:
+                statistics['classes'] = [dict(class_value=k, **v) for k, v in groups.items()]
+        return statistics
 
-        :param output_csv: the output file as an opened stream
-        :type output_csv: file
+    def create_upload(
+            self,
+            name,
+            attributes,
+            delimiter,
+            header,
+    ):
+        self.__check_table_name(name)
+        self.__create_uploads_tables()
 
-        :param include_header: if True, it includes the header in the output CSV
-        :type include_header: bool
+        # Creates the staging structure, published as the dataset once complete, and locked until it is registered.
+        upload_id = uuid.uuid4().hex
+        staging_table_name = UPLOAD_STAGING_TABLE_PREFIX + upload_id
+        self.__cursor.execute(LOCK_STAGING_STRUCTURE_STATEMENT, (staging_table_name,))
+        try:
+            self.create_structure(
+                name=staging_table_name,
+                attributes=attributes,
+            )
 
-        :param class_only: specifies if returning the class column only
-        :type class_only: bool
-        """
-        # Prepares the random generator.
-        random_generator = random.Random(random_seed)
+            self.__cursor.execute(
+                INSERT_UPLOAD_STATEMENT.format(uploads_table_name_=UPLOADS_TABLE_NAME),
+                (upload_id, name, staging_table_name, json.dumps(attributes), delimiter, header),
+            )
+            self.__connection.commit()
+        finally:
+            self.__unlock_staging_structure(staging_table_name)
+        return upload_id
 
-        # Retrieves the attributes names except for the class attribute.
-        attributes_names = self.__get_attributes_names(dataset_name, class_attribute)
+    def upload_chunk(
+            self,
+            upload_id,
+            chunk_number,
+            checksum,
+            input_csv,
+    ):
+        # Prevents the upload from being finalized meanwhile.
+        _, staging_table_name, _, delimiter, header = self.__get_upload(upload_id, ' FOR SHARE')
 
-        # Filters the attributes.
-        attributes_names = self.__filter_attributes(attributes_names, include_attributes, exclude_attributes)
+        # Serializes the uploads of the same chunk, so that a retried chunk replaces the previous attempt.
+        self.__cursor.execute(LOCK_UPLOAD_CHUNK_STATEMENT, (upload_id, chunk_number))
+        self.__cursor.execute(
+            SELECT_UPLOAD_CHUNK_STATEMENT.format(chunks_table_name_=UPLOAD_CHUNKS_TABLE_NAME),
+            (upload_id, chunk_number),
+        )
+        chunk = self.__cursor.fetchone()
+        if chunk is not None:
+            if chunk[0] == checksum:
+                self.__connection.commit()
+                return chunk[1]
+            self.__cursor.execute(
+                DELETE_ROW_IDS_RANGE_STATEMENT.format(
+                    table_name_=staging_table_name,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                    first_row_id_=chunk_number * CHUNK_ROW_IDS_NUMBER,
+                    last_row_id_=(chunk_number + 1) * CHUNK_ROW_IDS_NUMBER,
+                )
+            )
 
-        # Generates the random list of attributes.
-        attributes_sample_size = int(len(attributes_names) * attributes_rate)
-        attributes_sample = utils.random_ordered_sample(
-            random_generator,
-            attributes_names,
-            attributes_sample_size,
+        # The row ids of every chunk start after the ones reserved to the previous chunks.
+        instances_number = self.__copy_csv_to_table(
+            table_name=staging_table_name,
+            delimiter=delimiter,
+            header=header and chunk_number == 0,
+            input_csv=input_csv,
+            row_id_offset=chunk_number * CHUNK_ROW_IDS_NUMBER,
         )
+        self.__cursor.execute(
+            UPSERT_UPLOAD_CHUNK_STATEMENT.format(chunks_table_name_=UPLOAD_CHUNKS_TABLE_NAME),
+            (upload_id, chunk_number, checksum, instances_number),
+        )
+        self.__connection.commit()
+        return instances_number
 
-        # Retrieves the possible class attribute values.
-        class_attribute_values = self.__get_class_attribute_values(dataset_name, class_attribute)
+    def get_upload(
+            self,
+            upload_id,
+    ):
+        name, _, attributes, delimiter, header = self.__get_upload(upload_id, '')
+        self.__cursor.execute(
+            SELECT_UPLOAD_CHUNKS_STATEMENT.format(chunks_table_name_=UPLOAD_CHUNKS_TABLE_NAME),
+            (upload_id,),
+        )
+        chunks = [
+            {
+                'chunk_number': chunk_number,
+                'checksum': checksum,
+                'instances_number': instances_number,
+            }
+            for chunk_number, checksum, instances_number in self.__cursor.fetchall()
+        ]
+        self.__connection.commit()
+        return {
+            'name': name,
+            'attributes': json.loads(attributes),
+            'delimiter': delimiter,
+            'header': header,
+            'chunks': chunks,
+        }
 
-        # For each class attribute value samples the data.
-        is_first_partition = True
-        for class_attribute_value in class_attribute_values:
-            # Counts the number of instances for the current partition.
-            current_partition_size = self.__get_partition_size(dataset_name, class_attribute, class_attribute_value)
-
-            # Computes all the split sizes.
-            current_partition_training_split_size = int(current_partition_size * training_rate)
-            current_partition_fusion_split_size = int(current_partition_size * fusion_rate)
-            current_partition_test_split_size =\
-                current_partition_size - current_partition_training_split_size - current_partition_fusion_split_size
-
-            # Discriminates according to the split type.
-            current_partition_split_size = None
-            current_partition_split_offset = None
-            if split_type == DataDriver.SplitType.training:
-                current_partition_split_size = current_partition_training_split_size
-                current_partition_split_offset = 0
-            elif split_type == DataDriver.SplitType.fusion:
-                current_partition_split_size = current_partition_fusion_split_size
-                current_partition_split_offset = current_partition_training_split_size
-            elif split_type == DataDriver.SplitType.test:
-                current_partition_split_size = current_partition_test_split_size
-                current_partition_split_offset =\
-                    current_partition_training_split_size + current_partition_fusion_split_size
-            elif split_type == DataDriver.SplitType.training_sample:
-                current_partition_split_size = int(current_partition_training_split_size * training_sample_rate)
-                current_partition_split_offset = current_partition_split_size * training_sample_number
+    def finalize_upload(
+            self,
+            upload_id,
+            chunks_number,
+    ):
+        # Waits for the chunks being uploaded.
+        name, staging_table_name, _, _, _ = self.__get_upload(upload_id, ' FOR UPDATE')
+        self.__cursor.execute(
+            SELECT_UPLOAD_CHUNKS_STATEMENT.format(chunks_table_name_=UPLOAD_CHUNKS_TABLE_NAME),
+            (upload_id,),
+        )
+        chunks = self.__cursor.fetchall()
+        missing_chunks_numbers = sorted(set(range(chunks_number)) - {x[0] for x in chunks})
+        if missing_chunks_numbers or len(chunks) != chunks_number:
+            self.__connection.rollback()
+            raise ValueError('Missing or unexpected chunks, missing: {}.'.format(missing_chunks_numbers))
 
-            # Copies the instances to the output CSV.
-            self.__copy_instances_to_csv(
-                table_name=dataset_name,
-                attributes_sample=attributes_sample,
-                class_attribute=class_attribute,
-                class_attribute_value=class_attribute_value,
-                split_size=current_partition_split_size,
-                offset=current_partition_split_offset,
-                is_first_partition=is_first_partition,
-                random_seed=random_seed,
-                output_csv=output_csv,
-                include_header=include_header,
-                class_only=class_only,
+        # Renumbers the row ids contiguously and stores the instances in their order, as if the chunks were uploaded in
+        # a single file, since the splits depend on both.
+        self.__cursor.execute(
+            RENUMBER_ROW_IDS_STATEMENT.format(
+                table_name_=staging_table_name,
+                row_id_=ROW_ID_COLUMN_NAME,
+                position_=POSITION_COLUMN_NAME,
             )
+        )
+        self.__cursor.execute(
+            NEGATE_ROW_IDS_STATEMENT.format(
+                table_name_=staging_table_name,
+                row_id_=ROW_ID_COLUMN_NAME,
+            )
+        )
+        self.__cursor.execute(
+            CLUSTER_TABLE_STATEMENT.format(
+                table_name_=staging_table_name,
+                index_name_=PRIMARY_KEY_INDEX_NAME_PATTERN.format(table_name_=staging_table_name),
+            )
+        )
 
-            if is_first_partition:
-                is_first_partition = False
-
-    def __get_attributes_names(self, table_name, class_attribute):
-        """
-        Retrieves the list of attributes except for the class attribute.
+        # Replaces the dataset in a single transaction, so that it is always available.
+        self.__update_statistics(staging_table_name, 0)
+        self.__publish_structure(staging_table_name, name)
+        self.__cursor.execute(
+            DELETE_UPLOAD_STATEMENT.format(uploads_table_name_=UPLOADS_TABLE_NAME),
+            (upload_id,),
+        )
+        self.__connection.commit()
+        return sum(x[2] for x in chunks)
 
-        :param table_name: the name of the table
-        :type table_name: str
+    def abort_upload(
+            self,
+            upload_id,
+    ):
+        if not self.__table_exists(UPLOADS_TABLE_NAME):
+            return
 
-        :param class_attribute: the class attribute name
-        :type class_attribute: str
+        self.__cursor.execute(
+            DELETE_UPLOAD_STATEMENT.format(uploads_table_name_=UPLOADS_TABLE_NAME),
+            (upload_id,),
+        )
+        for staging_table_name, in self.__cursor.fetchall():
+            self.__drop_structure(staging_table_name)
+        self.__connection.commit()
 
-        :return: the list of attributes
-        :rtype: list[str]
+    def open_iterator(
+            self,
+            dataset_name,
+            split_type,
+            training_rate,
+            fusion_rate,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            epoch,
+            batch_size,
+            class_only,
+    ):
+        if batch_size <= 0:
+            raise ValueError('The batch size must be positive.')
+
+        # Releases the sessions left idle for too long.
+        self.__create_iterator_sessions_table()
+        self.__delete_expired_iterator_sessions()
+
+        # Generates the random list of attributes.
+        attributes_sample = self.__get_attributes_sample(
+            table_name=dataset_name,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+        )
+
+        # Collects the row ids of the split.
+        self.__create_split_instances_table(
+            table_name=dataset_name,
+            split_type=split_type,
+            training_rate=training_rate,
+            fusion_rate=fusion_rate,
+            training_sample_rate=0,
+            training_sample_number=0,
+            class_attribute=class_attribute,
+            random_seed=random_seed,
+        )
+
+        # Materializes the order of the first epoch, so that the batches are read by position.
+        token = uuid.uuid4().hex
+        iterator_table_name = '"' + self.__get_derived_table_name(dataset_name, 'iterator_' + token) + '"'
+        self.__cursor.execute(
+            CREATE_ITERATOR_TABLE_STATEMENT.format(
+                iterator_table_name_=iterator_table_name,
+                row_id_=ROW_ID_COLUMN_NAME,
+                position_=POSITION_COLUMN_NAME,
+                hash_=self.__compose_hash_expression(utils.keyed_hash(epoch & utils.HASH_MASK, random_seed)),
+                split_instances_table_name_=SPLIT_INSTANCES_TABLE_NAME,
+            )
+        )
+        size = self.__cursor.rowcount
+        self.__cursor.execute(
+            CREATE_ITERATOR_INDEX_STATEMENT.format(
+                iterator_table_name_=iterator_table_name,
+                position_=POSITION_COLUMN_NAME,
+            )
+        )
+
+        # Registers the session.
+        self.__cursor.execute(
+            INSERT_ITERATOR_SESSION_STATEMENT.format(sessions_table_name_=ITERATOR_SESSIONS_TABLE_NAME),
+            (
+                token,
+                dataset_name,
+                iterator_table_name,
+                self.__compose_attributes_selection(
+                    table_name=dataset_name,
+                    attributes_sample=attributes_sample,
+                    class_attribute=class_attribute,
+                    class_only=class_only,
+                ),
+                random_seed,
+                epoch,
+                batch_size,
+                size,
+            ),
+        )
+        self.__connection.commit()
+
+        return {
+            'token': token,
+            'size': size,
+            'batches_number': -(-size // batch_size),
+        }
+
+    def get_iterator_batch(
+            self,
+            token,
+            epoch,
+            batch_number,
+            output_csv,
+            include_header,
+    ):
+        # Retrieves the session, locking it until the batch is copied.
+        session = None
+        if self.__table_exists(ITERATOR_SESSIONS_TABLE_NAME):
+            self.__cursor.execute(
+                TOUCH_ITERATOR_SESSION_STATEMENT.format(sessions_table_name_=ITERATOR_SESSIONS_TABLE_NAME),
+                (token, self.__iterator_idle_timeout),
+            )
+            session = self.__cursor.fetchone()
+        if session is None:
+            self.__connection.rollback()
+            raise KeyError(token)
+        dataset_name, iterator_table_name, attributes, random_seed, session_epoch, batch_size, size = session
+
+        # The LIBSVM lines of the sparse datasets have no header.
+        include_header = include_header and not self.__get_dataset_options(dataset_name)['sparse']
+
+        # Reshuffles the instances at the beginning of a different epoch, reading the batch from the updated primary.
+        is_reshuffled = epoch != session_epoch
+        if is_reshuffled:
+            self.__cursor.execute(
+                SHUFFLE_ITERATOR_TABLE_STATEMENT.format(
+                    iterator_table_name_=iterator_table_name,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                    position_=POSITION_COLUMN_NAME,
+                    hash_=self.__compose_hash_expression(utils.keyed_hash(epoch & utils.HASH_MASK, random_seed)),
+                )
+            )
+            self.__cursor.execute(
+                UPDATE_ITERATOR_SESSION_EPOCH_STATEMENT.format(sessions_table_name_=ITERATOR_SESSIONS_TABLE_NAME),
+                (epoch, token),
+            )
+
+        first_position = batch_number * batch_size
+        last_position = min(first_position + batch_size, size)
+        statement = SELECT_ITERATOR_BATCH_STATEMENT.format(
+            attributes_=attributes,
+            table_name_=dataset_name,
+            iterator_table_name_=iterator_table_name,
+            row_id_=ROW_ID_COLUMN_NAME,
+            position_=POSITION_COLUMN_NAME,
+            first_position_=first_position,
+            last_position_=last_position,
+        )
+        achieved_size = self.__read_from_replica(
+            is_replicable=not is_reshuffled,
+            output_csv=output_csv,
+            read=functools.partial(
+                self.__copy_statement_to_csv,
+                table_name=dataset_name,
+                statement=statement,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=include_header,
+            ),
+        )
+        self.__connection.commit()
+
+        return {
+            'requested_size': max(last_position - first_position, 0),
+            'achieved_size': achieved_size,
+        }
+
+    def close_iterator(
+            self,
+            token,
+    ):
+        if not self.__table_exists(ITERATOR_SESSIONS_TABLE_NAME):
+            return
+
+        self.__cursor.execute(
+            DELETE_ITERATOR_SESSION_STATEMENT.format(sessions_table_name_=ITERATOR_SESSIONS_TABLE_NAME),
+            (token,),
+        )
+        for iterator_table_name, in self.__cursor.fetchall():
+            self.__cursor.execute(DROP_TABLE_STATEMENT.format(table_name_=iterator_table_name))
+        self.__connection.commit()
+
+    def _get_split(
+            self,
+            split_type,
+            dataset_name,
+            training_rate,
+            fusion_rate,
+            training_sample_rate,
+            training_sample_number,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            split_mode=DataDriver.SplitMode.random,
+            strata_number=None,
+            balancing_strategy=DataDriver.BalancingStrategy.none,
+            balancing_size=None,
+            balancing_ratio=None,
+            normalization=DataDriver.Normalization.none,
+    ):
+        """
+        Outputs the required split to a CSV output file.
+
+        In the random mode, every partition is shuffled with ORDER BY RANDOM() and the split is cut by LIMIT and OFFSET,
+        so the split sizes are exact. In the hash mode, every partition is ranked by a keyed hash of the row ids and of
+        the random seed and cut at the same sizes, in a single query: the assignment does not depend on the database
+        scan order or version. In the bernoulli
+        and system modes, every partition is sampled by TABLESAMPLE ... REPEATABLE, whose samples are nested for
+        increasing percentages, so the splits are disjoint and approximate but cost as much as the sampled pages. The
+        datasets stored in column groups read only the groups of the selected attributes, but cannot be sampled by
+        TABLESAMPLE.
+
+        :param split_type: the split type
+        :type split_type: DataDriver.SplitType
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param fusion_rate: the percentage of the dataset to consider as fusion split
+        :type fusion_rate: float
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param include_attributes: the list of the attributes to include, None otherwise
+        :type include_attributes: list[str]
+
+        :param exclude_attributes: the list of the attributes to exclude, None otherwise
+        :type exclude_attributes: list[str]
+
+        :param attributes_rate: the percentage of attributes to include
+        :type attributes_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :param class_only: specifies if returning the class column only
+        :type class_only: bool
+
+        :param split_mode: the way instances are assigned to the splits
+        :type split_mode: DataDriver.SplitMode
+
+        :param strata_number: if not None, the number of quantile buckets of the class attribute to stratify by
+        :type strata_number: int
+
+        :param balancing_strategy: the way the split sizes are balanced among the partitions
+        :type balancing_strategy: DataDriver.BalancingStrategy
+
+        :param balancing_size: the maximum split size of a partition, for the cap strategy
+        :type balancing_size: int
+
+        :param balancing_ratio: the maximum ratio between the split sizes of a partition and of the smallest one, for the
+        ratio strategy
+        :type balancing_ratio: float
+
+        :param normalization: the scaling of the numeric attributes, fitted on the training split of the same seed
+        :type normalization: DataDriver.Normalization
+
+        :return: the requested split size, None if unknown, and the achieved one
+        :rtype: dict[str, int]
+        """
+        # Generates the random list of attributes.
+        attributes_sample = self.__get_attributes_sample(
+            table_name=dataset_name,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+        )
+
+        # The LIBSVM lines of the sparse datasets have no header.
+        include_header = include_header and not self.__get_dataset_options(dataset_name)['sparse']
+
+        # The balancing needs the exact split sizes.
+        if balancing_strategy != DataDriver.BalancingStrategy.none and split_mode != DataDriver.SplitMode.random:
+            raise ValueError('The class balancing requires the random split mode.')
+        if balancing_strategy == DataDriver.BalancingStrategy.cap and (balancing_size is None or balancing_size < 0):
+            raise ValueError('The cap balancing requires a non-negative balancing size.')
+        if balancing_strategy == DataDriver.BalancingStrategy.ratio and (balancing_ratio is None or balancing_ratio < 1):
+            raise ValueError('The ratio balancing requires a balancing ratio of at least 1.')
+
+        # The column groups are joined by a view, which TABLESAMPLE cannot sample.
+        if (
+            split_mode in (DataDriver.SplitMode.bernoulli, DataDriver.SplitMode.system)
+            and self.__get_dataset_options(dataset_name)['column_groups_number']
+        ):
+            raise ValueError('The bernoulli and system split modes are not available with the column groups.')
+
+        # Fits the normalization on the training split, selected as the returned one.
+        normalization_parameters = None
+        if normalization != DataDriver.Normalization.none and not class_only:
+            if strata_number is not None or split_mode not in (DataDriver.SplitMode.random, DataDriver.SplitMode.hash):
+                raise ValueError('The normalization requires the random or hash split mode without strata.')
+            dataset_options = self.__get_dataset_options(dataset_name)
+            if dataset_options['array_attributes'] or dataset_options['sparse']:
+                raise ValueError('The normalization is not available with the array or sparse attributes.')
+
+            normalization_parameters = self.__fit_normalization(
+                table_name=dataset_name,
+                attributes_sample=attributes_sample,
+                class_attribute=class_attribute,
+                normalization=normalization,
+                split_mode=split_mode,
+                training_rate=training_rate,
+                random_seed=random_seed,
+            )
+
+        # In the stratified mode, selects the instances of all the quantile buckets at once.
+        if strata_number is not None:
+            if split_mode != DataDriver.SplitMode.random or balancing_strategy != DataDriver.BalancingStrategy.none:
+                raise ValueError('The quantile stratification requires the random split mode without balancing.')
+
+            split_size_expression, split_offset_expression = self.__compose_split_size_and_offset_expressions(
+                split_type=split_type,
+                partition_size_expression='"' + STRATUM_SIZE_COLUMN_NAME + '"',
+                training_rate=training_rate,
+                fusion_rate=fusion_rate,
+                training_sample_rate=training_sample_rate,
+                training_sample_number=training_sample_number,
+            )
+            statement = SELECT_STRATIFIED_SAMPLE_STATEMENT.format(
+                attributes_=self.__compose_attributes_selection(
+                    table_name=dataset_name,
+                    attributes_sample=attributes_sample,
+                    class_attribute=class_attribute,
+                    class_only=class_only,
+                ),
+                table_name_=dataset_name,
+                class_attribute_=class_attribute,
+                row_id_=ROW_ID_COLUMN_NAME,
+                strata_number_=strata_number,
+                stratum_=STRATUM_COLUMN_NAME,
+                stratum_size_=STRATUM_SIZE_COLUMN_NAME,
+                position_=POSITION_COLUMN_NAME,
+                size_=split_size_expression,
+                offset_=split_offset_expression,
+            )
+            achieved_size = self.__copy_statement_to_csv(
+                table_name=dataset_name,
+                statement=statement,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=include_header,
+            )
+
+            # The quantile buckets differ in size by one instance at most.
+            self.__cursor.execute(COUNT_ALL_STATEMENT.format(table_name_=dataset_name))
+            bucket_size, larger_buckets_number = divmod(self.__cursor.fetchone()[0], strata_number)
+            requested_size = 0
+            for stratum_size, strata_count in [
+                (bucket_size + 1, larger_buckets_number),
+                (bucket_size, strata_number - larger_buckets_number),
+            ]:
+                stratum_split_size, _ = self.__get_split_size_and_offset(
+                    split_type=split_type,
+                    partition_size=stratum_size,
+                    training_rate=training_rate,
+                    fusion_rate=fusion_rate,
+                    training_sample_rate=training_sample_rate,
+                    training_sample_number=training_sample_number,
+                )
+                requested_size += stratum_split_size * strata_count
+            return {
+                'requested_size': requested_size,
+                'achieved_size': achieved_size,
+            }
+
+        # In the hash mode, selects the instances of all the partitions at once.
+        if split_mode == DataDriver.SplitMode.hash:
+            ranked_instances, condition = self.__compose_hash_split_selection(
+                table_name=dataset_name,
+                split_type=split_type,
+                training_rate=training_rate,
+                fusion_rate=fusion_rate,
+                training_sample_rate=training_sample_rate,
+                training_sample_number=training_sample_number,
+                class_attribute=class_attribute,
+                random_seed=random_seed,
+            )
+            statement = SELECT_HASH_SAMPLE_STATEMENT.format(
+                attributes_=self.__compose_attributes_selection(
+                    table_name=dataset_name,
+                    attributes_sample=attributes_sample,
+                    class_attribute=class_attribute,
+                    class_only=class_only,
+                    normalization_parameters=normalization_parameters,
+                ),
+                ranked_instances_=ranked_instances,
+                condition_=condition,
+                class_attribute_=class_attribute,
+                position_=POSITION_COLUMN_NAME,
+            )
+            achieved_size = self.__copy_statement_to_csv(
+                table_name=dataset_name,
+                statement=statement,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=include_header,
+            )
+            requested_size = 0
+            for partition_size in self.__get_partitions_sizes(dataset_name, class_attribute).values():
+                partition_split_size, _ = self.__get_split_size_and_offset(
+                    split_type=split_type,
+                    partition_size=partition_size,
+                    training_rate=training_rate,
+                    fusion_rate=fusion_rate,
+                    training_sample_rate=training_sample_rate,
+                    training_sample_number=training_sample_number,
+                )
+                requested_size += partition_split_size
+            return {
+                'requested_size': requested_size,
+                'achieved_size': achieved_size,
+            }
+
+        # Retrieves the possible class attribute values, with the partition sizes if counted at once.
+        if split_mode == DataDriver.SplitMode.random:
+            class_attribute_values = self.__get_class_attribute_values(dataset_name, class_attribute)
+            partitions_sizes = None
+        else:
+            partitions_sizes = self.__get_partitions_sizes(dataset_name, class_attribute)
+            class_attribute_values = list(partitions_sizes)
+
+        # For each class attribute value computes the split size and offset.
+        partitions_splits = []
+        for class_attribute_value in class_attribute_values:
+            # Counts the number of instances for the current partition.
+            if partitions_sizes is None:
+                current_partition_size = self.__get_partition_size(dataset_name, class_attribute, class_attribute_value)
+            else:
+                current_partition_size = partitions_sizes[class_attribute_value]
+
+            current_partition_split_size, current_partition_split_offset = self.__get_split_size_and_offset(
+                split_type=split_type,
+                partition_size=current_partition_size,
+                training_rate=training_rate,
+                fusion_rate=fusion_rate,
+                training_sample_rate=training_sample_rate,
+                training_sample_number=training_sample_number,
+            )
+            partitions_splits.append(
+                (class_attribute_value, current_partition_split_size, current_partition_split_offset)
+            )
+
+        # Balances the split sizes among the partitions.
+        balanced_split_sizes = self.__balance_split_sizes(
+            split_sizes=[split_size for _, split_size, _ in partitions_splits],
+            balancing_strategy=balancing_strategy,
+            balancing_size=balancing_size,
+            balancing_ratio=balancing_ratio,
+        )
+
+        # For each class attribute value samples the data.
+        split_sizes = {
+            'requested_size': 0,
+            'achieved_size': 0,
+        }
+        is_first_partition = True
+        for (
+                class_attribute_value,
+                current_partition_split_size,
+                current_partition_split_offset,
+        ), current_partition_balanced_split_size in zip(partitions_splits, balanced_split_sizes):
+            # Copies the instances to the output CSV.
+            if split_mode == DataDriver.SplitMode.random:
+                current_partition_achieved_size = self.__copy_instances_to_csv(
+                    table_name=dataset_name,
+                    attributes_sample=attributes_sample,
+                    class_attribute=class_attribute,
+                    class_attribute_value=class_attribute_value,
+                    split_size=current_partition_split_size,
+                    offset=current_partition_split_offset,
+                    balanced_split_size=current_partition_balanced_split_size,
+                    is_first_partition=is_first_partition,
+                    random_seed=random_seed,
+                    output_csv=output_csv,
+                    include_header=include_header,
+                    class_only=class_only,
+                    normalization_parameters=normalization_parameters,
+                )
+            else:
+                lower_rate, upper_rate = self.__get_split_rates(
+                    split_type=split_type,
+                    training_rate=training_rate,
+                    fusion_rate=fusion_rate,
+                    training_sample_rate=training_sample_rate,
+                    training_sample_number=training_sample_number,
+                )
+                current_partition_achieved_size = self.__copy_table_sample_to_csv(
+                    table_name=dataset_name,
+                    attributes_sample=attributes_sample,
+                    class_attribute=class_attribute,
+                    class_attribute_value=class_attribute_value,
+                    sampling_method=split_mode.value.upper(),
+                    lower_rate=lower_rate,
+                    upper_rate=upper_rate,
+                    is_first_partition=is_first_partition,
+                    random_seed=random_seed,
+                    output_csv=output_csv,
+                    include_header=include_header,
+                    class_only=class_only,
+                )
+
+            split_sizes['requested_size'] += current_partition_balanced_split_size
+            split_sizes['achieved_size'] += current_partition_achieved_size
+
+            if is_first_partition:
+                is_first_partition = False
+
+        return split_sizes
+
+    def _get_fold_split(
+            self,
+            dataset_name,
+            folds_number,
+            fold_number,
+            validation,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+    ):
+        """
+        Outputs the training or the validation part of a cross-validation fold to a CSV output file.
+
+        The fold ids are computed once for the class attribute, the number of folds and the random seed, by ordering
+        every partition by the keyed hash of the row ids and dealing the instances round robin, and are stored in a
+        derived table that is clustered and indexed by fold.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param folds_number: the number of folds
+        :type folds_number: int
+
+        :param fold_number: the fold number starting from 0
+        :type fold_number: int
+
+        :param validation: if True, it outputs the validation part of the fold, the training part otherwise
+        :type validation: bool
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param include_attributes: the list of the attributes to include, None otherwise
+        :type include_attributes: list[str]
+
+        :param exclude_attributes: the list of the attributes to exclude, None otherwise
+        :type exclude_attributes: list[str]
+
+        :param attributes_rate: the percentage of attributes to include
+        :type attributes_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :param class_only: specifies if returning the class column only
+        :type class_only: bool
+
+        :return: the requested split size, None if unknown, and the achieved one
+        :rtype: dict[str, int]
+        """
+        # Generates the random list of attributes.
+        attributes_sample = self.__get_attributes_sample(
+            table_name=dataset_name,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+        )
+
+        # The LIBSVM lines of the sparse datasets have no header.
+        include_header = include_header and not self.__get_dataset_options(dataset_name)['sparse']
+
+        # Computes the fold ids, if not already available.
+        folds_table_name = self.__get_folds_table_name(dataset_name, class_attribute, folds_number, random_seed)
+        self.__create_folds_table(
+            table_name=dataset_name,
+            folds_table_name=folds_table_name,
+            class_attribute=class_attribute,
+            folds_number=folds_number,
+            random_seed=random_seed,
+        )
+
+        statement = SELECT_FOLD_STATEMENT.format(
+            attributes_=self.__compose_attributes_selection(
+                table_name=dataset_name,
+                attributes_sample=attributes_sample,
+                class_attribute=class_attribute,
+                class_only=class_only,
+            ),
+            table_name_=dataset_name,
+            folds_table_name_=folds_table_name,
+            row_id_=ROW_ID_COLUMN_NAME,
+            fold_=FOLD_COLUMN_NAME,
+            operator_='=' if validation else '<>',
+            fold_number_=fold_number,
+        )
+        achieved_size = self.__read_from_replica(
+            is_replicable=True,
+            output_csv=output_csv,
+            read=functools.partial(
+                self.__copy_statement_to_csv,
+                table_name=dataset_name,
+                statement=statement,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=include_header,
+            ),
+        )
+        return {
+            'requested_size': None,
+            'achieved_size': achieved_size,
+        }
+
+    def _get_bootstrap(
+            self,
+            dataset_name,
+            training_rate,
+            sample_size,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            include_weights=False,
+    ):
+        """
+        Outputs a sample of the training split drawn with replacement to a CSV output file.
+
+        The sample size is apportioned among the partitions as their training splits, and the positions drawn within
+        every training split, as keyed hashes of the draw numbers computed by the database, are selected in a single
+        pass over it, numbered by row id.
+
+        :param dataset_name: the name of the dataset
+        :type dataset_name: str
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param sample_size: the number of the instances to draw
+        :type sample_size: int
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param include_attributes: the list of the attributes to include, None otherwise
+        :type include_attributes: list[str]
+
+        :param exclude_attributes: the list of the attributes to exclude, None otherwise
+        :type exclude_attributes: list[str]
+
+        :param attributes_rate: the percentage of attributes to include
+        :type attributes_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :param class_only: specifies if returning the class column only
+        :type class_only: bool
+
+        :param include_weights: if True, every drawn instance is output once with its multiplicity as last column,
+        otherwise it is repeated
+        :type include_weights: bool
+
+        :return: the requested sample size and the achieved one
+        :rtype: dict[str, int]
+        """
+        # Generates the random list of attributes.
+        attributes_sample = self.__get_attributes_sample(
+            table_name=dataset_name,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+        )
+
+        # The LIBSVM lines of the sparse datasets have no header.
+        include_header = include_header and not self.__get_dataset_options(dataset_name)['sparse']
+        if include_weights and not class_only and self.__get_dataset_options(dataset_name)['sparse']:
+            raise ValueError('The multiplicities cannot be output with the LIBSVM lines.')
+
+        # Computes the training split sizes and splits the sample size proportionally.
+        partitions_sizes = self.__get_partitions_sizes(dataset_name, class_attribute)
+        class_attribute_values = sorted(partitions_sizes, key=str)
+        training_split_sizes = [
+            int(partitions_sizes[class_attribute_value] * training_rate)
+            for class_attribute_value in class_attribute_values
+        ]
+        partitions_sample_sizes = utils.apportion(sample_size, training_split_sizes)
+
+        split_sizes = {
+            'requested_size': sample_size,
+            'achieved_size': 0,
+        }
+        is_first_partition = True
+        for partition_number, (class_attribute_value, training_split_size, partition_sample_size) in enumerate(zip(
+                class_attribute_values,
+                training_split_sizes,
+                partitions_sample_sizes,
+        )):
+            if partition_sample_size == 0:
+                continue
+
+            # Selects the drawn instances in a single pass over the training split of the partition.
+            attributes = self.__compose_attributes_selection(
+                table_name=dataset_name,
+                attributes_sample=attributes_sample,
+                class_attribute=class_attribute,
+                class_only=class_only,
+            )
+            split_statement = SELECT_SAMPLE_STATEMENT.format(
+                attributes_='*',
+                table_name_=dataset_name,
+                class_attribute_=class_attribute,
+                class_attribute_value_=class_attribute_value,
+                limit_=training_split_size,
+                offset_=0,
+            )
+            if include_weights:
+                weight = BOOTSTRAP_WEIGHT_PATTERN.format(
+                    multiplicity_=MULTIPLICITY_COLUMN_NAME,
+                    weight_=WEIGHT_COLUMN_NAME,
+                )
+                repetition = ''
+            else:
+                weight = ''
+                repetition = BOOTSTRAP_REPETITION_PATTERN.format(multiplicity_=MULTIPLICITY_COLUMN_NAME)
+            # Draws the positions within the training split of the partition, with replacement, keyed by the partition.
+            statement = SELECT_BOOTSTRAP_STATEMENT.format(
+                attributes_=attributes,
+                weight_=weight,
+                row_id_=ROW_ID_COLUMN_NAME,
+                position_=POSITION_COLUMN_NAME,
+                split_statement_=split_statement,
+                hash_=self.__compose_hash_expression(
+                    utils.keyed_hash(partition_number, random_seed),
+                    column_name=DRAW_COLUMN_NAME,
+                ),
+                split_size_=training_split_size,
+                sample_size_=partition_sample_size,
+                draw_=DRAW_COLUMN_NAME,
+                multiplicity_=MULTIPLICITY_COLUMN_NAME,
+                repetition_=repetition,
+            )
+            self.__copy_statement_to_csv(
+                table_name=dataset_name,
+                statement=statement,
+                random_seed=random_seed,
+                output_csv=output_csv,
+                include_header=is_first_partition and include_header,
+            )
+            split_sizes['achieved_size'] += partition_sample_size
+
+            if is_first_partition:
+                is_first_partition = False
+
+        return split_sizes
+
+    def __fit_normalization(
+            self,
+            table_name,
+            attributes_sample,
+            class_attribute,
+            normalization,
+            split_mode,
+            training_rate,
+            random_seed,
+    ):
+        """
+        Computes in a single scan the center and the scale of the numeric attributes over the training split, without
+        committing.
+
+        The constant attributes, and the ones without values, are only centered.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param attributes_sample: the list of the selected attributes
+        :type attributes_sample: list[str]
+
+        :param class_attribute: the name of the class attribute, never normalized
+        :type class_attribute: str
+
+        :param normalization: the normalization
+        :type normalization: DataDriver.Normalization
+
+        :param split_mode: the way instances are assigned to the splits, random or hash
+        :type split_mode: DataDriver.SplitMode
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :return: the center and the scale of every normalized attribute
+        :rtype: dict[str, (float, float)]
+        """
+        attributes_types = {x['name']: x['type'] for x in self.get_structure_attributes(table_name)}
+        attributes_names = [
+            x for x in attributes_sample
+            if x != class_attribute and attributes_types.get(x, 'text') != 'text'
+        ]
+        if not attributes_names:
+            return {}
+
+        # Selects the training split as returned by the split mode.
+        if split_mode == DataDriver.SplitMode.random:
+            self.__create_split_instances_table(
+                table_name=table_name,
+                split_type=DataDriver.SplitType.training,
+                training_rate=training_rate,
+                fusion_rate=0,
+                training_sample_rate=0,
+                training_sample_number=0,
+                class_attribute=class_attribute,
+                random_seed=random_seed,
+            )
+            condition = SPLIT_INSTANCES_JOIN_PATTERN.format(
+                split_instances_table_name_=SPLIT_INSTANCES_TABLE_NAME,
+                row_id_=ROW_ID_COLUMN_NAME,
+            )
+            fitted_table_name = table_name
+        else:
+            fitted_table_name, condition = self.__compose_hash_split_selection(
+                table_name=table_name,
+                split_type=DataDriver.SplitType.training,
+                training_rate=training_rate,
+                fusion_rate=0,
+                training_sample_rate=0,
+                training_sample_number=0,
+                class_attribute=class_attribute,
+                random_seed=random_seed,
+            )
+
+        self.__cursor.execute(
+            FIT_NORMALIZATION_STATEMENT.format(
+                aggregates_=', '.join([
+                    NORMALIZATION_AGGREGATES_PATTERNS[normalization.value].format(column_name_=x)
+                    for x in attributes_names
+                ]),
+                table_name_=fitted_table_name,
+                condition_=condition,
+            )
+        )
+        row = self.__cursor.fetchone()
+
+        normalization_parameters = {}
+        for i, attribute_name in enumerate(attributes_names):
+            center, scale = row[2 * i:2 * i + 2]
+            normalization_parameters[attribute_name] = (center or 0.0, scale or 1.0)
+        return normalization_parameters
+
+    def __create_split_instances_table(
+            self,
+            table_name,
+            split_type,
+            training_rate,
+            fusion_rate,
+            training_sample_rate,
+            training_sample_number,
+            class_attribute,
+            random_seed,
+    ):
+        """
+        Collects the row ids of a random split into a temporary table, dropped at the end of the transaction.
+
+        Every partition is shuffled exactly as in the random split mode, so the table holds the instances of the split
+        returned by _get_split with the same parameters.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param split_type: the split type
+        :type split_type: DataDriver.SplitType
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param fusion_rate: the percentage of the dataset to consider as fusion split
+        :type fusion_rate: float
+
+        :param training_sample_rate: the percentage of instances, within the training split, to include
+        :type training_sample_rate: float
+
+        :param training_sample_number: the sample number starting from 0
+        :type training_sample_number: int
+
+        :param class_attribute: the class attribute name
+        :type class_attribute: str
+
+        :param random_seed: the random seed
+        :type random_seed: int
+        """
+        self.__cursor.execute(
+            CREATE_SPLIT_INSTANCES_TABLE_STATEMENT.format(
+                split_instances_table_name_=SPLIT_INSTANCES_TABLE_NAME,
+                row_id_=ROW_ID_COLUMN_NAME,
+            )
+        )
+
+        partitions_sizes = self.__get_partitions_sizes(table_name, class_attribute)
+        for class_attribute_value, partition_size in partitions_sizes.items():
+            split_size, split_offset = self.__get_split_size_and_offset(
+                split_type=split_type,
+                partition_size=partition_size,
+                training_rate=training_rate,
+                fusion_rate=fusion_rate,
+                training_sample_rate=training_sample_rate,
+                training_sample_number=training_sample_number,
+            )
+            statement = SELECT_SAMPLE_STATEMENT.format(
+                attributes_='"' + ROW_ID_COLUMN_NAME + '"',
+                table_name_=table_name,
+                class_attribute_=class_attribute,
+                class_attribute_value_=class_attribute_value,
+                limit_=split_size,
+                offset_=split_offset,
+            )
+            self.__cursor.execute(
+                INSERT_SPLIT_INSTANCES_STATEMENT.format(
+                    random_seed_=random_seed,
+                    split_instances_table_name_=SPLIT_INSTANCES_TABLE_NAME,
+                    statement_=statement,
+                )
+            )
+
+    def __create_folds_table(
+            self,
+            table_name,
+            folds_table_name,
+            class_attribute,
+            folds_number,
+            random_seed,
+    ):
+        """
+        Creates the table of the fold ids, if it does not exist.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param folds_table_name: the name of the folds table
+        :type folds_table_name: str
+
+        :param class_attribute: the class attribute name
+        :type class_attribute: str
+
+        :param folds_number: the number of folds
+        :type folds_number: int
+
+        :param random_seed: the random seed
+        :type random_seed: int
+        """
+        if self.__table_exists(folds_table_name):
+            return
+
+        try:
+            # Waits for the running appends, so that no appended instance is missed.
+            self.__cursor.execute(LOCK_TABLE_STATEMENT.format(table_name_=table_name, mode_='SHARE'))
+            self.__cursor.execute(
+                CREATE_FOLDS_TABLE_STATEMENT.format(
+                    folds_table_name_=folds_table_name,
+                    table_name_=table_name,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                    fold_=FOLD_COLUMN_NAME,
+                    class_attribute_=class_attribute,
+                    hash_=self.__compose_hash_expression(random_seed),
+                    folds_number_=folds_number,
+                )
+            )
+            self.__cursor.execute(
+                CREATE_FOLDS_INDEX_STATEMENT.format(
+                    folds_table_name_=folds_table_name,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                    fold_=FOLD_COLUMN_NAME,
+                )
+            )
+
+            # Stores the parameters of the folds and the partitions sizes, to deal the appended instances.
+            self.__set_table_options(
+                table_name=folds_table_name,
+                options={
+                    'class_attribute': class_attribute,
+                    'folds_number': folds_number,
+                    'random_seed': random_seed,
+                    'partitions_sizes': self.__get_partitions_sizes_after(table_name, class_attribute, 0),
+                },
+            )
+            self.__connection.commit()
+        except (psycopg2.errors.DuplicateTable, psycopg2.errors.UniqueViolation):
+            # Another request created the same table concurrently.
+            self.__connection.rollback()
+
+    def __append_folds(
+            self,
+            table_name,
+            folds_table_name,
+            last_row_id,
+    ):
+        """
+        Deals the instances appended after a row id to the folds, continuing every partition round robin from its last
+        fold, so that the folds stay balanced without recomputing the existing ones.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param folds_table_name: the name of the folds table
+        :type folds_table_name: str
+
+        :param last_row_id: the last row id before the append
+        :type last_row_id: int
+        """
+        options = self.__get_table_options(folds_table_name)
+
+        # Drops the folds without the stored parameters, to be computed again when required.
+        if options is None:
+            self.__cursor.execute(DROP_TABLE_STATEMENT.format(table_name_=folds_table_name))
+            return
+
+        folds_number = options['folds_number']
+        partitions_sizes = options['partitions_sizes']
+        cases = ' '.join(
+            FOLD_OFFSET_CASE_PATTERN.format(
+                value_=value.replace('\'', '\'\''),
+                offset_=size % folds_number,
+            )
+            for value, size in partitions_sizes.items()
+        )
+        if cases:
+            offset = FOLD_OFFSET_PATTERN.format(
+                class_attribute_=options['class_attribute'],
+                cases_=cases,
+            )
+        else:
+            offset = '0'
+        self.__cursor.execute(
+            INSERT_FOLDS_STATEMENT.format(
+                folds_table_name_=folds_table_name,
+                row_id_=ROW_ID_COLUMN_NAME,
+                fold_=FOLD_COLUMN_NAME,
+                class_attribute_=options['class_attribute'],
+                hash_=self.__compose_hash_expression(options['random_seed']),
+                offset_=offset,
+                folds_number_=folds_number,
+                table_name_=table_name,
+                last_row_id_=last_row_id,
+            )
+        )
+
+        # Updates the partitions sizes.
+        appended_partitions_sizes = self.__get_partitions_sizes_after(
+            table_name=table_name,
+            class_attribute=options['class_attribute'],
+            last_row_id=last_row_id,
+        )
+        for value, size in appended_partitions_sizes.items():
+            partitions_sizes[value] = partitions_sizes.get(value, 0) + size
+        self.__set_table_options(folds_table_name, options)
+
+    def __create_column_groups(self, table_name, attributes, column_group_size):
+        """
+        Creates the tables of the column groups, sharing the row ids, and the view joining them, without committing.
+
+        The view left joins every column group to the first one, storing the row ids only, on its primary key, so that
+        the planner removes the joins of the column groups whose attributes are not selected.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param attributes: the list of attributes
+        :type attributes: list[dict[str, object]]
+
+        :param column_group_size: the number of attributes of each column group
+        :type column_group_size: int
+
+        :return: the number of column groups storing the attributes
+        :rtype: int
+        """
+        if column_group_size < 1:
+            raise ValueError('The column group size must be positive.')
+
+        # The first column group generates the row ids.
+        row_ids_table_name = self.__get_column_group_table_name(table_name, 0)
+        self.__cursor.execute(
+            CREATE_TABLE_STATEMENT.format(
+                table_name_=row_ids_table_name,
+                columns_definitions_=ROW_ID_COLUMN_DEFINITION.format(name_=ROW_ID_COLUMN_NAME),
+            )
+        )
+        tables = row_ids_table_name
+        column_groups_number = 0
+        for first_attribute_index in range(0, len(attributes), column_group_size):
+            column_groups_number += 1
+            column_group_table_name = self.__get_column_group_table_name(table_name, column_groups_number)
+            self.__cursor.execute(
+                CREATE_TABLE_STATEMENT.format(
+                    table_name_=column_group_table_name,
+                    columns_definitions_=self.__compose_columns_definitions(
+                        attributes=attributes[first_attribute_index:first_attribute_index + column_group_size],
+                        row_id_column_definition=COLUMN_GROUP_ROW_ID_COLUMN_DEFINITION,
+                    ),
+                )
+            )
+            tables += COLUMN_GROUP_JOIN_PATTERN.format(
+                table_name_=column_group_table_name,
+                row_id_=ROW_ID_COLUMN_NAME,
+            )
+
+        self.__cursor.execute(
+            CREATE_VIEW_STATEMENT.format(
+                view_name_=table_name,
+                columns_=', '.join(['"' + x + '"' for x in [ROW_ID_COLUMN_NAME] + [y['name'] for y in attributes]]),
+                tables_=tables,
+            )
+        )
+
+        # The staging tables copied from the view generate the row ids of the first column group.
+        self.__cursor.execute(
+            SELECT_ROW_ID_SEQUENCE_STATEMENT.format(
+                table_name_=row_ids_table_name,
+                row_id_=ROW_ID_COLUMN_NAME,
+            )
+        )
+        self.__cursor.execute(
+            SET_VIEW_ROW_ID_DEFAULT_STATEMENT.format(
+                view_name_=table_name,
+                row_id_=ROW_ID_COLUMN_NAME,
+                sequence_name_=self.__cursor.fetchone()[0].replace('\'', '\'\''),
+            )
+        )
+        return column_groups_number
+
+    def __create_partitions(self, table_name, partition_attribute):
+        """
+        Creates the missing partitions of the class values of the staging table, without committing.
+
+        :param table_name: the name of the partitioned table
+        :type table_name: str
+
+        :param partition_attribute: the name of the partition attribute
+        :type partition_attribute: str
+        """
+        for value in self.__get_class_attribute_values(STAGING_TABLE_NAME, partition_attribute):
+            if value is None:
+                continue
+
+            partition_table_name = self.__get_partition_table_name(table_name, value)
+            if not self.__table_exists(partition_table_name):
+                self.__cursor.execute(
+                    CREATE_PARTITION_STATEMENT.format(
+                        partition_table_name_=partition_table_name,
+                        table_name_=table_name,
+                        value_=self.__cursor.mogrify('%s', (value,)).decode(),
+                    )
+                )
+
+    def __drop_structure(self, table_name):
+        """
+        Drops a table with its derived tables and iterator sessions, without committing.
+
+        :param table_name: the name of the table
+        :type table_name: str
+        """
+        # The view joining the column groups is dropped before them.
+        if self.__is_view(table_name):
+            self.__cursor.execute(DROP_VIEW_STATEMENT.format(view_name_=table_name))
+        else:
+            self.__cursor.execute(DROP_TABLE_STATEMENT.format(table_name_=table_name))
+        for derived_table_name in self.__get_derived_tables_names(table_name):
+            self.__cursor.execute(DROP_TABLE_STATEMENT.format(table_name_=derived_table_name))
+        if self.__table_exists(ITERATOR_SESSIONS_TABLE_NAME):
+            self.__cursor.execute(
+                DELETE_DATASET_ITERATOR_SESSIONS_STATEMENT.format(sessions_table_name_=ITERATOR_SESSIONS_TABLE_NAME),
+                (table_name,),
+            )
+        self.__datasets_options.pop(table_name, None)
+
+    def __drop_stale_staging_structures(self):
+        """
+        Drops the staging structures of the imports and of the unregistered uploads whose sessions ended without
+        dropping them, skipping the ones still locked by their sessions.
+        """
+        self.__cursor.execute(SELECT_STAGING_STRUCTURES_STATEMENT, (STAGING_TABLE_NAME_REGEX,))
+        staging_tables_names = [x for x, in self.__cursor.fetchall()]
+        self.__connection.commit()
+
+        for staging_table_name in staging_tables_names:
+            self.__cursor.execute(TRY_LOCK_STAGING_STRUCTURE_STATEMENT, (staging_table_name,))
+            if not self.__cursor.fetchone()[0]:
+                continue
+            try:
+                # The structure may have been published before the lock was taken.
+                if self.__table_exists(staging_table_name) and not self.__is_upload_staging_table(staging_table_name):
+                    self.__drop_structure(staging_table_name)
+                self.__connection.commit()
+            finally:
+                self.__unlock_staging_structure(staging_table_name)
+
+    def __is_upload_staging_table(self, staging_table_name):
+        """
+        Checks if a staging table belongs to a registered upload.
+
+        :param staging_table_name: the name of the staging table
+        :type staging_table_name: str
+
+        :return: True if an upload stores its chunks in the table
+        :rtype: bool
+        """
+        if not self.__table_exists(UPLOADS_TABLE_NAME):
+            return False
+
+        self.__cursor.execute(
+            SELECT_UPLOADS_STAGING_TABLES_STATEMENT.format(uploads_table_name_=UPLOADS_TABLE_NAME)
+        )
+        return staging_table_name in set(x for x, in self.__cursor.fetchall())
+
+    def __unlock_staging_structure(self, staging_table_name):
+        """
+        Releases the lock of a staging structure, held by the session until then.
+
+        :param staging_table_name: the name of the staging table
+        :type staging_table_name: str
+        """
+        self.__connection.rollback()
+        self.__cursor.execute(UNLOCK_STAGING_STRUCTURE_STATEMENT, (staging_table_name,))
+        self.__connection.commit()
+
+    def __publish_structure(self, staging_table_name, table_name):
+        """
+        Replaces a table, with its derived tables, by a staging table, without committing.
+
+        :param staging_table_name: the name of the staging table
+        :type staging_table_name: str
+
+        :param table_name: the name of the table
+        :type table_name: str
+        """
+        self.__drop_structure(table_name)
+
+        # Renames the derived tables, keeping their suffixes.
+        staging_prefix = self.__get_derived_table_name(staging_table_name, '')
+        for derived_table_name in self.__get_derived_tables_names(staging_table_name):
+            suffix = derived_table_name.strip('"')[len(staging_prefix):]
+            self.__cursor.execute(
+                RENAME_TABLE_STATEMENT.format(
+                    table_name_=derived_table_name,
+                    new_table_name_='"' + self.__get_derived_table_name(table_name, suffix) + '"',
+                )
+            )
+        self.__cursor.execute(
+            RENAME_TABLE_STATEMENT.format(
+                table_name_=staging_table_name,
+                new_table_name_=table_name,
+            )
+        )
+
+        # Continues the row ids after the published ones, for the appends, generated by the first column group if any.
+        if self.__is_view(table_name):
+            row_ids_table_name = self.__get_column_group_table_name(table_name, 0)
+        else:
+            row_ids_table_name = table_name
+        self.__cursor.execute(
+            RESET_ROW_ID_SEQUENCE_STATEMENT.format(
+                table_name_=row_ids_table_name,
+                row_id_=ROW_ID_COLUMN_NAME,
+            )
+        )
+        self.__datasets_options.pop(staging_table_name, None)
+        self.__datasets_options.pop(table_name, None)
+
+    def __update_statistics(self, table_name, last_row_id):
+        """
+        Updates the stored statistics with the instances after the last row id, without committing.
+
+        The statistics of the whole table are computed when the statistics table is created, while the statistics of
+        every stored class attribute are merged with the ones of the new instances, discarding their quantiles.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param last_row_id: the last row id before the new instances
+        :type last_row_id: int
+        """
+        statistics_table_name = self.__get_statistics_table_name(table_name)
+        if not self.__table_exists(statistics_table_name):
+            self.__cursor.execute(
+                CREATE_STATISTICS_TABLE_STATEMENT.format(statistics_table_name_=statistics_table_name)
+            )
+            self.__cursor.execute(
+                CREATE_STATISTICS_INDEX_STATEMENT.format(statistics_table_name_=statistics_table_name)
+            )
+            self.__store_statistics(table_name, NO_CLASS_ATTRIBUTE, 0)
+            return
+
+        self.__cursor.execute(
+            SELECT_STATISTICS_CLASS_ATTRIBUTES_STATEMENT.format(statistics_table_name_=statistics_table_name)
+        )
+        for class_attribute, in self.__cursor.fetchall():
+            self.__store_statistics(table_name, class_attribute, last_row_id)
+
+    def __store_statistics(self, table_name, class_attribute, last_row_id):
+        """
+        Computes in a single scan the statistics of the instances after the last row id, grouped by class, and merges
+        them with the stored ones, without committing.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attribute: the class attribute name, NO_CLASS_ATTRIBUTE for the whole table
+        :type class_attribute: str
+
+        :param last_row_id: the last row id before the instances, 0 for all the instances
+        :type last_row_id: int
+        """
+        array_attributes = self.__get_dataset_options(table_name)['array_attributes']
+        columns_names = set(self.__get_columns_names(table_name))
+        attributes = [x for x in self.get_structure_attributes(table_name) if x['name'] in columns_names]
+        class_values = self.__get_class_values_decoder(table_name, class_attribute)
+        statistics = collections.OrderedDict()
+        if attributes:
+            aggregates = ', '.join([
+                (TEXT_STATISTICS_PATTERN if x['type'] == 'text' else NUMERIC_STATISTICS_PATTERN).format(
+                    column_name_=x['name'],
+                )
+                for x in attributes
+            ])
+            self.__cursor.execute(
+                COMPUTE_STATISTICS_STATEMENT.format(
+                    class_value_=self.__compose_class_value_expression(class_attribute),
+                    aggregates_=aggregates,
+                    table_name_=table_name,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                    last_row_id_=last_row_id,
+                    group_by_=GROUP_BY_CLASS_VALUE if class_attribute != NO_CLASS_ATTRIBUTE else '',
+                )
+            )
+            for row in self.__cursor.fetchall():
+                for i, attribute in enumerate(attributes):
+                    statistics[(class_values(row[0]), attribute['name'])] = row[1 + 6 * i:7 + 6 * i]
+
+        # The array attributes are aggregated by position, over the unnested arrays.
+        if array_attributes:
+            self.__cursor.execute(
+                COMPUTE_ARRAY_STATISTICS_STATEMENT.format(
+                    class_value_=self.__compose_class_value_expression(class_attribute),
+                    position_=POSITION_COLUMN_NAME,
+                    aggregates_=NUMERIC_STATISTICS_PATTERN.format(column_name_=ARRAY_VALUE_COLUMN_NAME),
+                    table_name_=table_name,
+                    array_=ARRAY_COLUMN_NAME,
+                    value_=ARRAY_VALUE_COLUMN_NAME,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                    last_row_id_=last_row_id,
+                )
+            )
+            for row in self.__cursor.fetchall():
+                statistics[(class_values(row[0]), array_attributes[row[1] - 1])] = row[2:8]
+
+        # Merges the stored statistics, the instances before the last row id.
+        statistics_table_name = self.__get_statistics_table_name(table_name)
+        if last_row_id > 0:
+            self.__cursor.execute(
+                SELECT_STATISTICS_STATEMENT.format(statistics_table_name_=statistics_table_name),
+                (class_attribute,),
+            )
+            for row in self.__cursor.fetchall():
+                key = (row[0], row[1])
+                if key not in statistics:
+                    statistics[key] = row[2:8]
+                    continue
+
+                new_statistics = statistics[key]
+                if row[6] is None or new_statistics[4] is None:
+                    values_number = row[2] + new_statistics[0]
+                    mean, variance = new_statistics[4:6] if row[6] is None else row[6:8]
+                else:
+                    values_number, mean, variance = utils.merge_moments(
+                        row[2], row[6], row[7],
+                        new_statistics[0], new_statistics[4], new_statistics[5],
+                    )
+                statistics[key] = (
+                    values_number,
+                    row[3] + new_statistics[1],
+                    min([x for x in (row[4], new_statistics[2]) if x is not None], default=None),
+                    max([x for x in (row[5], new_statistics[3]) if x is not None], default=None),
+                    mean,
+                    variance,
+                )
+
+        self.__cursor.execute(
+            DELETE_STATISTICS_STATEMENT.format(statistics_table_name_=statistics_table_name),
+            (class_attribute,),
+        )
+        self.__cursor.executemany(
+            INSERT_STATISTICS_STATEMENT.format(statistics_table_name_=statistics_table_name),
+            [(class_attribute,) + k + tuple(v) + (None,) for k, v in statistics.items()],
+        )
+
+    def __store_quantiles(self, table_name, class_attribute):
+        """
+        Computes the missing quantiles of the numeric attributes, grouped by class, on a hash sample of about
+        QUANTILES_SAMPLE_SIZE instances, without committing.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attribute: the class attribute name, NO_CLASS_ATTRIBUTE for the whole table
+        :type class_attribute: str
+        """
+        statistics_table_name = self.__get_statistics_table_name(table_name)
+        statistics_rows = self.__get_stored_statistics(table_name, [class_attribute])[class_attribute]
+        array_attributes = self.__get_dataset_options(table_name)['array_attributes']
+        columns_names = set(self.__get_columns_names(table_name))
+        attributes_names = [
+            x['name'] for x in self.get_structure_attributes(table_name)
+            if x['type'] != 'text' and x['name'] in columns_names
+        ]
+        numeric_attributes = set(attributes_names + array_attributes)
+        if all(x[8] is not None for x in statistics_rows if x[1] in numeric_attributes):
+            return
+
+        instances_number = sum(x[2] + x[3] for x in statistics_rows if x[1] == statistics_rows[0][1])
+        rate = min(1.0, QUANTILES_SAMPLE_SIZE / max(instances_number, 1))
+        fractions = ', '.join([str(x) for x in QUANTILES_FRACTIONS])
+        class_values = self.__get_class_values_decoder(table_name, class_attribute)
+        if attributes_names:
+            self.__cursor.execute(
+                COMPUTE_QUANTILES_STATEMENT.format(
+                    class_value_=self.__compose_class_value_expression(class_attribute),
+                    aggregates_=', '.join([
+                        QUANTILES_PATTERN.format(fractions_=fractions, column_name_=x)
+                        for x in attributes_names
+                    ]),
+                    table_name_=table_name,
+                    hash_=self.__compose_hash_expression(QUANTILES_RANDOM_SEED),
+                    hash_bound_=utils.get_hash_bound(rate),
+                    group_by_=GROUP_BY_CLASS_VALUE if class_attribute != NO_CLASS_ATTRIBUTE else '',
+                )
+            )
+            self.__cursor.executemany(
+                UPDATE_STATISTICS_QUANTILES_STATEMENT.format(statistics_table_name_=statistics_table_name),
+                [
+                    (row[1 + i], class_attribute, class_values(row[0]), attribute_name)
+                    for row in self.__cursor.fetchall()
+                    for i, attribute_name in enumerate(attributes_names)
+                ],
+            )
+
+        # The array attributes are aggregated by position, over the unnested arrays.
+        if array_attributes:
+            self.__cursor.execute(
+                COMPUTE_ARRAY_QUANTILES_STATEMENT.format(
+                    class_value_=self.__compose_class_value_expression(class_attribute),
+                    position_=POSITION_COLUMN_NAME,
+                    aggregates_=QUANTILES_PATTERN.format(fractions_=fractions, column_name_=ARRAY_VALUE_COLUMN_NAME),
+                    table_name_=table_name,
+                    array_=ARRAY_COLUMN_NAME,
+                    value_=ARRAY_VALUE_COLUMN_NAME,
+                    hash_=self.__compose_hash_expression(QUANTILES_RANDOM_SEED),
+                    hash_bound_=utils.get_hash_bound(rate),
+                )
+            )
+            self.__cursor.executemany(
+                UPDATE_STATISTICS_QUANTILES_STATEMENT.format(statistics_table_name_=statistics_table_name),
+                [
+                    (row[2], class_attribute, class_values(row[0]), array_attributes[row[1] - 1])
+                    for row in self.__cursor.fetchall()
+                ],
+            )
+
+    def __get_stored_statistics(self, table_name, class_attributes):
+        """
+        Retrieves the stored statistics rows.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attributes: the class attribute names, NO_CLASS_ATTRIBUTE for the whole table
+        :type class_attributes: list[str]
+
+        :return: the statistics rows of every class attribute, empty if not stored
+        :rtype: dict[str, list[tuple]]
+        """
+        statistics_table_name = self.__get_statistics_table_name(table_name)
+        if not self.__table_exists(statistics_table_name):
+            return {x: [] for x in class_attributes}
+
+        statistics_rows = {}
+        for class_attribute in class_attributes:
+            self.__cursor.execute(
+                SELECT_STATISTICS_STATEMENT.format(statistics_table_name_=statistics_table_name),
+                (class_attribute,),
+            )
+            statistics_rows[class_attribute] = self.__cursor.fetchall()
+        return statistics_rows
+
+    @staticmethod
+    def __are_statistics_incomplete(statistics_rows, quantiles):
+        """
+        Checks if some statistics rows, or the quantiles of the numeric attributes if requested, are missing.
+
+        :param statistics_rows: the statistics rows of every class attribute
+        :type statistics_rows: dict[str, list[tuple]]
+
+        :param quantiles: specifies if the quantiles are requested
+        :type quantiles: bool
+
+        :return: True if some statistics must be computed
+        :rtype: bool
+        """
+        for rows in statistics_rows.values():
+            if not rows:
+                return True
+            if quantiles and any(x[4] is not None and x[8] is None for x in rows):
+                return True
+        return False
+
+    @staticmethod
+    def __compose_class_value_expression(class_attribute):
+        """
+        Composes the expression grouping the instances by class, as text.
+
+        :param class_attribute: the class attribute name, NO_CLASS_ATTRIBUTE for the whole table
+        :type class_attribute: str
+
+        :return: the class value expression
+        :rtype: str
+        """
+        if class_attribute == NO_CLASS_ATTRIBUTE:
+            return NULL_CLASS_VALUE
+        return CLASS_VALUE_PATTERN.format(class_attribute_=class_attribute)
+
+    def __get_class_values_decoder(self, table_name, class_attribute):
+        """
+        Composes the function converting the grouped class values into the original ones, for the encoded class
+        attributes.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attribute: the class attribute name
+        :type class_attribute: str
+
+        :return: the function converting a class value
+        :rtype: callable
+        """
+        if class_attribute not in self.__get_dataset_options(table_name)['encoded_attributes']:
+            return lambda x: x
+
+        self.__cursor.execute(
+            SELECT_DICTIONARY_STATEMENT.format(
+                code_=DICTIONARY_CODE_COLUMN_NAME,
+                value_=DICTIONARY_VALUE_COLUMN_NAME,
+                dictionary_table_name_=self.__get_dictionary_table_name(table_name),
+                attribute_=DICTIONARY_ATTRIBUTE_COLUMN_NAME,
+            ),
+            (class_attribute,),
+        )
+        values = dict(self.__cursor.fetchall())
+        return lambda x: values.get(x)
+
+    def __create_uploads_tables(self):
+        """
+        Creates the tables registering the uploads and their chunks, if they do not exist.
+        """
+        if self.__table_exists(UPLOAD_CHUNKS_TABLE_NAME):
+            return
+
+        try:
+            self.__cursor.execute(
+                CREATE_UPLOADS_TABLES_STATEMENT.format(
+                    uploads_table_name_=UPLOADS_TABLE_NAME,
+                    chunks_table_name_=UPLOAD_CHUNKS_TABLE_NAME,
+                )
+            )
+            self.__connection.commit()
+        except psycopg2.errors.UniqueViolation:
+            # Another request created the same tables concurrently.
+            self.__connection.rollback()
+
+    def __get_upload(self, upload_id, lock):
+        """
+        Retrieves an upload.
+
+        :param upload_id: the upload id
+        :type upload_id: str
+
+        :param lock: the locking clause of the select statement, if any
+        :type lock: str
+
+        :return: the dataset name, the staging table name, the JSON attributes, the delimiter and the header flag
+        :rtype: tuple
+
+        :raises KeyError: if the upload does not exist
+        """
+        upload = None
+        if self.__table_exists(UPLOADS_TABLE_NAME):
+            self.__cursor.execute(
+                SELECT_UPLOAD_STATEMENT.format(uploads_table_name_=UPLOADS_TABLE_NAME, lock_=lock),
+                (upload_id,),
+            )
+            upload = self.__cursor.fetchone()
+        if upload is None:
+            self.__connection.rollback()
+            raise KeyError(upload_id)
+        return upload
+
+    def __get_replica_connection(self):
+        """
+        Retrieves the connection to a replica having replayed the WAL written by the primary database so far, hence
+        every committed write, chosen in random order to spread the load.
+
+        :return: the replica connection, None if no replica is up to date
+        :rtype: psycopg2.extensions.connection
+        """
+        self.__cursor.execute(SELECT_CURRENT_LSN_STATEMENT)
+        lsn = self.__cursor.fetchone()[0]
+
+        for replica in random.sample(self.__replicas, len(self.__replicas)):
+            try:
+                if replica not in self.__replicas_connections:
+                    self.__replicas_connections[replica] = psycopg2.connect(
+                        database=self.__database,
+                        user=self.__username,
+                        password=self.__password,
+                        host=replica[0],
+                        port=replica[1]
+                    )
+                replica_connection = self.__replicas_connections[replica]
+                with replica_connection.cursor() as replica_cursor:
+                    replica_cursor.execute(IS_LSN_REPLAYED_STATEMENT, (lsn,))
+                    is_replayed = replica_cursor.fetchone()[0]
+                replica_connection.rollback()
+                if is_replayed:
+                    return replica_connection
+            except psycopg2.OperationalError:
+                # Skips the unreachable replica, reconnecting at the next read.
+                self.__discard_replica_connection(replica)
+        return None
+
+    def __discard_replica_connection(self, replica):
+        """
+        Closes the connection to a replica, if open.
+
+        :param replica: the (hostname, port) of the replica
+        :type replica: (str, str)
+        """
+        replica_connection = self.__replicas_connections.pop(replica, None)
+        if replica_connection is not None:
+            replica_connection.close()
+
+    def __read_from_replica(self, is_replicable, output_csv, read):
+        """
+        Runs a read on an up to date replica, if any, otherwise on the primary database.
+
+        If the replica fails, as when a query is cancelled by a conflict with the recovery, the output written meanwhile
+        is discarded and the read is run again on the primary database.
+
+        :param is_replicable: specifies if the read does not write, not even temporary tables
+        :type is_replicable: bool
+
+        :param output_csv: the output file as an opened and seekable stream
+        :type output_csv: file
+
+        :param read: the function running the read on the current connection
+        :type read: callable
+
+        :return: the result of the read
+        :rtype: object
+        """
+        replica_connection = None
+        if self.__replicas and is_replicable:
+            replica_connection = self.__get_replica_connection()
+
+        if replica_connection is not None:
+            output_position = output_csv.tell()
+            primary_connection = self.__connection
+            primary_cursor = self.__cursor
+            self.__connection = replica_connection
+            self.__cursor = replica_connection.cursor()
+            try:
+                return read()
+            except psycopg2.OperationalError:
+                # Covers the queries cancelled by a conflict with the recovery, and the lost connections.
+                output_csv.seek(output_position)
+                output_csv.truncate()
+            finally:
+                self.__cursor.close()
+                self.__connection = primary_connection
+                self.__cursor = primary_cursor
+                try:
+                    replica_connection.rollback()
+                except psycopg2.Error:
+                    for replica, connection in list(self.__replicas_connections.items()):
+                        if connection is replica_connection:
+                            self.__discard_replica_connection(replica)
+
+        return read()
+
+    @staticmethod
+    def __is_split_replicable(split_mode, normalization):
+        """
+        Checks if a split can be read from a replica, that is without writing temporary tables.
+
+        :param split_mode: the way instances are assigned to the splits
+        :type split_mode: DataDriver.SplitMode
+
+        :param normalization: the scaling of the numeric attributes
+        :type normalization: DataDriver.Normalization
+
+        :return: True if the split can be read from a replica
+        :rtype: bool
+        """
+        return normalization == DataDriver.Normalization.none or split_mode != DataDriver.SplitMode.random
+
+    def __create_iterator_sessions_table(self):
+        """
+        Creates the table registering the iterator sessions, if it does not exist.
+        """
+        if self.__table_exists(ITERATOR_SESSIONS_TABLE_NAME):
+            return
+
+        try:
+            self.__cursor.execute(
+                CREATE_ITERATOR_SESSIONS_TABLE_STATEMENT.format(sessions_table_name_=ITERATOR_SESSIONS_TABLE_NAME)
+            )
+            self.__connection.commit()
+        except psycopg2.errors.UniqueViolation:
+            # Another request created the same table concurrently.
+            self.__connection.rollback()
+
+    def __delete_expired_iterator_sessions(self):
+        """
+        Deletes the iterator sessions idle for longer than the timeout, with their tables.
+        """
+        self.__cursor.execute(
+            DELETE_EXPIRED_ITERATOR_SESSIONS_STATEMENT.format(sessions_table_name_=ITERATOR_SESSIONS_TABLE_NAME),
+            (self.__iterator_idle_timeout,),
+        )
+        for iterator_table_name, in self.__cursor.fetchall():
+            self.__cursor.execute(DROP_TABLE_STATEMENT.format(table_name_=iterator_table_name))
+        self.__connection.commit()
+
+    def __table_exists(self, table_name):
+        """
+        Checks if a table exists.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :return: True if the table exists
+        :rtype: bool
+        """
+        self.__cursor.execute(TABLE_EXISTS_STATEMENT.format(table_name_=table_name.replace('\'', '\'\'')))
+        return self.__cursor.fetchone()[0]
+
+    def __is_view(self, table_name):
+        """
+        Checks if a dataset is a view, joining its column groups.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :return: True if the dataset is a view
+        :rtype: bool
+        """
+        self.__cursor.execute(IS_VIEW_STATEMENT.format(table_name_=table_name.replace('\'', '\'\'')))
+        return self.__cursor.fetchone()[0]
+
+    def __get_derived_tables_names(self, table_name):
+        """
+        Retrieves the names of the tables derived from a table, such as the fold ids.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :return: the list of quoted table names
+        :rtype: list[str]
+        """
+        prefix = self.__get_derived_table_name(table_name, '')
+        self.__cursor.execute(
+            SELECT_DERIVED_TABLES_STATEMENT.format(
+                prefix_=prefix,
+                prefix_length_=len(prefix),
+            )
+        )
+        return ['"' + x[0] + '"' for x in self.__cursor.fetchall()]
+
+    def __get_dataset_options(self, table_name):
+        """
+        Retrieves the options of a dataset.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :return: the dataset options
+        :rtype: dict
+        """
+        if table_name not in self.__datasets_options:
+            options = self.__get_table_options(table_name) or {}
+            options.setdefault('encoded_attributes', [])
+            options.setdefault('column_groups_number', 0)
+            options.setdefault('array_attributes', [])
+            options.setdefault('attributes_names', [])
+            options.setdefault('sparse', False)
+            options.setdefault('features_number', 0)
+            options.setdefault('partition_attribute', None)
+            self.__datasets_options[table_name] = options
+        return self.__datasets_options[table_name]
+
+    def __set_dataset_options(self, table_name, options):
+        """
+        Stores the options of a dataset.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param options: the dataset options
+        :type options: dict
+        """
+        self.__set_table_options(
+            table_name=table_name,
+            options=options,
+            relation_kind='VIEW' if options.get('column_groups_number') else 'TABLE',
+        )
+        self.__datasets_options[table_name] = options
+
+    def __get_table_options(self, table_name):
+        """
+        Retrieves the options of a table, stored as its JSON comment.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :return: the table options, None if not stored
+        :rtype: dict
+        """
+        self.__cursor.execute(SELECT_TABLE_COMMENT_STATEMENT.format(table_name_=table_name.replace('\'', '\'\'')))
+        comment = self.__cursor.fetchone()[0]
+        return json.loads(comment) if comment else None
+
+    def __set_table_options(self, table_name, options, relation_kind='TABLE'):
+        """
+        Stores the options of a table as its JSON comment.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param options: the table options
+        :type options: dict
+
+        :param relation_kind: the kind of the relation, TABLE | VIEW
+        :type relation_kind: str
+        """
+        self.__cursor.execute(
+            COMMENT_TABLE_STATEMENT.format(
+                relation_kind_=relation_kind,
+                table_name_=table_name,
+                comment_=json.dumps(options).replace('\'', '\'\''),
+            )
+        )
+
+    @staticmethod
+    def __check_table_name(table_name):
+        """
+        Checks that a table name is not truncated by the database, which would confuse it with the other tables with the
+        same prefix.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :raises ValueError: if the table name is too long
+        """
+        if len(table_name.encode()) > MAXIMUM_TABLE_NAME_LENGTH:
+            raise ValueError('The name {} is longer than {} bytes.'.format(table_name, MAXIMUM_TABLE_NAME_LENGTH))
+
+    @staticmethod
+    def __get_derived_table_name(table_name, suffix):
+        """
+        Composes the name of a table derived from a table.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param suffix: the suffix of the derived table, empty for the prefix shared by the derived tables
+        :type suffix: str
+
+        :return: the unquoted table name
+        :rtype: str
+        """
+        # The unquoted table names are case insensitive.
+        table_hash = hashlib.md5(table_name.lower().encode()).hexdigest()[:DERIVED_TABLE_HASH_LENGTH]
+        return DERIVED_TABLE_NAME_PATTERN.format(table_hash_=table_hash, suffix_=suffix)
+
+    @staticmethod
+    def __get_dictionary_table_name(table_name):
+        """
+        Composes the name of the table storing the dictionary of the encoded attributes.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :return: the quoted table name
+        :rtype: str
+        """
+        return '"' + PostgreSQLDataDriver.__get_derived_table_name(table_name, 'dictionary') + '"'
+
+    @staticmethod
+    def __get_column_group_table_name(table_name, column_group_index):
+        """
+        Composes the name of the table storing a column group, the first one storing the row ids only.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param column_group_index: the index of the column group
+        :type column_group_index: int
+
+        :return: the quoted table name
+        :rtype: str
+        """
+        return '"' + PostgreSQLDataDriver.__get_derived_table_name(
+            table_name,
+            COLUMN_GROUP_TABLE_SUFFIX + str(column_group_index),
+        ) + '"'
+
+    @staticmethod
+    def __get_partition_table_name(table_name, class_attribute_value):
+        """
+        Composes the name of the partition of a class value.
+
+        :param table_name: the name of the partitioned table
+        :type table_name: str
+
+        :param class_attribute_value: the class value
+        :type class_attribute_value: object
+
+        :return: the quoted table name
+        :rtype: str
+        """
+        # The equal numeric values with different scales share the partition.
+        if isinstance(class_attribute_value, decimal.Decimal):
+            value = format(class_attribute_value.normalize(), 'f')
+        else:
+            value = str(class_attribute_value)
+        suffix = PARTITION_TABLE_SUFFIX + hashlib.md5(value.encode()).hexdigest()[:8]
+        return '"' + PostgreSQLDataDriver.__get_derived_table_name(table_name, suffix) + '"'
+
+    @staticmethod
+    def __get_default_partition_table_name(table_name):
+        """
+        Composes the name of the default partition, storing the null class values.
+
+        :param table_name: the name of the partitioned table
+        :type table_name: str
+
+        :return: the quoted table name
+        :rtype: str
+        """
+        return '"' + PostgreSQLDataDriver.__get_derived_table_name(table_name, DEFAULT_PARTITION_TABLE_SUFFIX) + '"'
+
+    def __get_class_table_name(self, table_name, class_attribute, class_attribute_value):
+        """
+        Retrieves the table storing the instances of a class value: its partition if the table is partitioned by the
+        class attribute, the table itself otherwise.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attribute: the class attribute name
+        :type class_attribute: str
+
+        :param class_attribute_value: the value of the class attribute
+        :type class_attribute_value: object
+
+        :return: the table name
+        :rtype: str
+        """
+        if self.__get_dataset_options(table_name)['partition_attribute'] != class_attribute:
+            return table_name
+
+        partition_table_name = self.__get_partition_table_name(table_name, class_attribute_value)
+        return partition_table_name if self.__table_exists(partition_table_name) else table_name
+
+    @staticmethod
+    def __get_statistics_table_name(table_name):
+        """
+        Composes the name of the table storing the statistics of the attributes.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :return: the quoted table name
+        :rtype: str
+        """
+        return '"' + PostgreSQLDataDriver.__get_derived_table_name(table_name, STATISTICS_TABLE_SUFFIX) + '"'
+
+    @staticmethod
+    def __get_folds_table_name(table_name, class_attribute, folds_number, random_seed):
+        """
+        Composes the name of the table storing the fold ids.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attribute: the class attribute name
+        :type class_attribute: str
+
+        :param folds_number: the number of folds
+        :type folds_number: int
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :return: the quoted table name
+        :rtype: str
+        """
+        # Seeds congruent modulo 2^32 share the same hash, hence the same folds.
+        parameters = '{}:{}:{}'.format(class_attribute, folds_number, random_seed & utils.HASH_MASK)
+        suffix = FOLDS_TABLE_SUFFIX + hashlib.md5(parameters.encode()).hexdigest()[:16]
+        return '"' + PostgreSQLDataDriver.__get_derived_table_name(table_name, suffix) + '"'
+
+    def __get_attributes_sample(
+            self,
+            table_name,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+    ):
+        """
+        Generates the random list of attributes to select.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attribute: the class attribute name
+        :type class_attribute: str
+
+        :param include_attributes: the list of the attributes to include, None otherwise
+        :type include_attributes: list[str]
+
+        :param exclude_attributes: the list of the attributes to exclude, None otherwise
+        :type exclude_attributes: list[str]
+
+        :param attributes_rate: the percentage of attributes to include
+        :type attributes_rate: float
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :return: the list of attributes, in the original order
+        :rtype: list[str]
+        """
+        # The partitions are selected by the class column.
+        dataset_options = self.__get_dataset_options(table_name)
+        if class_attribute in dataset_options['array_attributes']:
+            raise ValueError('The class attribute cannot be stored in the array.')
+        if dataset_options['sparse'] and class_attribute not in self.__get_columns_names(table_name):
+            raise ValueError('The class attribute of the sparse datasets is their label.')
+
+        # Prepares the random generator.
+        random_generator = random.Random(random_seed)
+
+        # Retrieves the attributes names except for the class attribute.
+        attributes_names = self.__get_attributes_names(table_name, class_attribute)
+
+        # Filters the attributes.
+        attributes_names = self.__filter_attributes(attributes_names, include_attributes, exclude_attributes)
+
+        # Generates the random list of attributes.
+        attributes_sample_size = int(len(attributes_names) * attributes_rate)
+        attributes_sample = utils.random_ordered_sample(
+            random_generator,
+            attributes_names,
+            attributes_sample_size,
+        )
+        return attributes_sample
+
+    def __get_attributes_names(self, table_name, class_attribute):
+        """
+        Retrieves the list of attributes except for the class attribute and the row id.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attribute: the class attribute name
+        :type class_attribute: str
+
+        :return: the list of attributes
+        :rtype: list[str]
+        """
+        dataset_options = self.__get_dataset_options(table_name)
+        if dataset_options['sparse']:
+            return [str(x) for x in range(1, dataset_options['features_number'] + 1)]
+
+        attributes_names = dataset_options['attributes_names'] or self.__get_columns_names(table_name)
+        return [x for x in attributes_names if x != class_attribute]
+
+    def __get_columns_names(self, table_name):
+        """
+        Retrieves the list of the columns except for the row id, the array attributes being stored in a single column.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :return: the list of columns
+        :rtype: list[str]
         """
         self.__cursor.execute(GET_COLUMNS_NAMES_STATEMENT.format(table_name_=table_name))
-        attributes_names = [
-            column.name
-            for column in self.__cursor.description
-            if column.name != class_attribute
-        ]
-        return attributes_names
+        return [column.name for column in self.__cursor.description if column.name != ROW_ID_COLUMN_NAME]
 
     def __get_class_attribute_values(self, table_name, class_attribute):
         """
@@ -410,7 +3800,8 @@ class PostgreSQLDataDriver(DataDriver):
         :param class_attribute: the class attribute name
         :type class_attribute: str
 
-        :return: the class attribute value
+        :return: the class attribute values, in increasing order whatever the plan, so that the splits do not depend on
+        the indexes and on the planner statistics
         :rtype: list[object]
         """
         self.__cursor.execute(
@@ -440,22 +3831,484 @@ class PostgreSQLDataDriver(DataDriver):
         """
         self.__cursor.execute(
             COUNT_STATEMENT.format(
-                table_name_=table_name,
+                table_name_=self.__get_class_table_name(table_name, class_attribute, class_attribute_value),
                 column_name_=class_attribute,
                 value_=class_attribute_value,
             )
         )
-        current_partition_size = self.__cursor.fetchone()[0]
-        return current_partition_size
+        current_partition_size = self.__cursor.fetchone()[0]
+        return current_partition_size
+
+    def __get_partitions_sizes(self, table_name, class_attribute):
+        """
+        Retrieves the number of instances in every partition, in a single scan.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attribute: the class attribute name
+        :type class_attribute: str
+
+        :return: the partition sizes by class attribute value
+        :rtype: dict[object, int]
+        """
+        self.__cursor.execute(
+            COUNT_GROUPED_STATEMENT.format(
+                table_name_=table_name,
+                column_name_=class_attribute,
+            )
+        )
+        partitions_sizes = {value: size for value, size in self.__cursor.fetchall()}
+        return partitions_sizes
+
+    def __get_partitions_sizes_after(self, table_name, class_attribute, last_row_id):
+        """
+        Retrieves the number of instances after a row id in every partition, by the text of the class attribute value.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param class_attribute: the class attribute name
+        :type class_attribute: str
+
+        :param last_row_id: the row id after which the instances are counted
+        :type last_row_id: int
+
+        :return: the partitions sizes by class attribute value
+        :rtype: dict[str, int]
+        """
+        self.__cursor.execute(
+            COUNT_GROUPED_AFTER_STATEMENT.format(
+                table_name_=table_name,
+                column_name_=class_attribute,
+                row_id_=ROW_ID_COLUMN_NAME,
+                last_row_id_=last_row_id,
+            )
+        )
+        return {value: size for value, size in self.__cursor.fetchall() if value is not None}
+
+    def __copy_csv_to_table(
+            self,
+            table_name,
+            delimiter,
+            header,
+            input_csv,
+            row_id_offset=None,
+            server_path=None,
+    ):
+        """
+        Copies the instances of a CSV file to the table, encoding the encoded attributes, without committing.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param delimiter: the delimiter used in the CSV file (ex. ',')
+        :type delimiter: str
+
+        :param header: specifies if the CSV file has a header
+        :type header: bool
+
+        :param input_csv: the input file as an opened stream
+        :type input_csv: file
+
+        :param row_id_offset: if not None, the row ids are the line numbers in the file, starting from 1, plus this
+        offset, instead of the next values of the sequence
+        :type row_id_offset: int
+
+        :param server_path: if not None, the path of the CSV file on the database server, read in place of the input
+        file
+        :type server_path: str
+
+        :return: the number of copied instances
+        :rtype: int
+        """
+        # Lists the columns explicitly, so that the row ids are generated in the file order.
+        columns_names = self.__get_columns_names(table_name)
+        columns = ', '.join(['"' + x + '"' for x in columns_names])
+
+        # Loads the encoded datasets, the column groups and the partitioned tables through a staging table storing the
+        # original values, with the same row ids.
+        dataset_options = self.__get_dataset_options(table_name)
+        encoded_attributes = dataset_options['encoded_attributes']
+        column_groups_number = dataset_options['column_groups_number']
+        partition_attribute = dataset_options['partition_attribute']
+        is_staged = any([
+            encoded_attributes,
+            row_id_offset is not None,
+            column_groups_number > 0,
+            partition_attribute is not None,
+        ])
+        if is_staged:
+            copy_table_name = STAGING_TABLE_NAME
+            self.__cursor.execute(
+                CREATE_STAGING_TABLE_STATEMENT.format(
+                    staging_table_name_=STAGING_TABLE_NAME,
+                    table_name_=table_name,
+                )
+            )
+            for attribute_name in encoded_attributes:
+                self.__cursor.execute(
+                    ALTER_COLUMN_TYPE_STATEMENT.format(
+                        table_name_=STAGING_TABLE_NAME,
+                        column_name_=attribute_name,
+                        type_=ATTRIBUTE_TYPE_NAMES['text'],
+                    )
+                )
+        else:
+            copy_table_name = table_name
+
+        # Packs the array attributes of every instance in a single field, parsed by the database server as an array.
+        packed_csv = None
+        if dataset_options['array_attributes']:
+            if server_path is not None:
+                raise ValueError('The array attributes cannot be read from the database server.')
+            packed_csv = self.__pack_array_attributes(
+                table_name=table_name,
+                delimiter=delimiter,
+                header=header,
+                input_csv=input_csv,
+            )
+            input_csv = packed_csv
+
+        # Packs the features of every instance as the arrays of their indices and of their values.
+        if dataset_options['sparse']:
+            if server_path is not None:
+                raise ValueError('The sparse datasets cannot be read from the database server.')
+            packed_csv, features_number = self.__pack_sparse_instances(input_csv)
+            input_csv = packed_csv
+            delimiter = SPARSE_DELIMITER
+            header = False
+            if features_number > dataset_options['features_number']:
+                self.__set_dataset_options(table_name, dict(dataset_options, features_number=features_number))
+
+        # The database server reads the files on its file system directly.
+        if server_path is None:
+            source = STDIN_SOURCE
+        else:
+            source = self.__cursor.mogrify('%s', (server_path,)).decode()
+
+        if header:
+            statement = COPY_FROM_CSV_WITH_HEADER_STATEMENT.format(
+                table_name_=copy_table_name,
+                columns_=columns,
+                source_=source,
+                delimiter_=delimiter,
+            )
+        else:
+            statement = COPY_FROM_CSV_WITHOUT_HEADER_STATEMENT.format(
+                table_name_=copy_table_name,
+                columns_=columns,
+                source_=source,
+                delimiter_=delimiter,
+            )
+
+        if server_path is None:
+            try:
+                self.__cursor.copy_expert(
+                    statement,
+                    file=input_csv,
+                )
+            finally:
+                if packed_csv is not None:
+                    packed_csv.close()
+        else:
+            self.__cursor.execute(statement)
+
+        # Adds the new values to the dictionary and moves the encoded instances to the dataset.
+        if is_staged:
+            dictionary_table_name = self.__get_dictionary_table_name(table_name)
+            for attribute_name in encoded_attributes:
+                self.__cursor.execute(
+                    INSERT_DICTIONARY_VALUES_STATEMENT.format(
+                        dictionary_table_name_=dictionary_table_name,
+                        attribute_=DICTIONARY_ATTRIBUTE_COLUMN_NAME,
+                        value_=DICTIONARY_VALUE_COLUMN_NAME,
+                        attribute_name_=attribute_name,
+                        staging_table_name_=STAGING_TABLE_NAME,
+                    )
+                )
+
+            values = []
+            joins = {}
+            for attribute_name in columns_names:
+                if attribute_name in encoded_attributes:
+                    alias = DICTIONARY_ALIAS_PATTERN.format(number_=len(joins))
+                    values.append(
+                        ENCODE_ATTRIBUTE_PATTERN.format(
+                            alias_=alias,
+                            code_=DICTIONARY_CODE_COLUMN_NAME,
+                        )
+                    )
+                    joins[attribute_name] = DICTIONARY_JOIN_PATTERN.format(
+                        dictionary_table_name_=dictionary_table_name,
+                        alias_=alias,
+                        attribute_=DICTIONARY_ATTRIBUTE_COLUMN_NAME,
+                        attribute_name_=attribute_name,
+                        key_=DICTIONARY_VALUE_COLUMN_NAME,
+                        instances_=STAGING_TABLE_NAME,
+                    )
+                else:
+                    values.append(STAGING_TABLE_NAME + '."' + attribute_name + '"')
+
+            # The sequence values of a single copy follow the file order.
+            if row_id_offset is None:
+                row_id_expression = '"' + ROW_ID_COLUMN_NAME + '"'
+            else:
+                row_id_expression = ROW_ID_OFFSET_PATTERN.format(
+                    row_id_offset_=row_id_offset,
+                    row_id_=ROW_ID_COLUMN_NAME,
+                )
+
+            # Creates the partitions of the new class values before moving the instances to them.
+            if partition_attribute is not None:
+                self.__create_partitions(table_name, partition_attribute)
+
+            # Every column group stores its own attributes, with the same row ids.
+            if column_groups_number > 0:
+                targets_tables_names = [
+                    self.__get_column_group_table_name(table_name, x) for x in range(column_groups_number + 1)
+                ]
+            else:
+                targets_tables_names = [table_name]
+            for target_table_name in targets_tables_names:
+                target_columns_names = self.__get_columns_names(target_table_name)
+                self.__cursor.execute(
+                    INSERT_STAGED_INSTANCES_STATEMENT.format(
+                        table_name_=target_table_name,
+                        columns_=', '.join(['"' + x + '"' for x in [ROW_ID_COLUMN_NAME] + target_columns_names]),
+                        values_=', '.join(
+                            [row_id_expression]
+                            + [values[columns_names.index(x)] for x in target_columns_names]
+                        ),
+                        staging_table_name_=STAGING_TABLE_NAME,
+                        joins_=''.join(joins[x] for x in target_columns_names if x in joins),
+                        row_id_=ROW_ID_COLUMN_NAME,
+                    )
+                )
+
+        return self.__cursor.rowcount
+
+    def __pack_array_attributes(
+            self,
+            table_name,
+            delimiter,
+            header,
+            input_csv,
+    ):
+        """
+        Rewrites the instances of a CSV file as the columns of the table, moving the array attributes in an array
+        literal after the other attributes, in the format of the file: CSV if it has a header, text otherwise.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param delimiter: the delimiter used in the CSV file (ex. ',')
+        :type delimiter: str
+
+        :param header: specifies if the CSV file has a header
+        :type header: bool
+
+        :param input_csv: the input file as an opened stream
+        :type input_csv: file
+
+        :return: the rewritten CSV file, positioned at the start
+        :rtype: file
+        """
+        dataset_options = self.__get_dataset_options(table_name)
+        array_attributes = set(dataset_options['array_attributes'])
+        are_array_attributes = [x in array_attributes for x in dataset_options['attributes_names']]
+
+        # The CSV format quotes the array literals, while the text format escapes their delimiters.
+        if header:
+            rows = csv.reader(self.__read_lines(input_csv), delimiter=delimiter)
+            array_delimiter = ','
+        else:
+            rows = (x.rstrip('\r\n').split(delimiter) for x in self.__read_lines(input_csv))
+            array_delimiter = '\\,' if delimiter == ',' else ','
+
+        packed_csv = tempfile.TemporaryFile(mode='w+', newline='')
+        try:
+            writer = csv.writer(packed_csv, delimiter=delimiter, lineterminator='\n')
+            for line_number, row in enumerate(rows, start=1):
+                if len(row) != len(are_array_attributes):
+                    raise ValueError('Line {}: expected {} values, found {}.'.format(
+                        line_number,
+                        len(are_array_attributes),
+                        len(row),
+                    ))
+                columns_values = [x for x, y in zip(row, are_array_attributes) if not y]
+                array_values = [x or NULL_ARRAY_ELEMENT for x, y in zip(row, are_array_attributes) if y]
+                array_literal = '{' + array_delimiter.join(array_values) + '}'
+                if header:
+                    writer.writerow(columns_values + [array_literal])
+                else:
+                    packed_csv.write(delimiter.join(columns_values + [array_literal]) + '\n')
+            packed_csv.seek(0)
+        except BaseException:
+            packed_csv.close()
+            raise
+        return packed_csv
+
+    def __pack_sparse_instances(self, input_csv):
+        """
+        Rewrites the instances of a LIBSVM file in the text format, as their labels followed by the array literals of
+        their feature indices and of their values, delimited by SPARSE_DELIMITER.
+
+        :param input_csv: the input LIBSVM file as an opened stream
+        :type input_csv: file
+
+        :return: the rewritten file, positioned at the start, and the greatest feature index
+        :rtype: (file, int)
+        """
+        features_number = 0
+        packed_csv = tempfile.TemporaryFile(mode='w+', newline='')
+        try:
+            for line_number, line in enumerate(self.__read_lines(input_csv), start=1):
+                try:
+                    label, indices, values = utils.parse_libsvm_line(line)
+                except ValueError as error:
+                    raise ValueError('Line {}: {}'.format(line_number, error))
+                packed_csv.write(SPARSE_DELIMITER.join([
+                    label,
+                    '{' + ','.join([str(x) for x in indices]) + '}',
+                    '{' + ','.join(values) + '}',
+                ]) + '\n')
+                features_number = max([features_number] + indices[-1:])
+            packed_csv.seek(0)
+        except BaseException:
+            packed_csv.close()
+            raise
+        return packed_csv, features_number
+
+    @staticmethod
+    def __read_lines(input_csv):
+        """
+        Reads the lines of a binary stream chunk by chunk, decoded as UTF-8, keeping the line endings.
+
+        :param input_csv: the input file as an opened stream
+        :type input_csv: file
+
+        :return: the lines
+        :rtype: collections.Iterable[str]
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        rest = ''
+        while True:
+            data = input_csv.read(DATA_CHUNK_SIZE)
+            lines = (rest + decoder.decode(data, final=not data)).split('\n')
+            rest = lines.pop()
+            for line in lines:
+                yield line + '\n'
+            if not data:
+                break
+        if rest:
+            yield rest
+
+    def __copy_instances_to_csv(
+            self,
+            table_name,
+            attributes_sample,
+            class_attribute,
+            class_attribute_value,
+            split_size,
+            offset,
+            balanced_split_size,
+            is_first_partition,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            normalization_parameters=None,
+    ):
+        """
+        Copies the instances to the output CSV file.
+
+        Only the first balanced split size instances are fetched if the split is undersampled, while all of them are
+        repeated evenly if it is oversampled.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param attributes_sample: the list of attributes to select
+        :type attributes_sample: list[str]
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param class_attribute_value: the value of the class attribute
+        :type class_attribute_value: object
+
+        :param split_size: the number of the instances to obtain
+        :type split_size: int
+
+        :param offset: the offset from the instance number 0
+        :type offset: int
+
+        :param balanced_split_size: the number of the instances to output
+        :type balanced_split_size: int
+
+        :param is_first_partition: specifies if is the first partition that is treated
+        :type is_first_partition: bool
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :param class_only: specifies if returning the class column only
+        :type class_only: bool
+
+        :param normalization_parameters: the center and the scale of every normalized attribute, None otherwise
+        :type normalization_parameters: dict[str, (float, float)]
+
+        :return: the number of copied instances
+        :rtype: int
+        """
+        attributes = self.__compose_attributes_selection(
+            table_name=table_name,
+            attributes_sample=attributes_sample,
+            class_attribute=class_attribute,
+            class_only=class_only,
+            normalization_parameters=normalization_parameters,
+        )
+        is_oversampled = balanced_split_size > split_size > 0
+        statement = SELECT_SAMPLE_STATEMENT.format(
+            attributes_='*' if is_oversampled else attributes,
+            table_name_=self.__get_class_table_name(table_name, class_attribute, class_attribute_value),
+            class_attribute_=class_attribute,
+            class_attribute_value_=class_attribute_value,
+            limit_=min(split_size, balanced_split_size),
+            offset_=offset,
+        )
+        if is_oversampled:
+            statement = SELECT_OVERSAMPLE_STATEMENT.format(
+                attributes_=attributes,
+                position_=POSITION_COLUMN_NAME,
+                split_statement_=statement,
+                repetitions_=balanced_split_size // split_size,
+                remainder_=balanced_split_size % split_size,
+            )
+        return self.__copy_statement_to_csv(
+            table_name=table_name,
+            statement=statement,
+            random_seed=random_seed,
+            output_csv=output_csv,
+            include_header=is_first_partition and include_header,
+        )
 
-    def __copy_instances_to_csv(
+    def __copy_table_sample_to_csv(
             self,
             table_name,
             attributes_sample,
             class_attribute,
             class_attribute_value,
-            split_size,
-            offset,
+            sampling_method,
+            lower_rate,
+            upper_rate,
             is_first_partition,
             random_seed,
             output_csv,
@@ -463,7 +4316,7 @@ class PostgreSQLDataDriver(DataDriver):
             class_only,
     ):
         """
-        Copies the instances to the output CSV file.
+        Copies the instances sampled by TABLESAMPLE to the output CSV file.
 
         :param table_name: the name of the table
         :type table_name: str
@@ -477,11 +4330,14 @@ class PostgreSQLDataDriver(DataDriver):
         :param class_attribute_value: the value of the class attribute
         :type class_attribute_value: object
 
-        :param split_size: the number of the instances to obtain
-        :type split_size: int
+        :param sampling_method: the TABLESAMPLE method, BERNOULLI | SYSTEM
+        :type sampling_method: str
 
-        :param offset: the offset from the instance number 0
-        :type offset: int
+        :param lower_rate: the rate of the instances preceding the split
+        :type lower_rate: float
+
+        :param upper_rate: the rate of the instances up to the end of the split
+        :type upper_rate: float
 
         :param is_first_partition: specifies if is the first partition that is treated
         :type is_first_partition: bool
@@ -497,23 +4353,94 @@ class PostgreSQLDataDriver(DataDriver):
 
         :param class_only: specifies if returning the class column only
         :type class_only: bool
+
+        :return: the number of copied instances
+        :rtype: int
         """
-        if class_only:
-            formatted_attributes_sample = ['"' + class_attribute + '"']
-        else:
-            formatted_attributes_sample = ['"' + x + '"' for x in attributes_sample]
-            formatted_class_attribute_name = '"' + class_attribute + '"'
-            formatted_attributes_sample.append(formatted_class_attribute_name)
+        # Samples the partition of the class value directly, if any.
+        class_table_name = self.__get_class_table_name(table_name, class_attribute, class_attribute_value)
 
-        statement = SELECT_SAMPLE_STATEMENT.format(
-            attributes_=', '.join(formatted_attributes_sample),
-            table_name_=table_name,
+        # Excludes the instances sampled by the lower rate, since the samples are nested.
+        exclusion = ''
+        if lower_rate > 0:
+            exclusion = TABLESAMPLE_EXCLUSION_PATTERN.format(
+                table_name_=class_table_name,
+                method_=sampling_method,
+                percentage_=self.__get_tablesample_percentage(lower_rate),
+                random_seed_=random_seed,
+                class_attribute_=class_attribute,
+                class_attribute_value_=class_attribute_value,
+            )
+
+        statement = SELECT_TABLESAMPLE_STATEMENT.format(
+            attributes_=self.__compose_attributes_selection(
+                table_name=table_name,
+                attributes_sample=attributes_sample,
+                class_attribute=class_attribute,
+                class_only=class_only,
+            ),
+            table_name_=class_table_name,
+            method_=sampling_method,
+            percentage_=self.__get_tablesample_percentage(upper_rate),
+            random_seed_=random_seed,
             class_attribute_=class_attribute,
             class_attribute_value_=class_attribute_value,
-            limit_=split_size,
-            offset_=offset,
+            exclusion_=exclusion,
         )
-        if is_first_partition and include_header:
+        return self.__copy_statement_to_csv(
+            table_name=table_name,
+            statement=statement,
+            random_seed=random_seed,
+            output_csv=output_csv,
+            include_header=is_first_partition and include_header,
+        )
+
+    @staticmethod
+    def __get_tablesample_percentage(rate):
+        """
+        Converts a rate into a TABLESAMPLE percentage, clamped to the accepted range against the rounding of the sums of
+        the rates (ex. 0.7 + 0.3).
+
+        :param rate: the rate, between 0 and 1
+        :type rate: float
+
+        :return: the percentage, between 0 and 100
+        :rtype: float
+        """
+        return min(max(rate * 100, 0), 100)
+
+    def __copy_statement_to_csv(
+            self,
+            table_name,
+            statement,
+            random_seed,
+            output_csv,
+            include_header,
+    ):
+        """
+        Copies the result of a statement to the output CSV file, decoding the encoded attributes it selects.
+
+        :param table_name: the name of the table selected by the statement
+        :type table_name: str
+
+        :param statement: the select statement
+        :type statement: str
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :return: the number of copied instances
+        :rtype: int
+        """
+        statement = self.__compose_decoded_statement(table_name, statement)
+
+        if include_header:
             self.__cursor.copy_expert(
                 COPY_TO_CSV_WITH_HEADER_STATEMENT.format(
                     random_seed_=random_seed,
@@ -529,24 +4456,476 @@ class PostgreSQLDataDriver(DataDriver):
                 ),
                 file=output_csv,
             )
+        return self.__cursor.rowcount
+
+    def __compose_decoded_statement(self, table_name, statement):
+        """
+        Wraps a statement selecting encoded attributes, so that their codes are converted into the original values by
+        joining the dictionary once per attribute.
+
+        :param table_name: the name of the table selected by the statement
+        :type table_name: str
+
+        :param statement: the select statement
+        :type statement: str
+
+        :return: the statement selecting the original values
+        :rtype: str
+        """
+        encoded_attributes = self.__get_dataset_options(table_name)['encoded_attributes']
+        if not encoded_attributes:
+            return statement
+
+        # Reads the selected columns without running the statement.
+        self.__cursor.execute(DESCRIBE_STATEMENT.format(statement_=statement))
+        columns_names = [x[0] for x in self.__cursor.description]
+        if not set(columns_names) & set(encoded_attributes):
+            return statement
+
+        columns = []
+        joins = []
+        for column_name in columns_names:
+            if column_name in encoded_attributes:
+                alias = DICTIONARY_ALIAS_PATTERN.format(number_=len(joins))
+                columns.append(
+                    DECODE_ATTRIBUTE_PATTERN.format(
+                        alias_=alias,
+                        value_=DICTIONARY_VALUE_COLUMN_NAME,
+                        attribute_name_=column_name,
+                    )
+                )
+                joins.append(
+                    DICTIONARY_JOIN_PATTERN.format(
+                        dictionary_table_name_=self.__get_dictionary_table_name(table_name),
+                        alias_=alias,
+                        attribute_=DICTIONARY_ATTRIBUTE_COLUMN_NAME,
+                        attribute_name_=column_name,
+                        key_=DICTIONARY_CODE_COLUMN_NAME,
+                        instances_=ENCODED_INSTANCES_ALIAS,
+                    )
+                )
+            else:
+                columns.append(ENCODED_INSTANCES_ALIAS + '."' + column_name + '"')
+        return SELECT_DECODED_STATEMENT.format(
+            columns_=', '.join(columns),
+            statement_=statement,
+            instances_=ENCODED_INSTANCES_ALIAS,
+            joins_=''.join(joins),
+        )
+
+    def __compose_attributes_selection(
+            self,
+            table_name,
+            attributes_sample,
+            class_attribute,
+            class_only,
+            normalization_parameters=None,
+    ):
+        """
+        Composes the list of the selected columns, placing the class attribute at the end, subscripting the array
+        attributes and normalizing the numeric ones, or the LIBSVM lines of the sparse datasets. The encoded attributes
+        are selected as codes, decoded by __copy_statement_to_csv.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param attributes_sample: the list of attributes to select
+        :type attributes_sample: list[str]
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param class_only: specifies if selecting the class column only
+        :type class_only: bool
+
+        :param normalization_parameters: the center and the scale of every normalized attribute, None otherwise
+        :type normalization_parameters: dict[str, (float, float)]
+
+        :return: the comma separated list of quoted columns
+        :rtype: str
+        """
+        dataset_options = self.__get_dataset_options(table_name)
+
+        # The instances of the sparse datasets are output as LIBSVM lines, with the sampled features only.
+        if dataset_options['sparse'] and not class_only:
+            if len(attributes_sample) < dataset_options['features_number']:
+                condition = SPARSE_FEATURES_CONDITION_PATTERN.format(
+                    index_=INDEX_COLUMN_NAME,
+                    indices_=','.join(attributes_sample),
+                )
+            else:
+                condition = ''
+            return LIBSVM_LINE_PATTERN.format(
+                class_attribute_=class_attribute,
+                index_=INDEX_COLUMN_NAME,
+                value_=ARRAY_VALUE_COLUMN_NAME,
+                indices_=INDICES_COLUMN_NAME,
+                values_=ARRAY_COLUMN_NAME,
+                condition_=condition,
+            )
+
+        if class_only:
+            attributes_names = [class_attribute]
+        else:
+            attributes_names = list(attributes_sample) + [class_attribute]
+
+        arrays_positions = {x: i + 1 for i, x in enumerate(dataset_options['array_attributes'])}
+        formatted_attributes_sample = []
+        for attribute_name in attributes_names:
+            if attribute_name in arrays_positions:
+                formatted_attributes_sample.append(
+                    ARRAY_ATTRIBUTE_PATTERN.format(
+                        array_=ARRAY_COLUMN_NAME,
+                        position_=arrays_positions[attribute_name],
+                        attribute_name_=attribute_name,
+                    )
+                )
+            elif normalization_parameters and attribute_name in normalization_parameters:
+                center, scale = normalization_parameters[attribute_name]
+                formatted_attributes_sample.append(
+                    NORMALIZE_ATTRIBUTE_PATTERN.format(
+                        attribute_name_=attribute_name,
+                        center_=repr(center),
+                        scale_=repr(scale),
+                    )
+                )
+            else:
+                formatted_attributes_sample.append('"' + attribute_name + '"')
+        return ', '.join(formatted_attributes_sample)
+
+    @staticmethod
+    def __compose_hash_expression(random_seed, column_name=ROW_ID_COLUMN_NAME):
+        """
+        Composes the SQL expression computing utils.keyed_hash of the row id and of the random seed.
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :param column_name: the name of the bigint column to hash in place of the row id
+        :type column_name: str
+
+        :return: the hash expression
+        :rtype: str
+        """
+        expression = HASH_KEY_PATTERN.format(
+            row_id_=column_name,
+            key_=utils.mix_hash(random_seed & utils.HASH_MASK),
+            mask_=utils.HASH_MASK,
+        )
+        for _ in range(2):
+            expression = HASH_STEP_PATTERN.format(
+                value_=expression,
+                multiplier_=utils.HASH_MULTIPLIER,
+                mask_=utils.HASH_MASK,
+            )
+        return HASH_FINAL_STEP_PATTERN.format(value_=expression)
+
+    @staticmethod
+    def __get_split_size_and_offset(
+            split_type,
+            partition_size,
+            training_rate,
+            fusion_rate,
+            training_sample_rate,
+            training_sample_number,
+    ):
+        """
+        Computes the size of the split within a partition and its offset from the instance number 0.
+
+        :param split_type: the split type
+        :type split_type: DataDriver.SplitType
+
+        :param partition_size: the number of instances in the partition
+        :type partition_size: int
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param fusion_rate: the percentage of the dataset to consider as fusion split
+        :type fusion_rate: float
+
+        :param training_sample_rate: the percentage of instances, within the training split, to include
+        :type training_sample_rate: float
+
+        :param training_sample_number: the sample number starting from 0
+        :type training_sample_number: int
+
+        :return: the split size and offset
+        :rtype: (int, int)
+        """
+        # Computes all the split sizes.
+        training_split_size = int(partition_size * training_rate)
+        fusion_split_size = int(partition_size * fusion_rate)
+        test_split_size = partition_size - training_split_size - fusion_split_size
+
+        # Discriminates according to the split type.
+        split_size = None
+        split_offset = None
+        if split_type == DataDriver.SplitType.training:
+            split_size = training_split_size
+            split_offset = 0
+        elif split_type == DataDriver.SplitType.fusion:
+            split_size = fusion_split_size
+            split_offset = training_split_size
+        elif split_type == DataDriver.SplitType.test:
+            split_size = test_split_size
+            split_offset = training_split_size + fusion_split_size
+        elif split_type == DataDriver.SplitType.training_sample:
+            split_size = int(training_split_size * training_sample_rate)
+            split_offset = split_size * training_sample_number
+        return split_size, split_offset
+
+    def __compose_hash_split_selection(
+            self,
+            table_name,
+            split_type,
+            training_rate,
+            fusion_rate,
+            training_sample_rate,
+            training_sample_number,
+            class_attribute,
+            random_seed,
+    ):
+        """
+        Composes the selection of a split in the hash mode: the instances of every class ranked by the keyed hash of
+        their row ids, and the condition on their positions.
+
+        :param table_name: the name of the table
+        :type table_name: str
+
+        :param split_type: the split type
+        :type split_type: DataDriver.SplitType
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param fusion_rate: the percentage of the dataset to consider as fusion split
+        :type fusion_rate: float
+
+        :param training_sample_rate: the percentage of instances, within the training split, to include
+        :type training_sample_rate: float
+
+        :param training_sample_number: the sample number starting from 0
+        :type training_sample_number: int
+
+        :param class_attribute: the name of the class attribute
+        :type class_attribute: str
+
+        :param random_seed: the random seed
+        :type random_seed: int
+
+        :return: the ranked instances subquery and the condition
+        :rtype: (str, str)
+        """
+        split_size_expression, split_offset_expression = self.__compose_split_size_and_offset_expressions(
+            split_type=split_type,
+            partition_size_expression='"' + STRATUM_SIZE_COLUMN_NAME + '"',
+            training_rate=training_rate,
+            fusion_rate=fusion_rate,
+            training_sample_rate=training_sample_rate,
+            training_sample_number=training_sample_number,
+        )
+        ranked_instances = HASH_RANKED_INSTANCES_PATTERN.format(
+            class_attribute_=class_attribute,
+            hash_=self.__compose_hash_expression(random_seed),
+            row_id_=ROW_ID_COLUMN_NAME,
+            position_=POSITION_COLUMN_NAME,
+            partition_size_=STRATUM_SIZE_COLUMN_NAME,
+            table_name_=table_name,
+        )
+        condition = POSITION_RANGE_CONDITION_PATTERN.format(
+            position_=POSITION_COLUMN_NAME,
+            offset_=split_offset_expression,
+            size_=split_size_expression,
+        )
+        return ranked_instances, condition
 
     @staticmethod
-    def __compose_columns_definitions(attributes):
+    def __compose_split_size_and_offset_expressions(
+            split_type,
+            partition_size_expression,
+            training_rate,
+            fusion_rate,
+            training_sample_rate,
+            training_sample_number,
+    ):
+        """
+        Composes the SQL expressions computing the split size and offset as in __get_split_size_and_offset, with
+        double precision arithmetic to round exactly like it.
+
+        :param split_type: the split type
+        :type split_type: DataDriver.SplitType
+
+        :param partition_size_expression: the SQL expression of the number of instances in the partition
+        :type partition_size_expression: str
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param fusion_rate: the percentage of the dataset to consider as fusion split
+        :type fusion_rate: float
+
+        :param training_sample_rate: the percentage of instances, within the training split, to include
+        :type training_sample_rate: float
+
+        :param training_sample_number: the sample number starting from 0
+        :type training_sample_number: int
+
+        :return: the split size and offset expressions
+        :rtype: (str, str)
+        """
+        # Composes all the split sizes.
+        training_split_size = SPLIT_SIZE_PATTERN.format(size_=partition_size_expression, rate_=float(training_rate))
+        fusion_split_size = SPLIT_SIZE_PATTERN.format(size_=partition_size_expression, rate_=float(fusion_rate))
+
+        # Discriminates according to the split type.
+        split_size = None
+        split_offset = None
+        if split_type == DataDriver.SplitType.training:
+            split_size = training_split_size
+            split_offset = '0'
+        elif split_type == DataDriver.SplitType.fusion:
+            split_size = fusion_split_size
+            split_offset = training_split_size
+        elif split_type == DataDriver.SplitType.test:
+            split_size = '({} - {} - {})'.format(partition_size_expression, training_split_size, fusion_split_size)
+            split_offset = '({} + {})'.format(training_split_size, fusion_split_size)
+        elif split_type == DataDriver.SplitType.training_sample:
+            split_size = SPLIT_SIZE_PATTERN.format(size_=training_split_size, rate_=float(training_sample_rate))
+            split_offset = '({} * {})'.format(split_size, training_sample_number)
+        return split_size, split_offset
+
+    @staticmethod
+    def __balance_split_sizes(
+            split_sizes,
+            balancing_strategy,
+            balancing_size,
+            balancing_ratio,
+    ):
+        """
+        Balances the split sizes of the partitions.
+
+        :param split_sizes: the split sizes of the partitions
+        :type split_sizes: list[int]
+
+        :param balancing_strategy: the way the split sizes are balanced among the partitions
+        :type balancing_strategy: DataDriver.BalancingStrategy
+
+        :param balancing_size: the maximum split size of a partition, for the cap strategy
+        :type balancing_size: int
+
+        :param balancing_ratio: the maximum ratio between the split sizes of a partition and of the smallest one, for the
+        ratio strategy
+        :type balancing_ratio: float
+
+        :return: the balanced split sizes, in the same order
+        :rtype: list[int]
+        """
+        # The partitions too small to be sampled stay empty, without emptying the others.
+        nonempty_split_sizes = [split_size for split_size in split_sizes if split_size > 0]
+        if not nonempty_split_sizes or balancing_strategy == DataDriver.BalancingStrategy.none:
+            return split_sizes
+        elif balancing_strategy == DataDriver.BalancingStrategy.cap:
+            return [min(split_size, balancing_size) for split_size in split_sizes]
+        elif balancing_strategy == DataDriver.BalancingStrategy.undersample:
+            return [min(nonempty_split_sizes) if split_size > 0 else 0 for split_size in split_sizes]
+        elif balancing_strategy == DataDriver.BalancingStrategy.oversample:
+            return [max(split_sizes) if split_size > 0 else 0 for split_size in split_sizes]
+        elif balancing_strategy == DataDriver.BalancingStrategy.ratio:
+            maximum_split_size = int(min(nonempty_split_sizes) * balancing_ratio)
+            return [min(split_size, maximum_split_size) for split_size in split_sizes]
+
+    @staticmethod
+    def __get_split_rates(
+            split_type,
+            training_rate,
+            fusion_rate,
+            training_sample_rate,
+            training_sample_number,
+    ):
+        """
+        Computes the range of the normalized hash values, or of the sampling percentages, assigned to the split.
+
+        :param split_type: the split type
+        :type split_type: DataDriver.SplitType
+
+        :param training_rate: the percentage of the dataset to consider as training split
+        :type training_rate: float
+
+        :param fusion_rate: the percentage of the dataset to consider as fusion split
+        :type fusion_rate: float
+
+        :param training_sample_rate: the percentage of instances, within the training split, to include
+        :type training_sample_rate: float
+
+        :param training_sample_number: the sample number starting from 0
+        :type training_sample_number: int
+
+        :return: the lower (included) and upper (excluded) rates
+        :rtype: (float, float)
+        """
+        if split_type == DataDriver.SplitType.training:
+            return 0, training_rate
+        elif split_type == DataDriver.SplitType.fusion:
+            return training_rate, training_rate + fusion_rate
+        elif split_type == DataDriver.SplitType.test:
+            return training_rate + fusion_rate, 1
+        elif split_type == DataDriver.SplitType.training_sample:
+            sample_width = training_rate * training_sample_rate
+            lower_rate = min(sample_width * training_sample_number, training_rate)
+            upper_rate = min(sample_width * (training_sample_number + 1), training_rate)
+            return lower_rate, upper_rate
+
+    @staticmethod
+    def __compose_columns_definitions(
+            attributes,
+            row_id_column_definition=ROW_ID_COLUMN_DEFINITION,
+            array_type=ARRAY_TYPE,
+    ):
         """
-        Composes a string containing the attibutes and their types.
+        Composes a string containing the attibutes and their types, storing the codes of the encoded attributes, and
+        the array attributes in a single array column after the other ones.
 
         :param attributes: the list of the attribute names
         :type attributes: list[str]
 
+        :param row_id_column_definition: the pattern of the row id column definition
+        :type row_id_column_definition: str
+
+        :param array_type: the type of the array elements, float4 | float8
+        :type array_type: str
+
         :return: the string of attributes with types
         :rtype: str
         """
-        columns_definitions = []
+        columns_definitions = [row_id_column_definition.format(name_=ROW_ID_COLUMN_NAME)]
+        is_array_stored = False
         for attribute in attributes:
+            if attribute.get('array', False):
+                if attribute['type'] == 'text':
+                    raise ValueError('Only the numeric attributes can be stored in the array.')
+                is_array_stored = True
+                continue
+
+            if attribute.get('encoded', False):
+                if attribute['type'] != 'text':
+                    raise ValueError('Only the text attributes can be encoded.')
+                type_name = ENCODED_ATTRIBUTE_TYPE_NAME
+            else:
+                type_name = ATTRIBUTE_TYPE_NAMES[attribute['type']]
             columns_definitions.append(
                 COLUMN_DEFINITIONS_PATTERN.format(
                     name_=attribute['name'],
-                    type_=ATTRIBUTE_TYPE_NAMES[attribute['type']]
+                    type_=type_name
+                )
+            )
+        if is_array_stored:
+            if array_type not in ARRAY_TYPE_NAMES:
+                raise ValueError('The array type must be float4 or float8.')
+            columns_definitions.append(
+                COLUMN_DEFINITIONS_PATTERN.format(
+                    name_=ARRAY_COLUMN_NAME,
+                    type_=ARRAY_TYPE_NAMES[array_type],
                 )
             )
         return ', '.join(columns_definitions)
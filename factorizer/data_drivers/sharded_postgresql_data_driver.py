@@ -0,0 +1,694 @@
+import collections
+import concurrent.futures
+import shutil
+import tempfile
+from factorizer import utils
+from factorizer.data_drivers.data_driver import DataDriver
+from factorizer.data_drivers.postgresql_data_driver import PostgreSQLDataDriver
+
+
+SHARDING_SEED = 0
+
+SHARD_OUTPUT_MEMORY_SIZE = 2 ** 24
+
+DATA_CHUNK_SIZE = 4096
+
+
+class ShardedPostgreSQLDataDriver(DataDriver):
+    """
+    Implements a data driver spreading the instances of every dataset across several PostgreSQL databases, the shards.
+
+    The instance with row id i, its line number in the dataset file, is stored by the shard keyed_hash(i) modulo the
+    number of shards. Every split is selected by all the shards in parallel, stratified by class within every shard, and
+    the selections are concatenated in the shard order, summing the per-class sizes.
+    """
+
+    def __init__(
+            self,
+            username,
+            password,
+            shards,
+    ):
+        """
+        Initializes the data driver.
+
+        :param username: the username
+        :type username: str
+
+        :param password: the password
+        :type password: str
+
+        :param shards: the list of the (hostname, port, database) of the shards
+        :type shards: list[(str, str, str)]
+        """
+        super().__init__()
+
+        self.__shards = [
+            PostgreSQLDataDriver(
+                database,
+                username,
+                password,
+                hostname,
+                port,
+            )
+            for hostname, port, database in shards
+        ]
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(self.__shards),
+            thread_name_prefix='shard',
+        )
+
+    def close(self):
+        self.__executor.shutdown()
+        for shard in self.__shards:
+            shard.close()
+
+    def create_structure(
+            self,
+            name,
+            attributes,
+            column_group_size=None,
+            array_type='float8',
+            sparse=False,
+            partition_attribute=None,
+    ):
+        # The feature indices of the sparse datasets are numbered across the whole dataset.
+        if sparse:
+            raise ValueError('The sparse datasets cannot be sharded.')
+
+        self.__scatter(lambda i, shard: shard.create_structure(
+            name=name,
+            attributes=attributes,
+            column_group_size=column_group_size,
+            array_type=array_type,
+            partition_attribute=partition_attribute,
+        ))
+
+    def destroy_structure(
+            self,
+            name,
+    ):
+        self.__scatter(lambda i, shard: shard.destroy_structure(
+            name=name,
+        ))
+
+    def fill_structure(
+            self,
+            name,
+            delimiter,
+            header,
+            input_csv,
+    ):
+        shards_csvs = self.__deal_instances(input_csv, header, 1)
+        try:
+            self.__scatter(lambda i, shard: shard.fill_structure(
+                name=name,
+                delimiter=delimiter,
+                header=header,
+                input_csv=shards_csvs[i],
+            ))
+        finally:
+            for shard_csv in shards_csvs:
+                shard_csv.close()
+
+    def import_structure(
+            self,
+            name,
+            attributes,
+            delimiter,
+            header,
+            input_csv=None,
+            server_path=None,
+            column_group_size=None,
+            array_type='float8',
+            sparse=False,
+            partition_attribute=None,
+    ):
+        # The feature indices of the sparse datasets are numbered across the whole dataset.
+        if sparse:
+            raise ValueError('The sparse datasets cannot be sharded.')
+
+        if server_path is not None:
+            raise ValueError('The sharded datasets cannot be imported from the database server.')
+
+        shards_csvs = self.__deal_instances(input_csv, header, 1)
+        try:
+            return sum(self.__scatter(lambda i, shard: shard.import_structure(
+                name=name,
+                attributes=attributes,
+                delimiter=delimiter,
+                header=header,
+                input_csv=shards_csvs[i],
+                column_group_size=column_group_size,
+                array_type=array_type,
+                partition_attribute=partition_attribute,
+            )))
+        finally:
+            for shard_csv in shards_csvs:
+                shard_csv.close()
+
+    def append_structure(
+            self,
+            name,
+            delimiter,
+            header,
+            input_csv,
+    ):
+        # Continues the row ids after the stored instances.
+        instances_number = sum(self.__scatter(lambda i, shard: shard.get_statistics(
+            dataset_name=name,
+        )['instances_number']))
+
+        shards_csvs = self.__deal_instances(input_csv, header, instances_number + 1)
+        try:
+            return sum(self.__scatter(lambda i, shard: shard.append_structure(
+                name=name,
+                delimiter=delimiter,
+                header=header,
+                input_csv=shards_csvs[i],
+            )))
+        finally:
+            for shard_csv in shards_csvs:
+                shard_csv.close()
+
+    def optimize_structure(
+            self,
+            name,
+            class_attribute,
+            cluster=False,
+    ):
+        # The shards are optimized in parallel, every step lasting as the slowest shard.
+        shards_durations = self.__scatter(lambda i, shard: shard.optimize_structure(
+            name=name,
+            class_attribute=class_attribute,
+            cluster=cluster,
+        ))
+        return collections.OrderedDict([
+            (step, max(x[step] for x in shards_durations)) for step in shards_durations[0]
+        ])
+
+    def get_structure_attributes(
+            self,
+            name,
+    ):
+        return self.__shards[0].get_structure_attributes(name)
+
+    def get_training_split(
+            self,
+            dataset_name,
+            training_rate,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            split_mode=DataDriver.SplitMode.random,
+            strata_number=None,
+            normalization=DataDriver.Normalization.none,
+    ):
+        self.__check_split_options(strata_number, normalization)
+        return self.__gather_split(
+            method_name='get_training_split',
+            output_csv=output_csv,
+            include_header=include_header,
+            dataset_name=dataset_name,
+            training_rate=training_rate,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            class_only=class_only,
+            split_mode=split_mode,
+        )
+
+    def get_fusion_split(
+            self,
+            dataset_name,
+            training_rate,
+            fusion_rate,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            split_mode=DataDriver.SplitMode.random,
+            strata_number=None,
+            normalization=DataDriver.Normalization.none,
+    ):
+        self.__check_split_options(strata_number, normalization)
+        return self.__gather_split(
+            method_name='get_fusion_split',
+            output_csv=output_csv,
+            include_header=include_header,
+            dataset_name=dataset_name,
+            training_rate=training_rate,
+            fusion_rate=fusion_rate,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            class_only=class_only,
+            split_mode=split_mode,
+        )
+
+    def get_test_split(
+            self,
+            dataset_name,
+            training_rate,
+            fusion_rate,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            split_mode=DataDriver.SplitMode.random,
+            strata_number=None,
+            normalization=DataDriver.Normalization.none,
+    ):
+        self.__check_split_options(strata_number, normalization)
+        return self.__gather_split(
+            method_name='get_test_split',
+            output_csv=output_csv,
+            include_header=include_header,
+            dataset_name=dataset_name,
+            training_rate=training_rate,
+            fusion_rate=fusion_rate,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            class_only=class_only,
+            split_mode=split_mode,
+        )
+
+    def get_training_sample(
+            self,
+            dataset_name,
+            training_rate,
+            sample_rate,
+            sample_number,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            split_mode=DataDriver.SplitMode.random,
+            strata_number=None,
+            balancing_strategy=DataDriver.BalancingStrategy.none,
+            balancing_size=None,
+            balancing_ratio=None,
+            normalization=DataDriver.Normalization.none,
+    ):
+        self.__check_split_options(strata_number, normalization)
+        if balancing_strategy != DataDriver.BalancingStrategy.none:
+            raise ValueError('The class balancing is not available for the sharded datasets.')
+
+        return self.__gather_split(
+            method_name='get_training_sample',
+            output_csv=output_csv,
+            include_header=include_header,
+            dataset_name=dataset_name,
+            training_rate=training_rate,
+            sample_rate=sample_rate,
+            sample_number=sample_number,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            class_only=class_only,
+            split_mode=split_mode,
+        )
+
+    def get_training_bootstrap(
+            self,
+            dataset_name,
+            training_rate,
+            sample_size,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            include_weights=False,
+    ):
+        # Splits the sample size proportionally to the training splits of the shards.
+        shards_sizes = self.__scatter(lambda i, shard: shard.get_statistics(
+            dataset_name=dataset_name,
+        )['instances_number'])
+        shards_sample_sizes = utils.apportion(sample_size, [int(x * training_rate) for x in shards_sizes])
+
+        split_sizes = self.__gather_split(
+            method_name='get_training_bootstrap',
+            output_csv=output_csv,
+            include_header=include_header,
+            shards_arguments=[{'sample_size': x} for x in shards_sample_sizes],
+            dataset_name=dataset_name,
+            training_rate=training_rate,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            class_only=class_only,
+            include_weights=include_weights,
+        )
+        split_sizes['requested_size'] = sample_size
+        return split_sizes
+
+    def get_training_weighted_sample(
+            self,
+            dataset_name,
+            training_rate,
+            sample_size,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+            weight_attribute=None,
+            input_weights_csv=None,
+    ):
+        raise NotImplementedError('The weighted samples are not available for the sharded datasets.')
+
+    def get_fold_training_split(
+            self,
+            dataset_name,
+            folds_number,
+            fold_number,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+    ):
+        return self.__gather_split(
+            method_name='get_fold_training_split',
+            output_csv=output_csv,
+            include_header=include_header,
+            dataset_name=dataset_name,
+            folds_number=folds_number,
+            fold_number=fold_number,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            class_only=class_only,
+        )
+
+    def get_fold_validation_split(
+            self,
+            dataset_name,
+            folds_number,
+            fold_number,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            output_csv,
+            include_header,
+            class_only,
+    ):
+        return self.__gather_split(
+            method_name='get_fold_validation_split',
+            output_csv=output_csv,
+            include_header=include_header,
+            dataset_name=dataset_name,
+            folds_number=folds_number,
+            fold_number=fold_number,
+            class_attribute=class_attribute,
+            include_attributes=include_attributes,
+            exclude_attributes=exclude_attributes,
+            attributes_rate=attributes_rate,
+            random_seed=random_seed,
+            class_only=class_only,
+        )
+
+    def get_statistics(
+            self,
+            dataset_name,
+            class_attribute=None,
+            quantiles=False,
+    ):
+        if quantiles:
+            raise NotImplementedError('The quantiles are not available for the sharded datasets.')
+
+        shards_statistics = self.__scatter(lambda i, shard: shard.get_statistics(
+            dataset_name=dataset_name,
+            class_attribute=class_attribute,
+        ))
+        if any(x is None for x in shards_statistics):
+            return None
+
+        statistics = self.__merge_statistics(shards_statistics)
+        if class_attribute:
+            classes = collections.OrderedDict()
+            for shard_statistics in shards_statistics:
+                for class_statistics in shard_statistics['classes']:
+                    classes.setdefault(class_statistics['class_value'], []).append(class_statistics)
+            statistics['classes'] = [
+                dict(class_value=class_value, **self.__merge_statistics(classes_statistics))
+                for class_value, classes_statistics in classes.items()
+            ]
+        return statistics
+
+    def create_upload(
+            self,
+            name,
+            attributes,
+            delimiter,
+            header,
+    ):
+        raise NotImplementedError('The chunked uploads are not available for the sharded datasets.')
+
+    def upload_chunk(
+            self,
+            upload_id,
+            chunk_number,
+            checksum,
+            input_csv,
+    ):
+        raise NotImplementedError('The chunked uploads are not available for the sharded datasets.')
+
+    def get_upload(
+            self,
+            upload_id,
+    ):
+        raise NotImplementedError('The chunked uploads are not available for the sharded datasets.')
+
+    def finalize_upload(
+            self,
+            upload_id,
+            chunks_number,
+    ):
+        raise NotImplementedError('The chunked uploads are not available for the sharded datasets.')
+
+    def abort_upload(
+            self,
+            upload_id,
+    ):
+        raise NotImplementedError('The chunked uploads are not available for the sharded datasets.')
+
+    def open_iterator(
+            self,
+            dataset_name,
+            split_type,
+            training_rate,
+            fusion_rate,
+            class_attribute,
+            include_attributes,
+            exclude_attributes,
+            attributes_rate,
+            random_seed,
+            epoch,
+            batch_size,
+            class_only,
+    ):
+        raise NotImplementedError('The iterator sessions are not available for the sharded datasets.')
+
+    def get_iterator_batch(
+            self,
+            token,
+            epoch,
+            batch_number,
+            output_csv,
+            include_header,
+    ):
+        raise NotImplementedError('The iterator sessions are not available for the sharded datasets.')
+
+    def close_iterator(
+            self,
+            token,
+    ):
+        raise NotImplementedError('The iterator sessions are not available for the sharded datasets.')
+
+    def __scatter(self, function):
+        """
+        Runs a function on every shard in parallel.
+
+        :param function: the function taking the shard number and its data driver
+        :type function: callable
+
+        :return: the results of the function, in the shard order
+        :rtype: list
+        """
+        futures = [self.__executor.submit(function, i, shard) for i, shard in enumerate(self.__shards)]
+        return [x.result() for x in futures]
+
+    def __gather_split(self, method_name, output_csv, include_header, shards_arguments=None, **arguments):
+        """
+        Selects a split on every shard in parallel and concatenates the selections, in the shard order, to the output
+        CSV file.
+
+        :param method_name: the name of the data driver method selecting the split
+        :type method_name: str
+
+        :param output_csv: the output file as an opened stream
+        :type output_csv: file
+
+        :param include_header: if True, it includes the header in the output CSV
+        :type include_header: bool
+
+        :param shards_arguments: the arguments specific to every shard, None otherwise
+        :type shards_arguments: list[dict]
+
+        :param arguments: the arguments common to the shards
+
+        :return: the requested split size, None if unknown, and the achieved one, summed over the shards
+        :rtype: dict[str, int]
+        """
+        shards_csvs = [tempfile.SpooledTemporaryFile(max_size=SHARD_OUTPUT_MEMORY_SIZE) for _ in self.__shards]
+        try:
+            shards_split_sizes = self.__scatter(lambda i, shard: getattr(shard, method_name)(
+                output_csv=shards_csvs[i],
+                include_header=include_header and i == 0,
+                **dict(arguments, **(shards_arguments[i] if shards_arguments else {}))
+            ))
+            for shard_csv in shards_csvs:
+                shard_csv.seek(0)
+                shutil.copyfileobj(shard_csv, output_csv, DATA_CHUNK_SIZE)
+        finally:
+            for shard_csv in shards_csvs:
+                shard_csv.close()
+
+        requested_sizes = [x['requested_size'] for x in shards_split_sizes]
+        return {
+            'requested_size': None if None in requested_sizes else sum(requested_sizes),
+            'achieved_size': sum(x['achieved_size'] for x in shards_split_sizes),
+        }
+
+    def __deal_instances(self, input_csv, header, first_row_id):
+        """
+        Deals the lines of a CSV file to the shards by the keyed hash of their row ids, repeating the header to every
+        shard.
+
+        The instances cannot span several lines.
+
+        :param input_csv: the input file as an opened stream
+        :type input_csv: file
+
+        :param header: specifies if the CSV file has a header
+        :type header: bool
+
+        :param first_row_id: the row id of the first instance
+        :type first_row_id: int
+
+        :return: the CSV files of the shards, positioned at the start
+        :rtype: list[file]
+        """
+        shards_csvs = [tempfile.TemporaryFile() for _ in self.__shards]
+        lines = iter(input_csv)
+        if header:
+            header_line = next(lines, b'')
+            for shard_csv in shards_csvs:
+                shard_csv.write(header_line)
+
+        for row_id, line in enumerate(lines, first_row_id):
+            shards_csvs[utils.keyed_hash(row_id, SHARDING_SEED) % len(shards_csvs)].write(line)
+
+        for shard_csv in shards_csvs:
+            shard_csv.seek(0)
+        return shards_csvs
+
+    @staticmethod
+    def __check_split_options(strata_number, normalization):
+        """
+        Checks that a split does not need the whole dataset at once, as the quantile strata and the normalization.
+
+        :param strata_number: the number of quantile buckets of the class attribute to stratify by, None otherwise
+        :type strata_number: int
+
+        :param normalization: the scaling of the numeric attributes
+        :type normalization: DataDriver.Normalization
+
+        :raises ValueError: if the split needs the whole dataset
+        """
+        if strata_number is not None or normalization != DataDriver.Normalization.none:
+            raise ValueError('The quantile strata and the normalization are not available for the sharded datasets.')
+
+    @staticmethod
+    def __merge_statistics(shards_statistics):
+        """
+        Merges the statistics of the same instances group over the shards.
+
+        :param shards_statistics: the statistics of every shard in the form {'instances_number': int,
+        'attributes': dict[str, dict]}
+        :type shards_statistics: list[dict[str, object]]
+
+        :return: the merged statistics in the same form
+        :rtype: dict[str, object]
+        """
+        attributes = collections.OrderedDict()
+        for shard_statistics in shards_statistics:
+            for attribute_name, shard_attribute in shard_statistics['attributes'].items():
+                attribute = attributes.get(attribute_name)
+                if attribute is None:
+                    attributes[attribute_name] = dict(shard_attribute)
+                    continue
+
+                extrema = [x for x in (attribute['minimum'], shard_attribute['minimum']) if x is not None]
+                attribute['minimum'] = min(extrema) if extrema else None
+                extrema = [x for x in (attribute['maximum'], shard_attribute['maximum']) if x is not None]
+                attribute['maximum'] = max(extrema) if extrema else None
+                if attribute['mean'] is not None or shard_attribute['mean'] is not None:
+                    _, attribute['mean'], attribute['variance'] = utils.merge_moments(
+                        attribute['values_number'],
+                        attribute['mean'],
+                        attribute['variance'],
+                        shard_attribute['values_number'],
+                        shard_attribute['mean'],
+                        shard_attribute['variance'],
+                    )
+                attribute['values_number'] += shard_attribute['values_number']
+                attribute['nulls_number'] += shard_attribute['nulls_number']
+
+        return {
+            'instances_number': sum(x['instances_number'] for x in shards_statistics),
+            'attributes': attributes,
+        }
@@ -0,0 +1,393 @@
+import concurrent.futures
+import threading
+import time
+import uuid
+
+
+QUEUED_PHASE = 'queued'
+LOADING_PHASE = 'loading'
+OPTIMIZING_PHASE = 'optimizing'
+DONE_PHASE = 'done'
+FAILED_PHASE = 'failed'
+
+
+class IngestionQueueFullError(Exception):
+    """
+    Reports that the ingestion queue cannot accept more jobs.
+    """
+    pass
+
+
+class IngestionJob(object):
+    """
+    Tracks the progress of the ingestion of a dataset file.
+    """
+
+    def __init__(self, name, bytes_number):
+        """
+        Initializes the job.
+
+        :param name: the name of the dataset
+        :type name: str
+
+        :param bytes_number: the size of the dataset file
+        :type bytes_number: int
+        """
+        self.job_id = uuid.uuid4().hex
+        self.name = name
+        self.phase = QUEUED_PHASE
+        self.error = None
+        self.optimization_durations = None
+
+        self.__lock = threading.Lock()
+        self.__bytes_number = bytes_number
+        self.__loaded_bytes_number = 0
+        self.__loaded_rows_number = 0
+        self.__creation_time = time.time()
+        self.__start_time = None
+        self.__end_time = None
+
+    def start(self):
+        """
+        Marks the job as loading.
+        """
+        with self.__lock:
+            self.phase = LOADING_PHASE
+            self.__start_time = time.time()
+
+    def update(self, bytes_number, rows_number):
+        """
+        Adds the bytes and the rows read from the dataset file.
+
+        :param bytes_number: the number of bytes read
+        :type bytes_number: int
+
+        :param rows_number: the number of rows read
+        :type rows_number: int
+        """
+        with self.__lock:
+            self.__loaded_bytes_number += bytes_number
+            self.__loaded_rows_number += rows_number
+
+    def optimize(self, rows_number):
+        """
+        Marks the job as optimizing the published dataset.
+
+        :param rows_number: the number of instances of the dataset
+        :type rows_number: int
+        """
+        with self.__lock:
+            self.phase = OPTIMIZING_PHASE
+            self.__loaded_rows_number = rows_number
+
+    def finish(self, rows_number, optimization_durations=None):
+        """
+        Marks the job as done, once the dataset is published.
+
+        :param rows_number: the number of instances of the dataset
+        :type rows_number: int
+
+        :param optimization_durations: the duration in seconds of every optimization step, None if not optimized
+        :type optimization_durations: dict[str, float]
+        """
+        with self.__lock:
+            self.phase = DONE_PHASE
+            self.optimization_durations = optimization_durations
+            self.__loaded_rows_number = rows_number
+            self.__end_time = time.time()
+
+    def fail(self, error):
+        """
+        Marks the job as failed.
+
+        :param error: the description of the error
+        :type error: str
+        """
+        with self.__lock:
+            self.phase = FAILED_PHASE
+            self.error = error
+            self.__end_time = time.time()
+
+    def is_finished(self):
+        """
+        Checks if the job is done or failed.
+
+        :return: True if the job is finished
+        :rtype: bool
+        """
+        return self.phase in (DONE_PHASE, FAILED_PHASE)
+
+    def get_end_time(self):
+        """
+        Retrieves the time the job finished at.
+
+        :return: the end time, None if the job is not finished
+        :rtype: float
+        """
+        return self.__end_time
+
+    def get_status(self):
+        """
+        Retrieves the status of the job.
+
+        :return: the status in the form {'job_id': str, 'name': str, 'phase': str, 'error': str, 'bytes_number': int,
+        'loaded_bytes_number': int, 'loaded_rows_number': int, 'rows_per_second': float, 'elapsed_time': float,
+        'queued_time': float, 'optimization_durations': dict[str, float]}
+        :rtype: dict[str, object]
+        """
+        with self.__lock:
+            if self.__start_time is None:
+                elapsed_time = 0.0
+            else:
+                elapsed_time = (self.__end_time or time.time()) - self.__start_time
+
+            return {
+                'job_id': self.job_id,
+                'name': self.name,
+                'phase': self.phase,
+                'error': self.error,
+                'bytes_number': self.__bytes_number,
+                'loaded_bytes_number': self.__loaded_bytes_number,
+                'loaded_rows_number': self.__loaded_rows_number,
+                'rows_per_second': self.__loaded_rows_number / elapsed_time if elapsed_time > 0 else 0.0,
+                'elapsed_time': elapsed_time,
+                'queued_time': (self.__start_time or time.time()) - self.__creation_time,
+                'optimization_durations': self.optimization_durations,
+            }
+
+
+class ProgressReader(object):
+    """
+    Wraps an input file, reporting to a job the bytes and the lines read from it.
+    """
+
+    def __init__(self, input_file, job):
+        """
+        Initializes the reader.
+
+        :param input_file: the input file as an opened stream
+        :type input_file: file
+
+        :param job: the job to update
+        :type job: IngestionJob
+        """
+        self.__input_file = input_file
+        self.__job = job
+
+    def read(self, size=-1):
+        """
+        Reads from the input file.
+
+        :param size: the maximum number of bytes to read, -1 to read until the end
+        :type size: int
+
+        :return: the data
+        :rtype: bytes
+        """
+        data = self.__input_file.read(size)
+        self.__job.update(len(data), data.count(b'\n'))
+        return data
+
+
+class IngestionJobs(object):
+    """
+    Runs the ingestion of the dataset files in a bounded pool of background workers, each with its own data driver.
+
+    The finished jobs are kept for the retention time, to be polled.
+
+    The jobs, and the temporary files they read, live in the memory of the process: only a single serving process is
+    supported, since a poll reaching another process would not find the job, and a job does not survive a restart.
+    """
+
+    def __init__(self, create_data_driver, workers_number, queued_jobs_number, retention_time):
+        """
+        Initializes the jobs.
+
+        :param create_data_driver: the function creating a data driver
+        :type create_data_driver: callable
+
+        :param workers_number: the number of jobs running concurrently
+        :type workers_number: int
+
+        :param queued_jobs_number: the maximum number of jobs not finished yet
+        :type queued_jobs_number: int
+
+        :param retention_time: the seconds the finished jobs are kept for
+        :type retention_time: float
+        """
+        self.__create_data_driver = create_data_driver
+        self.__workers_number = workers_number
+        self.__queued_jobs_number = queued_jobs_number
+        self.__retention_time = retention_time
+
+        self.__lock = threading.Lock()
+        self.__executor = None
+        self.__jobs = {}
+
+    def submit(self, name, attributes, delimiter, header, input_file, column_group_size=None, array_type='float8',
+               sparse=False, partition_attribute=None, class_attribute=None, cluster=False):
+        """
+        Queues the ingestion of a dataset file, closed once ingested.
+
+        :param name: the name of the dataset
+        :type name: str
+
+        :param attributes: the list of attributes in the form {'name': str, 'type': 'integer' | 'real' | 'text'}
+        :type attributes: list[dict[str, object]]
+
+        :param delimiter: the delimiter used in the CSV file (ex. ',')
+        :type delimiter: str
+
+        :param header: specifies if the CSV file has a header
+        :type header: bool
+
+        :param input_file: the input file as an opened stream, positioned at the end
+        :type input_file: file
+
+        :param column_group_size: if not None, the attributes are stored in groups of this size sharing the row ids
+        :type column_group_size: int
+
+        :param array_type: the type of the elements of the array attributes, float4 | float8
+        :type array_type: str
+
+        :param sparse: specifies if the file is in the LIBSVM format
+        :type sparse: bool
+
+        :param partition_attribute: if not None, the instances are partitioned by the values of this attribute
+        :type partition_attribute: str
+
+        :param class_attribute: if not None, the dataset is optimized for this class attribute once published
+        :type class_attribute: str
+
+        :param cluster: specifies if the optimization clusters the instances by class
+        :type cluster: bool
+
+        :return: the job id
+        :rtype: str
+
+        :raises IngestionQueueFullError: if too many jobs are not finished yet
+        """
+        bytes_number = input_file.tell()
+        input_file.seek(0)
+
+        with self.__lock:
+            # Forgets the expired jobs.
+            now = time.time()
+            for job_id, job in list(self.__jobs.items()):
+                if job.is_finished() and now - job.get_end_time() > self.__retention_time:
+                    del self.__jobs[job_id]
+
+            if sum(1 for x in self.__jobs.values() if not x.is_finished()) >= self.__queued_jobs_number:
+                raise IngestionQueueFullError('Too many ingestion jobs are queued.')
+
+            # Starts the workers lazily, in the serving process.
+            if self.__executor is None:
+                self.__executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.__workers_number,
+                    thread_name_prefix='ingestion',
+                )
+
+            job = IngestionJob(name, bytes_number)
+            self.__jobs[job.job_id] = job
+
+        self.__executor.submit(
+            self.__run,
+            job,
+            attributes,
+            delimiter,
+            header,
+            input_file,
+            column_group_size,
+            array_type,
+            sparse,
+            partition_attribute,
+            class_attribute,
+            cluster,
+        )
+        return job.job_id
+
+    def get_status(self, job_id):
+        """
+        Retrieves the status of a job.
+
+        :param job_id: the job id
+        :type job_id: str
+
+        :return: the status of the job
+        :rtype: dict[str, object]
+
+        :raises KeyError: if the job does not exist or it has expired
+        """
+        with self.__lock:
+            job = self.__jobs[job_id]
+        return job.get_status()
+
+    def __run(self, job, attributes, delimiter, header, input_file, column_group_size, array_type, sparse,
+              partition_attribute, class_attribute, cluster):
+        """
+        Ingests a dataset file, publishing the dataset atomically.
+
+        :param job: the job
+        :type job: IngestionJob
+
+        :param attributes: the list of attributes
+        :type attributes: list[dict[str, object]]
+
+        :param delimiter: the delimiter used in the CSV file
+        :type delimiter: str
+
+        :param header: specifies if the CSV file has a header
+        :type header: bool
+
+        :param input_file: the input file as an opened stream
+        :type input_file: file
+
+        :param column_group_size: the number of attributes of each column group, None if not grouped
+        :type column_group_size: int
+
+        :param array_type: the type of the elements of the array attributes
+        :type array_type: str
+
+        :param sparse: specifies if the file is in the LIBSVM format
+        :type sparse: bool
+
+        :param partition_attribute: the attribute to partition the instances by, None otherwise
+        :type partition_attribute: str
+
+        :param class_attribute: the class attribute to optimize the dataset for, None otherwise
+        :type class_attribute: str
+
+        :param cluster: specifies if the optimization clusters the instances by class
+        :type cluster: bool
+        """
+        data_driver = None
+        try:
+            job.start()
+            data_driver = self.__create_data_driver()
+            rows_number = data_driver.import_structure(
+                name=job.name,
+                attributes=attributes,
+                delimiter=delimiter,
+                header=header,
+                input_csv=ProgressReader(input_file, job),
+                column_group_size=column_group_size,
+                array_type=array_type,
+                sparse=sparse,
+                partition_attribute=partition_attribute,
+            )
+
+            optimization_durations = None
+            if class_attribute is not None:
+                job.optimize(rows_number)
+                optimization_durations = data_driver.optimize_structure(
+                    name=job.name,
+                    class_attribute=class_attribute,
+                    cluster=cluster,
+                )
+            job.finish(rows_number, optimization_durations)
+        except Exception as error:
+            job.fail(str(error))
+        finally:
+            input_file.close()
+            if data_driver is not None:
+                data_driver.close()
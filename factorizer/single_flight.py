@@ -0,0 +1,119 @@
+import threading
+
+
+class Flight(object):
+    """
+    Tracks the computation of a value shared by the concurrent calls with the same key.
+    """
+
+    def __init__(self):
+        """
+        Initializes the flight.
+        """
+        self.value = None
+        self.is_shared = False
+
+        self.__done = threading.Event()
+
+    def land(self, value, is_shared):
+        """
+        Publishes the computed value to the waiting calls.
+
+        :param value: the computed value
+        :type value: object
+
+        :param is_shared: specifies if the value can be shared, False if it failed or it is too large
+        :type is_shared: bool
+        """
+        self.value = value
+        self.is_shared = is_shared
+        self.__done.set()
+
+    def wait(self, timeout):
+        """
+        Waits for the computed value.
+
+        :param timeout: the maximum seconds to wait for
+        :type timeout: float
+
+        :return: True if the value can be shared
+        :rtype: bool
+        """
+        return self.__done.wait(timeout) and self.is_shared
+
+
+class SingleFlight(object):
+    """
+    Coalesces the concurrent calls with the same key: the first one computes the value, returned to the calls arriving
+    meanwhile, which compute it themselves only if it fails, takes too long or is larger than the maximum shared size.
+
+    The keys are tuples starting with a group, such as the dataset name, whose flights can be forgotten once the group
+    changes, so that the following calls do not receive a value computed before the change.
+    """
+
+    def __init__(self, maximum_shared_size, wait_timeout):
+        """
+        Initializes the coalescing.
+
+        :param maximum_shared_size: the maximum size of a shared value, bounding the memory kept for the waiting calls
+        :type maximum_shared_size: int
+
+        :param wait_timeout: the maximum seconds a call waits for the shared value before computing it itself
+        :type wait_timeout: float
+        """
+        self.__maximum_shared_size = maximum_shared_size
+        self.__wait_timeout = wait_timeout
+
+        self.__lock = threading.Lock()
+        self.__flights = {}
+
+    def run(self, key, compute, get_size):
+        """
+        Computes a value, once for the concurrent calls with the same key.
+
+        :param key: the key of the call, starting with its group
+        :type key: tuple
+
+        :param compute: the function computing the value
+        :type compute: callable
+
+        :param get_size: the function computing the size of the value
+        :type get_size: callable
+
+        :return: the value, shared by the concurrent calls if possible
+        :rtype: object
+        """
+        with self.__lock:
+            flight = self.__flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = Flight()
+                self.__flights[key] = flight
+
+        if not is_leader:
+            if flight.wait(self.__wait_timeout):
+                return flight.value
+            return compute()
+
+        value = None
+        is_shared = False
+        try:
+            value = compute()
+            is_shared = get_size(value) <= self.__maximum_shared_size
+            return value
+        finally:
+            with self.__lock:
+                if self.__flights.get(key) is flight:
+                    del self.__flights[key]
+            flight.land(value if is_shared else None, is_shared)
+
+    def forget(self, group):
+        """
+        Detaches the flights of a group from the following calls, which compute their values anew.
+
+        :param group: the group of the keys
+        :type group: object
+        """
+        with self.__lock:
+            for key in [x for x in self.__flights if x[0] == group]:
+                del self.__flights[key]
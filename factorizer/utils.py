@@ -1,3 +1,9 @@
+import array
+import re
+import struct
+import sys
+
+
 def random_ordered_sample(random_generator, population, k):
     """
     Computes a sample of k elements from a population list, maintaining the original order.
@@ -16,3 +22,195 @@ def random_ordered_sample(random_generator, population, k):
     """
     indices_sample = random_generator.sample(range(len(population)), k)
     return [population[x] for x in sorted(indices_sample)]
+
+
+def apportion(total, weights):
+    """
+    Splits a total proportionally to some weights, by the largest remainder method, so that the shares sum to the total.
+
+    :param total: the total to split
+    :type total: int
+
+    :param weights: the non-negative weights
+    :type weights: list[float]
+
+    :return: the shares, in the same order as the weights
+    :rtype: list[int]
+    """
+    weights_sum = sum(weights)
+    if weights_sum == 0:
+        return [0] * len(weights)
+
+    quotas = [total * weight / weights_sum for weight in weights]
+    shares = [int(quota) for quota in quotas]
+
+    # Assigns the remaining units to the largest remainders.
+    remainders_order = sorted(range(len(weights)), key=lambda i: quotas[i] - shares[i], reverse=True)
+    for i in remainders_order[:total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+HASH_MASK = 0xffffffff
+
+HASH_RANGE = HASH_MASK + 1
+
+HASH_MULTIPLIER = 0x45d9f3b
+
+
+def mix_hash(value):
+    """
+    Mixes the bits of a 32 bits unsigned integer, bijectively.
+
+    The multiplier fits 27 bits, so every intermediate result stays below 2^63 and the same steps can be computed by a
+    database on signed 64 bits integers.
+
+    :param value: the value to mix, between 0 and HASH_MASK
+    :type value: int
+
+    :return: the mixed value, between 0 and HASH_MASK
+    :rtype: int
+    """
+    value = (((value >> 16) ^ value) * HASH_MULTIPLIER) & HASH_MASK
+    value = (((value >> 16) ^ value) * HASH_MULTIPLIER) & HASH_MASK
+    return (value >> 16) ^ value
+
+
+def keyed_hash(value, seed):
+    """
+    Computes a 32 bits hash of a non-negative integer keyed by a random seed.
+
+    :param value: the value to hash (ex. a row id)
+    :type value: int
+
+    :param seed: the random seed
+    :type seed: int
+
+    :return: the hash, between 0 and HASH_MASK
+    :rtype: int
+    """
+    return mix_hash((value ^ (value >> 32) ^ mix_hash(seed & HASH_MASK)) & HASH_MASK)
+
+
+def get_hash_bound(rate):
+    """
+    Converts a rate into the corresponding hash bound.
+
+    :param rate: the rate, between 0 and 1
+    :type rate: float
+
+    :return: the hash bound, between 0 and HASH_RANGE
+    :rtype: int
+    """
+    return min(max(int(rate * HASH_RANGE), 0), HASH_RANGE)
+
+
+def merge_moments(count_a, mean_a, variance_a, count_b, mean_b, variance_b):
+    """
+    Merges the mean and the population variance of two disjoint sets of values, by the parallel algorithm of Chan et al.
+
+    :param count_a: the number of values of the first set
+    :type count_a: int
+
+    :param mean_a: the mean of the first set, None if empty
+    :type mean_a: float
+
+    :param variance_a: the population variance of the first set, None if empty
+    :type variance_a: float
+
+    :param count_b: the number of values of the second set
+    :type count_b: int
+
+    :param mean_b: the mean of the second set, None if empty
+    :type mean_b: float
+
+    :param variance_b: the population variance of the second set, None if empty
+    :type variance_b: float
+
+    :return: the number of values, the mean and the population variance of the union
+    :rtype: (int, float, float)
+    """
+    if count_a == 0:
+        return count_b, mean_b, variance_b
+    if count_b == 0:
+        return count_a, mean_a, variance_a
+
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    squares_sum = variance_a * count_a + variance_b * count_b + delta * delta * count_a * count_b / count
+    return count, mean, squares_sum / count
+
+
+LIBSVM_INDEX_MAXIMUM = 2 ** 31 - 1
+
+LIBSVM_VALUE_PATTERN = re.compile(r'[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?')
+
+CSR_HEADER_FORMAT = '<QQQ'
+
+
+def parse_libsvm_line(line):
+    """
+    Parses a line of a LIBSVM file, in the form 'label index:value ...' with the indices starting from 1 and an
+    optional trailing comment.
+
+    :param line: the line
+    :type line: str
+
+    :return: the label, the feature indices in increasing order and their values
+    :rtype: (str, list[int], list[str])
+
+    :raises ValueError: if the line is invalid
+    """
+    tokens = line.split('#', 1)[0].split()
+    if not tokens:
+        raise ValueError('missing label.')
+
+    features = []
+    for token in tokens[1:]:
+        index, separator, value = token.partition(':')
+        if not separator or not index.isdigit() or not 0 < int(index) <= LIBSVM_INDEX_MAXIMUM:
+            raise ValueError('invalid feature "{}".'.format(token))
+        if not LIBSVM_VALUE_PATTERN.fullmatch(value):
+            raise ValueError('invalid value "{}" of the feature {}.'.format(value, index))
+        features.append((int(index), value))
+
+    features.sort()
+    for (index, _), (next_index, _) in zip(features, features[1:]):
+        if index == next_index:
+            raise ValueError('repeated feature {}.'.format(index))
+    return tokens[0], [x for x, _ in features], [x for _, x in features]
+
+
+def write_csr(lines, output_file):
+    """
+    Writes the instances of a LIBSVM file as a compressed sparse row matrix, in little endian binary form: the numbers
+    of rows, of columns and of non-zero values as unsigned 64 bits integers, followed by the labels as doubles, the
+    row pointers as 64 bits integers, the column indices, starting from 0, as 32 bits integers and the values as
+    doubles.
+
+    :param lines: the lines of the LIBSVM file
+    :type lines: collections.Iterable[str]
+
+    :param output_file: the binary output file as an opened stream
+    :type output_file: file
+
+    :raises ValueError: if a line is invalid
+    """
+    labels = array.array('d')
+    pointers = array.array('q', [0])
+    indices = array.array('i')
+    values = array.array('d')
+    for line in lines:
+        label, line_indices, line_values = parse_libsvm_line(line)
+        labels.append(float(label))
+        indices.extend([x - 1 for x in line_indices])
+        values.extend([float(x) for x in line_values])
+        pointers.append(len(indices))
+
+    columns_number = max(indices) + 1 if indices else 0
+    output_file.write(struct.pack(CSR_HEADER_FORMAT, len(labels), columns_number, len(indices)))
+    for numbers in (labels, pointers, indices, values):
+        if sys.byteorder == 'big':
+            numbers.byteswap()
+        numbers.tofile(output_file)
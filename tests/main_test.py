@@ -1,8 +1,12 @@
+import hashlib
 import io
 import json
 import os
+import threading
+import time
 import unittest
 
+from factorizer.admission_control import AdmissionControl
 from factorizer.data_drivers.postgresql_data_driver import PostgreSQLDataDriver
 from factorizer import __main__
 
@@ -136,6 +140,14 @@ TRAINING_RATE = 0.5
 FUSION_RATE = 0.3
 TRAINING_SAMPLE_RATE = 0.1
 TRAINING_SAMPLE_NUMBER = 1
+FOLDS_NUMBER = 5
+FOLD_NUMBER = 2
+BOOTSTRAP_SAMPLE_SIZE = 300
+WEIGHTED_SAMPLE_SIZE = 100
+ITERATOR_BATCH_SIZE = 64
+UPLOAD_CHUNK_LINES_NUMBER = 300
+JOB_POLLS_NUMBER = 100
+JOB_POLLING_INTERVAL = 0.1
 CLASS_ATTRIBUTE = 'label'
 INCLUDE_ATTRIBUTES = []
 EXCLUDE_ATTRIBUTES = []
@@ -169,6 +181,30 @@ class MainTest(unittest.TestCase):
     def tearDown(self):
         self.__postgresql_data_driver.close()
 
+    def __create_dataset(self, name):
+        """
+        Replaces a dataset by the test dataset.
+
+        :param name: the name of the dataset
+        :type name: str
+        """
+        self.__postgresql_data_driver.destroy_structure(
+            name=name,
+        )
+
+        self.__postgresql_data_driver.create_structure(
+            name=name,
+            attributes=DATASET_ATTRIBUTES,
+        )
+
+        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+            self.__postgresql_data_driver.fill_structure(
+                name=name,
+                delimiter=DATASET_DELIMITER,
+                header=DATASET_HEADER,
+                input_csv=dataset_file,
+            )
+
     def test_post_dataset(self):
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
@@ -216,25 +252,204 @@ class MainTest(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
 
     def test_get_training_split(self):
+        self.__create_dataset(DATASET_NAME)
+
+        data = {
+            'training_rate': TRAINING_RATE,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+        }
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        stream = io.BytesIO(response.data)
+        for line in stream:
+            print(line)
+
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-        self.__postgresql_data_driver.create_structure(
-            name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
+    def test_get_training_split_coalesced(self):
+        self.__create_dataset(DATASET_NAME)
+
+        data = {
+            'training_rate': TRAINING_RATE,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+        }
+
+        # Holds the first request until the others are waiting for it, counting the computed splits.
+        create_data_driver = __main__.create_data_driver
+        computed_splits = []
+        release = threading.Event()
+
+        def create_held_data_driver():
+            computed_splits.append(True)
+            release.wait(10)
+            return create_data_driver()
+
+        responses = []
+
+        def get_training_split():
+            client = __main__.app.test_client()
+            responses.append(client.get(
+                '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+                query_string=data,
+            ))
+
+        __main__.create_data_driver = create_held_data_driver
+        try:
+            threads = [threading.Thread(target=get_training_split) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            time.sleep(1)
+            release.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            __main__.create_data_driver = create_data_driver
+
+        self.assertEqual(len(computed_splits), 1)
+        self.assertEqual(len(responses), 8)
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, responses[0].data)
+            self.assertEqual(response.headers['X-Achieved-Size'], responses[0].headers['X-Achieved-Size'])
+
+        # A deleted dataset is not served by the splits computed before.
+        response = self.__client.delete(
+            '/dataset/{name_}'.format(name_=DATASET_NAME)
         )
 
-        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
-                delimiter=DATASET_DELIMITER,
-                header=DATASET_HEADER,
-                input_csv=dataset_file,
+        self.assertEqual(response.status_code, 200)
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertNotEqual(response.data, responses[0].data)
+
+    def test_get_training_split_overloaded(self):
+        self.__create_dataset(DATASET_NAME)
+
+        def get_data(random_seed):
+            return {
+                'training_rate': TRAINING_RATE,
+                'class_attribute': CLASS_ATTRIBUTE,
+                'include_attributes': INCLUDE_ATTRIBUTES,
+                'exclude_attributes': EXCLUDE_ATTRIBUTES,
+                'attributes_rate': ATTRIBUTES_RATE,
+                'random_seed': random_seed,
+                'include_header': INCLUDE_HEADER,
+            }
+
+        # Holds the running request, admitting one request and queueing another one.
+        create_data_driver = __main__.create_data_driver
+        split_admission = __main__.split_admission
+        release = threading.Event()
+
+        def create_held_data_driver():
+            release.wait(10)
+            return create_data_driver()
+
+        responses = {}
+
+        def get_training_split(random_seed):
+            client = __main__.app.test_client()
+            responses[random_seed] = client.get(
+                '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+                query_string=get_data(random_seed),
+            )
+
+        __main__.create_data_driver = create_held_data_driver
+        __main__.split_admission = AdmissionControl(
+            running_number=1,
+            dataset_running_number=1,
+            queued_number=1,
+            wait_timeout=1,
+        )
+        try:
+            threads = []
+            for random_seed in range(2):
+                threads.append(threading.Thread(target=get_training_split, args=(random_seed,)))
+                threads[-1].start()
+                time.sleep(0.3)
+
+            response = self.__client.get(
+                '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+                query_string=get_data(2),
             )
 
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers['Retry-After'], str(__main__.SPLIT_ADMISSION_RETRY_AFTER))
+
+            threads[1].join()
+            release.set()
+            threads[0].join()
+        finally:
+            __main__.create_data_driver = create_data_driver
+            __main__.split_admission = split_admission
+
+        self.assertEqual(responses[0].status_code, 200)
+        self.assertEqual(responses[1].status_code, 503)
+        self.assertEqual(responses[1].headers['Retry-After'], str(__main__.SPLIT_ADMISSION_RETRY_AFTER))
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_admission_control_fairness(self):
+        admission_control = AdmissionControl(
+            running_number=1,
+            dataset_running_number=1,
+            queued_number=8,
+            wait_timeout=10,
+        )
+
+        admissions = []
+        release = threading.Semaphore(0)
+
+        def run(dataset_name, request_number):
+            with admission_control.admit(dataset_name=dataset_name):
+                admissions.append((dataset_name, request_number))
+                release.acquire()
+
+        # Queues the requests of a flooded dataset before the one of another dataset.
+        threads = []
+        for dataset_name, request_number in [('a', 0), ('a', 1), ('a', 2), ('b', 0)]:
+            threads.append(threading.Thread(target=run, args=(dataset_name, request_number)))
+            threads[-1].start()
+            time.sleep(0.1)
+
+        for _ in threads:
+            release.release()
+            time.sleep(0.1)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(admissions, [('a', 0), ('a', 1), ('b', 0), ('a', 2)])
+
+    def test_get_fusion_split(self):
+        self.__create_dataset(DATASET_NAME)
+
         data = {
             'training_rate': TRAINING_RATE,
+            'fusion_rate': FUSION_RATE,
             'class_attribute': CLASS_ATTRIBUTE,
             'include_attributes': INCLUDE_ATTRIBUTES,
             'exclude_attributes': EXCLUDE_ATTRIBUTES,
@@ -244,7 +459,7 @@ class MainTest(unittest.TestCase):
         }
 
         response = self.__client.get(
-            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+            '/dataset/{name_}/split/fusion'.format(name_=DATASET_NAME),
             query_string=data,
         )
 
@@ -258,23 +473,77 @@ class MainTest(unittest.TestCase):
             name=DATASET_NAME,
         )
 
-    def test_get_fusion_split(self):
+    def test_get_test_split(self):
+        self.__create_dataset(DATASET_NAME)
+
+        data = {
+            'training_rate': TRAINING_RATE,
+            'fusion_rate': FUSION_RATE,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+        }
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/test'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        stream = io.BytesIO(response.data)
+        for line in stream:
+            print(line)
+
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-        self.__postgresql_data_driver.create_structure(
+    def test_get_dataset_training_sample(self):
+        self.__create_dataset(DATASET_NAME)
+
+        data = {
+            'training_rate': TRAINING_RATE,
+            'sample_rate': TRAINING_SAMPLE_RATE,
+            'sample_number': TRAINING_SAMPLE_NUMBER,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+        }
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/training/sample'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        stream = io.BytesIO(response.data)
+        for line in stream:
+            print(line)
+
+        # The cap balancing without balancing size is rejected.
+        data['balancing_strategy'] = 'cap'
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/training/sample'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+        self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
         )
 
-        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
-                delimiter=DATASET_DELIMITER,
-                header=DATASET_HEADER,
-                input_csv=dataset_file,
-            )
+    def test_get_fusion_split_class(self):
+        self.__create_dataset(DATASET_NAME)
 
         data = {
             'training_rate': TRAINING_RATE,
@@ -288,7 +557,7 @@ class MainTest(unittest.TestCase):
         }
 
         response = self.__client.get(
-            '/dataset/{name_}/split/fusion'.format(name_=DATASET_NAME),
+            '/dataset/{name_}/split/fusion/class'.format(name_=DATASET_NAME),
             query_string=data,
         )
 
@@ -302,27 +571,131 @@ class MainTest(unittest.TestCase):
             name=DATASET_NAME,
         )
 
-    def test_get_test_split(self):
+    def test_get_training_split_bernoulli(self):
+        self.__create_dataset(DATASET_NAME)
+
+        data = {
+            'training_rate': TRAINING_RATE,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+            'split_mode': 'bernoulli',
+        }
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(int(response.headers['X-Requested-Size']), 500)
+        self.assertEqual(int(response.headers['X-Achieved-Size']), len(response.data.splitlines()))
+
+        print(response.headers['X-Requested-Size'], response.headers['X-Achieved-Size'])
+
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-        self.__postgresql_data_driver.create_structure(
-            name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
+    def test_get_training_split_invalid(self):
+        self.__create_dataset(DATASET_NAME)
+
+        data = {
+            'training_rate': TRAINING_RATE,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+            'split_mode': 'hash',
+            'strata_number': 4,
+        }
+
+        # The quantile stratification is only available in the random mode.
+        for split_type in ['training', 'training/class']:
+            response = self.__client.get(
+                '/dataset/{name_}/split/{split_type_}'.format(name_=DATASET_NAME, split_type_=split_type),
+                query_string=data,
+            )
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(b'The quantile stratification requires the random split mode', response.data)
+
+        # The normalization is fitted on the training split of the random or hash mode without strata.
+        response = self.__client.get(
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+            query_string=dict(data, split_mode='random', normalization='zscore'),
         )
 
-        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
-                delimiter=DATASET_DELIMITER,
-                header=DATASET_HEADER,
-                input_csv=dataset_file,
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b'The normalization requires the random or hash split mode without strata', response.data)
+
+        # The unknown enumeration values are rejected before reaching the driver.
+        for argument_name, route in [
+            ('split_mode', 'training'),
+            ('normalization', 'training'),
+            ('balancing_strategy', 'training/sample'),
+        ]:
+            query_string = dict(
+                data,
+                sample_rate=TRAINING_SAMPLE_RATE,
+                sample_number=TRAINING_SAMPLE_NUMBER,
+            )
+            del query_string['strata_number']
+            query_string[argument_name] = 'unknown'
+
+            response = self.__client.get(
+                '/dataset/{name_}/split/{route_}'.format(name_=DATASET_NAME, route_=route),
+                query_string=query_string,
             )
 
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('The {} must be one of'.format(argument_name).encode(), response.data)
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_fold_validation_split(self):
+        self.__create_dataset(DATASET_NAME)
+
+        data = {
+            'folds_number': FOLDS_NUMBER,
+            'fold_number': FOLD_NUMBER,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+        }
+
+        response = self.__client.get(
+            '/dataset/{name_}/folds/validation'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data.splitlines()), 1000 // FOLDS_NUMBER)
+
+        stream = io.BytesIO(response.data)
+        for line in stream:
+            print(line)
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_dataset_training_bootstrap(self):
+        self.__create_dataset(DATASET_NAME)
+
         data = {
             'training_rate': TRAINING_RATE,
-            'fusion_rate': FUSION_RATE,
+            'sample_size': BOOTSTRAP_SAMPLE_SIZE,
             'class_attribute': CLASS_ATTRIBUTE,
             'include_attributes': INCLUDE_ATTRIBUTES,
             'exclude_attributes': EXCLUDE_ATTRIBUTES,
@@ -332,11 +705,12 @@ class MainTest(unittest.TestCase):
         }
 
         response = self.__client.get(
-            '/dataset/{name_}/split/test'.format(name_=DATASET_NAME),
+            '/dataset/{name_}/split/training/bootstrap'.format(name_=DATASET_NAME),
             query_string=data,
         )
 
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data.splitlines()), BOOTSTRAP_SAMPLE_SIZE)
 
         stream = io.BytesIO(response.data)
         for line in stream:
@@ -346,28 +720,196 @@ class MainTest(unittest.TestCase):
             name=DATASET_NAME,
         )
 
-    def test_get_dataset_training_sample(self):
+    def test_get_dataset_training_weighted_sample(self):
+        self.__create_dataset(DATASET_NAME)
+
+        # Weights the first half of the instances only.
+        weights = ''.join('{},{}\n'.format(row_id, 1.0 if row_id <= 500 else 0.0) for row_id in range(1, 1001))
+
+        data = {
+            'training_rate': TRAINING_RATE,
+            'sample_size': WEIGHTED_SAMPLE_SIZE,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+        }
+
+        response = self.__client.post(
+            '/dataset/{name_}/split/training/weighted'.format(name_=DATASET_NAME),
+            query_string=data,
+            data={
+                'weights': (io.BytesIO(weights.encode()), 'weights.csv'),
+            },
+            content_type='multipart/form-data',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data.splitlines()), WEIGHTED_SAMPLE_SIZE)
+
+        stream = io.BytesIO(response.data)
+        for line in stream:
+            print(line)
+
+        # The weights are required, either stored in the dataset or uploaded.
+        response = self.__client.get(
+            '/dataset/{name_}/split/training/weighted'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 400)
+
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-        self.__postgresql_data_driver.create_structure(
+    def test_iterate_dataset_training_split(self):
+        self.__create_dataset(DATASET_NAME)
+
+        data = {
+            'training_rate': TRAINING_RATE,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+        }
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+        training_lines = sorted(response.data.splitlines())
+
+        response = self.__client.post(
+            '/dataset/{name_}/iterator'.format(name_=DATASET_NAME),
+            data={
+                'training_rate': TRAINING_RATE,
+                'class_attribute': CLASS_ATTRIBUTE,
+                'attributes_rate': ATTRIBUTES_RATE,
+                'random_seed': RANDOM_SEED,
+                'batch_size': ITERATOR_BATCH_SIZE,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        iterator = json.loads(response.data)
+        print(iterator)
+
+        # Every epoch covers the whole training split, in a different order.
+        epochs_lines = []
+        for epoch in range(2):
+            epoch_lines = []
+            for batch_number in range(iterator['batches_number']):
+                response = self.__client.get(
+                    '/iterator/{token_}/batch/{batch_number_}'.format(
+                        token_=iterator['token'],
+                        batch_number_=batch_number,
+                    ),
+                    query_string={
+                        'epoch': epoch,
+                        'include_header': INCLUDE_HEADER,
+                    },
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(int(response.headers['X-Achieved-Size']), ITERATOR_BATCH_SIZE)
+                epoch_lines.extend(response.data.splitlines())
+            self.assertEqual(sorted(epoch_lines), training_lines)
+            epochs_lines.append(epoch_lines)
+        self.assertNotEqual(epochs_lines[0], epochs_lines[1])
+
+        response = self.__client.delete('/iterator/{token_}'.format(token_=iterator['token']))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.__client.get(
+            '/iterator/{token_}/batch/0'.format(token_=iterator['token']),
+            query_string={
+                'epoch': 0,
+                'include_header': INCLUDE_HEADER,
+            },
+        )
+        self.assertEqual(response.status_code, 404)
+
+        # The mini-batches hold at least one instance.
+        response = self.__client.post(
+            '/dataset/{name_}/iterator'.format(name_=DATASET_NAME),
+            data={
+                'training_rate': TRAINING_RATE,
+                'class_attribute': CLASS_ATTRIBUTE,
+                'attributes_rate': ATTRIBUTES_RATE,
+                'random_seed': RANDOM_SEED,
+                'batch_size': 0,
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+
+        self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
         )
 
+    def test_post_invalid_dataset(self):
+        self.__create_dataset(DATASET_NAME)
+
+        # Corrupts the second value of the third line.
         with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
-                delimiter=DATASET_DELIMITER,
-                header=DATASET_HEADER,
-                input_csv=dataset_file,
-            )
+            lines = dataset_file.readlines()
+        values = lines[2].split(b',')
+        values[1] = b'abc'
+        lines[2] = b','.join(values)
+
+        data = {
+            'name': DATASET_NAME,
+            'attributes': json.dumps(DATASET_ATTRIBUTES),
+            'delimiter': DATASET_DELIMITER,
+            'header': DATASET_HEADER,
+            'dataset': (io.BytesIO(b''.join(lines)), 'dataset.csv'),
+        }
+
+        response = self.__client.post(
+            '/dataset',
+            data=data,
+            content_type='multipart/form-data'
+        )
+
+        print(response.data)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b'Line 3, column 2', response.data)
+
+        # Rejects the numbers with underscores, not accepted by every database version.
+        values[1] = b'1_000'
+        lines[2] = b','.join(values)
+        data['dataset'] = (io.BytesIO(b''.join(lines)), 'dataset.csv')
+
+        response = self.__client.post(
+            '/dataset',
+            data=data,
+            content_type='multipart/form-data'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b'Line 3, column 2', response.data)
 
+        # A value rejected by the database only, as it overflows, fails the load without replacing the dataset.
+        values[1] = b'1e1000000'
+        lines[2] = b','.join(values)
+        data['dataset'] = (io.BytesIO(b''.join(lines[:600])), 'dataset.csv')
+
+        response = self.__client.post(
+            '/dataset',
+            data=data,
+            content_type='multipart/form-data'
+        )
+
+        print(response.data)
+
+        self.assertEqual(response.status_code, 400)
+
+        # The existing dataset is preserved.
         data = {
             'training_rate': TRAINING_RATE,
-            'sample_rate': TRAINING_SAMPLE_RATE,
-            'sample_number': TRAINING_SAMPLE_NUMBER,
             'class_attribute': CLASS_ATTRIBUTE,
             'include_attributes': INCLUDE_ATTRIBUTES,
             'exclude_attributes': EXCLUDE_ATTRIBUTES,
@@ -377,41 +919,205 @@ class MainTest(unittest.TestCase):
         }
 
         response = self.__client.get(
-            '/dataset/{name_}/split/training/sample'.format(name_=DATASET_NAME),
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
             query_string=data,
         )
 
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data.splitlines()), 500)
 
-        stream = io.BytesIO(response.data)
-        for line in stream:
-            print(line)
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
 
+    def test_post_dataset_chunked_upload(self):
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-    def test_get_fusion_split_class(self):
+        data = {
+            'name': DATASET_NAME,
+            'attributes': json.dumps(DATASET_ATTRIBUTES),
+            'delimiter': DATASET_DELIMITER,
+            'header': DATASET_HEADER,
+        }
+
+        response = self.__client.post(
+            '/upload',
+            data=data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        upload_id = response.get_json()['upload_id']
+
+        # Splits the dataset in chunks on line boundaries.
+        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+            lines = dataset_file.readlines()
+        chunks = [
+            b''.join(lines[i:i + UPLOAD_CHUNK_LINES_NUMBER])
+            for i in range(0, len(lines), UPLOAD_CHUNK_LINES_NUMBER)
+        ]
+
+        # Uploads the chunks out of order, sending the last one twice.
+        for chunk_number in reversed(range(len(chunks))):
+            response = self.__client.put(
+                '/upload/{upload_id_}/chunk/{chunk_number_}'.format(upload_id_=upload_id, chunk_number_=chunk_number),
+                query_string={'checksum': hashlib.md5(chunks[chunk_number]).hexdigest()},
+                data=chunks[chunk_number],
+            )
+
+            self.assertEqual(response.status_code, 200)
+
+        response = self.__client.put(
+            '/upload/{upload_id_}/chunk/{chunk_number_}'.format(upload_id_=upload_id, chunk_number_=0),
+            query_string={'checksum': hashlib.md5(chunks[0]).hexdigest()},
+            data=chunks[0],
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['instances_number'], UPLOAD_CHUNK_LINES_NUMBER)
+
+        # A corrupted chunk is rejected.
+        response = self.__client.put(
+            '/upload/{upload_id_}/chunk/{chunk_number_}'.format(upload_id_=upload_id, chunk_number_=1),
+            query_string={'checksum': hashlib.md5(chunks[0]).hexdigest()},
+            data=chunks[1],
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+        response = self.__client.get(
+            '/upload/{upload_id_}'.format(upload_id_=upload_id),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['chunks']), len(chunks))
+
+        response = self.__client.post(
+            '/upload/{upload_id_}/finalize'.format(upload_id_=upload_id),
+            data={'chunks_number': len(chunks) + 1},
+        )
+
+        self.assertEqual(response.status_code, 409)
+
+        response = self.__client.post(
+            '/upload/{upload_id_}/finalize'.format(upload_id_=upload_id),
+            data={'chunks_number': len(chunks)},
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = {
+            'training_rate': TRAINING_RATE,
+            'class_attribute': CLASS_ATTRIBUTE,
+            'include_attributes': INCLUDE_ATTRIBUTES,
+            'exclude_attributes': EXCLUDE_ATTRIBUTES,
+            'attributes_rate': ATTRIBUTES_RATE,
+            'random_seed': RANDOM_SEED,
+            'include_header': INCLUDE_HEADER,
+        }
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data.splitlines()), 500)
+
+        response = self.__client.get(
+            '/upload/{upload_id_}'.format(upload_id_=upload_id),
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+        # The hash splits of the uploaded chunks are the ones of the whole file.
+        data['split_mode'] = 'hash'
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        chunked_split = response.data
+
+        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+            response = self.__client.post(
+                '/dataset',
+                data={
+                    'name': DATASET_NAME,
+                    'attributes': json.dumps(DATASET_ATTRIBUTES),
+                    'delimiter': DATASET_DELIMITER,
+                    'header': DATASET_HEADER,
+                    'dataset': dataset_file,
+                },
+                content_type='multipart/form-data'
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+        response = self.__client.get(
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
+            query_string=data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, chunked_split)
+
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-        self.__postgresql_data_driver.create_structure(
+    def test_post_dataset_import(self):
+        self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
         )
 
-        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
-                delimiter=DATASET_DELIMITER,
-                header=DATASET_HEADER,
-                input_csv=dataset_file,
+        data = {
+            'name': DATASET_NAME,
+            'attributes': json.dumps(DATASET_ATTRIBUTES),
+            'delimiter': DATASET_DELIMITER,
+            'header': DATASET_HEADER,
+            'path': DATASET_FILE_PATH,
+            'location': 'application',
+        }
+
+        # The files outside the import directories are rejected.
+        response = self.__client.post(
+            '/dataset/import',
+            data=data,
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+        response = self.__client.post(
+            '/dataset/import',
+            data=dict(data, path=''),
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+        os.environ[__main__.APPLICATION_IMPORT_DIRECTORIES_VARIABLE] = os.path.dirname(DATASET_FILE_PATH)
+        try:
+            response = self.__client.post(
+                '/dataset/import',
+                data=dict(data, path=os.path.join(os.path.dirname(DATASET_FILE_PATH), '..', 'main_test.py')),
+            )
+
+            self.assertEqual(response.status_code, 403)
+
+            response = self.__client.post(
+                '/dataset/import',
+                data=data,
             )
+        finally:
+            del os.environ[__main__.APPLICATION_IMPORT_DIRECTORIES_VARIABLE]
+
+        self.assertEqual(response.status_code, 200)
 
         data = {
             'training_rate': TRAINING_RATE,
-            'fusion_rate': FUSION_RATE,
             'class_attribute': CLASS_ATTRIBUTE,
             'include_attributes': INCLUDE_ATTRIBUTES,
             'exclude_attributes': EXCLUDE_ATTRIBUTES,
@@ -421,16 +1127,67 @@ class MainTest(unittest.TestCase):
         }
 
         response = self.__client.get(
-            '/dataset/{name_}/split/fusion/class'.format(name_=DATASET_NAME),
+            '/dataset/{name_}/split/training'.format(name_=DATASET_NAME),
             query_string=data,
         )
 
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data.splitlines()), 500)
 
-        stream = io.BytesIO(response.data)
-        for line in stream:
-            print(line)
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
 
+    def test_post_dataset_asynchronous(self):
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
-        )
\ No newline at end of file
+        )
+
+        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+            data = {
+                'name': DATASET_NAME,
+                'attributes': json.dumps(DATASET_ATTRIBUTES),
+                'delimiter': DATASET_DELIMITER,
+                'header': DATASET_HEADER,
+                'asynchronous': True,
+                'class_attribute': CLASS_ATTRIBUTE,
+                'cluster': True,
+                'dataset': dataset_file,
+            }
+
+            response = self.__client.post(
+                '/dataset',
+                data=data,
+                content_type='multipart/form-data'
+            )
+
+        self.assertEqual(response.status_code, 202)
+        job_id = response.get_json()['job_id']
+
+        # Polls the job until it is finished.
+        for _ in range(JOB_POLLS_NUMBER):
+            response = self.__client.get(
+                '/job/{job_id_}'.format(job_id_=job_id),
+            )
+
+            self.assertEqual(response.status_code, 200)
+            status = response.get_json()
+            if status['phase'] in ('done', 'failed'):
+                break
+            time.sleep(JOB_POLLING_INTERVAL)
+
+        self.assertEqual(status['phase'], 'done')
+        self.assertGreater(status['loaded_rows_number'], 0)
+        self.assertEqual(status['loaded_bytes_number'], os.path.getsize(DATASET_FILE_PATH))
+        self.assertEqual(set(status['optimization_durations']), {'index', 'cluster', 'analyze', 'vacuum'})
+
+        # The dataset is published.
+        attributes = self.__postgresql_data_driver.get_structure_attributes(
+            name=DATASET_NAME,
+        )
+
+        self.assertEqual(len(attributes), len(DATASET_ATTRIBUTES))
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
@@ -1,7 +1,15 @@
+import collections
+import io
 import os
+import statistics
+import struct
 import tempfile
 import unittest
 
+import psycopg2
+
+from factorizer import utils
+from factorizer.data_drivers.data_driver import DataDriver
 from factorizer.data_drivers.postgresql_data_driver import PostgreSQLDataDriver
 
 
@@ -134,16 +142,29 @@ TRAINING_RATE = 0.5
 FUSION_RATE = 0.3
 TRAINING_SAMPLE_RATE = 0.1
 TRAINING_SAMPLE_NUMBER = 1
+FOLDS_NUMBER = 5
+FOLD_NUMBER = 2
+BOOTSTRAP_SAMPLE_SIZE = 300
+WEIGHTED_SAMPLE_SIZE = 100
+STRATA_NUMBER = 10
+CONTINUOUS_CLASS_ATTRIBUTE = 'lepton_pt'
 CLASS_ATTRIBUTE = 'label'
+RARE_CLASS_ATTRIBUTE = 'jet_4_b-tag'
 INCLUDE_ATTRIBUTES = []
 EXCLUDE_ATTRIBUTES = []
 ATTRIBUTES_RATE = 0.5
 RANDOM_SEED = 0
+COLUMN_GROUP_SIZE = 5
+ARRAY_ATTRIBUTES_NUMBER = 2000
+ARRAY_INSTANCES_NUMBER = 200
+SPARSE_FEATURES_NUMBER = 100000
+SPARSE_INSTANCES_NUMBER = 200
 
 INCLUDE_HEADER = False
 
 POSTGRESQL_HOSTNAME = 'localhost'
 POSTGRESQL_PORT = '5432'
+UNREACHABLE_POSTGRESQL_PORT = '1'
 POSTGRESQL_DATABASE = 'postgres'
 POSTGRESQL_USERNAME = 'postgres'
 POSTGRESQL_PASSWORD = 'postgres'
@@ -162,59 +183,53 @@ class PostgreSQLDataDriverTest(unittest.TestCase):
     def tearDown(self):
         self.__postgresql_data_driver.close()
 
-    def test_structure_creation(self):
-        self.__postgresql_data_driver.destroy_structure(
-            name=DATASET_NAME,
-        )
-
-        self.__postgresql_data_driver.create_structure(
-            name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
-        )
-
-        self.__postgresql_data_driver.destroy_structure(
-            name=DATASET_NAME,
-        )
+    def __create_dataset(self, name):
+        """
+        Replaces a dataset by the test dataset.
 
-    def test_fill_structure(self):
+        :param name: the name of the dataset
+        :type name: str
+        """
         self.__postgresql_data_driver.destroy_structure(
-            name=DATASET_NAME,
+            name=name,
         )
 
         self.__postgresql_data_driver.create_structure(
-            name=DATASET_NAME,
+            name=name,
             attributes=DATASET_ATTRIBUTES,
         )
 
         with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
             self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
+                name=name,
                 delimiter=DATASET_DELIMITER,
                 header=DATASET_HEADER,
                 input_csv=dataset_file,
             )
 
+    def test_structure_creation(self):
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-    def test_get_training_split(self):
+        self.__postgresql_data_driver.create_structure(
+            name=DATASET_NAME,
+            attributes=DATASET_ATTRIBUTES,
+        )
+
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-        self.__postgresql_data_driver.create_structure(
+    def test_fill_structure(self):
+        self.__create_dataset(DATASET_NAME)
+
+        self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
         )
 
-        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
-                delimiter=DATASET_DELIMITER,
-                header=DATASET_HEADER,
-                input_csv=dataset_file,
-            )
+    def test_get_training_split(self):
+        self.__create_dataset(DATASET_NAME)
 
         with tempfile.TemporaryFile() as temporary_file:
             self.__postgresql_data_driver.get_training_split(
@@ -240,28 +255,68 @@ class PostgreSQLDataDriverTest(unittest.TestCase):
         )
 
     def test_get_fusion_split(self):
+        self.__create_dataset(DATASET_NAME)
+
+        with tempfile.TemporaryFile() as temporary_file:
+            self.__postgresql_data_driver.get_fusion_split(
+                dataset_name=DATASET_NAME,
+                training_rate=TRAINING_RATE,
+                fusion_rate=FUSION_RATE,
+                class_attribute=CLASS_ATTRIBUTE,
+                include_attributes=INCLUDE_ATTRIBUTES,
+                exclude_attributes=EXCLUDE_ATTRIBUTES,
+                attributes_rate=ATTRIBUTES_RATE,
+                random_seed=RANDOM_SEED,
+                output_csv=temporary_file,
+                include_header=INCLUDE_HEADER,
+                class_only=False,
+            )
+
+            temporary_file.seek(0)
+
+            for line in temporary_file:
+                print(line)
+
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-        self.__postgresql_data_driver.create_structure(
+    def test_get_test_split(self):
+        self.__create_dataset(DATASET_NAME)
+
+        with tempfile.TemporaryFile() as temporary_file:
+            self.__postgresql_data_driver.get_test_split(
+                dataset_name=DATASET_NAME,
+                training_rate=TRAINING_RATE,
+                fusion_rate=FUSION_RATE,
+                class_attribute=CLASS_ATTRIBUTE,
+                include_attributes=INCLUDE_ATTRIBUTES,
+                exclude_attributes=EXCLUDE_ATTRIBUTES,
+                attributes_rate=ATTRIBUTES_RATE,
+                random_seed=RANDOM_SEED,
+                output_csv=temporary_file,
+                include_header=INCLUDE_HEADER,
+                class_only=False,
+            )
+
+            temporary_file.seek(0)
+
+            for line in temporary_file:
+                print(line)
+
+        self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
         )
 
-        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
-                delimiter=DATASET_DELIMITER,
-                header=DATASET_HEADER,
-                input_csv=dataset_file,
-            )
+    def test_get_training_sample(self):
+        self.__create_dataset(DATASET_NAME)
 
         with tempfile.TemporaryFile() as temporary_file:
-            self.__postgresql_data_driver.get_fusion_split(
+            self.__postgresql_data_driver.get_training_sample(
                 dataset_name=DATASET_NAME,
                 training_rate=TRAINING_RATE,
-                fusion_rate=FUSION_RATE,
+                sample_rate=TRAINING_SAMPLE_RATE,
+                sample_number=TRAINING_SAMPLE_NUMBER,
                 class_attribute=CLASS_ATTRIBUTE,
                 include_attributes=INCLUDE_ATTRIBUTES,
                 exclude_attributes=EXCLUDE_ATTRIBUTES,
@@ -281,72 +336,285 @@ class PostgreSQLDataDriverTest(unittest.TestCase):
             name=DATASET_NAME,
         )
 
-    def test_get_test_split(self):
+    def test_get_fusion_split_class(self):
+        self.__create_dataset(DATASET_NAME)
+
+        with tempfile.TemporaryFile() as temporary_file:
+            self.__postgresql_data_driver.get_fusion_split(
+                dataset_name=DATASET_NAME,
+                training_rate=TRAINING_RATE,
+                fusion_rate=FUSION_RATE,
+                class_attribute=CLASS_ATTRIBUTE,
+                include_attributes=INCLUDE_ATTRIBUTES,
+                exclude_attributes=EXCLUDE_ATTRIBUTES,
+                attributes_rate=ATTRIBUTES_RATE,
+                random_seed=RANDOM_SEED,
+                output_csv=temporary_file,
+                include_header=INCLUDE_HEADER,
+                class_only=True,
+            )
+
+            temporary_file.seek(0)
+
+            for line in temporary_file:
+                print(line)
+
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-        self.__postgresql_data_driver.create_structure(
+    def test_get_splits_hash(self):
+        self.__create_dataset(DATASET_NAME)
+
+        splits_lines = []
+        for get_split in [
+            self.__postgresql_data_driver.get_fusion_split,
+            self.__postgresql_data_driver.get_test_split,
+        ]:
+            with tempfile.TemporaryFile() as temporary_file:
+                get_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    fusion_rate=FUSION_RATE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=1.0,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                    split_mode=DataDriver.SplitMode.hash,
+                )
+
+                temporary_file.seek(0)
+                splits_lines.append(temporary_file.readlines())
+
+        with tempfile.TemporaryFile() as temporary_file:
+            self.__postgresql_data_driver.get_training_split(
+                dataset_name=DATASET_NAME,
+                training_rate=TRAINING_RATE,
+                class_attribute=CLASS_ATTRIBUTE,
+                include_attributes=INCLUDE_ATTRIBUTES,
+                exclude_attributes=EXCLUDE_ATTRIBUTES,
+                attributes_rate=1.0,
+                random_seed=RANDOM_SEED,
+                output_csv=temporary_file,
+                include_header=INCLUDE_HEADER,
+                class_only=False,
+                split_mode=DataDriver.SplitMode.hash,
+            )
+
+            temporary_file.seek(0)
+            splits_lines.append(temporary_file.readlines())
+
+        # The splits are disjoint and cover the dataset.
+        all_lines = [line for split_lines in splits_lines for line in split_lines]
+        self.assertEqual(len(all_lines), 1000)
+        self.assertEqual(len(set(all_lines)), len(all_lines))
+
+        # Every class is split at the sizes of the random mode, the class being the last column.
+        fusion_classes_counts, test_classes_counts, training_classes_counts = [
+            collections.Counter(line.rstrip(b'\n').split(b',')[-1] for line in split_lines)
+            for split_lines in splits_lines
+        ]
+        classes_counts = fusion_classes_counts + test_classes_counts + training_classes_counts
+        for class_value, class_count in classes_counts.items():
+            self.assertEqual(training_classes_counts[class_value], int(class_count * TRAINING_RATE))
+            self.assertEqual(fusion_classes_counts[class_value], int(class_count * FUSION_RATE))
+
+        self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
         )
 
-        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
-                delimiter=DATASET_DELIMITER,
-                header=DATASET_HEADER,
-                input_csv=dataset_file,
-            )
+    def test_get_splits_bernoulli(self):
+        self.__create_dataset(DATASET_NAME)
+
+        splits_lines = []
+        for get_split in [
+            self.__postgresql_data_driver.get_fusion_split,
+            self.__postgresql_data_driver.get_test_split,
+        ]:
+            with tempfile.TemporaryFile() as temporary_file:
+                get_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    fusion_rate=FUSION_RATE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=1.0,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                    split_mode=DataDriver.SplitMode.bernoulli,
+                )
+
+                temporary_file.seek(0)
+                splits_lines.append(temporary_file.readlines())
 
         with tempfile.TemporaryFile() as temporary_file:
-            self.__postgresql_data_driver.get_test_split(
+            self.__postgresql_data_driver.get_training_split(
                 dataset_name=DATASET_NAME,
                 training_rate=TRAINING_RATE,
-                fusion_rate=FUSION_RATE,
                 class_attribute=CLASS_ATTRIBUTE,
                 include_attributes=INCLUDE_ATTRIBUTES,
                 exclude_attributes=EXCLUDE_ATTRIBUTES,
-                attributes_rate=ATTRIBUTES_RATE,
+                attributes_rate=1.0,
                 random_seed=RANDOM_SEED,
                 output_csv=temporary_file,
                 include_header=INCLUDE_HEADER,
                 class_only=False,
+                split_mode=DataDriver.SplitMode.bernoulli,
             )
 
             temporary_file.seek(0)
+            splits_lines.append(temporary_file.readlines())
 
-            for line in temporary_file:
-                print(line)
+        # The splits are disjoint and cover the dataset.
+        all_lines = [line for split_lines in splits_lines for line in split_lines]
+        self.assertEqual(len(all_lines), 1000)
+        self.assertEqual(len(set(all_lines)), len(all_lines))
+
+        # The rates summing beyond 1 sample the whole dataset, leaving the test split empty.
+        with tempfile.TemporaryFile() as temporary_file:
+            split_sizes = self.__postgresql_data_driver.get_fusion_split(
+                dataset_name=DATASET_NAME,
+                training_rate=TRAINING_RATE,
+                fusion_rate=1 - TRAINING_RATE + FUSION_RATE,
+                class_attribute=CLASS_ATTRIBUTE,
+                include_attributes=INCLUDE_ATTRIBUTES,
+                exclude_attributes=EXCLUDE_ATTRIBUTES,
+                attributes_rate=1.0,
+                random_seed=RANDOM_SEED,
+                output_csv=temporary_file,
+                include_header=INCLUDE_HEADER,
+                class_only=False,
+                split_mode=DataDriver.SplitMode.bernoulli,
+            )
+
+        self.assertEqual(split_sizes['achieved_size'], 1000 - len(splits_lines[2]))
 
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-    def test_get_training_sample(self):
+    def test_get_fold_splits(self):
+        self.__create_dataset(DATASET_NAME)
+
+        training_lines = []
+        validation_lines = []
+        for fold_number in range(FOLDS_NUMBER):
+            for get_fold_split, lines in [
+                (self.__postgresql_data_driver.get_fold_training_split, training_lines),
+                (self.__postgresql_data_driver.get_fold_validation_split, validation_lines),
+            ]:
+                with tempfile.TemporaryFile() as temporary_file:
+                    get_fold_split(
+                        dataset_name=DATASET_NAME,
+                        folds_number=FOLDS_NUMBER,
+                        fold_number=fold_number,
+                        class_attribute=CLASS_ATTRIBUTE,
+                        include_attributes=[CLASS_ATTRIBUTE],
+                        exclude_attributes=EXCLUDE_ATTRIBUTES,
+                        attributes_rate=1.0,
+                        random_seed=RANDOM_SEED,
+                        output_csv=temporary_file,
+                        include_header=INCLUDE_HEADER,
+                        class_only=False,
+                    )
+
+                    temporary_file.seek(0)
+                    lines.append(temporary_file.readlines())
+
+        # The folds partition the dataset, every fold training part being the other folds.
+        classes_counts = collections.Counter(line for fold_lines in validation_lines for line in fold_lines)
+        self.assertEqual(sum(classes_counts.values()), 1000)
+        for fold_number in range(FOLDS_NUMBER):
+            self.assertEqual(len(training_lines[fold_number]) + len(validation_lines[fold_number]), 1000)
+
+            # Every class is dealt evenly across the folds.
+            fold_classes_counts = collections.Counter(validation_lines[fold_number])
+            for class_value, class_count in classes_counts.items():
+                self.assertLessEqual(abs(fold_classes_counts[class_value] - class_count / FOLDS_NUMBER), 1)
+
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-        self.__postgresql_data_driver.create_structure(
+    def test_destroy_structure_derived_tables(self):
+        other_dataset_name = DATASET_NAME + '__other'
+
+        def get_tables_names():
+            connection = psycopg2.connect(
+                database=POSTGRESQL_DATABASE,
+                user=POSTGRESQL_USERNAME,
+                password=POSTGRESQL_PASSWORD,
+                host=POSTGRESQL_HOSTNAME,
+                port=POSTGRESQL_PORT,
+            )
+            with connection, connection.cursor() as cursor:
+                cursor.execute('SELECT tablename FROM pg_tables WHERE schemaname = CURRENT_SCHEMA();')
+                tables_names = {x[0] for x in cursor.fetchall()}
+            connection.close()
+            return tables_names
+
+        def get_fold_split(dataset_name):
+            with tempfile.TemporaryFile() as temporary_file:
+                self.__postgresql_data_driver.get_fold_validation_split(
+                    dataset_name=dataset_name,
+                    folds_number=FOLDS_NUMBER,
+                    fold_number=FOLD_NUMBER,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=1.0,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                )
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=other_dataset_name,
+        )
+
+        # Collects the tables of a dataset and of another one whose name starts with its derived tables prefix.
+        tables_names = get_tables_names()
+        self.__create_dataset(DATASET_NAME)
+        get_fold_split(DATASET_NAME)
+        dataset_tables_names = get_tables_names() - tables_names
+
+        self.__create_dataset(other_dataset_name)
+        get_fold_split(other_dataset_name)
+        tables_names = get_tables_names()
+
+        # Only the tables of the destroyed dataset are dropped.
+        self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
-            attributes=DATASET_ATTRIBUTES,
         )
 
-        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
-                name=DATASET_NAME,
-                delimiter=DATASET_DELIMITER,
-                header=DATASET_HEADER,
-                input_csv=dataset_file,
+        self.assertEqual(get_tables_names(), tables_names - dataset_tables_names)
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=other_dataset_name,
+        )
+
+        # The names truncated by the database are rejected.
+        with self.assertRaises(ValueError):
+            self.__postgresql_data_driver.create_structure(
+                name='d' * 64,
+                attributes=DATASET_ATTRIBUTES,
             )
 
+    def test_get_training_bootstrap(self):
+        self.__create_dataset(DATASET_NAME)
+
         with tempfile.TemporaryFile() as temporary_file:
-            self.__postgresql_data_driver.get_training_sample(
+            self.__postgresql_data_driver.get_training_split(
                 dataset_name=DATASET_NAME,
                 training_rate=TRAINING_RATE,
-                sample_rate=TRAINING_SAMPLE_RATE,
-                sample_number=TRAINING_SAMPLE_NUMBER,
                 class_attribute=CLASS_ATTRIBUTE,
                 include_attributes=INCLUDE_ATTRIBUTES,
                 exclude_attributes=EXCLUDE_ATTRIBUTES,
@@ -358,15 +626,231 @@ class PostgreSQLDataDriverTest(unittest.TestCase):
             )
 
             temporary_file.seek(0)
+            training_lines = set(temporary_file.readlines())
 
-            for line in temporary_file:
-                print(line)
+        with tempfile.TemporaryFile() as temporary_file:
+            self.__postgresql_data_driver.get_training_bootstrap(
+                dataset_name=DATASET_NAME,
+                training_rate=TRAINING_RATE,
+                sample_size=BOOTSTRAP_SAMPLE_SIZE,
+                class_attribute=CLASS_ATTRIBUTE,
+                include_attributes=INCLUDE_ATTRIBUTES,
+                exclude_attributes=EXCLUDE_ATTRIBUTES,
+                attributes_rate=ATTRIBUTES_RATE,
+                random_seed=RANDOM_SEED,
+                output_csv=temporary_file,
+                include_header=INCLUDE_HEADER,
+                class_only=False,
+                include_weights=True,
+            )
+
+            temporary_file.seek(0)
+            bootstrap_lines = temporary_file.readlines()
+
+        # The drawn instances belong to the training split and their multiplicities sum to the sample size.
+        multiplicities_sum = 0
+        for line in bootstrap_lines:
+            instance, multiplicity = line.rsplit(b',', 1)
+            self.assertIn(instance + b'\n', training_lines)
+            multiplicities_sum += int(multiplicity)
+        self.assertEqual(multiplicities_sum, BOOTSTRAP_SAMPLE_SIZE)
+
+        # The positions are drawn uniformly, repeating some instances as many independent draws would.
+        training_size = len(training_lines)
+        expected_drawn_number = training_size * (1 - (1 - 1 / training_size) ** BOOTSTRAP_SAMPLE_SIZE)
+        self.assertAlmostEqual(len(bootstrap_lines), expected_drawn_number, delta=20)
 
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
 
-    def test_get_fusion_split_class(self):
+    def test_get_training_sample_balanced(self):
+        self.__create_dataset(DATASET_NAME)
+
+        for balancing_strategy in [DataDriver.BalancingStrategy.undersample, DataDriver.BalancingStrategy.oversample]:
+            with tempfile.TemporaryFile() as temporary_file:
+                split_sizes = self.__postgresql_data_driver.get_training_sample(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    sample_rate=TRAINING_SAMPLE_RATE,
+                    sample_number=TRAINING_SAMPLE_NUMBER,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=True,
+                    balancing_strategy=balancing_strategy,
+                )
+
+                temporary_file.seek(0)
+                classes_counts = collections.Counter(temporary_file.readlines())
+
+            # Every class is represented by the same number of instances.
+            self.assertEqual(len(set(classes_counts.values())), 1)
+            self.assertEqual(sum(classes_counts.values()), split_sizes['achieved_size'])
+            self.assertEqual(split_sizes['requested_size'], split_sizes['achieved_size'])
+
+        # The classes too small to be sampled, as the 32 training instances of a class sampled at 2%, are ignored by the
+        # smallest sample size, the other classes having samples of 2 and 6 instances.
+        for balancing_strategy, balancing_ratio, expected_classes_counts in [
+            (DataDriver.BalancingStrategy.undersample, None, [2, 2]),
+            (DataDriver.BalancingStrategy.ratio, 1.5, [2, 3]),
+        ]:
+            with tempfile.TemporaryFile() as temporary_file:
+                self.__postgresql_data_driver.get_training_sample(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    sample_rate=0.02,
+                    sample_number=0,
+                    class_attribute=RARE_CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=True,
+                    balancing_strategy=balancing_strategy,
+                    balancing_ratio=balancing_ratio,
+                )
+
+                temporary_file.seek(0)
+                classes_counts = collections.Counter(temporary_file.readlines())
+
+            self.assertEqual(sorted(classes_counts.values()), expected_classes_counts)
+
+        # The cap and ratio strategies require their parameters.
+        for balancing_strategy in [DataDriver.BalancingStrategy.cap, DataDriver.BalancingStrategy.ratio]:
+            with self.assertRaises(ValueError):
+                self.__postgresql_data_driver.get_training_sample(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    sample_rate=TRAINING_SAMPLE_RATE,
+                    sample_number=TRAINING_SAMPLE_NUMBER,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=io.BytesIO(),
+                    include_header=INCLUDE_HEADER,
+                    class_only=True,
+                    balancing_strategy=balancing_strategy,
+                )
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_splits_stratified(self):
+        self.__create_dataset(DATASET_NAME)
+
+        splits_lines = []
+        for get_split in [
+            self.__postgresql_data_driver.get_fusion_split,
+            self.__postgresql_data_driver.get_test_split,
+        ]:
+            with tempfile.TemporaryFile() as temporary_file:
+                split_sizes = get_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    fusion_rate=FUSION_RATE,
+                    class_attribute=CONTINUOUS_CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=1.0,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                    strata_number=STRATA_NUMBER,
+                )
+                self.assertEqual(split_sizes['requested_size'], split_sizes['achieved_size'])
+
+                temporary_file.seek(0)
+                splits_lines.append(temporary_file.readlines())
+
+        with tempfile.TemporaryFile() as temporary_file:
+            split_sizes = self.__postgresql_data_driver.get_training_split(
+                dataset_name=DATASET_NAME,
+                training_rate=TRAINING_RATE,
+                class_attribute=CONTINUOUS_CLASS_ATTRIBUTE,
+                include_attributes=INCLUDE_ATTRIBUTES,
+                exclude_attributes=EXCLUDE_ATTRIBUTES,
+                attributes_rate=1.0,
+                random_seed=RANDOM_SEED,
+                output_csv=temporary_file,
+                include_header=INCLUDE_HEADER,
+                class_only=False,
+                strata_number=STRATA_NUMBER,
+            )
+            self.assertEqual(split_sizes['requested_size'], 500)
+            self.assertEqual(split_sizes['achieved_size'], 500)
+
+            temporary_file.seek(0)
+            splits_lines.append(temporary_file.readlines())
+
+        # The splits are disjoint and cover the dataset.
+        all_lines = [line for split_lines in splits_lines for line in split_lines]
+        self.assertEqual(len(all_lines), 1000)
+        self.assertEqual(len(set(all_lines)), len(all_lines))
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_training_split_encoded(self):
+        text_attributes = [dict(x, type='text') if x['name'] == CLASS_ATTRIBUTE else x for x in DATASET_ATTRIBUTES]
+        encoded_attributes = [dict(x, encoded=True) if x['name'] == CLASS_ATTRIBUTE else x for x in text_attributes]
+
+        splits_lines = []
+        for attributes in [text_attributes, encoded_attributes]:
+            self.__postgresql_data_driver.destroy_structure(
+                name=DATASET_NAME,
+            )
+
+            self.__postgresql_data_driver.create_structure(
+                name=DATASET_NAME,
+                attributes=attributes,
+            )
+
+            with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+                self.__postgresql_data_driver.fill_structure(
+                    name=DATASET_NAME,
+                    delimiter=DATASET_DELIMITER,
+                    header=DATASET_HEADER,
+                    input_csv=dataset_file,
+                )
+
+            with tempfile.TemporaryFile() as temporary_file:
+                self.__postgresql_data_driver.get_training_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                )
+
+                temporary_file.seek(0)
+                splits_lines.append(sorted(temporary_file.readlines()))
+
+        # The encoded class attribute is decoded to the original values.
+        self.assertEqual(len(splits_lines[1]), 500)
+        self.assertEqual(splits_lines[0], splits_lines[1])
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_append_structure(self):
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
@@ -377,33 +861,666 @@ class PostgreSQLDataDriverTest(unittest.TestCase):
         )
 
         with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
-            self.__postgresql_data_driver.fill_structure(
+            lines = dataset_file.readlines()
+
+        self.__postgresql_data_driver.fill_structure(
+            name=DATASET_NAME,
+            delimiter=DATASET_DELIMITER,
+            header=DATASET_HEADER,
+            input_csv=io.BytesIO(b''.join(lines[:600])),
+        )
+
+        folds_lines = []
+        for _ in range(2):
+            folds_lines.append([])
+            for fold_number in range(FOLDS_NUMBER):
+                with tempfile.TemporaryFile() as temporary_file:
+                    self.__postgresql_data_driver.get_fold_validation_split(
+                        dataset_name=DATASET_NAME,
+                        folds_number=FOLDS_NUMBER,
+                        fold_number=fold_number,
+                        class_attribute=CLASS_ATTRIBUTE,
+                        include_attributes=INCLUDE_ATTRIBUTES,
+                        exclude_attributes=EXCLUDE_ATTRIBUTES,
+                        attributes_rate=1.0,
+                        random_seed=RANDOM_SEED,
+                        output_csv=temporary_file,
+                        include_header=INCLUDE_HEADER,
+                        class_only=False,
+                    )
+
+                    temporary_file.seek(0)
+                    folds_lines[-1].append(set(temporary_file.readlines()))
+
+            if len(folds_lines) == 1:
+                appended_instances_number = self.__postgresql_data_driver.append_structure(
+                    name=DATASET_NAME,
+                    delimiter=DATASET_DELIMITER,
+                    header=DATASET_HEADER,
+                    input_csv=io.BytesIO(b''.join(lines[600:])),
+                )
+                self.assertEqual(appended_instances_number, 400)
+
+        # The existing instances keep their folds, and the appended ones are dealt evenly.
+        all_lines = [line for fold_lines in folds_lines[1] for line in fold_lines]
+        self.assertEqual(len(all_lines), 1000)
+        self.assertEqual(len(set(all_lines)), len(all_lines))
+        for fold_number in range(FOLDS_NUMBER):
+            self.assertTrue(folds_lines[0][fold_number] <= folds_lines[1][fold_number])
+            self.assertLessEqual(abs(len(folds_lines[1][fold_number]) - 1000 // FOLDS_NUMBER), 2)
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_statistics(self):
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+        self.__postgresql_data_driver.create_structure(
+            name=DATASET_NAME,
+            attributes=DATASET_ATTRIBUTES,
+        )
+
+        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+            lines = dataset_file.readlines()
+
+        self.__postgresql_data_driver.fill_structure(
+            name=DATASET_NAME,
+            delimiter=DATASET_DELIMITER,
+            header=DATASET_HEADER,
+            input_csv=io.BytesIO(b''.join(lines[:600])),
+        )
+
+        # Computes the statistics of every class before appending, so that they are merged.
+        self.__postgresql_data_driver.get_statistics(
+            dataset_name=DATASET_NAME,
+            class_attribute=CLASS_ATTRIBUTE,
+        )
+
+        self.__postgresql_data_driver.append_structure(
+            name=DATASET_NAME,
+            delimiter=DATASET_DELIMITER,
+            header=DATASET_HEADER,
+            input_csv=io.BytesIO(b''.join(lines[600:])),
+        )
+
+        dataset_statistics = self.__postgresql_data_driver.get_statistics(
+            dataset_name=DATASET_NAME,
+            class_attribute=CLASS_ATTRIBUTE,
+            quantiles=True,
+        )
+
+        self.assertEqual(dataset_statistics['instances_number'], 1000)
+
+        values = collections.defaultdict(list)
+        for line in lines:
+            row = line.decode().split(DATASET_DELIMITER)
+            values[float(row[0])].append(float(row[1]))
+        all_values = [x for class_values in values.values() for x in class_values]
+
+        attribute_statistics = dataset_statistics['attributes'][CONTINUOUS_CLASS_ATTRIBUTE]
+        self.assertEqual(attribute_statistics['values_number'], 1000)
+        self.assertAlmostEqual(attribute_statistics['minimum'], min(all_values), delta=1e-4)
+        self.assertAlmostEqual(attribute_statistics['maximum'], max(all_values), delta=1e-4)
+        self.assertAlmostEqual(attribute_statistics['mean'], statistics.mean(all_values), delta=1e-4)
+        self.assertAlmostEqual(attribute_statistics['variance'], statistics.pvariance(all_values), delta=1e-4)
+        self.assertEqual(len(attribute_statistics['quantiles']), len(dataset_statistics['quantiles_fractions']))
+
+        self.assertEqual(len(dataset_statistics['classes']), len(values))
+        for class_statistics in dataset_statistics['classes']:
+            class_values = values[float(class_statistics['class_value'])]
+            attribute_statistics = class_statistics['attributes'][CONTINUOUS_CLASS_ATTRIBUTE]
+            self.assertEqual(class_statistics['instances_number'], len(class_values))
+            self.assertAlmostEqual(attribute_statistics['mean'], statistics.mean(class_values), delta=1e-4)
+            self.assertAlmostEqual(attribute_statistics['variance'], statistics.pvariance(class_values), delta=1e-4)
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_training_split_normalized(self):
+        self.__create_dataset(DATASET_NAME)
+
+        for split_mode, normalization in [
+            (DataDriver.SplitMode.random, DataDriver.Normalization.zscore),
+            (DataDriver.SplitMode.hash, DataDriver.Normalization.minmax),
+        ]:
+            with tempfile.TemporaryFile() as temporary_file:
+                self.__postgresql_data_driver.get_training_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=1.0,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=False,
+                    class_only=False,
+                    split_mode=split_mode,
+                    normalization=normalization,
+                )
+
+                temporary_file.seek(0)
+                rows = [[float(x) for x in line.decode().split(',')] for line in temporary_file]
+
+            # The attributes are normalized over the same training split, while the class is preserved.
+            columns = list(zip(*rows))
+            self.assertTrue(set(columns[-1]) <= {0.0, 1.0})
+            for column in columns[:-1]:
+                if normalization == DataDriver.Normalization.zscore:
+                    self.assertAlmostEqual(statistics.mean(column), 0.0, delta=1e-4)
+                    self.assertAlmostEqual(statistics.pstdev(column), 1.0, delta=1e-4)
+                else:
+                    self.assertAlmostEqual(min(column), 0.0, delta=1e-4)
+                    self.assertAlmostEqual(max(column), 1.0, delta=1e-4)
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_training_split_from_replica(self):
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+        # A database not in recovery is always up to date, as a replica, while an unreachable replica is skipped.
+        replicated_postgresql_data_driver = PostgreSQLDataDriver(
+            POSTGRESQL_DATABASE,
+            POSTGRESQL_USERNAME,
+            POSTGRESQL_PASSWORD,
+            POSTGRESQL_HOSTNAME,
+            POSTGRESQL_PORT,
+            replicas=[(POSTGRESQL_HOSTNAME, POSTGRESQL_PORT), (POSTGRESQL_HOSTNAME, UNREACHABLE_POSTGRESQL_PORT)],
+        )
+
+        replicated_postgresql_data_driver.create_structure(
+            name=DATASET_NAME,
+            attributes=DATASET_ATTRIBUTES,
+        )
+
+        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+            replicated_postgresql_data_driver.fill_structure(
                 name=DATASET_NAME,
                 delimiter=DATASET_DELIMITER,
                 header=DATASET_HEADER,
                 input_csv=dataset_file,
             )
 
-        with tempfile.TemporaryFile() as temporary_file:
-            self.__postgresql_data_driver.get_fusion_split(
+        splits_lines = []
+        for postgresql_data_driver in [self.__postgresql_data_driver, replicated_postgresql_data_driver]:
+            with tempfile.TemporaryFile() as temporary_file:
+                postgresql_data_driver.get_training_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                )
+
+                postgresql_data_driver.get_training_bootstrap(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    sample_size=BOOTSTRAP_SAMPLE_SIZE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                )
+
+                postgresql_data_driver.get_fold_validation_split(
+                    dataset_name=DATASET_NAME,
+                    folds_number=FOLDS_NUMBER,
+                    fold_number=FOLD_NUMBER,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                )
+
+                temporary_file.seek(0)
+                splits_lines.append(temporary_file.readlines())
+
+        self.assertEqual(len(splits_lines[0]), 500 + BOOTSTRAP_SAMPLE_SIZE + 200)
+        self.assertEqual(splits_lines[0], splits_lines[1])
+
+        # Releases the reads of the replicated driver before destroying the dataset.
+        replicated_postgresql_data_driver.close()
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_training_split_column_groups(self):
+        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+            lines = dataset_file.readlines()
+
+        splits_lines = []
+        for column_group_size in [None, COLUMN_GROUP_SIZE]:
+            self.__postgresql_data_driver.destroy_structure(
+                name=DATASET_NAME,
+            )
+
+            self.__postgresql_data_driver.create_structure(
+                name=DATASET_NAME,
+                attributes=DATASET_ATTRIBUTES,
+                column_group_size=column_group_size,
+            )
+
+            self.__postgresql_data_driver.fill_structure(
+                name=DATASET_NAME,
+                delimiter=DATASET_DELIMITER,
+                header=DATASET_HEADER,
+                input_csv=io.BytesIO(b''.join(lines[:600])),
+            )
+            self.__postgresql_data_driver.append_structure(
+                name=DATASET_NAME,
+                delimiter=DATASET_DELIMITER,
+                header=DATASET_HEADER,
+                input_csv=io.BytesIO(b''.join(lines[600:])),
+            )
+
+            with tempfile.TemporaryFile() as temporary_file:
+                self.__postgresql_data_driver.get_training_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=True,
+                    class_only=False,
+                    split_mode=DataDriver.SplitMode.hash,
+                )
+
+                temporary_file.seek(0)
+                splits_lines.append(sorted(temporary_file.readlines()))
+
+        # The column groups store the same instances, with the same row ids.
+        self.assertEqual(self.__postgresql_data_driver.get_structure_attributes(DATASET_NAME), DATASET_ATTRIBUTES)
+        self.assertEqual(splits_lines[0], splits_lines[1])
+
+        # Only the column group of the selected attribute is joined to the row ids.
+        connection = psycopg2.connect(
+            database=POSTGRESQL_DATABASE,
+            user=POSTGRESQL_USERNAME,
+            password=POSTGRESQL_PASSWORD,
+            host=POSTGRESQL_HOSTNAME,
+            port=POSTGRESQL_PORT,
+        )
+        with connection, connection.cursor() as cursor:
+            cursor.execute('EXPLAIN SELECT "m_bb" FROM {};'.format(DATASET_NAME))
+            plan = '\n'.join(x[0] for x in cursor.fetchall())
+        connection.close()
+        scanned_column_groups = {x for x in range(7) if '__columns_{} '.format(x) in plan}
+        self.assertEqual(scanned_column_groups, {0, 6})
+
+        # The view of the column groups cannot be sampled by TABLESAMPLE.
+        with self.assertRaises(ValueError):
+            self.__postgresql_data_driver.get_training_split(
                 dataset_name=DATASET_NAME,
                 training_rate=TRAINING_RATE,
-                fusion_rate=FUSION_RATE,
                 class_attribute=CLASS_ATTRIBUTE,
                 include_attributes=INCLUDE_ATTRIBUTES,
                 exclude_attributes=EXCLUDE_ATTRIBUTES,
                 attributes_rate=ATTRIBUTES_RATE,
                 random_seed=RANDOM_SEED,
-                output_csv=temporary_file,
+                output_csv=io.BytesIO(),
                 include_header=INCLUDE_HEADER,
-                class_only=True,
+                class_only=False,
+                split_mode=DataDriver.SplitMode.bernoulli,
+            )
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_training_split_array(self):
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+        # More attributes than the columns of a table, the value j of the instance i being i * 10000 + j.
+        self.__postgresql_data_driver.create_structure(
+            name=DATASET_NAME,
+            attributes=[{'name': CLASS_ATTRIBUTE, 'type': 'integer'}] + [
+                {'name': 'feature_{}'.format(x), 'type': 'real', 'array': True}
+                for x in range(ARRAY_ATTRIBUTES_NUMBER)
+            ],
+            array_type='float4',
+        )
+
+        self.__postgresql_data_driver.fill_structure(
+            name=DATASET_NAME,
+            delimiter=DATASET_DELIMITER,
+            header=DATASET_HEADER,
+            input_csv=io.BytesIO(b''.join(
+                ','.join([str(i % 2)] + [str(i * 10000 + j) for j in range(ARRAY_ATTRIBUTES_NUMBER)]).encode() + b'\n'
+                for i in range(ARRAY_INSTANCES_NUMBER)
+            )),
+        )
+
+        with tempfile.TemporaryFile() as temporary_file:
+            self.__postgresql_data_driver.get_training_split(
+                dataset_name=DATASET_NAME,
+                training_rate=TRAINING_RATE,
+                class_attribute=CLASS_ATTRIBUTE,
+                include_attributes=INCLUDE_ATTRIBUTES,
+                exclude_attributes=EXCLUDE_ATTRIBUTES,
+                attributes_rate=0.01,
+                random_seed=RANDOM_SEED,
+                output_csv=temporary_file,
+                include_header=True,
+                class_only=False,
             )
 
             temporary_file.seek(0)
+            split_lines = [x.decode().strip().split(',') for x in temporary_file.readlines()]
 
-            for line in temporary_file:
-                print(line)
+        # The sampled attributes are subscripted from the arrays, in the original order.
+        header = split_lines[0]
+        self.assertEqual(len(header), int(ARRAY_ATTRIBUTES_NUMBER * 0.01) + 1)
+        self.assertEqual(header[-1], CLASS_ATTRIBUTE)
+        positions = [int(x[len('feature_'):]) for x in header[:-1]]
+        self.assertEqual(positions, sorted(positions))
+        self.assertEqual(len(split_lines) - 1, ARRAY_INSTANCES_NUMBER * TRAINING_RATE)
+        for row in split_lines[1:]:
+            instance_number = int(float(row[0])) // 10000
+            self.assertEqual([float(x) for x in row[:-1]], [instance_number * 10000.0 + x for x in positions])
+            self.assertEqual(int(row[-1]), instance_number % 2)
+
+        # The statistics of the array attributes are computed by position.
+        dataset_statistics = self.__postgresql_data_driver.get_statistics(
+            dataset_name=DATASET_NAME,
+            class_attribute=CLASS_ATTRIBUTE,
+            quantiles=True,
+        )
+        attribute_statistics = dataset_statistics['attributes']['feature_5']
+        self.assertEqual(attribute_statistics['values_number'], ARRAY_INSTANCES_NUMBER)
+        self.assertAlmostEqual(
+            attribute_statistics['mean'],
+            statistics.mean(i * 10000 + 5 for i in range(ARRAY_INSTANCES_NUMBER)),
+        )
+        self.assertEqual(len(attribute_statistics['quantiles']), len(dataset_statistics['quantiles_fractions']))
+        self.assertEqual(
+            len(self.__postgresql_data_driver.get_structure_attributes(DATASET_NAME)),
+            ARRAY_ATTRIBUTES_NUMBER + 1,
+        )
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_training_split_sparse(self):
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+        self.__postgresql_data_driver.create_structure(
+            name=DATASET_NAME,
+            attributes=[{'name': CLASS_ATTRIBUTE, 'type': 'integer'}],
+            sparse=True,
+        )
+
+        # The instance i has the non-zero features i + 1 and i * 500 + 1, the last one being the last feature.
+        def get_features(i):
+            return sorted({i + 1, i * 500 + 1, SPARSE_FEATURES_NUMBER} if i == 0 else {i + 1, i * 500 + 1})
+
+        self.__postgresql_data_driver.fill_structure(
+            name=DATASET_NAME,
+            delimiter=None,
+            header=None,
+            input_csv=io.BytesIO(b''.join(
+                ' '.join([str(i % 2)] + ['{}:{}'.format(x, i) for x in get_features(i)]).encode() + b'\n'
+                for i in range(SPARSE_INSTANCES_NUMBER)
+            )),
+        )
+        self.assertEqual(
+            len(self.__postgresql_data_driver.get_structure_attributes(DATASET_NAME)),
+            SPARSE_FEATURES_NUMBER + 1,
+        )
+
+        for attributes_rate in [1, 0.5]:
+            with tempfile.TemporaryFile() as temporary_file:
+                split_sizes = self.__postgresql_data_driver.get_training_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=attributes_rate,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=True,
+                    class_only=False,
+                )
+
+                temporary_file.seek(0)
+                split_lines = [x.decode() for x in temporary_file.readlines()]
+
+            # The LIBSVM lines have no header, and keep the sampled features only.
+            self.assertEqual(len(split_lines), split_sizes['achieved_size'])
+            self.assertEqual(len(split_lines), SPARSE_INSTANCES_NUMBER * TRAINING_RATE)
+            for line in split_lines:
+                label, indices, values = utils.parse_libsvm_line(line)
+                instance_number = int(float(values[0])) if values else None
+                if instance_number is None:
+                    self.assertLess(attributes_rate, 1)
+                    continue
+                self.assertEqual(int(label), instance_number % 2)
+                self.assertLessEqual(set(indices), set(get_features(instance_number)))
+                if attributes_rate == 1:
+                    self.assertEqual(indices, get_features(instance_number))
+
+            # The compressed sparse rows keep the instances and their non-zero values.
+            with io.BytesIO() as csr_file:
+                utils.write_csr(split_lines, csr_file)
+                rows_number, _, values_number = struct.unpack(utils.CSR_HEADER_FORMAT, csr_file.getvalue()[:24])
+            self.assertEqual(rows_number, len(split_lines))
+            self.assertEqual(values_number, sum(len(x.split()) - 1 for x in split_lines))
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_optimize_structure(self):
+        self.__create_dataset(DATASET_NAME)
+
+        splits_lines = []
+        for cluster in [None, False, True]:
+            if cluster is not None:
+                durations = self.__postgresql_data_driver.optimize_structure(
+                    name=DATASET_NAME,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    cluster=cluster,
+                )
+                self.assertEqual(
+                    list(durations),
+                    ['index', 'cluster', 'analyze', 'vacuum'] if cluster else ['index', 'analyze', 'vacuum'],
+                )
+                self.assertTrue(all(x >= 0 for x in durations.values()))
+
+            with tempfile.TemporaryFile() as temporary_file:
+                self.__postgresql_data_driver.get_training_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                )
+
+                temporary_file.seek(0)
+                splits_lines.append(temporary_file.readlines())
+
+        # The clustering keeps the order of the instances within every class, and so the random splits.
+        self.assertEqual(splits_lines[1], splits_lines[0])
+        self.assertEqual(splits_lines[2], splits_lines[0])
+
+        # The class index is created once.
+        connection = psycopg2.connect(
+            database=POSTGRESQL_DATABASE,
+            user=POSTGRESQL_USERNAME,
+            password=POSTGRESQL_PASSWORD,
+            host=POSTGRESQL_HOSTNAME,
+            port=POSTGRESQL_PORT,
+        )
+        cursor = connection.cursor()
+        cursor.execute('SELECT COUNT(*) FROM pg_index WHERE indrelid = TO_REGCLASS(%s);', (DATASET_NAME,))
+        self.assertEqual(cursor.fetchone()[0], 2)
+        connection.close()
+
+        with self.assertRaises(ValueError):
+            self.__postgresql_data_driver.optimize_structure(
+                name=DATASET_NAME,
+                class_attribute='missing',
+            )
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_get_training_split_partitioned(self):
+        splits_lines = collections.defaultdict(list)
+        for partition_attribute in [None, CLASS_ATTRIBUTE]:
+            self.__postgresql_data_driver.destroy_structure(
+                name=DATASET_NAME,
+            )
+
+            with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+                self.__postgresql_data_driver.import_structure(
+                    name=DATASET_NAME,
+                    attributes=DATASET_ATTRIBUTES,
+                    delimiter=DATASET_DELIMITER,
+                    header=DATASET_HEADER,
+                    input_csv=dataset_file,
+                    partition_attribute=partition_attribute,
+                )
+
+            # The partitions are clustered one by one.
+            if partition_attribute is not None:
+                self.__postgresql_data_driver.optimize_structure(
+                    name=DATASET_NAME,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    cluster=True,
+                )
 
+            for split_mode in [DataDriver.SplitMode.random, DataDriver.SplitMode.hash, DataDriver.SplitMode.bernoulli]:
+                with tempfile.TemporaryFile() as temporary_file:
+                    split_sizes = self.__postgresql_data_driver.get_training_split(
+                        dataset_name=DATASET_NAME,
+                        training_rate=TRAINING_RATE,
+                        class_attribute=CLASS_ATTRIBUTE,
+                        include_attributes=INCLUDE_ATTRIBUTES,
+                        exclude_attributes=EXCLUDE_ATTRIBUTES,
+                        attributes_rate=ATTRIBUTES_RATE,
+                        random_seed=RANDOM_SEED,
+                        output_csv=temporary_file,
+                        include_header=INCLUDE_HEADER,
+                        class_only=False,
+                        split_mode=split_mode,
+                    )
+
+                    temporary_file.seek(0)
+                    split_lines = temporary_file.readlines()
+                    self.assertEqual(split_sizes['achieved_size'], len(split_lines))
+                    splits_lines[split_mode].append(split_lines)
+
+        # Every class value is stored in its own partition, with the published dataset.
+        connection = psycopg2.connect(
+            database=POSTGRESQL_DATABASE,
+            user=POSTGRESQL_USERNAME,
+            password=POSTGRESQL_PASSWORD,
+            host=POSTGRESQL_HOSTNAME,
+            port=POSTGRESQL_PORT,
+        )
+        cursor = connection.cursor()
+        cursor.execute('SELECT COUNT(*) FROM pg_inherits WHERE inhparent = TO_REGCLASS(%s);', (DATASET_NAME,))
+        self.assertEqual(cursor.fetchone()[0], 3)
+        connection.close()
+
+        # The random and hash splits select the same instances, while the bernoulli ones depend on the storage.
+        random_splits_lines = splits_lines[DataDriver.SplitMode.random]
+        self.assertEqual(random_splits_lines[1], random_splits_lines[0])
+        hash_splits_lines = splits_lines[DataDriver.SplitMode.hash]
+        self.assertEqual(sorted(hash_splits_lines[1]), sorted(hash_splits_lines[0]))
+        bernoulli_splits_lines = splits_lines[DataDriver.SplitMode.bernoulli]
+        self.assertAlmostEqual(len(bernoulli_splits_lines[1]), len(bernoulli_splits_lines[0]), delta=50)
+
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+    def test_import_structure_stale_staging(self):
+        self.__postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+        # Leaves the staging structures of an interrupted import, of a running one and of a pending upload.
+        stale_table_name = 'factorizer_import_' + '0' * 32
+        running_table_name = 'factorizer_import_' + '1' * 32
+        for table_name in [stale_table_name, running_table_name]:
+            self.__postgresql_data_driver.create_structure(
+                name=table_name,
+                attributes=DATASET_ATTRIBUTES,
+            )
+        upload_id = self.__postgresql_data_driver.create_upload(
+            name=DATASET_NAME,
+            attributes=DATASET_ATTRIBUTES,
+            delimiter=DATASET_DELIMITER,
+            header=DATASET_HEADER,
+        )
+
+        connection = psycopg2.connect(
+            database=POSTGRESQL_DATABASE,
+            user=POSTGRESQL_USERNAME,
+            password=POSTGRESQL_PASSWORD,
+            host=POSTGRESQL_HOSTNAME,
+            port=POSTGRESQL_PORT,
+        )
+        connection.autocommit = True
+        cursor = connection.cursor()
+        cursor.execute('SELECT PG_ADVISORY_LOCK(HASHTEXT(%s));', (running_table_name,))
+
+        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+            self.__postgresql_data_driver.import_structure(
+                name=DATASET_NAME,
+                attributes=DATASET_ATTRIBUTES,
+                delimiter=DATASET_DELIMITER,
+                header=DATASET_HEADER,
+                input_csv=dataset_file,
+            )
+
+        # Only the structure no session holds is dropped.
+        tables_names = [stale_table_name, running_table_name, 'factorizer_upload_' + upload_id]
+        cursor.execute('SELECT TO_REGCLASS(x) IS NOT NULL FROM UNNEST(%s) AS x;', (tables_names,))
+        self.assertEqual([x for x, in cursor.fetchall()], [False, True, True])
+        connection.close()
+
+        self.__postgresql_data_driver.abort_upload(upload_id)
+        self.__postgresql_data_driver.destroy_structure(
+            name=running_table_name,
+        )
         self.__postgresql_data_driver.destroy_structure(
             name=DATASET_NAME,
         )
@@ -0,0 +1,148 @@
+import collections
+import os
+import tempfile
+import unittest
+
+import psycopg2
+import psycopg2.errors
+
+from factorizer.data_drivers.sharded_postgresql_data_driver import ShardedPostgreSQLDataDriver
+
+
+THIS_DIRECTORY_PATH = os.path.dirname(os.path.abspath(__file__))
+
+DATASET_FILE_PATH = os.path.join(THIS_DIRECTORY_PATH, 'resources/datasets/higgs-1000.csv')
+DATASET_NAME = 'higgs'
+DATASET_DELIMITER = ','
+DATASET_HEADER = False
+DATASET_ATTRIBUTES = [
+    {
+        'name': name,
+        'type': 'real',
+    }
+    for name in [
+        'label', 'lepton_pt', 'lepton_eta', 'lepton_phi', 'missing_energy_magnitude', 'missing_energy_phi', 'jet_1_pt',
+        'jet_1_eta', 'jet_1_phi', 'jet_1_b-tag', 'jet_2_pt', 'jet_2_eta', 'jet_2_phi', 'jet_2_b-tag', 'jet_3_pt',
+        'jet_3_eta', 'jet_3_phi', 'jet_3_b-tag', 'jet_4_pt', 'jet_4_eta', 'jet_4_phi', 'jet_4_b-tag', 'm_jj', 'm_jjj',
+        'm_lv', 'm_jlv', 'm_bb', 'm_wbb', 'm_wwbb',
+    ]
+]
+
+TRAINING_RATE = 0.5
+FUSION_RATE = 0.3
+CLASS_ATTRIBUTE = 'label'
+INCLUDE_ATTRIBUTES = []
+EXCLUDE_ATTRIBUTES = []
+ATTRIBUTES_RATE = 1
+RANDOM_SEED = 0
+
+INCLUDE_HEADER = False
+
+POSTGRESQL_HOSTNAME = 'localhost'
+POSTGRESQL_PORT = '5432'
+POSTGRESQL_DATABASE = 'postgres'
+POSTGRESQL_USERNAME = 'postgres'
+POSTGRESQL_PASSWORD = 'postgres'
+
+# The shards are databases of the same server.
+POSTGRESQL_SHARDS_DATABASES = ['postgres', 'factorizer_shard']
+
+
+class ShardedPostgreSQLDataDriverTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connection = psycopg2.connect(
+            database=POSTGRESQL_DATABASE,
+            user=POSTGRESQL_USERNAME,
+            password=POSTGRESQL_PASSWORD,
+            host=POSTGRESQL_HOSTNAME,
+            port=POSTGRESQL_PORT,
+        )
+        connection.autocommit = True
+        for database in POSTGRESQL_SHARDS_DATABASES[1:]:
+            try:
+                connection.cursor().execute('CREATE DATABASE {};'.format(database))
+            except psycopg2.errors.DuplicateDatabase:
+                pass
+        connection.close()
+
+    def setUp(self):
+        self.__sharded_postgresql_data_driver = ShardedPostgreSQLDataDriver(
+            POSTGRESQL_USERNAME,
+            POSTGRESQL_PASSWORD,
+            [(POSTGRESQL_HOSTNAME, POSTGRESQL_PORT, x) for x in POSTGRESQL_SHARDS_DATABASES],
+        )
+
+    def tearDown(self):
+        self.__sharded_postgresql_data_driver.close()
+
+    def test_get_splits(self):
+        self.__sharded_postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )
+
+        self.__sharded_postgresql_data_driver.create_structure(
+            name=DATASET_NAME,
+            attributes=DATASET_ATTRIBUTES,
+        )
+
+        with open(DATASET_FILE_PATH, mode='rb') as dataset_file:
+            self.__sharded_postgresql_data_driver.fill_structure(
+                name=DATASET_NAME,
+                delimiter=DATASET_DELIMITER,
+                header=DATASET_HEADER,
+                input_csv=dataset_file,
+            )
+            dataset_file.seek(0)
+            dataset_lines = dataset_file.readlines()
+
+        # The per-class sizes of the whole dataset are summed from the shards.
+        statistics = self.__sharded_postgresql_data_driver.get_statistics(
+            dataset_name=DATASET_NAME,
+            class_attribute=CLASS_ATTRIBUTE,
+        )
+        self.assertEqual(statistics['instances_number'], len(dataset_lines))
+        classes_sizes = {x['class_value']: x['instances_number'] for x in statistics['classes']}
+
+        splits_lines = []
+        for get_split in [
+            self.__sharded_postgresql_data_driver.get_training_split,
+            self.__sharded_postgresql_data_driver.get_fusion_split,
+            self.__sharded_postgresql_data_driver.get_test_split,
+        ]:
+            with tempfile.TemporaryFile() as temporary_file:
+                arguments = {} if get_split == self.__sharded_postgresql_data_driver.get_training_split else {
+                    'fusion_rate': FUSION_RATE,
+                }
+                split_sizes = get_split(
+                    dataset_name=DATASET_NAME,
+                    training_rate=TRAINING_RATE,
+                    class_attribute=CLASS_ATTRIBUTE,
+                    include_attributes=INCLUDE_ATTRIBUTES,
+                    exclude_attributes=EXCLUDE_ATTRIBUTES,
+                    attributes_rate=ATTRIBUTES_RATE,
+                    random_seed=RANDOM_SEED,
+                    output_csv=temporary_file,
+                    include_header=INCLUDE_HEADER,
+                    class_only=False,
+                    **arguments
+                )
+
+                temporary_file.seek(0)
+                split_lines = temporary_file.readlines()
+                self.assertEqual(split_sizes['achieved_size'], len(split_lines))
+                splits_lines.append(split_lines)
+
+        # The splits partition the dataset, stratified by class within every shard.
+        self.assertEqual(len(set().union(*splits_lines)), len(dataset_lines))
+        self.assertEqual(sum(len(x) for x in splits_lines), len(dataset_lines))
+        training_classes_sizes = collections.Counter(float(x.split(b',')[-1]) for x in splits_lines[0])
+        for class_value, class_size in classes_sizes.items():
+            self.assertLessEqual(
+                abs(training_classes_sizes[float(class_value)] - class_size * TRAINING_RATE),
+                len(POSTGRESQL_SHARDS_DATABASES),
+            )
+
+        self.__sharded_postgresql_data_driver.destroy_structure(
+            name=DATASET_NAME,
+        )